@@ -0,0 +1,295 @@
+"""Closed-loop JPEG quality / resolution control for UDP capture.
+
+A fixed ``--jpeg-quality`` is either wasteful on a fast link or too much
+for a congested one, where whole frames are lost to a single dropped
+datagram. With ``--adaptive`` the capture process steers its encoder from
+what the receiver reports back::
+
+    receiver  --FEEDBACK(cam_id, last_frame_id, frames, latency, decode)-->  capture process
+
+:class:`FeedbackReporter` (receiver side) sends one FEEDBACK datagram per
+camera every :data:`FEEDBACK_INTERVAL_S` to the address its frames come
+from: the newest frame_id it completed, how many frames it has completed
+in total, and the mean capture-to-delivery latency and JPEG decode time
+since the previous report. Frame ids are consecutive per camera on the
+sending side, so the capture process gets the share of sent frames that
+arrived from two counters without the receiver knowing what was sent,
+and a lost FEEDBACK only lengthens the next interval.
+
+:class:`QualityController` (capture side) turns those samples, plus the
+bytes the sender put on the wire, into a JPEG quality cap and a
+resolution scale, AIMD style: when any camera's delivery rate falls under
+the target, latency or decode time exceed their limits, or the byte rate
+exceeds the budget, quality drops by a large step down to
+``min_quality`` and then resolution steps down the configured ladder;
+after a few good intervals in a row the last reduction is undone in
+small steps. Every change is followed by a settling time, since the
+feedback in flight still describes the old setting.
+
+FEEDBACK datagrams use their own magic, so capture processes that predate
+them drop them like any other unknown packet.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.capture.telemetry import ReceiveCounters
+
+
+FEEDBACK_MAGIC = b"EYEF"
+
+# magic, cam_id, <reserved>, last_frame_id, frames, latency_ms, decode_ms
+FEEDBACK_FMT = "<4sBxxxIIff"
+FEEDBACK_SIZE = struct.calcsize(FEEDBACK_FMT)
+_FEEDBACK = struct.Struct(FEEDBACK_FMT)
+
+FEEDBACK_INTERVAL_S = 0.5
+
+# Samples older than this no longer describe the link.
+_STALE_S = 3.0
+
+
+class Feedback(NamedTuple):
+    cam_id: int
+    # Newest frame_id completed by the receiver.
+    last_frame_id: int
+    # Frames completed so far (wraps at 2**32).
+    frames: int
+    # Means over the interval since the previous report; 0 when none.
+    latency_ms: float
+    decode_ms: float
+
+
+def pack_feedback(feedback: Feedback) -> bytes:
+    return _FEEDBACK.pack(
+        FEEDBACK_MAGIC,
+        feedback.cam_id,
+        feedback.last_frame_id & 0xFFFFFFFF,
+        feedback.frames & 0xFFFFFFFF,
+        feedback.latency_ms,
+        feedback.decode_ms,
+    )
+
+
+def is_feedback_packet(packet) -> bool:
+    return len(packet) == FEEDBACK_SIZE and bytes(packet[:4]) == FEEDBACK_MAGIC
+
+
+def parse_feedback(packet) -> Feedback:
+    """Decode a FEEDBACK datagram. Raises ValueError on anything else."""
+    if len(packet) != FEEDBACK_SIZE:
+        raise ValueError(f"feedback packet must be {FEEDBACK_SIZE} bytes, got {len(packet)}")
+    magic, cam_id, last_frame_id, frames, latency_ms, decode_ms = _FEEDBACK.unpack_from(packet)
+    if magic != FEEDBACK_MAGIC:
+        raise ValueError(f"bad feedback magic: {magic!r}")
+    return Feedback(cam_id, last_frame_id, frames, latency_ms, decode_ms)
+
+
+class FeedbackReporter:
+    """Receiver-side bookkeeping for FEEDBACK datagrams.
+
+    The receiver thread calls :meth:`frame_completed` for every completed
+    frame and sends what :meth:`due` returns to each camera's source.
+    """
+
+    def __init__(self, interval: float = FEEDBACK_INTERVAL_S) -> None:
+        self._interval = float(interval)
+        self._last_frame_id: Dict[int, int] = {}
+        # cam_id -> (frames, latency_s, decoded, decode_s) at the last report
+        self._previous: Dict[int, Tuple[int, float, int, float]] = {}
+        self._next_at: Optional[float] = None
+
+    def frame_completed(self, cam_id: int, frame_id: int, now: float) -> None:
+        self._last_frame_id[cam_id] = frame_id
+        if self._next_at is None:
+            self._next_at = now + self._interval
+
+    def next_at(self) -> Optional[float]:
+        return self._next_at
+
+    def due(self, now: float, counters: Mapping[int, ReceiveCounters]) -> List[Feedback]:
+        """One :class:`Feedback` per camera once an interval has passed,
+        else nothing. ``counters`` are the receiver's cumulative ones."""
+        if self._next_at is None or now < self._next_at:
+            return []
+        self._next_at = now + self._interval
+        reports = []
+        for cam_id, last_frame_id in self._last_frame_id.items():
+            c = counters.get(cam_id)
+            if c is None:
+                continue
+            frames, latency_s, decoded, decode_s = self._previous.get(cam_id, (0, 0.0, 0, 0.0))
+            self._previous[cam_id] = (c.frames, c.latency_s, c.decoded, c.decode_s)
+            new_frames = c.frames - frames
+            new_decoded = c.decoded - decoded
+            reports.append(
+                Feedback(
+                    cam_id=cam_id,
+                    last_frame_id=last_frame_id,
+                    frames=c.frames,
+                    latency_ms=1000.0 * (c.latency_s - latency_s) / new_frames if new_frames else 0.0,
+                    decode_ms=1000.0 * (c.decode_s - decode_s) / new_decoded if new_decoded else 0.0,
+                )
+            )
+        return reports
+
+
+class AdaptiveConfig(NamedTuple):
+    """Bounds and targets for :class:`QualityController`."""
+
+    # Quality is never cut below this (nor raised above the commanded one).
+    min_quality: int = 40
+    # Share of sent frames that must arrive.
+    target_delivery: float = 0.95
+    # Bytes per second on the wire, parity and headers included; 0: none.
+    byte_budget: float = 0.0
+    # Mean capture-to-delivery latency and decode time limits; 0: off.
+    max_latency_ms: float = 150.0
+    max_decode_ms: float = 25.0
+    # Resolution ladder, full size first; (1.0,) keeps the resolution.
+    scales: Tuple[float, ...] = (1.0,)
+    step_down: int = 10
+    step_up: int = 2
+    # Good decisions in a row before stepping back up.
+    raise_after: int = 3
+    # Seconds between decisions, and after a change.
+    interval: float = 1.0
+    settle: float = 2.0
+
+
+class AdaptiveSetting(NamedTuple):
+    # Upper bound on the commanded JPEG quality; 100 leaves it alone.
+    quality_cap: int
+    scale: float
+
+
+class _CamSample(NamedTuple):
+    at: float
+    delivery: float
+    latency_ms: float
+    decode_ms: float
+
+
+class QualityController:
+    """Capture-side controller; see the module docstring.
+
+    Feed every FEEDBACK to :meth:`on_feedback` and call :meth:`update`
+    after it; a returned :class:`AdaptiveSetting` is the new quality cap
+    and resolution scale to apply. Not thread-safe: drive it from one
+    thread.
+    """
+
+    def __init__(self, config: AdaptiveConfig = AdaptiveConfig(), now: float = 0.0) -> None:
+        if not 1 <= config.min_quality <= 100:
+            raise ValueError(f"min_quality must be in [1, 100], got {config.min_quality}")
+        if not 0.0 < config.target_delivery <= 1.0:
+            raise ValueError(f"target_delivery must be in (0, 1], got {config.target_delivery}")
+        if not config.scales or config.scales[0] != 1.0 or any(
+            not 0.0 < b < a for a, b in zip(config.scales, config.scales[1:])
+        ):
+            raise ValueError(f"scales must start at 1.0 and decrease, got {config.scales}")
+        self._config = config
+        self._quality = 100
+        self._scale_idx = 0
+        # cam_id -> (last_frame_id, frames) of the previous FEEDBACK
+        self._last: Dict[int, Tuple[int, int]] = {}
+        self._samples: Dict[int, _CamSample] = {}
+        self._good = 0
+        self._decide_at = now + config.interval
+        self._bytes_at: Optional[Tuple[float, int]] = None
+        self._byte_rate = 0.0
+
+    @property
+    def setting(self) -> AdaptiveSetting:
+        return AdaptiveSetting(self._quality, self._config.scales[self._scale_idx])
+
+    def on_feedback(self, feedback: Feedback, now: float) -> None:
+        previous = self._last.get(feedback.cam_id)
+        self._last[feedback.cam_id] = (feedback.last_frame_id, feedback.frames)
+        if previous is None:
+            return
+        sent = (feedback.last_frame_id - previous[0]) & 0xFFFFFFFF
+        arrived = (feedback.frames - previous[1]) & 0xFFFFFFFF
+        if sent == 0 or sent >= 0x80000000:
+            # Nothing new, or the sender restarted its frame ids.
+            return
+        self._samples[feedback.cam_id] = _CamSample(
+            now, min(1.0, arrived / sent), feedback.latency_ms, feedback.decode_ms
+        )
+
+    def update(self, now: float, bytes_sent: int, ceiling: int) -> Optional[AdaptiveSetting]:
+        """Decide once per interval. ``bytes_sent`` is the sender's running
+        total, ``ceiling`` the commanded JPEG quality. Returns the new
+        setting when it changed, else None."""
+        if self._bytes_at is None:
+            self._bytes_at = (now, bytes_sent)
+        if now < self._decide_at:
+            return None
+        since, sent_before = self._bytes_at
+        if now > since:
+            self._byte_rate = (bytes_sent - sent_before) / (now - since)
+        self._bytes_at = (now, bytes_sent)
+        self._decide_at = now + self._config.interval
+        samples = [s for s in self._samples.values() if now - s.at <= _STALE_S]
+        if not samples:
+            return None
+        before = self.setting
+        verdict = self._judge(samples)
+        if verdict < 0:
+            self._good = 0
+            self._step_down(ceiling)
+        elif verdict > 0:
+            self._good += 1
+            if self._good >= self._config.raise_after:
+                self._good = 0
+                self._step_up(ceiling)
+        else:
+            self._good = 0
+        setting = self.setting
+        if setting == before:
+            return None
+        self._decide_at = now + self._config.settle
+        # Samples from before the change say nothing about the new setting.
+        self._samples.clear()
+        return setting
+
+    def _judge(self, samples: List[_CamSample]) -> int:
+        """-1: congested, 1: room to spare, 0: hold."""
+        cfg = self._config
+        delivery = min(s.delivery for s in samples)
+        latency = max(s.latency_ms for s in samples)
+        decode = max(s.decode_ms for s in samples)
+        if (
+            delivery < cfg.target_delivery
+            or (cfg.max_latency_ms > 0 and latency > cfg.max_latency_ms)
+            or (cfg.max_decode_ms > 0 and decode > cfg.max_decode_ms)
+            or (cfg.byte_budget > 0 and self._byte_rate > cfg.byte_budget)
+        ):
+            return -1
+        # Headroom, so that the step up does not immediately overshoot.
+        if cfg.byte_budget > 0 and self._byte_rate > 0.9 * cfg.byte_budget:
+            return 0
+        return 1
+
+    def _step_down(self, ceiling: int) -> None:
+        cfg = self._config
+        quality = min(self._quality, ceiling)
+        if quality > cfg.min_quality:
+            self._quality = max(cfg.min_quality, quality - cfg.step_down)
+        elif self._scale_idx + 1 < len(cfg.scales):
+            self._scale_idx += 1
+
+    def _step_up(self, ceiling: int) -> None:
+        # Undo the last reduction first: resolution went down last.
+        if self._scale_idx > 0:
+            self._scale_idx -= 1
+        elif self._quality < ceiling:
+            self._quality += self._config.step_up
+            if self._quality >= ceiling:
+                # Back at the commanded quality; stop capping it.
+                self._quality = 100
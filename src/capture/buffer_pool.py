@@ -0,0 +1,124 @@
+"""Reusable frame-sized buffers.
+
+Every analysed frame used to allocate a fresh frame-sized array for each
+conversion on its way to the landmarker (BGR -> RGB, per camera), about
+a megabyte a time at 640x480; at 60 fps on two cameras that is a steady
+stream of large allocations, and with it page faults and allocator
+jitter in the tracking loop. A :class:`BufferPool` keeps the arrays of
+released leases and hands them out again for the next frame of the same
+shape, so the steady state allocates nothing.
+
+Leases are explicit: whoever takes one releases it (``with`` or
+:meth:`BufferLease.release`) once nothing reads the array any more, and
+must not keep references to it past that. Anything that outlives the
+frame (visualization payloads cross to the UI thread) should still copy.
+
+The receiver keeps one pool per camera (see
+:meth:`src.capture.frame_receiver.BaseFrameReceiver.lease_rgb`; face-ROI
+frames paste their crops into full-size buffers from it too), and
+:meth:`BufferPool.stats` counts hits and misses so a mis-sized pool shows
+up in diagnostics.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV; arrays come from ``numpy.empty`` unless ``allocate`` says
+otherwise.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_FREE = 4
+
+_Key = Tuple[Tuple[int, ...], str]
+
+
+def _allocate_ndarray(shape: Tuple[int, ...], dtype: str):
+    import numpy as np
+
+    return np.empty(shape, dtype=dtype)
+
+
+class BufferLease:
+    """One array on loan from a :class:`BufferPool`."""
+
+    __slots__ = ("array", "_pool", "_key")
+
+    def __init__(self, pool: "BufferPool", key: _Key, array: Any) -> None:
+        self.array = array
+        self._pool: Optional[BufferPool] = pool
+        self._key = key
+
+    def release(self) -> None:
+        """Return the array to the pool. Idempotent."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool._give_back(self._key, self.array)
+
+    def __enter__(self):
+        return self.array
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class BufferPool:
+    """Free arrays by (shape, dtype), at most ``max_free`` of each kept.
+    Thread-safe."""
+
+    def __init__(
+        self,
+        max_free: int = DEFAULT_MAX_FREE,
+        allocate: Optional[Callable[[Tuple[int, ...], str], Any]] = None,
+    ) -> None:
+        if max_free < 0:
+            raise ValueError(f"max_free must be >= 0, got {max_free}")
+        self._max_free = max_free
+        self._allocate = allocate or _allocate_ndarray
+        self._lock = threading.Lock()
+        self._free: Dict[_Key, List[Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._outstanding = 0
+
+    def lease(self, shape: Tuple[int, ...], dtype: str = "uint8") -> BufferLease:
+        """An array of ``shape`` / ``dtype`` with undefined contents.
+        ``dtype`` is a name like ``"uint8"`` (``ndarray.dtype.name``);
+        other spellings of the same type get separate buffers."""
+        key = (tuple(int(n) for n in shape), str(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            array = free.pop() if free else None
+            if array is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            self._outstanding += 1
+        if array is None:
+            array = self._allocate(key[0], key[1])
+        return BufferLease(self, key, array)
+
+    def _give_back(self, key: _Key, array: Any) -> None:
+        with self._lock:
+            self._outstanding -= 1
+            free = self._free.setdefault(key, [])
+            if len(free) < self._max_free:
+                free.append(array)
+
+    def clear(self) -> None:
+        """Drop the free arrays (e.g. after a resolution change)."""
+        with self._lock:
+            self._free.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """``hits`` / ``misses`` (leases served from the pool / newly
+        allocated), ``outstanding`` leases and ``free`` arrays."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "outstanding": self._outstanding,
+                "free": sum(len(free) for free in self._free.values()),
+            }
@@ -0,0 +1,279 @@
+"""Clock-offset estimation for capture processes on other hosts.
+
+Frame timestamps are the sender's ``time.monotonic()``. On the same host
+that is the receiver's clock too; a capture process on another machine
+(``--host``) has an unrelated one, so ``since`` watermarks, stereo
+``max_skew`` pairing and capture-to-delivery latency stop meaning
+anything. This module lets the receiver map remote timestamps into its
+own clock.
+
+Exchange (NTP-style, over the frame socket pair)::
+
+    receiver  --PING(seq, t0)---------->  capture process
+    receiver  <--PONG(seq, t0, t1, t2)--  capture process
+                 t3 = arrival
+
+``t0`` / ``t3`` are receiver clock, ``t1`` / ``t2`` capture clock. Each
+round trip gives ``offset = ((t1 - t0) + (t2 - t3)) / 2`` (remote minus
+local) with an error of at most half the round-trip time.
+:class:`ClockEstimator` keeps a window of samples, fits offset and drift
+to the ones with the shortest round trips (queueing only ever adds delay)
+and reports the uncertainty of the result.
+
+Sync packets use their own magic, so receivers and capture processes
+that predate them drop them as garbage; a capture process that never
+answers simply leaves its source unsynced (see :meth:`ClockSync.to_local`).
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import struct
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+
+SYNC_MAGIC = b"EYES"
+KIND_PING = 1
+KIND_PONG = 2
+
+# magic, kind, <reserved>, seq, t0, t1, t2
+SYNC_FMT = "<4sBxxxIddd"
+SYNC_SIZE = struct.calcsize(SYNC_FMT)
+_SYNC = struct.Struct(SYNC_FMT)
+
+DEFAULT_WINDOW = 64
+# A source counts as synced after this many round trips.
+MIN_SAMPLES = 4
+# Drift is only fitted once the samples span this long; before that a
+# slope would mostly be fitting noise.
+MIN_DRIFT_SPAN_S = 10.0
+
+# Ping every FAST_INTERVAL_S until synced, then every INTERVAL_S.
+INTERVAL_S = 1.0
+FAST_INTERVAL_S = 0.1
+
+
+class SyncPacket(NamedTuple):
+    kind: int
+    seq: int
+    t0: float
+    t1: float = 0.0
+    t2: float = 0.0
+
+
+def pack_ping(seq: int, t0: float) -> bytes:
+    return _SYNC.pack(SYNC_MAGIC, KIND_PING, seq & 0xFFFFFFFF, t0, 0.0, 0.0)
+
+
+def pack_pong(ping: SyncPacket, t1: float, t2: float) -> bytes:
+    return _SYNC.pack(SYNC_MAGIC, KIND_PONG, ping.seq, ping.t0, t1, t2)
+
+
+def is_sync_packet(packet) -> bool:
+    return len(packet) == SYNC_SIZE and bytes(packet[:4]) == SYNC_MAGIC
+
+
+def parse_sync_packet(packet) -> SyncPacket:
+    """Decode a PING / PONG datagram. Raises ValueError on anything else."""
+    if len(packet) != SYNC_SIZE:
+        raise ValueError(f"sync packet must be {SYNC_SIZE} bytes, got {len(packet)}")
+    magic, kind, seq, t0, t1, t2 = _SYNC.unpack_from(packet)
+    if magic != SYNC_MAGIC:
+        raise ValueError(f"bad sync magic: {magic!r}")
+    if kind not in (KIND_PING, KIND_PONG):
+        raise ValueError(f"unknown sync packet kind {kind}")
+    return SyncPacket(kind, seq, t0, t1, t2)
+
+
+class ClockEstimator:
+    """Offset and drift of one remote clock relative to ours.
+
+    ``offset_at(t)`` is remote minus local time at local time ``t``;
+    :meth:`to_local` maps a remote timestamp into the local clock.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        # (local midpoint, offset, round trip)
+        self._samples: Deque[Tuple[float, float, float]] = deque(maxlen=window)
+        self._offset = 0.0
+        self._drift = 0.0
+        self._t_ref = 0.0
+        self._uncertainty = float("inf")
+        self._min_rtt = float("inf")
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    @property
+    def synced(self) -> bool:
+        return len(self._samples) >= MIN_SAMPLES
+
+    @property
+    def uncertainty(self) -> float:
+        """Bound on the offset error in seconds (inf until the first sample)."""
+        return self._uncertainty
+
+    @property
+    def drift(self) -> float:
+        """Remote clock rate minus ours, in seconds per second."""
+        return self._drift
+
+    def add(self, t0: float, t1: float, t2: float, t3: float) -> bool:
+        """Add one round trip; False if it is inconsistent (negative RTT)."""
+        rtt = (t3 - t0) - (t2 - t1)
+        if rtt < 0.0 or t3 < t0:
+            return False
+        offset = ((t1 - t0) + (t2 - t3)) / 2.0
+        self._samples.append(((t0 + t3) / 2.0, offset, rtt))
+        self._refit()
+        return True
+
+    def _refit(self) -> None:
+        # Queueing only ever adds delay, so the fastest round trips carry
+        # the least error; fit to the best half.
+        ranked = sorted(self._samples, key=lambda s: s[2])
+        best = ranked[: max(1, len(ranked) // 2)]
+        self._min_rtt = ranked[0][2]
+        n = len(best)
+        t_ref = sum(s[0] for s in best) / n
+        mean_offset = sum(s[1] for s in best) / n
+        span = max(s[0] for s in best) - min(s[0] for s in best)
+        drift = 0.0
+        if n >= 3 and span >= MIN_DRIFT_SPAN_S:
+            var_t = sum((s[0] - t_ref) ** 2 for s in best)
+            if var_t > 0.0:
+                drift = sum((s[0] - t_ref) * (s[1] - mean_offset) for s in best) / var_t
+        residual = 0.0
+        if n > 1:
+            residual = (
+                sum((s[1] - mean_offset - drift * (s[0] - t_ref)) ** 2 for s in best) / n
+            ) ** 0.5
+        self._t_ref = t_ref
+        self._offset = mean_offset
+        self._drift = drift
+        self._uncertainty = self._min_rtt / 2.0 + residual
+
+    def offset_at(self, local_t: float) -> float:
+        return self._offset + self._drift * (local_t - self._t_ref)
+
+    def to_local(self, remote_ts: float) -> float:
+        # Evaluating the fit at remote_ts - offset instead of the exact
+        # local time is off by drift * offset, far below the uncertainty.
+        return remote_ts - self.offset_at(remote_ts - self._offset)
+
+    def status(self) -> Dict[str, float]:
+        return {
+            "offset_ms": 1000.0 * self._offset,
+            "uncertainty_ms": 1000.0 * self._uncertainty,
+            "drift_ppm": 1e6 * self._drift,
+            "rtt_ms": 1000.0 * self._min_rtt,
+            "samples": float(len(self._samples)),
+            "synced": float(self.synced),
+        }
+
+
+def _is_local(addr: Tuple[str, int]) -> bool:
+    try:
+        return ipaddress.ip_address(addr[0]).is_loopback
+    except ValueError:
+        return addr[0] == "localhost"
+
+
+class ClockSync:
+    """Receiver-side bookkeeping: one :class:`ClockEstimator` per remote
+    sender address, ping scheduling and timestamp mapping.
+
+    The receiver calls :meth:`observe` for the source of every completed
+    frame, sends what :meth:`due_pings` returns and hands PONGs to
+    :meth:`handle`. Senders on this host share our clock and are left
+    alone.
+    """
+
+    def __init__(self, interval: float = INTERVAL_S, fast_interval: float = FAST_INTERVAL_S) -> None:
+        self._interval = float(interval)
+        self._fast_interval = float(fast_interval)
+        # addr -> estimator; None for same-host senders.
+        self._sources: Dict[Tuple[str, int], Optional[ClockEstimator]] = {}
+        self._next_ping: Dict[Tuple[str, int], float] = {}
+        self._seq = 0
+
+    def observe(self, addr: Tuple[str, int], now: float) -> Optional[ClockEstimator]:
+        """Register ``addr`` as a frame source; its estimator, or None if
+        it is on this host."""
+        try:
+            return self._sources[addr]
+        except KeyError:
+            pass
+        estimator = None if _is_local(addr) else ClockEstimator()
+        self._sources[addr] = estimator
+        if estimator is not None:
+            self._next_ping[addr] = now
+        return estimator
+
+    def due_pings(self, now: float) -> List[Tuple[Tuple[str, int], bytes]]:
+        due = []
+        for addr, at in self._next_ping.items():
+            if at > now:
+                continue
+            estimator = self._sources[addr]
+            step = self._interval if estimator is not None and estimator.synced else self._fast_interval
+            self._next_ping[addr] = now + step
+            self._seq = (self._seq + 1) & 0xFFFFFFFF
+            due.append((addr, pack_ping(self._seq, now)))
+        return due
+
+    def next_ping_at(self) -> Optional[float]:
+        return min(self._next_ping.values()) if self._next_ping else None
+
+    def handle(self, packet, addr: Tuple[str, int], now: float) -> bool:
+        """Feed a sync datagram from ``addr`` received at ``now``; True if
+        it was a usable PONG."""
+        estimator = self._sources.get(addr)
+        if estimator is None:
+            return False
+        try:
+            pong = parse_sync_packet(packet)
+        except ValueError:
+            return False
+        if pong.kind != KIND_PONG:
+            return False
+        return estimator.add(pong.t0, pong.t1, pong.t2, now)
+
+    def to_local(self, addr: Tuple[str, int], timestamp: float, now: float) -> float:
+        """``timestamp`` from ``addr`` in our clock. Same-host timestamps
+        pass through; a remote sender that is not synced yet gets the
+        receive time ``now``, which is late by the transport delay but
+        at least on the right clock."""
+        estimator = self.observe(addr, now)
+        if estimator is None:
+            return timestamp
+        if not estimator.synced:
+            return now
+        # Never later than it arrived.
+        return min(estimator.to_local(timestamp), now)
+
+    def status(self) -> Dict[Tuple[str, int], Dict[str, float]]:
+        return {
+            addr: estimator.status()
+            for addr, estimator in self._sources.items()
+            if estimator is not None
+        }
+
+
+def answer_ping(packet, t1: float, t2: float) -> Optional[bytes]:
+    """Capture side: the PONG for a PING datagram, or None if ``packet``
+    is not a PING."""
+    if not is_sync_packet(packet):
+        return None
+    try:
+        ping = parse_sync_packet(packet)
+    except ValueError:
+        return None
+    if ping.kind != KIND_PING:
+        return None
+    return pack_pong(ping, t1, t2)
@@ -0,0 +1,157 @@
+"""Runtime control channel from the supervisor to the capture process.
+
+The supervisor writes one command per line to the capture process's stdin
+(enabled with ``--control-stdin``)::
+
+    SET fps=5 jpeg_quality=60     -- change some capture parameters
+    RESET                         -- back to the launch parameters and
+                                     full frames on every camera
+    ROI cam=0 x=200 y=96 w=160 h=192
+                                  -- stream only this face box (padded)
+                                     of cam_id 0; w=0 h=0 clears it
+
+A warm standby worker (``--standby``, see
+:class:`src.capture.supervisor.WarmCapturePool`) first waits for one
+line carrying the launch arguments it would otherwise have been spawned
+with, then treats the rest of stdin as above::
+
+    START --cam0 0 --port 9123 --control-stdin
+
+``fps`` throttles how many frames are processed and sent, not the rate
+the camera is read at, so going back to full rate takes effect on the
+very next camera frame. ``width`` / ``height`` renegotiate the camera
+resolution and are slower to apply. ``ROI`` boxes are in full-frame
+pixels; see :mod:`src.capture.roi` for what the capture process does
+with them.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import shlex
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+CONTROL_KEYS = ("fps", "width", "height", "jpeg_quality")
+
+# Inclusive bounds per key; values outside are rejected, not clamped.
+_LIMITS: Dict[str, tuple] = {
+    "fps": (1, 240),
+    "width": (16, 7680),
+    "height": (16, 4320),
+    "jpeg_quality": (1, 100),
+}
+
+OP_SET = "SET"
+OP_RESET = "RESET"
+OP_ROI = "ROI"
+OP_START = "START"
+
+ROI_KEYS = ("cam", "x", "y", "w", "h")
+_ROI_LIMITS: Dict[str, tuple] = {
+    "cam": (0, 255),
+    "x": (0, 7680),
+    "y": (0, 4320),
+    "w": (0, 7680),
+    "h": (0, 4320),
+}
+
+
+class ControlCommand(NamedTuple):
+    op: str
+    params: Dict[str, int]
+
+
+def _check(key: str, value: int) -> int:
+    if key not in _LIMITS:
+        raise ValueError(f"unknown control key {key!r}; expected one of {CONTROL_KEYS}")
+    lo, hi = _LIMITS[key]
+    if not lo <= value <= hi:
+        raise ValueError(f"{key}={value} out of range [{lo}, {hi}]")
+    return value
+
+
+def format_set(**params: int) -> str:
+    """Encode a ``SET`` command line (without the trailing newline)."""
+    if not params:
+        raise ValueError("SET needs at least one parameter")
+    fields = [f"{key}={_check(key, int(value))}" for key, value in params.items()]
+    return " ".join([OP_SET] + fields)
+
+
+def format_reset() -> str:
+    return OP_RESET
+
+
+def format_roi(cam_id: int, box: Optional[Tuple[int, int, int, int]]) -> str:
+    """Encode a ``ROI`` command for ``cam_id``; ``box`` is (x, y, w, h) in
+    full-frame pixels, or None to go back to full frames."""
+    x, y, w, h = box if box is not None else (0, 0, 0, 0)
+    values = dict(zip(ROI_KEYS, (cam_id, x, y, w, h)))
+    fields = []
+    for key, value in values.items():
+        lo, hi = _ROI_LIMITS[key]
+        fields.append(f"{key}={min(hi, max(lo, int(value)))}")
+    return " ".join([OP_ROI] + fields)
+
+
+def parse_control_line(line: str) -> ControlCommand:
+    """Decode one control line. Raises ValueError on anything malformed,
+    so the capture process can log and ignore it."""
+    parts = line.split()
+    if not parts:
+        raise ValueError("empty control line")
+    op = parts[0].upper()
+    if op == OP_RESET:
+        if len(parts) != 1:
+            raise ValueError("RESET takes no parameters")
+        return ControlCommand(op=OP_RESET, params={})
+    if op not in (OP_SET, OP_ROI):
+        raise ValueError(f"unknown control op {parts[0]!r}")
+    if len(parts) == 1:
+        raise ValueError(f"{op} needs parameters")
+    params: Dict[str, int] = {}
+    for field in parts[1:]:
+        key, sep, raw = field.partition("=")
+        if not sep:
+            raise ValueError(f"malformed field {field!r}; expected key=value")
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError(f"{key} must be an integer, got {raw!r}") from None
+        if op == OP_ROI:
+            if key not in _ROI_LIMITS:
+                raise ValueError(f"unknown ROI key {key!r}; expected {ROI_KEYS}")
+            lo, hi = _ROI_LIMITS[key]
+            if not lo <= value <= hi:
+                raise ValueError(f"{key}={value} out of range [{lo}, {hi}]")
+            params[key] = value
+        else:
+            params[key] = _check(key, value)
+    if op == OP_ROI and set(params) != set(ROI_KEYS):
+        raise ValueError(f"ROI needs all of {ROI_KEYS}")
+    return ControlCommand(op=op, params=params)
+
+
+def format_start(argv: Sequence[str]) -> str:
+    """Encode the ``START`` line handing launch arguments to a standby
+    worker."""
+    if not argv:
+        raise ValueError("START needs launch arguments")
+    return " ".join([OP_START] + [shlex.quote(str(arg)) for arg in argv])
+
+
+def parse_start_line(line: str) -> List[str]:
+    """Launch arguments from a ``START`` line. Raises ValueError on
+    anything else."""
+    try:
+        parts = shlex.split(line)
+    except ValueError as e:
+        raise ValueError(f"malformed START line: {e}") from None
+    if not parts or parts[0] != OP_START:
+        raise ValueError(f"expected {OP_START}, got {line!r}")
+    if len(parts) == 1:
+        raise ValueError("START needs launch arguments")
+    return parts[1:]
@@ -0,0 +1,149 @@
+"""Erasure coding for the UDP frame protocol.
+
+A frame of ``n`` data packets gets ``k`` parity packets computed with a
+systematic Cauchy Reed-Solomon code over GF(2^8): parity row ``i`` is
+``sum_j c[i][j] * D_j`` with ``c[i][j] = 1 / (x_i + y_j)``. Every square
+submatrix of a Cauchy matrix is invertible, so *any* ``n`` of the
+``n + k`` packets rebuild the frame -- unlike plain XOR parity, which
+only survives one loss per group.
+
+All packets of a frame are ``chunk`` bytes except the last data packet;
+for coding it is treated as zero-padded to ``chunk``. Packet-sized
+GF(2^8) arithmetic stays in C: multiplying a packet by a constant is one
+``bytes.translate`` through that constant's 256-byte product table, and
+adding packets is one big-integer XOR.
+
+See :mod:`src.capture.protocol` for how parity packets travel.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Mapping, Sequence
+
+# Data plus parity packets of one frame must fit in the field's 256
+# distinct evaluation points.
+MAX_CODED_PACKETS = 256
+
+_POLY = 0x11D
+_EXP = [0] * 512
+_LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    _EXP[_i] = _x
+    _LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= _POLY
+for _i in range(255, 512):
+    _EXP[_i] = _EXP[_i - 255]
+del _x, _i
+
+_MUL_TABLES: Dict[int, bytes] = {}
+
+
+def _mul(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return _EXP[_LOG[a] + _LOG[b]]
+
+
+def _inv(a: int) -> int:
+    if a == 0:
+        raise ZeroDivisionError("0 has no inverse in GF(256)")
+    return _EXP[255 - _LOG[a]]
+
+
+def _mul_table(c: int) -> bytes:
+    table = _MUL_TABLES.get(c)
+    if table is None:
+        table = _MUL_TABLES[c] = bytes(_mul(c, v) for v in range(256))
+    return table
+
+
+def _coefficient(row: int, col: int) -> int:
+    # x_i = 255 - i and y_j = j are distinct while n + k <= 256.
+    return _inv((255 - row) ^ col)
+
+
+def parity_count(total: int, ratio: float) -> int:
+    """Parity packets for a frame of ``total`` data packets at redundancy
+    ``ratio`` (0 = off): at least one, and never more than the field
+    allows."""
+    if ratio <= 0.0 or total <= 0:
+        return 0
+    k = max(1, math.ceil(total * ratio))
+    return max(0, min(k, MAX_CODED_PACKETS - total))
+
+
+def encode_parity(chunks: Sequence[bytes], chunk: int, k: int) -> List[bytes]:
+    """``k`` parity payloads of ``chunk`` bytes for the data packet
+    payloads ``chunks`` (the last one may be short)."""
+    n = len(chunks)
+    if n + k > MAX_CODED_PACKETS:
+        raise ValueError(f"{n} data + {k} parity packets exceed {MAX_CODED_PACKETS}")
+    padded = [bytes(c) if len(c) == chunk else bytes(c).ljust(chunk, b"\0") for c in chunks]
+    parity = []
+    for row in range(k):
+        acc = 0
+        for col, data in enumerate(padded):
+            acc ^= int.from_bytes(data.translate(_mul_table(_coefficient(row, col))), "little")
+        parity.append(acc.to_bytes(chunk, "little"))
+    return parity
+
+
+def _invert(matrix: List[List[int]]) -> List[List[int]]:
+    """Gauss-Jordan inverse over GF(256)."""
+    m = len(matrix)
+    a = [list(row) + [1 if r == c else 0 for c in range(m)] for r, row in enumerate(matrix)]
+    for col in range(m):
+        pivot = next(r for r in range(col, m) if a[r][col])
+        a[col], a[pivot] = a[pivot], a[col]
+        scale = _inv(a[col][col])
+        a[col] = [_mul(scale, v) for v in a[col]]
+        for r in range(m):
+            if r != col and a[r][col]:
+                factor = a[r][col]
+                a[r] = [v ^ _mul(factor, p) for v, p in zip(a[r], a[col])]
+    return [row[m:] for row in a]
+
+
+def recover(
+    data: Mapping[int, bytes],
+    parity: Mapping[int, bytes],
+    n: int,
+    chunk: int,
+) -> Dict[int, bytes]:
+    """Rebuild the missing data packets of a frame.
+
+    ``data`` maps data packet index -> payload (zero-padded to ``chunk``
+    for the last one), ``parity`` maps parity row -> payload. Returns
+    index -> ``chunk``-byte payload for every missing data packet. Raises
+    ValueError if fewer than ``n`` packets are available.
+    """
+    missing = [j for j in range(n) if j not in data]
+    if not missing:
+        return {}
+    if len(missing) > len(parity):
+        raise ValueError(f"{len(missing)} packets missing, only {len(parity)} parity packets")
+    rows = sorted(parity)[: len(missing)]
+    # Syndromes: each parity row minus the contribution of the data we have.
+    syndromes = []
+    for row in rows:
+        acc = int.from_bytes(parity[row], "little")
+        for col, payload in data.items():
+            acc ^= int.from_bytes(bytes(payload).translate(_mul_table(_coefficient(row, col))), "little")
+        syndromes.append(acc.to_bytes(chunk, "little"))
+    inverse = _invert([[_coefficient(row, col) for col in missing] for row in rows])
+    rebuilt = {}
+    for i, col in enumerate(missing):
+        acc = 0
+        for r, syndrome in enumerate(syndromes):
+            c = inverse[i][r]
+            if c:
+                acc ^= int.from_bytes(syndrome.translate(_mul_table(c)), "little")
+        rebuilt[col] = acc.to_bytes(chunk, "little")
+    return rebuilt
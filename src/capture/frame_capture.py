@@ -1,5 +1,6 @@
 """Capture subprocess: reads frames from one or two cameras and streams them
-over UDP to the desktop process as JPEG-encoded fragments.
+to the desktop process, either over UDP as JPEG-encoded fragments or, for
+same-host capture, as raw BGR frames in a shared-memory ring.
 
 Spawned by :class:`src.capture.supervisor.CaptureSupervisor`. Indices come
 from CLI args; the desktop has already resolved stable IDs to /dev/videoN
@@ -11,29 +12,135 @@ Single-camera invocation:
 Stereo invocation:
     python -m src.capture.frame_capture --cam0 0 --cam1 2 --port 9123
 
+MJPEG passthrough (UDP only): forward the camera's own MJPEG bitstream
+instead of letting OpenCV decode it to BGR and re-encoding it:
+    python -m src.capture.frame_capture --cam0 0 --port 9123 --passthrough
+
+Large datagrams (UDP to a loopback address only): ``--max-payload``
+proposes a payload size above the Ethernet-safe default; the largest size
+the OS accepts up to it is used and reported in the READY line (see
+:func:`src.capture.protocol.pick_max_payload`):
+    python -m src.capture.frame_capture --cam0 0 --port 9123 --max-payload 65000
+
+One process per camera of a stereo rig (see :mod:`src.capture.workers`):
+each worker gets a single ``--cam0`` and the stereo ``--cam-id`` it
+publishes under, optionally pinned to CPUs and at a lower priority:
+    python -m src.capture.frame_capture --cam0 0 --cam-id 1 --port 9123 --cpus 2 --nice 5
+    python -m src.capture.frame_capture --cam0 2 --cam-id 2 --port 9123 --cpus 3 --nice 5
+
+Capture node on a lossy link (Wi-Fi): ``--fec R`` adds about R parity
+packets per data packet, so a frame survives that many losses (see
+:mod:`src.capture.fec`):
+    python -m src.capture.frame_capture --cam0 0 --host 192.168.1.10 --port 9123 --fec 0.1
+
+Congested link or loaded receiver (UDP only): ``--adaptive`` lowers JPEG
+quality (never above ``--jpeg-quality``) and, with
+``--adaptive-resolution``, the capture resolution whenever the receiver's
+feedback shows frames going missing, latency or decode time growing, or
+the byte rate over ``--byte-budget``, and raises them again once it
+recovers (see :mod:`src.capture.adaptive`):
+    python -m src.capture.frame_capture --cam0 0 --host 192.168.1.10 --port 9123 --adaptive --min-quality 50
+
+Landmark-only streaming (UDP only): ``--landmarks`` runs the face
+landmarker here and sends a ~6 KB landmark record per frame instead of
+the JPEG, plus a small thumbnail every ``--thumbnail-interval`` seconds
+for the visualizer (see :mod:`src.capture.landmark_stream`):
+    python -m src.capture.frame_capture --cam0 0 --host 192.168.1.10 --port 9123 --landmarks
+
+Shared-memory invocation (no JPEG, no UDP; one ring per camera named
+``<prefix>_cam<cam_id>``, created here and unlinked on exit):
+    python -m src.capture.frame_capture --cam0 0 --transport shm --shm-prefix eyec_1234
+
+With ``--control-stdin`` the process also reads control commands from
+stdin (see :mod:`src.capture.control`) to change fps / resolution / JPEG
+quality at runtime, and exits when stdin closes. Over UDP the same channel
+carries face boxes; while one is set only a padded crop around it is
+encoded and sent, with periodic full frames (see :mod:`src.capture.roi`).
+
+Over UDP the process also answers clock-sync pings arriving on its
+sending socket (see :mod:`src.capture.clock_sync`), so a receiver on
+another host can map frame timestamps into its own clock. Receiver
+feedback for ``--adaptive`` arrives on the same socket.
+
+Warm standby (see :class:`src.capture.supervisor.WarmCapturePool`): start
+with only ``--standby`` to pay interpreter start-up and imports ahead of
+time; the process reports ``STANDBY=1`` and waits for a ``START`` line on
+stdin carrying the arguments above (see :func:`src.capture.control.format_start`),
+so claiming it only costs the camera open:
+    python -m src.capture.frame_capture --standby
+
 cam_id mapping in the wire protocol:
-    single  --cam0  -> cam_id 0
+    single  --cam0  -> cam_id 0 (or --cam-id)
     stereo  --cam0  -> cam_id 1 (left)
             --cam1  -> cam_id 2 (right)
 
 Stderr handshake (parsed by the supervisor):
-    READY=1 cameras=N           -- captures opened, sender threads started
+    STANDBY=1                   -- imports done, waiting for START
+    READY=1 cameras=N port=P transport=T open_ms=M [payload=B]
+                                -- captures opened (taking M ms), sender
+                                   threads started; payload is the UDP
+                                   payload size in use
     READY=0 reason=<short>      -- failed to open one or more captures
+
+Informational stderr lines (logged, not parsed):
+    WARN <message>
+    CONTROL fps=N width=W height=H jpeg_quality=Q  -- params now in effect
+    ADAPT jpeg_quality=Q width=W height=H  -- --adaptive changed quality / resolution
+    CLOCK cam_id=<id> source=driver|grab  -- where frame timestamps come from
+                                   (see :func:`src.capture.latency.pick_capture_timestamp`)
+
+With ``--stats-interval S`` each camera thread also reports every S
+seconds (parsed by the supervisor, see :mod:`src.capture.telemetry`):
+    STATS cam=<id> capture_fps=.. sent_fps=.. encode_ms=.. frame_bytes=.. ...
 """
 
 from __future__ import annotations
 
 import argparse
+import errno
+import ipaddress
+import os
+import select
 import signal
 import socket
 import sys
 import threading
 import time
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import cv2
 
-from src.capture.protocol import pack_packets
+from src.capture.adaptive import (
+    FEEDBACK_SIZE,
+    AdaptiveConfig,
+    Feedback,
+    QualityController,
+    is_feedback_packet,
+    parse_feedback,
+)
+from src.capture.clock_sync import SYNC_SIZE, answer_ping
+from src.capture.control import (
+    OP_RESET,
+    OP_ROI,
+    ControlCommand,
+    parse_control_line,
+    parse_start_line,
+)
+from src.capture.landmark_stream import encode_record
+from src.capture.latency import pick_capture_timestamp
+from src.capture.mjpeg import ensure_huffman_tables, scan_jpeg, trim_to_eoi
+from src.capture.protocol import (
+    FLAG_LANDMARKS,
+    MAX_FEC_PAYLOAD,
+    MAX_LARGE_PAYLOAD,
+    MAX_PAYLOAD,
+    pack_packets,
+    pick_max_payload,
+)
+from src.capture.roi import Box, RoiScheduler
+from src.capture.shm_ring import DEFAULT_SLOTS, ShmFrameRing, ring_name
+from src.capture.telemetry import CaptureCounters, format_stats_line
+from src.capture.workers import parse_cpu_list
 
 
 SINGLE_CAM_ID = 0
@@ -48,15 +155,19 @@ def _open_camera(
     fps: int,
     mjpeg: bool,
     buffer_size: int,
+    passthrough: bool = False,
 ) -> cv2.VideoCapture:
     """Open a camera and apply the same configuration the rest of the project
     uses (`hardware/stereo_clahe_preview.py`): MJPEG fourcc for higher USB
     framerates, fixed resolution, requested fps, buffer size 1 to minimize
-    latency.
+    latency. With ``passthrough`` the backend is asked not to decode, so
+    ``read()`` returns the raw MJPEG bytes.
     """
     cap = cv2.VideoCapture(index)
     if mjpeg:
         cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter.fourcc(*"MJPG"))
+    if passthrough:
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
     cap.set(cv2.CAP_PROP_FPS, fps)
@@ -64,44 +175,515 @@ def _open_camera(
     return cap
 
 
+class _UdpSink:
+    """JPEG-encode each frame and send it as protocol datagrams."""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        addr: Tuple[str, int],
+        jpeg_quality: int,
+        max_payload: int = MAX_PAYLOAD,
+        fec_ratio: float = 0.0,
+    ) -> None:
+        self._sock = sock
+        self._addr = addr
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self.max_payload = max_payload
+        self.fec_ratio = fec_ratio
+        # Datagram bytes handed to the OS, for --byte-budget.
+        self._bytes_sent = 0
+        self._bytes_lock = threading.Lock()
+
+    @property
+    def bytes_sent(self) -> int:
+        with self._bytes_lock:
+            return self._bytes_sent
+
+    def set_jpeg_quality(self, jpeg_quality: int) -> None:
+        # Swap the whole list so camera threads never see a half update.
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+
+    def send(
+        self,
+        cam_id: int,
+        frame_id: int,
+        frame,
+        roi: Optional[Box] = None,
+        stats: Optional[CaptureCounters] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        h, w = frame.shape[:2]
+        offset = None
+        if roi is not None:
+            x, y, rw, rh = roi
+            frame = frame[y : y + rh, x : x + rw]
+            offset = (x, y)
+        t0 = time.perf_counter()
+        ok, encoded = cv2.imencode(".jpg", frame, self._encode_params)
+        if stats is not None:
+            stats.encode_s += time.perf_counter() - t0
+        if not ok:
+            return
+        self.send_jpeg(
+            cam_id, frame_id, bytes(encoded), w, h, roi=offset, stats=stats, timestamp=timestamp
+        )
+
+    def send_jpeg(
+        self,
+        cam_id: int,
+        frame_id: int,
+        jpeg_bytes: bytes,
+        width: int,
+        height: int,
+        roi: Optional[Tuple[int, int]] = None,
+        stats: Optional[CaptureCounters] = None,
+        timestamp: Optional[float] = None,
+        flags: int = 0,
+    ) -> None:
+        """Send an encoded payload: a JPEG or, with ``FLAG_LANDMARKS``, a
+        landmark record."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        max_payload = self.max_payload
+        packets = pack_packets(
+            cam_id=cam_id,
+            frame_id=frame_id,
+            timestamp=timestamp,
+            width=width,
+            height=height,
+            jpeg_bytes=jpeg_bytes,
+            roi=roi,
+            max_payload=max_payload,
+            fec_ratio=self.fec_ratio,
+            flags=flags,
+        )
+        if stats is not None:
+            stats.sent += 1
+            stats.bytes += len(jpeg_bytes)
+            stats.packets += len(packets)
+        with self._bytes_lock:
+            self._bytes_sent += sum(len(pkt) for pkt in packets)
+        for pkt in packets:
+            try:
+                self._sock.sendto(pkt, self._addr)
+            except OSError as e:
+                if stats is not None:
+                    stats.send_errors += 1
+                if e.errno == errno.EMSGSIZE and max_payload != MAX_PAYLOAD:
+                    # The route stopped accepting large datagrams; this
+                    # frame is lost, later ones go out Ethernet-sized.
+                    self.max_payload = MAX_PAYLOAD
+                    _print_status(
+                        f"WARN {max_payload}-byte datagrams rejected; "
+                        f"falling back to {MAX_PAYLOAD}"
+                    )
+                    return
+                # UDP send can fail under transient network conditions; drop
+                # the packet and keep streaming. Reassembler TTL handles the
+                # rest.
+                pass
+
+    def serve_return_channel(
+        self,
+        stop_event: threading.Event,
+        on_feedback: Optional[Callable[[Feedback, float], None]] = None,
+    ) -> None:
+        """Answer the receiver's clock-sync PINGs (see
+        :mod:`src.capture.clock_sync`) and hand its FEEDBACK datagrams
+        (see :mod:`src.capture.adaptive`) to ``on_feedback`` until
+        ``stop_event`` is set. Both arrive on the sending socket, which
+        nothing else reads."""
+        while not stop_event.is_set():
+            try:
+                readable, _, _ = select.select([self._sock], [], [], 0.5)
+                if not readable:
+                    continue
+                packet, addr = self._sock.recvfrom(max(SYNC_SIZE, FEEDBACK_SIZE) + 1)
+                t1 = time.monotonic()
+            except ValueError:
+                # Socket closed on shutdown.
+                return
+            except OSError:
+                if self._sock.fileno() == -1:
+                    return
+                # Not bound until the first frame goes out (Windows
+                # refuses to select on it), or an ICMP error surfaced.
+                stop_event.wait(0.1)
+                continue
+            if is_feedback_packet(packet):
+                if on_feedback is not None:
+                    on_feedback(parse_feedback(packet), t1)
+                continue
+            pong = answer_ping(packet, t1, time.monotonic())
+            if pong is None:
+                continue
+            try:
+                self._sock.sendto(pong, addr)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class _ShmSink:
+    """Publish raw BGR frames into one shared-memory ring per camera."""
+
+    def __init__(self, rings: Dict[int, ShmFrameRing]) -> None:
+        self._rings = rings
+        self._warned: Set[int] = set()
+
+    def send(
+        self,
+        cam_id: int,
+        frame_id: int,
+        frame,
+        roi: Optional[Box] = None,
+        stats: Optional[CaptureCounters] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        # Always the full frame: there is no encode to save on a memcpy.
+        ring = self._rings[cam_id]
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if ring.publish(frame_id, timestamp, frame):
+            if stats is not None:
+                stats.sent += 1
+                stats.bytes += frame.nbytes
+            return
+        if stats is not None:
+            stats.send_errors += 1
+        if cam_id not in self._warned:
+            self._warned.add(cam_id)
+            _print_status(
+                f"WARN cam_id={cam_id} frame {frame.shape} does not fit "
+                f"shm slot ({ring.slot_capacity} bytes); dropping"
+            )
+
+    def set_jpeg_quality(self, jpeg_quality: int) -> None:
+        # Raw frames; nothing is encoded.
+        pass
+
+    def close(self) -> None:
+        for ring in self._rings.values():
+            ring.close()
+
+
+class _CaptureControl:
+    """Capture parameters the supervisor can change at runtime.
+
+    Written by the control thread, read by the camera threads. Throttling
+    is applied per camera after ``grab()``: every camera frame is still
+    dequeued (cheap, no decode), but only frames that are due get
+    retrieved, encoded and sent, so raising the rate again takes effect
+    on the next camera frame.
+
+    With ``--adaptive`` the quality cap and resolution scale set by
+    :meth:`set_adaptive` apply on top of the commanded parameters.
+    """
+
+    def __init__(self, fps: int, width: int, height: int, jpeg_quality: int) -> None:
+        self._lock = threading.Lock()
+        self._launch = {"fps": fps, "width": width, "height": height, "jpeg_quality": jpeg_quality}
+        self._current = dict(self._launch)
+        self._quality_cap = 100
+        self._scale = 1.0
+        # The rate the camera was opened at; asking for more is a no-op.
+        self._nominal_fps = max(1, fps)
+        self._last_sent: Dict[int, float] = {}
+        self._resolution_version = 0
+        self._roi: Dict[int, RoiScheduler] = {}
+
+    def apply(self, command: ControlCommand) -> Dict[str, int]:
+        """Apply a SET / RESET command; returns the parameters now in effect."""
+        with self._lock:
+            before = self._effective_size()
+            if command.op == OP_RESET:
+                self._current = dict(self._launch)
+                # A fresh consumer starts from full frames too.
+                self._roi.clear()
+            else:
+                self._current.update(command.params)
+            self._resolution_changed(before)
+            return self._effective()
+
+    def set_adaptive(self, quality_cap: int, scale: float) -> Dict[str, int]:
+        """Cap the commanded JPEG quality and scale the commanded
+        resolution; returns the parameters now in effect."""
+        with self._lock:
+            before = self._effective_size()
+            self._quality_cap = quality_cap
+            self._scale = scale
+            self._resolution_changed(before)
+            return self._effective()
+
+    def _effective_size(self) -> Tuple[int, int]:
+        if self._scale == 1.0:
+            return self._current["width"], self._current["height"]
+        # Even sizes: most drivers and the JPEG chroma subsampling want them.
+        return (
+            max(2, int(self._current["width"] * self._scale) & ~1),
+            max(2, int(self._current["height"] * self._scale) & ~1),
+        )
+
+    def _effective(self) -> Dict[str, int]:
+        width, height = self._effective_size()
+        return {
+            "fps": self._current["fps"],
+            "width": width,
+            "height": height,
+            "jpeg_quality": min(self._current["jpeg_quality"], self._quality_cap),
+        }
+
+    def _resolution_changed(self, before: Tuple[int, int]) -> None:
+        if self._effective_size() != before:
+            self._resolution_version += 1
+            # Boxes are in the old resolution's pixels.
+            self._roi.clear()
+
+    def set_roi(self, cam_id: int, box: Optional[Box], now: float) -> None:
+        with self._lock:
+            scheduler = self._roi.get(cam_id)
+            if scheduler is None:
+                scheduler = self._roi[cam_id] = RoiScheduler()
+            scheduler.set_box(box, now)
+
+    def crop_for(self, cam_id: int, now: float, frame_w: int, frame_h: int) -> Optional[Box]:
+        """Crop to send for this frame, or None for the full frame."""
+        with self._lock:
+            scheduler = self._roi.get(cam_id)
+            if scheduler is None:
+                return None
+            return scheduler.crop_for(now, frame_w, frame_h)
+
+    @property
+    def jpeg_quality(self) -> int:
+        """The quality to encode at: the commanded one, capped."""
+        with self._lock:
+            return min(self._current["jpeg_quality"], self._quality_cap)
+
+    @property
+    def commanded_quality(self) -> int:
+        with self._lock:
+            return self._current["jpeg_quality"]
+
+    def resolution(self) -> Tuple[int, int, int]:
+        """(version, width, height); the version bumps on every change."""
+        with self._lock:
+            return (self._resolution_version,) + self._effective_size()
+
+    def frame_due(self, cam_id: int, now: float) -> bool:
+        with self._lock:
+            fps = self._current["fps"]
+            last = self._last_sent.get(cam_id)
+            if fps < self._nominal_fps and last is not None:
+                # Half a camera frame of slack so e.g. 5 fps out of 30 lands
+                # on every 6th frame instead of every 7th.
+                interval = 1.0 / fps - 0.5 / self._nominal_fps
+                if now - last < interval:
+                    return False
+            self._last_sent[cam_id] = now
+            return True
+
+
+def _control_loop(
+    stream,
+    control: _CaptureControl,
+    sink,
+    stop_event: threading.Event,
+) -> None:
+    """Read control commands until the supervisor closes our stdin."""
+    for raw in stream:
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            command = parse_control_line(line)
+        except ValueError as e:
+            _print_status(f"WARN ignoring control line {line!r}: {e}")
+            continue
+        if command.op == OP_ROI:
+            # Sent several times a second while tracking; not echoed.
+            p = command.params
+            box = (p["x"], p["y"], p["w"], p["h"]) if p["w"] and p["h"] else None
+            control.set_roi(p["cam"], box, time.monotonic())
+            continue
+        current = control.apply(command)
+        sink.set_jpeg_quality(current["jpeg_quality"])
+        _print_status("CONTROL " + " ".join(f"{k}={v}" for k, v in current.items()))
+    # EOF: the supervisor stopped us or went away without doing so.
+    stop_event.set()
+
+
+def _adaptive_feedback(
+    controller: QualityController,
+    control: _CaptureControl,
+    sink: _UdpSink,
+) -> Callable[[Feedback, float], None]:
+    """``on_feedback`` for :meth:`_UdpSink.serve_return_channel` that lets
+    ``controller`` steer ``control`` and the encoder."""
+
+    def _on_feedback(feedback: Feedback, now: float) -> None:
+        controller.on_feedback(feedback, now)
+        setting = controller.update(now, sink.bytes_sent, control.commanded_quality)
+        if setting is None:
+            return
+        current = control.set_adaptive(setting.quality_cap, setting.scale)
+        sink.set_jpeg_quality(current["jpeg_quality"])
+        _print_status(
+            f"ADAPT jpeg_quality={current['jpeg_quality']} "
+            f"width={current['width']} height={current['height']}"
+        )
+
+    return _on_feedback
+
+
+class _LandmarkStreamer:
+    """``--landmarks``: run the face landmarker on each frame and send its
+    result as a landmark record; every ``thumbnail_interval`` seconds also
+    send a ``thumbnail_width`` pixels wide JPEG of the frame. One per
+    camera thread, since a landmarker instance is not thread-safe."""
+
+    def __init__(self, provider, thumbnail_interval: float, thumbnail_width: int) -> None:
+        self._provider = provider
+        self._thumbnail_interval = thumbnail_interval
+        self._thumbnail_width = thumbnail_width
+        self._next_thumbnail = 0.0
+
+    def send(
+        self,
+        sink: "_UdpSink",
+        cam_id: int,
+        frame_id: int,
+        frame,
+        stats: Optional[CaptureCounters],
+        timestamp: float,
+    ) -> int:
+        """Send what ``frame`` yields; returns the next free frame_id."""
+        h, w = frame.shape[:2]
+        t0 = time.perf_counter()
+        observation = self._provider.get_primary_face_observation(
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        )
+        if observation is None:
+            record = encode_record(None)
+        else:
+            record = encode_record(
+                observation.landmarks,
+                observation.facial_transformation_matrix,
+                observation.blendshapes,
+            )
+        if stats is not None:
+            # Inference takes the place of the JPEG encode in STATS.
+            stats.encode_s += time.perf_counter() - t0
+        sink.send_jpeg(
+            cam_id, frame_id, record, w, h, stats=stats, timestamp=timestamp, flags=FLAG_LANDMARKS
+        )
+        frame_id = (frame_id + 1) & 0xFFFFFFFF
+        now = time.monotonic()
+        if self._thumbnail_interval > 0 and now >= self._next_thumbnail:
+            self._next_thumbnail = now + self._thumbnail_interval
+            tw = min(w, self._thumbnail_width)
+            th = max(1, round(h * tw / w))
+            thumbnail = cv2.resize(frame, (tw, th), interpolation=cv2.INTER_AREA)
+            sink.send(cam_id, frame_id, thumbnail, stats=stats, timestamp=timestamp)
+            frame_id = (frame_id + 1) & 0xFFFFFFFF
+        return frame_id
+
+    def close(self) -> None:
+        self._provider.release()
+
+
+def _passthrough_jpeg(raw) -> Optional[Tuple[bytes, int, int]]:
+    """Turn a non-decoded ``cap.read()`` buffer into (jpeg, width, height),
+    or None if it doesn't hold a usable JPEG."""
+    data = trim_to_eoi(raw.tobytes())
+    info = scan_jpeg(data)
+    if info is None or info.width == 0 or info.height == 0:
+        return None
+    return ensure_huffman_tables(data, info), info.width, info.height
+
+
 def _camera_loop(
     cap: cv2.VideoCapture,
     cam_id: int,
-    sock: socket.socket,
-    addr: Tuple[str, int],
-    jpeg_quality: int,
+    sink,
     stop_event: threading.Event,
+    control: _CaptureControl,
+    passthrough: bool = False,
+    stats: Optional[CaptureCounters] = None,
+    landmarks: Optional[_LandmarkStreamer] = None,
 ) -> None:
-    encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
     frame_id = 0
+    resolution_version = 0
+    driver_stamps: Optional[bool] = None
     while not stop_event.is_set():
-        ok, frame = cap.read()
+        if stats is not None:
+            report = stats.report(time.monotonic())
+            if report is not None:
+                _print_status(format_stats_line(cam_id, report))
+        version, width, height = control.resolution()
+        if version != resolution_version:
+            resolution_version = version
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if not cap.grab():
+            time.sleep(0.001)
+            continue
+        # Stamp before retrieve(): decode and encode must not count as
+        # capture time. Prefer the driver's own buffer timestamp.
+        grabbed_at = time.monotonic()
+        if stats is not None:
+            stats.grabbed += 1
+        if not control.frame_due(cam_id, grabbed_at):
+            continue
+        timestamp, from_driver = pick_capture_timestamp(
+            cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, grabbed_at
+        )
+        if from_driver != driver_stamps:
+            driver_stamps = from_driver
+            _print_status(f"CLOCK cam_id={cam_id} source={'driver' if from_driver else 'grab'}")
+        ok, frame = cap.retrieve()
         if not ok or frame is None:
             # Brief sleep avoids a busy-spin if the camera is momentarily
             # unavailable (cap.read normally blocks on the next frame).
             time.sleep(0.001)
             continue
-        h, w = frame.shape[:2]
-        ok2, encoded = cv2.imencode(".jpg", frame, encode_params)
-        if not ok2:
+        if passthrough:
+            if frame.ndim == 3:
+                # The backend ignored CAP_PROP_CONVERT_RGB=0 and decoded
+                # anyway; re-encode like the default path from now on.
+                _print_status(
+                    f"WARN cam_id={cam_id} backend does not expose raw MJPEG; "
+                    "falling back to re-encoding"
+                )
+                passthrough = False
+            else:
+                packed = _passthrough_jpeg(frame)
+                if packed is not None:
+                    jpeg_bytes, w, h = packed
+                    sink.send_jpeg(
+                        cam_id,
+                        frame_id & 0xFFFFFFFF,
+                        jpeg_bytes,
+                        w,
+                        h,
+                        stats=stats,
+                        timestamp=timestamp,
+                    )
+                    frame_id = (frame_id + 1) & 0xFFFFFFFF
+                # A corrupt MJPEG frame is dropped rather than forwarded.
+                continue
+        if landmarks is not None:
+            frame_id = landmarks.send(sink, cam_id, frame_id, frame, stats, timestamp)
             continue
-        timestamp = time.monotonic()
-        packets = pack_packets(
-            cam_id=cam_id,
-            frame_id=frame_id & 0xFFFFFFFF,
-            timestamp=timestamp,
-            width=w,
-            height=h,
-            jpeg_bytes=bytes(encoded),
-        )
-        for pkt in packets:
-            try:
-                sock.sendto(pkt, addr)
-            except OSError:
-                # UDP send can fail under transient network conditions; drop
-                # the packet and keep streaming. Reassembler TTL handles the
-                # rest.
-                pass
+        h, w = frame.shape[:2]
+        roi = control.crop_for(cam_id, time.monotonic(), w, h)
+        sink.send(cam_id, frame_id & 0xFFFFFFFF, frame, roi, stats=stats, timestamp=timestamp)
         frame_id = (frame_id + 1) & 0xFFFFFFFF
 
 
@@ -117,7 +699,7 @@ def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         prog="python -m src.capture.frame_capture",
         description=(
             "Capture frames from 1 or 2 cameras and stream them over UDP "
-            "as JPEG-encoded fragments."
+            "as JPEG-encoded fragments, or into shared memory as raw BGR."
         ),
     )
     parser.add_argument("--cam0", type=int, required=True, help="First camera index.")
@@ -127,8 +709,31 @@ def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         default=None,
         help="Second camera index (sets stereo mode). cam_id=1 for --cam0, cam_id=2 for --cam1.",
     )
+    parser.add_argument(
+        "--cam-id",
+        type=int,
+        default=None,
+        help="Wire cam_id for a single --cam0 (default 0); lets one process per stereo camera publish as 1 / 2.",
+    )
+    parser.add_argument(
+        "--cpus",
+        type=parse_cpu_list,
+        default=None,
+        help="Pin this process to these CPUs, e.g. 2,3 or 4-7 (where the OS supports it).",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=0,
+        help="Add this to the process's nice value (POSIX only).",
+    )
     parser.add_argument("--host", default="127.0.0.1", help="Destination IP for UDP datagrams.")
-    parser.add_argument("--port", type=int, required=True, help="Destination port for UDP datagrams.")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Destination port for UDP datagrams (required with --transport udp).",
+    )
     parser.add_argument("--width", type=int, default=640)
     parser.add_argument("--height", type=int, default=480)
     parser.add_argument("--fps", type=int, default=30)
@@ -138,15 +743,266 @@ def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         help="Disable MJPEG fourcc on the camera (default: MJPEG enabled).",
     )
     parser.add_argument("--jpeg-quality", type=int, default=85)
+    parser.add_argument(
+        "--passthrough",
+        action="store_true",
+        help="Forward the camera's native MJPEG frames without decoding / re-encoding (UDP only).",
+    )
     parser.add_argument("--buffer-size", type=int, default=1, help="cv2 CAP_PROP_BUFFERSIZE.")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--max-payload",
+        type=int,
+        default=MAX_PAYLOAD,
+        help=(
+            f"Proposed UDP payload bytes per datagram (up to {MAX_LARGE_PAYLOAD}); "
+            "use a large value only when the receiver is on loopback."
+        ),
+    )
+    parser.add_argument(
+        "--fec",
+        type=float,
+        default=0.0,
+        help=(
+            "Parity packets per data packet for UDP forward error correction, e.g. 0.1 "
+            "(at least one per frame); 0: off. For lossy links."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=(
+            "Adjust JPEG quality (at most --jpeg-quality) to the receiver's feedback on "
+            "frame delivery, latency and decode time (UDP only)."
+        ),
+    )
+    parser.add_argument(
+        "--min-quality",
+        type=int,
+        default=AdaptiveConfig().min_quality,
+        help="Lowest JPEG quality --adaptive may use.",
+    )
+    parser.add_argument(
+        "--target-delivery",
+        type=float,
+        default=AdaptiveConfig().target_delivery,
+        help="Share of sent frames --adaptive keeps arriving, e.g. 0.95.",
+    )
+    parser.add_argument(
+        "--byte-budget",
+        type=float,
+        default=0.0,
+        help="Bytes per second --adaptive stays under, FEC and headers included (0: no limit).",
+    )
+    parser.add_argument(
+        "--adaptive-resolution",
+        action="store_true",
+        help="Let --adaptive also step the resolution down (3/4, then 1/2) once quality is at --min-quality.",
+    )
+    parser.add_argument(
+        "--landmarks",
+        action="store_true",
+        help="Run the face landmarker here and send landmark records instead of images (UDP only).",
+    )
+    parser.add_argument(
+        "--face-model",
+        default=None,
+        help="Face Landmarker .task model for --landmarks (default: download to the user cache).",
+    )
+    parser.add_argument(
+        "--thumbnail-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between preview thumbnails with --landmarks (0: none).",
+    )
+    parser.add_argument(
+        "--thumbnail-width",
+        type=int,
+        default=160,
+        help="Width in pixels of the --landmarks preview thumbnails.",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("udp", "shm"),
+        default="udp",
+        help="udp: JPEG over UDP (works across hosts). shm: raw BGR shared-memory ring (same host only).",
+    )
+    parser.add_argument(
+        "--shm-prefix",
+        default=None,
+        help="Segment name prefix for --transport shm; rings are <prefix>_cam<cam_id>.",
+    )
+    parser.add_argument(
+        "--shm-slots",
+        type=int,
+        default=DEFAULT_SLOTS,
+        help="Slots per shared-memory ring.",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=0.0,
+        help="Seconds between per-camera STATS lines on stderr (0: off).",
+    )
+    parser.add_argument(
+        "--control-stdin",
+        action="store_true",
+        help="Read runtime control commands from stdin; exit when it closes.",
+    )
+    args = parser.parse_args(argv)
+    if args.transport == "udp" and args.port is None:
+        parser.error("--port is required with --transport udp")
+    if args.transport == "shm" and not args.shm_prefix:
+        parser.error("--shm-prefix is required with --transport shm")
+    if args.passthrough and (args.transport != "udp" or args.no_mjpeg):
+        parser.error("--passthrough needs MJPEG and --transport udp")
+    if args.cam_id is not None and (args.cam1 is not None or not 0 <= args.cam_id <= 255):
+        parser.error("--cam-id needs a single camera and a value in [0, 255]")
+    if not MAX_PAYLOAD <= args.max_payload <= MAX_LARGE_PAYLOAD:
+        parser.error(f"--max-payload must be in [{MAX_PAYLOAD}, {MAX_LARGE_PAYLOAD}]")
+    if not 0.0 <= args.fec <= 1.0 or (args.fec and args.transport != "udp"):
+        parser.error("--fec must be in [0, 1] and needs --transport udp")
+    if args.landmarks and (args.transport != "udp" or args.passthrough):
+        parser.error("--landmarks needs --transport udp and no --passthrough")
+    if args.thumbnail_interval < 0 or args.thumbnail_width < 16:
+        parser.error("--thumbnail-interval must be >= 0 and --thumbnail-width >= 16")
+    if args.adaptive and args.transport != "udp":
+        parser.error("--adaptive needs --transport udp")
+    if not 1 <= args.min_quality <= 100 or not 0.0 < args.target_delivery <= 1.0:
+        parser.error("--min-quality must be in [1, 100] and --target-delivery in (0, 1]")
+    if args.byte_budget < 0:
+        parser.error("--byte-budget must be >= 0")
+    return args
+
+
+def _adaptive_config(args: argparse.Namespace) -> AdaptiveConfig:
+    return AdaptiveConfig(
+        min_quality=args.min_quality,
+        target_delivery=args.target_delivery,
+        byte_budget=args.byte_budget,
+        scales=(1.0, 0.75, 0.5) if args.adaptive_resolution else (1.0,),
+    )
+
+
+def _frame_bytes(cap: cv2.VideoCapture, width: int, height: int) -> int:
+    """Size of one BGR frame as negotiated by the driver, falling back to
+    the requested resolution when the backend doesn't report it."""
+    w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+    h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+    return w * h * 3
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _build_sink(args: argparse.Namespace, captures: List[Tuple[int, cv2.VideoCapture]]):
+    if args.transport == "udp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        addr = (args.host, args.port)
+        max_payload = MAX_PAYLOAD
+        if args.max_payload > MAX_PAYLOAD:
+            if _is_loopback(args.host):
+                wanted = min(args.max_payload, MAX_FEC_PAYLOAD) if args.fec else args.max_payload
+                max_payload = pick_max_payload(sock, addr, wanted)
+            else:
+                _print_status(
+                    f"WARN --max-payload ignored for non-loopback host {args.host}; "
+                    f"using {MAX_PAYLOAD}"
+                )
+        return _UdpSink(sock, addr, args.jpeg_quality, max_payload, fec_ratio=args.fec)
+    rings: Dict[int, ShmFrameRing] = {}
+    try:
+        for cam_id, cap in captures:
+            rings[cam_id] = ShmFrameRing.create(
+                name=ring_name(args.shm_prefix, cam_id),
+                cam_id=cam_id,
+                slot_capacity=_frame_bytes(cap, args.width, args.height),
+                n_slots=args.shm_slots,
+            )
+    except (OSError, ValueError):
+        for ring in rings.values():
+            ring.close()
+        raise
+    return _ShmSink(rings)
+
+
+def _build_landmark_streamers(
+    args: argparse.Namespace, cam_ids: List[int]
+) -> Dict[int, _LandmarkStreamer]:
+    # Imported here: only --landmarks nodes need (or have) MediaPipe.
+    from src.face_tracking.providers.face_landmarks import FaceLandmarksProvider
+
+    streamers: Dict[int, _LandmarkStreamer] = {}
+    try:
+        for cam_id in cam_ids:
+            streamers[cam_id] = _LandmarkStreamer(
+                FaceLandmarksProvider(face_model_path=args.face_model),
+                args.thumbnail_interval,
+                args.thumbnail_width,
+            )
+    except Exception:
+        for streamer in streamers.values():
+            streamer.close()
+        raise
+    return streamers
+
+
+def _apply_scheduling(cpus: Optional[Tuple[int, ...]], nice: int) -> None:
+    """CPU pinning and priority for the whole process; the camera threads
+    started later inherit both. Unsupported on this OS: warn and go on."""
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except AttributeError:
+            _print_status("WARN --cpus not supported on this platform; ignored")
+        except OSError as e:
+            _print_status(f"WARN could not pin to CPUs {list(cpus)}: {e}")
+    if nice:
+        try:
+            os.nice(nice)
+        except AttributeError:
+            _print_status("WARN --nice not supported on this platform; ignored")
+        except OSError as e:
+            _print_status(f"WARN could not change priority by {nice}: {e}")
+
+
+STANDBY_FLAG = "--standby"
+
+
+def _wait_for_start(stream) -> Optional[List[str]]:
+    """Standby: announce readiness, then block for the ``START`` line.
+    None if stdin closes first (the pool was shut down)."""
+    _print_status("STANDBY=1")
+    for raw in stream:
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            return parse_start_line(line)
+        except ValueError as e:
+            _print_status(f"WARN ignoring standby line {line!r}: {e}")
+    return None
 
 
 def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if list(argv) == [STANDBY_FLAG]:
+        argv = _wait_for_start(sys.stdin)
+        if argv is None:
+            return 0
     args = _parse_args(argv)
+    opening_since = time.monotonic()
+    _apply_scheduling(args.cpus, args.nice)
 
     if args.cam1 is None:
-        cam_setup: List[Tuple[int, int]] = [(SINGLE_CAM_ID, args.cam0)]
+        cam_id = SINGLE_CAM_ID if args.cam_id is None else args.cam_id
+        cam_setup: List[Tuple[int, int]] = [(cam_id, args.cam0)]
     else:
         cam_setup = [
             (STEREO_LEFT_CAM_ID, args.cam0),
@@ -162,6 +1018,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             fps=args.fps,
             mjpeg=not args.no_mjpeg,
             buffer_size=args.buffer_size,
+            passthrough=args.passthrough,
         )
         if not cap.isOpened():
             cap.release()
@@ -171,8 +1028,26 @@ def main(argv: Optional[List[str]] = None) -> int:
             return 1
         captures.append((cam_id, cap))
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    addr = (args.host, args.port)
+    try:
+        sink = _build_sink(args, captures)
+    except (OSError, ValueError) as e:
+        for _, c in captures:
+            c.release()
+        _print_status(f"ERROR {args.transport} sink setup failed: {e}")
+        _print_status(f"READY=0 reason=could_not_create_{args.transport}_sink")
+        return 1
+
+    streamers: Dict[int, _LandmarkStreamer] = {}
+    if args.landmarks:
+        try:
+            streamers = _build_landmark_streamers(args, [cam_id for cam_id, _ in captures])
+        except (ImportError, RuntimeError) as e:
+            sink.close()
+            for _, c in captures:
+                c.release()
+            _print_status(f"ERROR face landmarker setup failed: {e}")
+            _print_status("READY=0 reason=could_not_load_landmarker")
+            return 1
 
     stop_event = threading.Event()
 
@@ -182,21 +1057,66 @@ def main(argv: Optional[List[str]] = None) -> int:
     signal.signal(signal.SIGTERM, _handle_signal)
     signal.signal(signal.SIGINT, _handle_signal)
 
+    control = _CaptureControl(
+        fps=args.fps,
+        width=args.width,
+        height=args.height,
+        jpeg_quality=args.jpeg_quality,
+    )
+
     threads: List[threading.Thread] = []
     for cam_id, cap in captures:
         t = threading.Thread(
             target=_camera_loop,
-            args=(cap, cam_id, sock, addr, args.jpeg_quality, stop_event),
+            args=(
+                cap,
+                cam_id,
+                sink,
+                stop_event,
+                control,
+                args.passthrough,
+                CaptureCounters(args.stats_interval) if args.stats_interval > 0 else None,
+                streamers.get(cam_id),
+            ),
             daemon=True,
             name=f"capture-cam{cam_id}",
         )
         threads.append(t)
 
-    _print_status(f"READY=1 cameras={len(captures)} port={args.port}")
+    open_ms = 1000.0 * (time.monotonic() - opening_since)
+    ready = (
+        f"READY=1 cameras={len(captures)} port={args.port} "
+        f"transport={args.transport} open_ms={open_ms:.0f}"
+    )
+    if isinstance(sink, _UdpSink):
+        ready += f" payload={sink.max_payload}"
+    _print_status(ready)
 
     for t in threads:
         t.start()
 
+    if isinstance(sink, _UdpSink):
+        on_feedback = None
+        if args.adaptive:
+            controller = QualityController(_adaptive_config(args), now=time.monotonic())
+            on_feedback = _adaptive_feedback(controller, control, sink)
+        # Not joined: exits once stop_event is set or the socket closes.
+        threading.Thread(
+            target=sink.serve_return_channel,
+            args=(stop_event, on_feedback),
+            daemon=True,
+            name="capture-return-channel",
+        ).start()
+
+    if args.control_stdin:
+        # Not joined: it blocks on stdin and dies with the process.
+        threading.Thread(
+            target=_control_loop,
+            args=(sys.stdin, control, sink, stop_event),
+            daemon=True,
+            name="capture-control",
+        ).start()
+
     # Polling wait so the SIGTERM/SIGINT handler reliably wakes us; on some
     # platforms a blocking Event.wait() does not interrupt on signal.
     while not stop_event.wait(timeout=0.5):
@@ -205,10 +1125,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     for t in threads:
         t.join(timeout=2.0)
 
-    try:
-        sock.close()
-    except OSError:
-        pass
+    for streamer in streamers.values():
+        streamer.close()
+    sink.close()
     for _, cap in captures:
         cap.release()
 
@@ -1,9 +1,42 @@
-"""Host-side UDP receiver for the capture protocol.
+"""Host-side receivers for the capture process.
 
-A background thread reads UDP packets, hands them to the
-:class:`Reassembler`, decodes completed JPEGs to BGR ndarrays, and stores
-the latest frame per cam_id. The mode loop pulls frames via
-:meth:`get_latest_bgr` (single) or :meth:`get_latest_pair` (stereo).
+:class:`FrameReceiver` runs a background thread that reads UDP packets,
+hands them to the :class:`Reassembler` and stores the latest completed
+frame per cam_id still JPEG-compressed. Decoding happens lazily, in the
+caller's thread, the first time a consumer asks for the pixels -- so when
+the mode loop runs slower than the camera, frames it never looks at are
+never decoded.
+
+Capture processes on another host stamp frames with their own clock;
+:class:`FrameReceiver` pings them (see :mod:`src.capture.clock_sync`) and
+maps their timestamps into this host's ``time.monotonic()`` before
+publishing, so watermarks, stereo pairing and latency figures hold across
+hosts. :meth:`FrameReceiver.clock_status` reports the estimated offset
+and its uncertainty per camera. It also reports delivery, latency and
+decode time back to each capture process; those started with
+``--adaptive`` pick their JPEG quality from it (see
+:mod:`src.capture.adaptive`).
+
+A capture node streaming landmarks instead of images (``--landmarks``,
+see :mod:`src.capture.landmark_stream`) is received the same way; its
+records are served by :meth:`BaseFrameReceiver.get_latest_landmarks` and
+its occasional thumbnails like any other frame.
+
+:class:`ShmFrameReceiver` instead polls the shared-memory rings written by
+``--transport shm`` and publishes checked copies of the raw frames.
+
+:class:`ReplayFrameReceiver` plays back a recording made with
+:class:`~src.capture.recording.FrameRecorder` (see
+:meth:`FrameReceiver.set_recorder`), so modes can run without cameras.
+
+Both share :class:`BaseFrameReceiver`, so the mode loop pulls frames the
+same way regardless of transport: :meth:`get_latest_bgr` (single) or
+:meth:`get_latest_pair` (stereo), or the undecoded :class:`ReceivedFrame`
+handles (:meth:`get_latest_frame`, :meth:`get_latest_frame_pair`) when
+different stages want different decode variants of the same frame.
+:meth:`~BaseFrameReceiver.lease_rgb` converts a decoded frame for the
+landmarker into a pooled buffer (see :mod:`src.capture.buffer_pool`)
+instead of a fresh array per frame.
 
 Owned by :class:`src.capture.supervisor.CaptureSupervisor` -- consumers
 do not construct this directly.
@@ -11,120 +44,485 @@ do not construct this directly.
 
 from __future__ import annotations
 
+import select
 import socket
 import threading
 import time
-from typing import Dict, Optional, Tuple
+import weakref
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-from src.capture.protocol import Reassembler
+from src.capture.adaptive import FeedbackReporter, pack_feedback
+from src.capture.buffer_pool import BufferLease, BufferPool
+from src.capture.clock_sync import SYNC_MAGIC, SYNC_SIZE, ClockSync
+from src.capture.landmark_stream import LandmarkFrame, decode_record
+from src.capture.pairing import DEFAULT_HISTORY_LEN, PairSkewStats, select_pair
+from src.capture.protocol import FLAG_LANDMARKS, FLAG_ROI, CompletedFrame, Reassembler
+from src.capture.recording import FrameRecorder, Recording, replay_schedule
+from src.capture.shm_ring import ShmFrameRing, ring_name
+from src.capture.telemetry import ReceiveCounters
 
 
 _RCV_BUF_BYTES = 4 * 1024 * 1024
 _PACKET_RECV_SIZE = 65536
+# How long the UDP receiver waits for the socket to become readable before
+# pruning expired partials.
+_UDP_WAIT_S = 0.2
+# How often the shm receiver checks the rings for a new publish. Well under
+# one frame interval at 60 fps, and cheap: one 8-byte read per ring.
+_SHM_POLL_INTERVAL_S = 0.001
 
 
-class FrameReceiver:
-    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
-        self._host = host
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RCV_BUF_BYTES)
-        except OSError:
-            pass
-        self._sock.bind((host, port))
-        self._sock.settimeout(0.2)
-        self._actual_port = self._sock.getsockname()[1]
+# Decode variants a consumer can ask a ReceivedFrame for. The reduced and
+# grayscale flags let libjpeg skip most of the IDCT / colour work instead of
+# decoding at full size and shrinking afterwards.
+FRAME_VARIANTS = ("full", "half", "quarter", "gray")
+_DECODE_FLAGS = {
+    "full": cv2.IMREAD_COLOR,
+    "half": cv2.IMREAD_REDUCED_COLOR_2,
+    "quarter": cv2.IMREAD_REDUCED_COLOR_4,
+    "gray": cv2.IMREAD_GRAYSCALE,
+}
+_REDUCTION = {"half": 2, "quarter": 4}
+
+
+def _derive_variant(full: np.ndarray, variant: str) -> np.ndarray:
+    """Produce ``variant`` from an already decoded full-size BGR frame.
+    Sizes round up like libjpeg's scaled decode so both paths agree."""
+    if variant == "gray":
+        return cv2.cvtColor(full, cv2.COLOR_BGR2GRAY)
+    factor = _REDUCTION[variant]
+    h, w = full.shape[:2]
+    size = (-(-w // factor), -(-h // factor))
+    return cv2.resize(full, size, interpolation=cv2.INTER_AREA)
+
+
+def _paste_roi(
+    crop: np.ndarray,
+    variant: str,
+    width: int,
+    height: int,
+    offset: Tuple[int, int],
+    pool: Optional[BufferPool] = None,
+) -> Tuple[np.ndarray, Optional[BufferLease]]:
+    """Place a decoded ROI crop into a black ``variant``-sized frame, so
+    pixel coordinates match a full-frame decode. Offsets are aligned to
+    the JPEG block grid, so they divide exactly in the reduced variants.
+
+    The frame comes from ``pool`` when given (returned with its lease, for
+    the caller to release) instead of a new allocation per ROI frame."""
+    factor = _REDUCTION.get(variant, 1)
+    w = -(-width // factor)
+    h = -(-height // factor)
+    shape = (h, w) + crop.shape[2:]
+    lease = None
+    if pool is not None:
+        lease = pool.lease(shape, crop.dtype.name)
+        canvas = lease.array
+        canvas.fill(0)
+    else:
+        canvas = np.zeros(shape, dtype=crop.dtype)
+    x = min(offset[0] // factor, w)
+    y = min(offset[1] // factor, h)
+    ch = min(crop.shape[0], h - y)
+    cw = min(crop.shape[1], w - x)
+    canvas[y : y + ch, x : x + cw] = crop[:ch, :cw]
+    return canvas, lease
+
+
+def _release_leases(leases: List[BufferLease]) -> None:
+    for lease in leases:
+        lease.release()
+
+
+def _detached(frame: "ReceivedFrame", image: np.ndarray) -> np.ndarray:
+    """``image`` of ``frame``, copied if it lives in a pooled canvas
+    that goes back to the pool once ``frame`` is collected."""
+    if frame.roi is not None and frame._pool is not None:
+        return image.copy()
+    return image
+
+
+class ReceivedFrame:
+    """One delivered frame, decoded on first use.
+
+    Wraps either a compressed :class:`CompletedFrame` (UDP) or an already
+    raw BGR array (shm). :meth:`image` decodes each variant at most once
+    per frame and caches it on the handle, so every consumer of the same
+    frame_id shares one decode. Once the full frame has been decoded the
+    smaller variants are derived from it rather than decoded again.
 
-        self._reassembler = Reassembler(ttl=0.2)
+    ``width`` / ``height`` are always the full capture size, whatever
+    variant was decoded -- use them for anything in camera pixel units
+    (intrinsics, triangulation).
+
+    A face-ROI frame (see :mod:`src.capture.roi`) only carries a crop;
+    its images are full-size with the crop in place and black elsewhere,
+    and :attr:`roi` gives the crop's (x, y) offset. Given a ``pool``,
+    those full-size images are pooled buffers that go back to it once the
+    handle is garbage collected, so keep the handle for as long as you
+    use its pixels (or copy them).
+    """
+
+    __slots__ = (
+        "cam_id",
+        "frame_id",
+        "timestamp",
+        "received_at",
+        "width",
+        "height",
+        "decode_s",
+        "roi",
+        "_jpeg",
+        "_images",
+        "_failed",
+        "_lock",
+        "_pool",
+        "_leases",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        cam_id: int,
+        frame_id: int,
+        timestamp: float,
+        completed: Optional[CompletedFrame] = None,
+        bgr: Optional[np.ndarray] = None,
+        pool: Optional[BufferPool] = None,
+    ) -> None:
+        self.cam_id = cam_id
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        # time.monotonic() when the receiver published it (see _publish).
+        self.received_at: Optional[float] = None
+        self._jpeg = completed.jpeg_bytes if completed is not None else None
+        self.roi: Optional[Tuple[int, int]] = None
+        if completed is not None and completed.flags & FLAG_ROI:
+            self.roi = (completed.roi_x, completed.roi_y)
+        # variant -> decoded pixels
+        self._images: Dict[str, np.ndarray] = {}
+        if bgr is not None:
+            self._images["full"] = bgr
+            self.height, self.width = bgr.shape[:2]
+        elif completed is not None:
+            self.width = completed.width
+            self.height = completed.height
+        else:
+            raise ValueError("ReceivedFrame needs either a CompletedFrame or pixels")
+        self._failed = False
+        self._lock = threading.Lock()
+        self._pool = pool
+        # Leases behind pasted ROI images; released when this is collected.
+        self._leases: List[BufferLease] = []
+        # Seconds spent in cv2.imdecode for this frame, summed over variants.
+        self.decode_s = 0.0
+
+    @classmethod
+    def from_completed(
+        cls, completed: CompletedFrame, pool: Optional[BufferPool] = None
+    ) -> "ReceivedFrame":
+        return cls(
+            cam_id=completed.cam_id,
+            frame_id=completed.frame_id,
+            timestamp=completed.timestamp,
+            completed=completed,
+            pool=pool,
+        )
+
+    @property
+    def decoded(self) -> bool:
+        return bool(self._images) or self._failed
+
+    def image(self, variant: str = "full") -> Optional[np.ndarray]:
+        """Pixels for ``variant`` (one of :data:`FRAME_VARIANTS`): BGR for
+        ``full`` / ``half`` / ``quarter``, single-channel for ``gray``.
+        Returns None if the JPEG is corrupt."""
+        if variant not in _DECODE_FLAGS:
+            raise ValueError(f"unknown frame variant {variant!r}; expected one of {FRAME_VARIANTS}")
+        cached = self._images.get(variant)
+        if cached is not None or self._failed:
+            return cached
+        with self._lock:
+            cached = self._images.get(variant)
+            if cached is not None or self._failed:
+                return cached
+            full = self._images.get("full")
+            if full is not None:
+                img = _derive_variant(full, variant)
+            else:
+                t0 = time.perf_counter()
+                arr = np.frombuffer(self._jpeg, dtype=np.uint8)
+                img = cv2.imdecode(arr, _DECODE_FLAGS[variant])
+                self.decode_s += time.perf_counter() - t0
+                if img is None:
+                    self._failed = True
+                    self._images.clear()
+                    return None
+                if self.roi is not None:
+                    img, lease = _paste_roi(
+                        img, variant, self.width, self.height, self.roi, self._pool
+                    )
+                    if lease is not None:
+                        if not self._leases:
+                            weakref.finalize(self, _release_leases, self._leases)
+                        self._leases.append(lease)
+            self._images[variant] = img
+            return img
+
+    def bgr(self) -> Optional[np.ndarray]:
+        """Full-resolution BGR pixels, or None if the JPEG is corrupt."""
+        return self.image("full")
+
+
+class BaseFrameReceiver:
+    """Short per-cam_id frame history plus the blocking getters modes use.
+
+    Single-camera getters only ever look at the newest frame; the history
+    lets :meth:`get_latest_frame_pair` match stereo frames by timestamp
+    when the two cameras drift in phase.
+
+    Subclasses implement :meth:`_run` (the background thread body) and call
+    :meth:`_publish` for every new frame.
+    """
+
+    _thread_name = "frame-receiver"
+
+    def __init__(self, history_len: int = DEFAULT_HISTORY_LEN) -> None:
+        if history_len < 1:
+            raise ValueError(f"history_len must be >= 1, got {history_len}")
+        self._history_len = history_len
         self._lock = threading.Lock()
         self._cond = threading.Condition(self._lock)
-        # cam_id -> (bgr, timestamp)
-        self._latest: Dict[int, Tuple[np.ndarray, float]] = {}
+        # cam_id -> recent frames, oldest first (possibly not yet decoded)
+        self._history: Dict[int, Deque[ReceivedFrame]] = {}
+        self._pair_stats = PairSkewStats()
         # cam_id -> wall-clock time of last received complete frame (diagnostics)
         self._last_seen: Dict[int, float] = {}
+        # cam_id -> newest landmark record from a --landmarks capture node
+        self._landmarks: Dict[int, LandmarkFrame] = {}
+        # cam_id -> buffers for the consumers' per-frame conversions
+        self._pools: Dict[int, BufferPool] = {}
+
+        # cam_id -> packet / frame / drop / decode / latency counts; the
+        # UDP reassembler writes into the same objects.
+        self._recv_counters: Dict[int, ReceiveCounters] = {}
 
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
-    @property
-    def actual_port(self) -> int:
-        return self._actual_port
-
     def start(self) -> None:
         if self._thread is not None:
             return
         self._thread = threading.Thread(
-            target=self._run, daemon=True, name="frame-receiver"
+            target=self._run, daemon=True, name=self._thread_name
         )
         self._thread.start()
 
     def stop(self) -> None:
         self._stop.set()
-        try:
-            self._sock.close()
-        except OSError:
-            pass
+        self._close_source()
         if self._thread is not None:
             self._thread.join(timeout=2.0)
             self._thread = None
         # Wake any waiters so they don't block past stop.
         with self._cond:
             self._cond.notify_all()
+        self._release_source()
+
+    def _close_source(self) -> None:
+        """Unblock the background thread. Called before joining it."""
+
+    def _release_source(self) -> None:
+        """Free transport resources. Called after the thread has exited."""
 
     def _run(self) -> None:
-        while not self._stop.is_set():
-            try:
-                packet, _addr = self._sock.recvfrom(_PACKET_RECV_SIZE)
-            except socket.timeout:
-                # Periodic prune of expired partials.
-                self._reassembler.prune()
-                continue
-            except OSError:
-                # Socket closed during stop().
-                break
+        raise NotImplementedError
 
-            now = time.monotonic()
-            completed = self._reassembler.feed(packet, now=now)
-            if completed is None:
-                continue
+    def _publish_completed(self, completed: CompletedFrame, now: float) -> None:
+        """Publish a reassembled frame: a landmark record or an image."""
+        if not completed.flags & FLAG_LANDMARKS:
+            pool = self.buffer_pool(completed.cam_id) if completed.flags & FLAG_ROI else None
+            self._publish(ReceivedFrame.from_completed(completed, pool), now)
+            return
+        try:
+            record = decode_record(completed.jpeg_bytes)
+        except ValueError:
+            with self._lock:
+                self._counters(completed.cam_id).rejected += 1
+            return
+        landmarks = LandmarkFrame(
+            cam_id=completed.cam_id,
+            frame_id=completed.frame_id,
+            timestamp=completed.timestamp,
+            width=completed.width,
+            height=completed.height,
+            record=record,
+            received_at=now,
+        )
+        with self._cond:
+            self._count_delivery(self._counters(completed.cam_id), completed.timestamp, now)
+            self._landmarks[completed.cam_id] = landmarks
+            self._last_seen[completed.cam_id] = now
+            self._cond.notify_all()
 
-            arr = np.frombuffer(completed.jpeg_bytes, dtype=np.uint8)
-            frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            if frame is None:
-                continue
+    def _counters(self, cam_id: int) -> ReceiveCounters:
+        counters = self._recv_counters.get(cam_id)
+        if counters is None:
+            counters = self._recv_counters[cam_id] = ReceiveCounters()
+        return counters
 
-            with self._cond:
-                self._latest[completed.cam_id] = (frame, completed.timestamp)
-                self._last_seen[completed.cam_id] = now
-                self._cond.notify_all()
+    @staticmethod
+    def _count_delivery(counters: ReceiveCounters, timestamp: float, now: float) -> None:
+        counters.frames += 1
+        # Both timestamps are time.monotonic() on the same host.
+        latency = max(0.0, now - timestamp)
+        counters.latency_s += latency
+        if latency > counters.latency_max_s:
+            counters.latency_max_s = latency
 
-    def get_latest_bgr(
+    def _publish(self, frame: ReceivedFrame, now: float) -> None:
+        with self._cond:
+            counters = self._counters(frame.cam_id)
+            history = self._history.get(frame.cam_id)
+            if history is None:
+                history = self._history[frame.cam_id] = deque(maxlen=self._history_len)
+            if len(history) == history.maxlen:
+                evicted = history[0]
+                if not evicted.decoded:
+                    counters.never_decoded += 1
+                elif evicted.decode_s > 0.0:
+                    counters.decoded += 1
+                    counters.decode_s += evicted.decode_s
+            self._count_delivery(counters, frame.timestamp, now)
+            frame.received_at = now
+            history.append(frame)
+            self._last_seen[frame.cam_id] = now
+            self._cond.notify_all()
+
+    def decode_stats(self) -> Dict[str, int]:
+        """Frames delivered by the transport vs. frames that aged out of the
+        history before any consumer asked for their pixels."""
+        with self._lock:
+            return {
+                "frames_received": sum(c.frames for c in self._recv_counters.values()),
+                "frames_never_decoded": sum(c.never_decoded for c in self._recv_counters.values()),
+            }
+
+    def receive_counters(self, cam_id: int) -> Optional[ReceiveCounters]:
+        """Copy of the cumulative receive counters for ``cam_id`` (None
+        before its first packet). ``latency_max_s`` restarts on each call,
+        so it is the worst latency since the previous one."""
+        with self._lock:
+            counters = self._recv_counters.get(cam_id)
+            if counters is None:
+                return None
+            snapshot = counters.copy()
+            counters.latency_max_s = 0.0
+            return snapshot
+
+    def buffer_pool(self, cam_id: int) -> BufferPool:
+        """The pool for frame-sized buffers derived from ``cam_id``."""
+        with self._lock:
+            pool = self._pools.get(cam_id)
+            if pool is None:
+                pool = self._pools[cam_id] = BufferPool()
+            return pool
+
+    def lease_rgb(self, cam_id: int, bgr: np.ndarray) -> BufferLease:
+        """``bgr`` converted to RGB in a buffer from ``cam_id``'s pool.
+        Release the lease (or use it as a context manager) once the
+        landmarker has run."""
+        lease = self.buffer_pool(cam_id).lease(bgr.shape, bgr.dtype.name)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=lease.array)
+        return lease
+
+    def pool_stats(self) -> Dict[int, Dict[str, int]]:
+        """cam_id -> :meth:`BufferPool.stats`; misses that keep growing
+        after start-up mean buffers are not being released."""
+        with self._lock:
+            pools = dict(self._pools)
+        return {cam_id: pool.stats() for cam_id, pool in pools.items()}
+
+    def get_latest_frame(
         self,
         cam_id: int,
         since: float = 0.0,
         timeout: float = 0.5,
-    ) -> Optional[Tuple[np.ndarray, float]]:
-        """Return the latest decoded BGR frame for ``cam_id`` whose capture
-        timestamp is strictly greater than ``since``. Blocks up to
-        ``timeout`` seconds for a fresh frame; returns ``None`` if it
-        doesn't arrive.
+    ) -> Optional[ReceivedFrame]:
+        """Return the newest frame handle for ``cam_id`` whose capture
+        timestamp is strictly greater than ``since``, without decoding it.
+        Blocks up to ``timeout`` seconds for a fresh frame; returns
+        ``None`` if it doesn't arrive.
         """
         deadline = time.monotonic() + max(0.0, timeout)
         with self._cond:
             while True:
                 if self._stop.is_set():
                     return None
-                latest = self._latest.get(cam_id)
-                if latest is not None and latest[1] > since:
+                history = self._history.get(cam_id)
+                if history and history[-1].timestamp > since:
+                    return history[-1]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(timeout=remaining)
+
+    def get_latest_landmarks(
+        self,
+        cam_id: int,
+        since: float = 0.0,
+        timeout: float = 0.5,
+    ) -> Optional[LandmarkFrame]:
+        """Like :meth:`get_latest_frame`, for the landmark records of a
+        capture node running with ``--landmarks``."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while True:
+                if self._stop.is_set():
+                    return None
+                latest = self._landmarks.get(cam_id)
+                if latest is not None and latest.timestamp > since:
                     return latest
                 remaining = deadline - time.monotonic()
                 if remaining <= 0:
                     return None
                 self._cond.wait(timeout=remaining)
 
+    def get_latest_bgr(
+        self,
+        cam_id: int,
+        since: float = 0.0,
+        timeout: float = 0.5,
+        variant: str = "full",
+    ) -> Optional[Tuple[np.ndarray, float]]:
+        """Return the latest decoded frame for ``cam_id`` whose capture
+        timestamp is strictly greater than ``since``. Blocks up to
+        ``timeout`` seconds for a fresh frame; returns ``None`` if it
+        doesn't arrive. Decoding runs in the caller's thread; ``variant``
+        picks the decode (see :data:`FRAME_VARIANTS`).
+
+        The array is the caller's to keep. ROI frames are pasted into
+        pooled canvases that are recycled once their handle is dropped, so
+        those come back as copies; hold the :meth:`get_latest_frame`
+        handle instead to avoid that.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            frame = self.get_latest_frame(
+                cam_id, since=since, timeout=deadline - time.monotonic()
+            )
+            if frame is None:
+                return None
+            image = frame.image(variant)
+            if image is not None:
+                return _detached(frame, image), frame.timestamp
+            # Corrupt JPEG: skip it and wait for the next one.
+            since = frame.timestamp
+
     def get_latest_pair(
         self,
         cam_id_left: int = 1,
@@ -133,32 +531,334 @@ class FrameReceiver:
         max_skew: float = 0.05,
         since_left: float = 0.0,
         since_right: float = 0.0,
+        variant: str = "full",
     ) -> Optional[Tuple[np.ndarray, np.ndarray, float, float]]:
-        """Return the most recent (left, right) frame pair whose timestamps
-        are within ``max_skew`` seconds of each other and both newer than
-        the respective ``since_*`` watermarks. Blocks up to ``timeout`` for
-        a satisfying pair to arrive; returns ``None`` on timeout.
+        """Return the best-matched (left, right) frame pair whose
+        timestamps are within ``max_skew`` seconds of each other and both
+        newer than the respective ``since_*`` watermarks, searching each
+        camera's recent history (see :func:`select_pair`). Blocks up to
+        ``timeout`` for a satisfying pair to arrive; returns ``None`` on
+        timeout. ROI frames come back as copies, as in
+        :meth:`get_latest_bgr`.
         """
         deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            pair = self.get_latest_frame_pair(
+                cam_id_left,
+                cam_id_right,
+                timeout=deadline - time.monotonic(),
+                max_skew=max_skew,
+                since_left=since_left,
+                since_right=since_right,
+            )
+            if pair is None:
+                return None
+            left, right = pair
+            left_img = left.image(variant)
+            right_img = right.image(variant)
+            if left_img is not None and right_img is not None:
+                return (
+                    _detached(left, left_img),
+                    _detached(right, right_img),
+                    left.timestamp,
+                    right.timestamp,
+                )
+            # Corrupt JPEG on either side: move past it and keep waiting.
+            if left_img is None:
+                since_left = left.timestamp
+            if right_img is None:
+                since_right = right.timestamp
+
+    def get_latest_frame_pair(
+        self,
+        cam_id_left: int = 1,
+        cam_id_right: int = 2,
+        timeout: float = 0.5,
+        max_skew: float = 0.05,
+        since_left: float = 0.0,
+        since_right: float = 0.0,
+    ) -> Optional[Tuple[ReceivedFrame, ReceivedFrame]]:
+        """Like :meth:`get_latest_pair` but returns the undecoded handles,
+        so each stage can pick the variant it needs."""
+        deadline = time.monotonic() + max(0.0, timeout)
         with self._cond:
             while True:
                 if self._stop.is_set():
                     return None
-                left = self._latest.get(cam_id_left)
-                right = self._latest.get(cam_id_right)
-                if (
-                    left is not None
-                    and right is not None
-                    and left[1] > since_left
-                    and right[1] > since_right
-                    and abs(left[1] - right[1]) <= max_skew
-                ):
-                    return left[0], right[0], left[1], right[1]
+                left_hist = self._history.get(cam_id_left)
+                right_hist = self._history.get(cam_id_right)
+                if left_hist and right_hist:
+                    picked = select_pair(
+                        [f.timestamp for f in left_hist],
+                        [f.timestamp for f in right_hist],
+                        since_left,
+                        since_right,
+                        max_skew,
+                    )
+                    if picked is not None:
+                        i, j = picked
+                        left, right = left_hist[i], right_hist[j]
+                        self._pair_stats.record(
+                            left.timestamp - right.timestamp,
+                            from_history=(i != len(left_hist) - 1 or j != len(right_hist) - 1),
+                        )
+                        return left, right
                 remaining = deadline - time.monotonic()
                 if remaining <= 0:
                     return None
                 self._cond.wait(timeout=remaining)
 
+    def pair_stats(self) -> Dict[str, float]:
+        """Skew statistics over the stereo pairs handed out so far."""
+        with self._lock:
+            return self._pair_stats.snapshot()
+
     def last_seen(self, cam_id: int) -> Optional[float]:
         with self._lock:
             return self._last_seen.get(cam_id)
+
+    def clock_status(self) -> Dict[int, Dict[str, float]]:
+        """Clock-offset estimates for cameras on other hosts; see
+        :meth:`FrameReceiver.clock_status`. Other transports are always
+        same-host."""
+        return {}
+
+
+class FrameReceiver(BaseFrameReceiver):
+    """UDP receiver: reassembles JPEG fragments into :class:`ReceivedFrame`
+    handles that decode on demand."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        history_len: int = DEFAULT_HISTORY_LEN,
+    ) -> None:
+        super().__init__(history_len=history_len)
+        self._host = host
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RCV_BUF_BYTES)
+        except OSError:
+            pass
+        self._sock.bind((host, port))
+        # Non-blocking: _run drains every queued datagram per wakeup.
+        self._sock.setblocking(False)
+        self._actual_port = self._sock.getsockname()[1]
+        self._reassembler = Reassembler(ttl=0.2, counters=self._recv_counters)
+        self._recorder: Optional[FrameRecorder] = None
+        # Only touched by the receiver thread, except status reads.
+        self._clock = ClockSync()
+        self._clock_lock = threading.Lock()
+        self._cam_sources: Dict[int, Tuple[str, int]] = {}
+        self._feedback = FeedbackReporter()
+
+    @property
+    def actual_port(self) -> int:
+        return self._actual_port
+
+    def set_recorder(self, recorder: Optional[FrameRecorder]) -> None:
+        """Append every completed frame to ``recorder`` (None: stop). The
+        caller closes the recorder."""
+        self._recorder = recorder
+
+    def clock_status(self) -> Dict[int, Dict[str, float]]:
+        """cam_id -> clock offset estimate (ms), its uncertainty (ms),
+        drift (ppm), best round trip and sample count, for cameras whose
+        capture process runs on another host. Empty when all are local."""
+        with self._clock_lock:
+            by_source = self._clock.status()
+            sources = dict(self._cam_sources)
+        return {
+            cam_id: by_source[addr] for cam_id, addr in sources.items() if addr in by_source
+        }
+
+    def _close_source(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def _send_pings(self, now: float) -> None:
+        with self._clock_lock:
+            due = self._clock.due_pings(now)
+        for addr, packet in due:
+            try:
+                self._sock.sendto(packet, addr)
+            except OSError:
+                # A lost ping is just a missing sample.
+                pass
+
+    def _send_feedback(self, now: float) -> None:
+        if self._feedback.next_at() is None or now < self._feedback.next_at():
+            return
+        # Frame, latency and decode counts change under the lock (decode
+        # times are accumulated by consumer threads on the frames), so
+        # report from a snapshot taken under it.
+        with self._lock:
+            counters = {cam_id: c.copy() for cam_id, c in self._recv_counters.items()}
+        reports = self._feedback.due(now, counters)
+        if not reports:
+            return
+        with self._clock_lock:
+            sources = dict(self._cam_sources)
+        for feedback in reports:
+            addr = sources.get(feedback.cam_id)
+            if addr is None:
+                continue
+            try:
+                self._sock.sendto(pack_feedback(feedback), addr)
+            except OSError:
+                pass
+
+    def _wait_s(self, now: float) -> float:
+        wait = _UDP_WAIT_S
+        for at in (self._clock.next_ping_at(), self._feedback.next_at()):
+            if at is not None:
+                wait = min(wait, max(0.0, at - now))
+        return wait
+
+    def _run(self) -> None:
+        # One receive buffer for the thread's lifetime; the reassembler
+        # copies each payload into its frame buffer before the next recv.
+        buf = bytearray(_PACKET_RECV_SIZE)
+        view = memoryview(buf)
+        sock = self._sock
+        feed = self._reassembler.feed
+        clock = self._clock
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([sock], [], [], self._wait_s(time.monotonic()))
+            except (OSError, ValueError):
+                # Socket closed during stop().
+                break
+            self._send_pings(time.monotonic())
+            self._send_feedback(time.monotonic())
+            if not readable:
+                # Periodic prune of expired partials.
+                self._reassembler.prune()
+                continue
+            # A frame is a burst of datagrams: drain them all before
+            # waiting again instead of paying a poll per packet.
+            while True:
+                try:
+                    n, addr = sock.recvfrom_into(buf)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    return
+                now = time.monotonic()
+                if n == SYNC_SIZE and buf.startswith(SYNC_MAGIC):
+                    with self._clock_lock:
+                        clock.handle(view[:n], addr, now)
+                    continue
+                completed = feed(view[:n], now=now)
+                if completed is not None:
+                    with self._clock_lock:
+                        timestamp = clock.to_local(addr, completed.timestamp, now)
+                        self._cam_sources[completed.cam_id] = addr
+                    self._feedback.frame_completed(completed.cam_id, completed.frame_id, now)
+                    if timestamp != completed.timestamp:
+                        completed = completed._replace(timestamp=timestamp)
+                    recorder = self._recorder
+                    if recorder is not None:
+                        recorder.write(completed)
+                    self._publish_completed(completed, now)
+
+
+class ShmFrameReceiver(BaseFrameReceiver):
+    """Shared-memory receiver for ``--transport shm``.
+
+    Attaches to the per-camera rings the capture process created and
+    publishes a copy of each new frame, taken with
+    :meth:`ShmFrameRing.read_latest` in copy mode so a frame the capture
+    process overwrote mid-copy is dropped rather than handed on torn.
+    Consumers may hold frames for as long as they like -- a raw copy is
+    still far cheaper than the JPEG round trip. Construct only after the
+    capture process has signalled ``READY=1``, since that is when the
+    rings exist.
+    """
+
+    _thread_name = "shm-frame-receiver"
+
+    def __init__(
+        self,
+        prefix: str,
+        cam_ids: Iterable[int],
+        history_len: int = DEFAULT_HISTORY_LEN,
+    ) -> None:
+        rings: Dict[int, ShmFrameRing] = {}
+        try:
+            for cam_id in cam_ids:
+                rings[cam_id] = ShmFrameRing.attach(ring_name(prefix, cam_id))
+        except (OSError, ValueError):
+            for ring in rings.values():
+                ring.close()
+            raise
+        super().__init__(history_len=history_len)
+        self._rings = rings
+        self._seen_seq: Dict[int, int] = {cam_id: 0 for cam_id in self._rings}
+
+    def _release_source(self) -> None:
+        for ring in self._rings.values():
+            ring.close()
+        self._rings = {}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            for cam_id, ring in self._rings.items():
+                if ring.latest_seq == self._seen_seq[cam_id]:
+                    continue
+                got = ring.read_latest(copy=True)
+                if got is None:
+                    continue
+                self._seen_seq[cam_id] = got.seq
+                frame = ReceivedFrame(
+                    cam_id=cam_id,
+                    frame_id=got.frame_id,
+                    timestamp=got.timestamp,
+                    bgr=got.image,
+                )
+                self._publish(frame, time.monotonic())
+            self._stop.wait(_SHM_POLL_INTERVAL_S)
+
+
+class ReplayFrameReceiver(BaseFrameReceiver):
+    """Publishes the frames of a :class:`Recording` as if they had just
+    arrived, paced per :func:`src.capture.recording.replay_schedule`.
+
+    Timestamps are moved onto this process's clock with their recorded
+    spacing intact, so watermarks, stereo pairing and the receive counters
+    behave as they do live. :attr:`finished` is set after the last frame;
+    the receiver keeps serving its history until stopped.
+    """
+
+    _thread_name = "replay-frame-receiver"
+
+    def __init__(
+        self,
+        recording: Recording,
+        pacing: str = "realtime",
+        fps: float = 0.0,
+        history_len: int = DEFAULT_HISTORY_LEN,
+    ) -> None:
+        super().__init__(history_len=history_len)
+        self._recording = recording
+        self._schedule = replay_schedule(recording, pacing, fps)
+        self.finished = threading.Event()
+
+    def _release_source(self) -> None:
+        self._recording.close()
+
+    def _run(self) -> None:
+        start = time.monotonic()
+        for due, offset, completed in self._schedule:
+            if due is not None:
+                delay = start + due - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            if self._stop.is_set():
+                return
+            now = time.monotonic()
+            self._publish_completed(completed._replace(timestamp=start + offset), now)
+        self.finished.set()
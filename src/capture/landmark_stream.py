@@ -0,0 +1,221 @@
+"""Compact face-landmark records for landmark-only streaming.
+
+A capture node started with ``--landmarks`` runs the face landmarker next
+to the camera and sends what it found instead of the image: one record
+per frame with the normalized landmarks, the blendshape scores and the
+facial transformation matrix, about 6 KB against tens of KB for a JPEG.
+Records travel as ordinary frames of the UDP protocol with
+``FLAG_LANDMARKS`` set (see :mod:`src.capture.protocol`), so
+fragmentation, FEC, clock sync and receiver feedback work unchanged; an
+occasional small JPEG thumbnail on the same cam_id keeps the visualizer
+fed.
+
+Record layout (little-endian)::
+
+    version u8, flags u8, n_landmarks u16, n_blendshapes u16, <reserved> u16
+    n_landmarks  x (x f32, y f32, z f32)
+    16 x f32 row-major facial transformation matrix   -- if FLAG_MATRIX
+    n_blendshapes x (name index u8, score f32)        -- if FLAG_BLENDSHAPES
+
+A record without ``FLAG_FACE`` means the landmarker saw no face in that
+frame. Blendshape names are indices into :data:`BLENDSHAPE_NAMES`
+(MediaPipe's 52 categories); names outside it are not sent.
+
+:class:`Landmark` and :class:`Category` mirror the attributes of
+MediaPipe's own result objects that the face pipeline reads, so a
+decoded record can stand in for a landmarker result (see
+:class:`src.face_tracking.providers.streamed_landmarks.StreamedLandmarksProvider`).
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+
+RECORD_VERSION = 1
+
+FLAG_FACE = 0x01
+FLAG_MATRIX = 0x02
+FLAG_BLENDSHAPES = 0x04
+
+# version, flags, n_landmarks, n_blendshapes, <reserved>
+RECORD_HEADER_FMT = "<BBHHxx"
+RECORD_HEADER_SIZE = struct.calcsize(RECORD_HEADER_FMT)
+_RECORD_HEADER = struct.Struct(RECORD_HEADER_FMT)
+_MATRIX = struct.Struct("<16f")
+_CATEGORY = struct.Struct("<Bf")
+
+# MediaPipe FaceLandmarker blendshape categories, in its output order.
+BLENDSHAPE_NAMES = (
+    "_neutral",
+    "browDownLeft",
+    "browDownRight",
+    "browInnerUp",
+    "browOuterUpLeft",
+    "browOuterUpRight",
+    "cheekPuff",
+    "cheekSquintLeft",
+    "cheekSquintRight",
+    "eyeBlinkLeft",
+    "eyeBlinkRight",
+    "eyeLookDownLeft",
+    "eyeLookDownRight",
+    "eyeLookInLeft",
+    "eyeLookInRight",
+    "eyeLookOutLeft",
+    "eyeLookOutRight",
+    "eyeLookUpLeft",
+    "eyeLookUpRight",
+    "eyeSquintLeft",
+    "eyeSquintRight",
+    "eyeWideLeft",
+    "eyeWideRight",
+    "jawForward",
+    "jawLeft",
+    "jawOpen",
+    "jawRight",
+    "mouthClose",
+    "mouthDimpleLeft",
+    "mouthDimpleRight",
+    "mouthFrownLeft",
+    "mouthFrownRight",
+    "mouthFunnel",
+    "mouthLeft",
+    "mouthLowerDownLeft",
+    "mouthLowerDownRight",
+    "mouthPressLeft",
+    "mouthPressRight",
+    "mouthPucker",
+    "mouthRight",
+    "mouthRollLower",
+    "mouthRollUpper",
+    "mouthShrugLower",
+    "mouthShrugUpper",
+    "mouthSmileLeft",
+    "mouthSmileRight",
+    "mouthStretchLeft",
+    "mouthStretchRight",
+    "mouthUpperUpLeft",
+    "mouthUpperUpRight",
+    "noseSneerLeft",
+    "noseSneerRight",
+)
+_BLENDSHAPE_INDEX = {name: i for i, name in enumerate(BLENDSHAPE_NAMES)}
+
+
+class Landmark(NamedTuple):
+    """A normalized landmark (``x`` / ``y`` in [0, 1] of the frame)."""
+
+    x: float
+    y: float
+    z: float
+
+
+class Category(NamedTuple):
+    """A blendshape score, named like MediaPipe's ``Category``."""
+
+    index: int
+    category_name: str
+    score: float
+
+
+class LandmarkRecord(NamedTuple):
+    # None when no face was found.
+    landmarks: Optional[List[Landmark]]
+    facial_transformation_matrix: Optional[List[List[float]]] = None
+    blendshapes: Optional[List[Category]] = None
+
+
+class LandmarkFrame(NamedTuple):
+    """A received record with its frame metadata (see
+    :meth:`src.capture.frame_receiver.BaseFrameReceiver.get_latest_landmarks`)."""
+
+    cam_id: int
+    frame_id: int
+    # Capture time, on the receiver's clock.
+    timestamp: float
+    # Size of the frame the landmarker ran on.
+    width: int
+    height: int
+    record: LandmarkRecord
+    received_at: float
+
+
+def encode_record(
+    landmarks: Optional[Iterable],
+    facial_transformation_matrix: Optional[Sequence[Sequence[float]]] = None,
+    blendshapes: Optional[Iterable] = None,
+) -> bytes:
+    """Pack one landmarker result. ``landmarks`` are objects with ``x`` /
+    ``y`` / ``z`` (None: no face), ``blendshapes`` objects with
+    ``category_name`` / ``score``."""
+    if landmarks is None:
+        return _RECORD_HEADER.pack(RECORD_VERSION, 0, 0, 0)
+    flat: List[float] = []
+    for lm in landmarks:
+        flat += (lm.x, lm.y, lm.z)
+    n = len(flat) // 3
+    if n > 0xFFFF:
+        raise ValueError(f"too many landmarks: {n}")
+    flags = FLAG_FACE
+    parts = [b"", struct.pack(f"<{len(flat)}f", *flat)]
+    if facial_transformation_matrix is not None:
+        values = [float(v) for row in facial_transformation_matrix for v in row]
+        if len(values) != 16:
+            raise ValueError(f"facial transformation matrix must be 4x4, got {len(values)} values")
+        flags |= FLAG_MATRIX
+        parts.append(_MATRIX.pack(*values))
+    n_blendshapes = 0
+    if blendshapes is not None:
+        flags |= FLAG_BLENDSHAPES
+        for category in blendshapes:
+            index = _BLENDSHAPE_INDEX.get(getattr(category, "category_name", None))
+            if index is None:
+                continue
+            parts.append(_CATEGORY.pack(index, float(category.score)))
+            n_blendshapes += 1
+    parts[0] = _RECORD_HEADER.pack(RECORD_VERSION, flags, n, n_blendshapes)
+    return b"".join(parts)
+
+
+def decode_record(payload) -> LandmarkRecord:
+    """Unpack a record. Raises ValueError if it is malformed or from an
+    unknown version."""
+    if len(payload) < RECORD_HEADER_SIZE:
+        raise ValueError(f"landmark record too short: {len(payload)} bytes")
+    version, flags, n, n_blendshapes = _RECORD_HEADER.unpack_from(payload)
+    if version != RECORD_VERSION:
+        raise ValueError(f"unsupported landmark record version {version}")
+    size = (
+        RECORD_HEADER_SIZE
+        + 12 * n
+        + (_MATRIX.size if flags & FLAG_MATRIX else 0)
+        + _CATEGORY.size * n_blendshapes
+    )
+    if len(payload) != size:
+        raise ValueError(f"landmark record is {len(payload)} bytes, expected {size}")
+    if not flags & FLAG_FACE:
+        return LandmarkRecord(None)
+    offset = RECORD_HEADER_SIZE
+    flat = struct.unpack_from(f"<{3 * n}f", payload, offset)
+    offset += 12 * n
+    landmarks = [Landmark(*flat[i : i + 3]) for i in range(0, len(flat), 3)]
+    matrix = None
+    if flags & FLAG_MATRIX:
+        values = _MATRIX.unpack_from(payload, offset)
+        offset += _MATRIX.size
+        matrix = [list(values[r * 4 : r * 4 + 4]) for r in range(4)]
+    categories = None
+    if flags & FLAG_BLENDSHAPES:
+        categories = []
+        for _ in range(n_blendshapes):
+            index, score = _CATEGORY.unpack_from(payload, offset)
+            offset += _CATEGORY.size
+            if index >= len(BLENDSHAPE_NAMES):
+                raise ValueError(f"unknown blendshape index {index}")
+            categories.append(Category(index, BLENDSHAPE_NAMES[index], score))
+    return LandmarkRecord(landmarks, matrix, categories)
@@ -0,0 +1,229 @@
+"""Capture timestamps and end-to-end latency histograms.
+
+Every frame carries the ``time.monotonic()`` at which it was captured
+(see :func:`pick_capture_timestamp`). Modes measure, against that stamp,
+how long each stage of the pipeline took to finish with the frame:
+
+- ``receive``: the receiver published it;
+- ``decode``: the mode had its pixels;
+- ``inference``: face / gaze analysis returned;
+- ``cursor``: the cursor update (``set_pos``) driven by it returned.
+
+Each stage is cumulative (time since capture, not time spent in the
+stage), so the ``cursor`` histogram is the end-to-end latency and the gap
+between two neighbouring stages is the cost of the later one.
+:func:`mode_latency` keeps one :class:`LatencyTracker` per mode id for
+the life of the process, so histograms survive mode restarts and every
+latency optimisation can be judged against the same numbers.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+STAGES = ("receive", "decode", "inference", "cursor")
+
+# Driver timestamps older than this (relative to when grab() returned) are
+# taken to be on some other clock rather than that stale.
+DEFAULT_MAX_DRIVER_AGE_S = 1.0
+
+DEFAULT_REPORT_INTERVAL_S = 30.0
+
+# Bucket upper bounds in seconds: 0.5 ms to ~2 s, ~19% apart.
+_BUCKETS_PER_OCTAVE = 4
+_FIRST_BOUND_S = 0.0005
+_BUCKET_COUNT = 48
+
+
+def pick_capture_timestamp(
+    driver_s: Optional[float],
+    grabbed_at: float,
+    max_age: float = DEFAULT_MAX_DRIVER_AGE_S,
+) -> Tuple[float, bool]:
+    """(timestamp, from_driver) for a frame whose ``grab()`` returned at
+    ``grabbed_at`` (``time.monotonic()``).
+
+    ``driver_s`` is the backend's own buffer timestamp in seconds
+    (``CAP_PROP_POS_MSEC / 1000``). V4L2 stamps buffers on
+    ``CLOCK_MONOTONIC`` -- the clock behind ``time.monotonic()`` on Linux
+    -- at the end of exposure, which also accounts for frames that sat in
+    the driver's queue. Other backends report a stream position or
+    nothing, so the driver value is only used when it lands in the
+    ``max_age`` window before ``grabbed_at``; otherwise the frame is
+    stamped with ``grabbed_at`` itself, which is when the frame left the
+    driver and before any decode or encode.
+    """
+    if driver_s is not None and driver_s > 0.0:
+        if grabbed_at - max_age <= driver_s <= grabbed_at:
+            return driver_s, True
+    return grabbed_at, False
+
+
+def _bucket_bounds() -> List[float]:
+    factor = 2.0 ** (1.0 / _BUCKETS_PER_OCTAVE)
+    return [_FIRST_BOUND_S * factor**i for i in range(_BUCKET_COUNT)]
+
+
+_BOUNDS = _bucket_bounds()
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory.
+
+    Percentiles are reported as the upper bound of the bucket they fall
+    in, so they are accurate to one bucket (~19%); count, mean and max
+    are exact.
+    """
+
+    __slots__ = ("counts", "count", "total_s", "max_s")
+
+    def __init__(self) -> None:
+        # One more bucket than bounds for everything slower than the last.
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def add(self, latency_s: float) -> None:
+        latency_s = max(0.0, latency_s)
+        self.counts[bisect.bisect_left(_BOUNDS, latency_s)] += 1
+        self.count += 1
+        self.total_s += latency_s
+        if latency_s > self.max_s:
+            self.max_s = latency_s
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile ``q`` (0..1); the
+        exact max for the overflow bucket; 0 when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _BOUNDS[i] if i < len(_BOUNDS) else self.max_s
+        return self.max_s
+
+    def summary(self) -> Dict[str, float]:
+        """count, mean / p50 / p95 / p99 / max in milliseconds."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": 1000.0 * self.total_s / self.count,
+            "p50_ms": 1000.0 * min(self.percentile(0.5), self.max_s),
+            "p95_ms": 1000.0 * min(self.percentile(0.95), self.max_s),
+            "p99_ms": 1000.0 * min(self.percentile(0.99), self.max_s),
+            "max_ms": 1000.0 * self.max_s,
+        }
+
+
+class LatencyTracker:
+    """Per-stage capture-to-stage latency histograms for one mode.
+
+    The mode loop calls :meth:`record` as a frame clears each stage; the
+    tracker prints a one-line summary to stderr every ``report_interval``
+    seconds (0 disables). Thread-safe; the UI may read :meth:`snapshot`
+    while the loop records.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        stages: Sequence[str] = STAGES,
+        report_interval: float = DEFAULT_REPORT_INTERVAL_S,
+    ) -> None:
+        self.name = name
+        self.stages = tuple(stages)
+        self.report_interval = float(report_interval)
+        self._lock = threading.Lock()
+        self._histograms = {stage: LatencyHistogram() for stage in self.stages}
+        self._next_report: Optional[float] = None
+
+    def record(
+        self,
+        stage: str,
+        capture_ts: Optional[float],
+        now: Optional[float] = None,
+    ) -> None:
+        """Record that the frame captured at ``capture_ts`` has cleared
+        ``stage`` at ``now`` (default: ``time.monotonic()``). Frames
+        without a capture stamp are ignored."""
+        if capture_ts is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                raise ValueError(f"unknown latency stage {stage!r}; expected one of {self.stages}")
+            histogram.add(now - capture_ts)
+            report = self._due_report(now)
+        if report is not None:
+            sys.stderr.write(report + "\n")
+            sys.stderr.flush()
+
+    def _due_report(self, now: float) -> Optional[str]:
+        if self.report_interval <= 0:
+            return None
+        if self._next_report is None:
+            self._next_report = now + self.report_interval
+            return None
+        if now < self._next_report:
+            return None
+        self._next_report = now + self.report_interval
+        return self._format_locked()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """stage -> :meth:`LatencyHistogram.summary`."""
+        with self._lock:
+            return {stage: h.summary() for stage, h in self._histograms.items()}
+
+    def format(self) -> str:
+        with self._lock:
+            return self._format_locked()
+
+    def _format_locked(self) -> str:
+        parts = []
+        for stage, h in self._histograms.items():
+            if h.count == 0:
+                continue
+            s = h.summary()
+            parts.append(f"{stage} p50={s['p50_ms']:.1f} p95={s['p95_ms']:.1f} max={s['max_ms']:.1f}")
+        body = "; ".join(parts) if parts else "no frames"
+        return f"[latency] {self.name}: {body} (ms since capture)"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {stage: LatencyHistogram() for stage in self.stages}
+            self._next_report = None
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def mode_latency(mode_id: str) -> LatencyTracker:
+    """The process-wide :class:`LatencyTracker` for ``mode_id``."""
+    with _trackers_lock:
+        tracker = _trackers.get(mode_id)
+        if tracker is None:
+            tracker = _trackers[mode_id] = LatencyTracker(mode_id)
+        return tracker
+
+
+def all_mode_latencies() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """mode id -> :meth:`LatencyTracker.snapshot`, for every mode that has
+    recorded anything this process."""
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+    return {tracker.name: tracker.snapshot() for tracker in trackers}
@@ -0,0 +1,163 @@
+"""Helpers for forwarding a camera's native MJPEG bitstream untouched.
+
+UVC webcams deliver each MJPEG frame as a complete baseline JPEG, except
+that many of them follow the AVI1 convention and omit the Huffman tables
+(DHT), relying on the decoder to assume the standard tables from the JPEG
+spec (Annex K.3). Not every decoder does, so before forwarding a frame we
+insert those tables when they are missing.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+
+_DHT = 0xC4
+_SOS = 0xDA
+# Start-of-frame markers carrying the image size. C4 (DHT), C8 (JPG
+# extension) and CC (DAC) share the range but are not frame headers.
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field.
+_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+
+# (table class << 4 | table id, BITS[1..16], HUFFVAL) from ITU T.81 Annex K.3.
+_STD_TABLES: List[Tuple[int, bytes, bytes]] = [
+    (
+        0x00,
+        bytes([0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0]),
+        bytes(range(12)),
+    ),
+    (
+        0x10,
+        bytes([0, 2, 1, 3, 3, 2, 4, 3, 5, 5, 4, 4, 0, 0, 1, 0x7D]),
+        bytes(
+            [
+                0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12, 0x21, 0x31, 0x41, 0x06,
+                0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
+                0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72,
+                0x82, 0x09, 0x0A, 0x16, 0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28,
+                0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39, 0x3A, 0x43, 0x44, 0x45,
+                0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
+                0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75,
+                0x76, 0x77, 0x78, 0x79, 0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89,
+                0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98, 0x99, 0x9A, 0xA2, 0xA3,
+                0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
+                0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9,
+                0xCA, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2,
+                0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA, 0xF1, 0xF2, 0xF3, 0xF4,
+                0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
+            ]
+        ),
+    ),
+    (
+        0x01,
+        bytes([0, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0]),
+        bytes(range(12)),
+    ),
+    (
+        0x11,
+        bytes([0, 2, 1, 2, 4, 4, 3, 4, 7, 5, 4, 4, 0, 1, 2, 0x77]),
+        bytes(
+            [
+                0x00, 0x01, 0x02, 0x03, 0x11, 0x04, 0x05, 0x21, 0x31, 0x06, 0x12, 0x41,
+                0x51, 0x07, 0x61, 0x71, 0x13, 0x22, 0x32, 0x81, 0x08, 0x14, 0x42, 0x91,
+                0xA1, 0xB1, 0xC1, 0x09, 0x23, 0x33, 0x52, 0xF0, 0x15, 0x62, 0x72, 0xD1,
+                0x0A, 0x16, 0x24, 0x34, 0xE1, 0x25, 0xF1, 0x17, 0x18, 0x19, 0x1A, 0x26,
+                0x27, 0x28, 0x29, 0x2A, 0x35, 0x36, 0x37, 0x38, 0x39, 0x3A, 0x43, 0x44,
+                0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58,
+                0x59, 0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74,
+                0x75, 0x76, 0x77, 0x78, 0x79, 0x7A, 0x82, 0x83, 0x84, 0x85, 0x86, 0x87,
+                0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98, 0x99, 0x9A,
+                0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4,
+                0xB5, 0xB6, 0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7,
+                0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA,
+                0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA, 0xF2, 0xF3, 0xF4,
+                0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
+            ]
+        ),
+    ),
+]
+
+for _tc_th, _bits, _vals in _STD_TABLES:
+    assert len(_bits) == 16 and sum(_bits) == len(_vals), f"bad std table {_tc_th:#x}"
+
+
+def _build_std_dht_segment() -> bytes:
+    body = b"".join(bytes([tc_th]) + bits + vals for tc_th, bits, vals in _STD_TABLES)
+    return b"\xff\xc4" + struct.pack(">H", len(body) + 2) + body
+
+
+STD_DHT_SEGMENT = _build_std_dht_segment()
+
+
+class JpegInfo(NamedTuple):
+    """What :func:`scan_jpeg` learned about a JPEG's header segments."""
+
+    width: int
+    height: int
+    has_dht: bool
+    sos_offset: int
+
+
+def scan_jpeg(data: bytes) -> Optional[JpegInfo]:
+    """Walk the marker segments up to the start of scan. Returns None if
+    ``data`` is not a well-formed JPEG header (missing SOI, truncated
+    segment, no frame header before SOS)."""
+    if len(data) < 4 or data[:2] != SOI:
+        return None
+    pos = 2
+    n = len(data)
+    width = height = 0
+    has_sof = False
+    has_dht = False
+    while pos + 4 <= n:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker.
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        (seg_len,) = struct.unpack_from(">H", data, pos + 2)
+        if seg_len < 2 or pos + 2 + seg_len > n:
+            return None
+        if marker == _SOS:
+            if not has_sof:
+                return None
+            return JpegInfo(width=width, height=height, has_dht=has_dht, sos_offset=pos)
+        if marker == _DHT:
+            has_dht = True
+        elif marker in _SOF_MARKERS and seg_len >= 7:
+            height, width = struct.unpack_from(">HH", data, pos + 5)
+            has_sof = True
+        pos += 2 + seg_len
+    return None
+
+
+def ensure_huffman_tables(data: bytes, info: Optional[JpegInfo] = None) -> bytes:
+    """Return ``data`` with the standard DHT segment inserted before SOS if
+    the stream has no Huffman tables of its own. Unchanged otherwise."""
+    if info is None:
+        info = scan_jpeg(data)
+    if info is None or info.has_dht:
+        return data
+    return data[: info.sos_offset] + STD_DHT_SEGMENT + data[info.sos_offset :]
+
+
+def trim_to_eoi(data: bytes) -> bytes:
+    """Drop any padding a driver left after the EOI marker."""
+    end = data.rfind(EOI)
+    if end < 0:
+        return data
+    return data[: end + 2]
@@ -0,0 +1,102 @@
+"""Timestamp matching for stereo frame pairs.
+
+The receivers keep a short history of frames per camera. When two USB
+cameras drift in phase their *newest* frames can be further apart than
+the allowed skew even though an older frame from one side matches the
+other's newest almost exactly. :func:`select_pair` searches both
+histories for the best-matched pair instead of waiting for the newest
+two to line up.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+
+DEFAULT_HISTORY_LEN = 6
+
+
+def select_pair(
+    left_ts: Sequence[float],
+    right_ts: Sequence[float],
+    since_left: float,
+    since_right: float,
+    max_skew: float,
+) -> Optional[Tuple[int, int]]:
+    """Pick the (left, right) indices of the best-matched frame pair.
+
+    Both sequences hold capture timestamps, oldest first. Candidates must
+    be strictly newer than their ``since_*`` watermark and at most
+    ``max_skew`` seconds apart, and at least one side must be its camera's
+    newest frame -- so pairing never trades freshness for a marginally
+    better match. Among those the smallest skew wins; ties go to the newer
+    pair. Returns None if no candidate pair exists.
+    """
+    if not left_ts or not right_ts:
+        return None
+    last_l = len(left_ts) - 1
+    last_r = len(right_ts) - 1
+    candidates = [(last_l, j) for j in range(last_r + 1)]
+    candidates += [(i, last_r) for i in range(last_l)]
+
+    best: Optional[Tuple[int, int]] = None
+    best_skew = 0.0
+    best_age = 0.0
+    for i, j in candidates:
+        lt = left_ts[i]
+        rt = right_ts[j]
+        if lt <= since_left or rt <= since_right:
+            continue
+        skew = abs(lt - rt)
+        if skew > max_skew:
+            continue
+        age = min(lt, rt)
+        if best is None or skew < best_skew or (skew == best_skew and age > best_age):
+            best = (i, j)
+            best_skew = skew
+            best_age = age
+    return best
+
+
+class PairSkewStats:
+    """Running statistics over the pairs handed out by ``get_latest_pair``.
+
+    ``from_history`` counts pairs where at least one side was not that
+    camera's newest frame, i.e. pairs the history made possible (or
+    better matched) compared to newest-only pairing.
+    """
+
+    __slots__ = ("pairs", "from_history", "total_skew", "max_skew", "last_skew")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.pairs = 0
+        self.from_history = 0
+        self.total_skew = 0.0
+        self.max_skew = 0.0
+        self.last_skew = 0.0
+
+    def record(self, skew: float, from_history: bool) -> None:
+        skew = abs(skew)
+        self.pairs += 1
+        if from_history:
+            self.from_history += 1
+        self.total_skew += skew
+        self.last_skew = skew
+        if skew > self.max_skew:
+            self.max_skew = skew
+
+    def snapshot(self) -> Dict[str, float]:
+        mean = self.total_skew / self.pairs if self.pairs else 0.0
+        return {
+            "pairs": self.pairs,
+            "from_history": self.from_history,
+            "mean_skew_s": mean,
+            "max_skew_s": self.max_skew,
+            "last_skew_s": self.last_skew,
+        }
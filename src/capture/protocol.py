@@ -4,17 +4,59 @@ A JPEG-encoded frame is split into one or more datagrams, each prefixed by a
 fixed 28-byte header. The receiver reassembles complete frames keyed by
 (cam_id, frame_id). No OpenCV / numpy dependency lives here — this module
 is pure-Python so it can be unit-tested without hardware or image libs.
+
+Packets that need more than the base header use ``VERSION_EXT``: the same
+28-byte header (with the version byte set to 2) followed by a 6-byte
+extension carrying a flags byte and, for ``FLAG_ROI`` frames, the offset
+of the cropped region inside the full frame. ``width`` / ``height`` always
+describe the full frame; a crop's own size is in its JPEG. Receivers drop
+packets with flag bits they don't know.
+
+Every packet of a frame but the last carries exactly the sender's payload
+size. Versions 1 and 2 imply ``MAX_PAYLOAD``, sized for Ethernet. On
+loopback, where a datagram can be close to 64 KB, the sender can use
+``VERSION_LARGE``: the version-2 extension plus the payload size, so a
+typical frame fits in one or two datagrams instead of about thirty.
+Either way a frame's packets may span at most :data:`MAX_FRAME_BYTES`;
+receivers size a frame's buffer from its first packet's header, so they
+reject headers that claim more.
+Receivers that only know versions 1-2 reject these packets outright
+instead of misplacing fragments. :func:`pick_max_payload` is the sender
+side of the negotiation.
+
+For lossy links (a capture node on Wi-Fi) a sender can add forward error
+correction: ``fec_ratio`` in :func:`pack_packets` appends parity packets
+(see :mod:`src.capture.fec`) after a frame's data packets, and the
+:class:`Reassembler` rebuilds the frame from any ``total`` of its
+``total + k`` packets. Data packets are unchanged. Parity packets use
+``VERSION_FEC``, whose extension adds the payload size and the frame's
+JPEG length to the version-2 fields, set ``FLAG_PARITY`` and have
+``packet_idx >= total``, so receivers without FEC support reject them
+whichever packet of the frame they see first.
+
+A frame with ``FLAG_LANDMARKS`` carries a face-landmark record instead of
+a JPEG (see :mod:`src.capture.landmark_stream`); it is framed, coded and
+reassembled exactly like an image.
 """
 
 from __future__ import annotations
 
+import errno
+import socket
 import struct
 import time
+from collections import OrderedDict
 from typing import Dict, List, NamedTuple, Optional, Tuple
 
+from src.capture.fec import MAX_CODED_PACKETS, encode_parity, parity_count, recover
+from src.capture.telemetry import ReceiveCounters
+
 
 MAGIC = b"EYEC"
 VERSION = 1
+VERSION_EXT = 2
+VERSION_LARGE = 3
+VERSION_FEC = 4
 
 # Stay under a typical 1500-byte Ethernet MTU once the 28-byte header and
 # IP/UDP overhead are accounted for. 1400 leaves comfortable headroom.
@@ -23,6 +65,40 @@ MAX_PAYLOAD = 1400
 HEADER_FMT = "<4sBBIHHdHHH"
 HEADER_SIZE = struct.calcsize(HEADER_FMT)
 assert HEADER_SIZE == 28, f"unexpected header size {HEADER_SIZE}"
+_HEADER = struct.Struct(HEADER_FMT)
+
+# flags, <reserved>, roi_x, roi_y
+EXT_FMT = "<BxHH"
+EXT_SIZE = struct.calcsize(EXT_FMT)
+_EXT = struct.Struct(EXT_FMT)
+
+# VERSION_LARGE: the same fields plus the sender's payload size.
+EXT_LARGE_FMT = "<BxHHH"
+EXT_LARGE_SIZE = struct.calcsize(EXT_LARGE_FMT)
+_EXT_LARGE = struct.Struct(EXT_LARGE_FMT)
+
+# VERSION_FEC (parity packets): flags, roi_x, roi_y, the data packets'
+# payload size and the frame's JPEG length.
+EXT_FEC_FMT = "<BxHHHI"
+EXT_FEC_SIZE = struct.calcsize(EXT_FEC_FMT)
+_EXT_FEC = struct.Struct(EXT_FEC_FMT)
+
+# Cap on total packets x payload size: well above a raw 4K BGR frame
+# (about 25 MB), where JPEGs and landmark records are far smaller.
+MAX_FRAME_BYTES = 32 * 1024 * 1024
+
+# Largest IPv4 UDP payload, minus our headers.
+MAX_LARGE_PAYLOAD = 65507 - HEADER_SIZE - EXT_LARGE_SIZE
+# Parity packets are as large as data packets plus a bigger extension.
+MAX_FEC_PAYLOAD = 65507 - HEADER_SIZE - EXT_FEC_SIZE
+
+# The payload is a crop of the full frame at (roi_x, roi_y).
+FLAG_ROI = 0x01
+# A parity packet (VERSION_FEC only).
+FLAG_PARITY = 0x02
+# The payload is a landmark record, not a JPEG.
+FLAG_LANDMARKS = 0x04
+KNOWN_FLAGS = FLAG_ROI | FLAG_PARITY | FLAG_LANDMARKS
 
 
 class PacketHeader(NamedTuple):
@@ -34,6 +110,13 @@ class PacketHeader(NamedTuple):
     width: int
     height: int
     payload_len: int
+    flags: int = 0
+    roi_x: int = 0
+    roi_y: int = 0
+    # Payload size of every packet of this frame but the last.
+    chunk: int = MAX_PAYLOAD
+    # JPEG length of the whole frame; parity packets only.
+    frame_len: int = 0
 
 
 class CompletedFrame(NamedTuple):
@@ -42,7 +125,12 @@ class CompletedFrame(NamedTuple):
     timestamp: float
     width: int
     height: int
+    # The reassembly buffer itself (a bytearray) when it came from a
+    # Reassembler; treat it as read-only.
     jpeg_bytes: bytes
+    flags: int = 0
+    roi_x: int = 0
+    roi_y: int = 0
 
 
 def pack_packets(
@@ -52,23 +140,55 @@ def pack_packets(
     width: int,
     height: int,
     jpeg_bytes: bytes,
+    roi: Optional[Tuple[int, int]] = None,
+    max_payload: int = MAX_PAYLOAD,
+    fec_ratio: float = 0.0,
+    flags: int = 0,
 ) -> List[bytes]:
-    """Split a JPEG byte string into header-prefixed UDP datagrams."""
+    """Split a JPEG byte string into header-prefixed UDP datagrams.
+
+    With ``roi=(x, y)`` the JPEG is a crop placed at that offset inside a
+    ``width`` x ``height`` frame, and the packets carry the extension, as
+    they do for other ``flags`` (``FLAG_LANDMARKS``).
+    A ``max_payload`` other than :data:`MAX_PAYLOAD` (see
+    :func:`pick_max_payload`) switches to ``VERSION_LARGE``. A positive
+    ``fec_ratio`` appends ``ceil(total * fec_ratio)`` parity packets (see
+    :func:`src.capture.fec.parity_count`).
+    """
+    if not 0 < max_payload <= MAX_LARGE_PAYLOAD:
+        raise ValueError(f"max_payload must be in [1, {MAX_LARGE_PAYLOAD}], got {max_payload}")
+    if fec_ratio > 0.0 and max_payload > MAX_FEC_PAYLOAD:
+        raise ValueError(f"max_payload must be <= {MAX_FEC_PAYLOAD} with FEC, got {max_payload}")
     payload_len = len(jpeg_bytes)
     if payload_len == 0:
         return []
-    total = (payload_len + MAX_PAYLOAD - 1) // MAX_PAYLOAD
-    if total > 0xFFFF:
+    total = (payload_len + max_payload - 1) // max_payload
+    if total > 0xFFFF or total * max_payload > MAX_FRAME_BYTES:
         raise ValueError(f"frame too large: {payload_len} bytes -> {total} packets")
+    if flags & ~FLAG_LANDMARKS:
+        raise ValueError(f"flags may only add FLAG_LANDMARKS, got {flags:#04x}")
+    if roi is not None:
+        flags |= FLAG_ROI
+    roi_x, roi_y = roi if roi is not None else (0, 0)
+    if max_payload != MAX_PAYLOAD:
+        version = VERSION_LARGE
+        ext = _EXT_LARGE.pack(flags, roi_x & 0xFFFF, roi_y & 0xFFFF, max_payload)
+    elif flags:
+        version = VERSION_EXT
+        ext = _EXT.pack(flags, roi_x & 0xFFFF, roi_y & 0xFFFF)
+    else:
+        version = VERSION
+        ext = b""
     packets: List[bytes] = []
+    chunks = []
     for i in range(total):
-        start = i * MAX_PAYLOAD
-        end = min(start + MAX_PAYLOAD, payload_len)
+        start = i * max_payload
+        end = min(start + max_payload, payload_len)
         chunk = jpeg_bytes[start:end]
-        header = struct.pack(
-            HEADER_FMT,
+        chunks.append(chunk)
+        header = _HEADER.pack(
             MAGIC,
-            VERSION,
+            version,
             cam_id & 0xFF,
             frame_id & 0xFFFFFFFF,
             i,
@@ -78,21 +198,67 @@ def pack_packets(
             height & 0xFFFF,
             len(chunk),
         )
-        packets.append(header + chunk)
+        packets.append(header + ext + chunk)
+    k = parity_count(total, fec_ratio)
+    if k:
+        # A one-packet frame is coded at its own length, not max_payload.
+        coded = max_payload if total > 1 else payload_len
+        ext = _EXT_FEC.pack(
+            flags | FLAG_PARITY, roi_x & 0xFFFF, roi_y & 0xFFFF, max_payload, payload_len
+        )
+        for row, parity in enumerate(encode_parity(chunks, coded, k)):
+            header = _HEADER.pack(
+                MAGIC,
+                VERSION_FEC,
+                cam_id & 0xFF,
+                frame_id & 0xFFFFFFFF,
+                total + row,
+                total,
+                timestamp,
+                width & 0xFFFF,
+                height & 0xFFFF,
+                coded,
+            )
+            packets.append(header + ext + parity)
     return packets
 
 
 def parse_packet(packet: bytes) -> Tuple[PacketHeader, bytes]:
-    """Decode a single datagram into (header, payload). Raises on bad input."""
+    """Decode a single datagram into (header, payload). Raises on bad input.
+
+    ``packet`` may be any bytes-like object; for a memoryview (e.g. over a
+    reused receive buffer) the payload is a view into it, not a copy.
+    """
     if len(packet) < HEADER_SIZE:
         raise ValueError(f"packet shorter than header: {len(packet)} bytes")
-    fields = struct.unpack(HEADER_FMT, packet[:HEADER_SIZE])
+    fields = _HEADER.unpack_from(packet)
     magic, version, cam_id, frame_id, packet_idx, total_pkts, timestamp, width, height, payload_len = fields
     if magic != MAGIC:
         raise ValueError(f"bad magic: {magic!r}")
-    if version != VERSION:
+    flags = roi_x = roi_y = frame_len = 0
+    chunk = MAX_PAYLOAD
+    offset = _payload_offset(version)
+    if offset is None:
         raise ValueError(f"unsupported version: {version}")
-    payload = packet[HEADER_SIZE : HEADER_SIZE + payload_len]
+    if len(packet) < offset:
+        raise ValueError(f"packet shorter than extended header: {len(packet)} bytes")
+    if version == VERSION_EXT:
+        flags, roi_x, roi_y = _EXT.unpack_from(packet, HEADER_SIZE)
+    elif version == VERSION_LARGE:
+        flags, roi_x, roi_y, chunk = _EXT_LARGE.unpack_from(packet, HEADER_SIZE)
+        if chunk == 0:
+            raise ValueError("zero payload size in large-datagram header")
+    elif version == VERSION_FEC:
+        flags, roi_x, roi_y, chunk, frame_len = _EXT_FEC.unpack_from(packet, HEADER_SIZE)
+        if not flags & FLAG_PARITY or chunk == 0 or packet_idx < total_pkts:
+            raise ValueError("malformed parity packet header")
+    if total_pkts * chunk > MAX_FRAME_BYTES:
+        raise ValueError(f"frame too large: {total_pkts} packets of {chunk} bytes")
+    if flags & ~KNOWN_FLAGS:
+        raise ValueError(f"unknown flags: {flags:#04x}")
+    if flags & FLAG_PARITY and version != VERSION_FEC:
+        raise ValueError("parity flag outside a parity packet")
+    payload = packet[offset : offset + payload_len]
     if len(payload) != payload_len:
         raise ValueError(
             f"truncated payload: header says {payload_len}, got {len(payload)}"
@@ -107,31 +273,167 @@ def parse_packet(packet: bytes) -> Tuple[PacketHeader, bytes]:
             width=width,
             height=height,
             payload_len=payload_len,
+            flags=flags,
+            roi_x=roi_x,
+            roi_y=roi_y,
+            chunk=chunk,
+            frame_len=frame_len,
         ),
         payload,
     )
 
 
+def _payload_offset(version: int) -> Optional[int]:
+    if version == VERSION:
+        return HEADER_SIZE
+    if version == VERSION_EXT:
+        return HEADER_SIZE + EXT_SIZE
+    if version == VERSION_LARGE:
+        return HEADER_SIZE + EXT_LARGE_SIZE
+    if version == VERSION_FEC:
+        return HEADER_SIZE + EXT_FEC_SIZE
+    return None
+
+
+def pick_max_payload(sock: socket.socket, addr: Tuple[str, int], wanted: int) -> int:
+    """Largest payload size up to ``wanted`` this socket can actually send
+    to ``addr`` in one datagram, falling back to :data:`MAX_PAYLOAD`.
+
+    Probes with datagrams the receiver drops as bad magic; the OS rejects
+    an oversized one synchronously (``EMSGSIZE``, e.g. macOS caps UDP at
+    9216 bytes by default), in which case the size is halved.
+    """
+    size = min(int(wanted), MAX_LARGE_PAYLOAD)
+    if size <= MAX_PAYLOAD:
+        return MAX_PAYLOAD
+    overhead = HEADER_SIZE + EXT_LARGE_SIZE
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * (size + overhead))
+    except OSError:
+        pass
+    while size > MAX_PAYLOAD:
+        try:
+            sock.sendto(bytes(size + overhead), addr)
+            return size
+        except OSError as e:
+            if e.errno not in (errno.EMSGSIZE, errno.ENOBUFS):
+                break
+        size //= 2
+    return MAX_PAYLOAD
+
+
 class _PartialFrame:
-    __slots__ = ("packets", "total", "deadline", "timestamp", "width", "height")
+    """One frame being reassembled.
+
+    Payloads are copied straight to their final position
+    (``packet_idx * chunk``) in a buffer sized for the whole frame when the
+    first packet arrives, so completing a frame needs no join and the
+    caller's receive buffer can be reused immediately.
+
+    Parity payloads (FEC) are copied aside; once data plus parity packets
+    reach ``total`` the missing data packets are rebuilt in place.
+    """
 
-    def __init__(self, total: int, deadline: float, timestamp: float, width: int, height: int) -> None:
-        self.packets: Dict[int, bytes] = {}
+    __slots__ = (
+        "buf",
+        "received",
+        "count",
+        "total",
+        "chunk",
+        "length",
+        "deadline",
+        "header",
+        "offset",
+        "parity",
+        "frame_len",
+    )
+
+    def __init__(
+        self,
+        total: int,
+        chunk: int,
+        deadline: float,
+        header: PacketHeader,
+        offset: Optional[int],
+    ) -> None:
+        self.buf = bytearray(total * chunk)
+        self.received = bytearray(total)
+        self.count = 0
         self.total = total
+        self.chunk = chunk
+        # Exact once the last packet is in; every other packet is full-size.
+        self.length = len(self.buf)
         self.deadline = deadline
-        self.timestamp = timestamp
-        self.width = width
-        self.height = height
+        # First packet's header: timestamp, size and ROI are per frame.
+        self.header = header
+        # Where the payload starts in this frame's data packets; None
+        # while only parity packets have arrived.
+        self.offset = offset
+        # parity row -> payload
+        self.parity: Optional[Dict[int, bytes]] = None
+        self.frame_len = 0
+
+    def add(self, idx: int, payload: bytes) -> bool:
+        """Store one payload; False for duplicates and malformed packets."""
+        if idx >= self.total or self.received[idx]:
+            return False
+        chunk = self.chunk
+        n = len(payload)
+        last = idx == self.total - 1
+        if n > chunk or (not last and n != chunk):
+            return False
+        start = idx * chunk
+        self.buf[start : start + n] = payload
+        if last:
+            self.length = start + n
+        self.received[idx] = 1
+        self.count += 1
+        return True
 
-    def add(self, idx: int, payload: bytes) -> None:
-        if idx not in self.packets:
-            self.packets[idx] = payload
+    def add_parity(self, row: int, payload: bytes, frame_len: int) -> bool:
+        """Store one parity payload; False for duplicates and parity that
+        does not fit this frame."""
+        total, chunk = self.total, self.chunk
+        coded = chunk if total > 1 else frame_len
+        if len(payload) != coded or not (total - 1) * chunk < frame_len <= total * chunk:
+            return False
+        if total + row >= MAX_CODED_PACKETS:
+            return False
+        if self.parity is None:
+            self.parity = {}
+        elif row in self.parity or frame_len != self.frame_len:
+            return False
+        self.parity[row] = bytes(payload)
+        self.frame_len = frame_len
+        return True
 
     def is_complete(self) -> bool:
-        return len(self.packets) == self.total
+        return self.count == self.total
+
+    def is_recoverable(self) -> bool:
+        return self.parity is not None and self.count + len(self.parity) >= self.total
+
+    def rebuild(self) -> None:
+        """Fill in the missing data packets from parity (needs
+        :meth:`is_recoverable`)."""
+        total, chunk, buf = self.total, self.chunk, self.buf
+        coded = chunk if total > 1 else self.frame_len
+        # Unreceived bytes, including the tail of a short last packet, are
+        # still zero: exactly the padding the sender coded with.
+        data = {
+            i: buf[i * chunk : i * chunk + coded] for i in range(total) if self.received[i]
+        }
+        for i, payload in recover(data, self.parity, total, coded).items():
+            start = i * chunk
+            buf[start : start + coded] = payload
+            self.received[i] = 1
+        self.count = total
+        self.length = self.frame_len
 
-    def assemble(self) -> bytes:
-        return b"".join(self.packets[i] for i in range(self.total))
+    def assemble(self) -> bytearray:
+        # Shrinking in place: no copy of the frame.
+        del self.buf[self.length :]
+        return self.buf
 
 
 class Reassembler:
@@ -141,60 +443,129 @@ class Reassembler:
     an already-delivered frame_id are dropped (by comparison against the
     latest delivered frame_id per cam_id). Incomplete frames are dropped
     after ``ttl`` seconds via :py:meth:`prune`.
+
+    Partials are kept per cam_id in arrival order, which is also deadline
+    order and (nearly always) frame_id order, so dropping superseded or
+    expired partials only ever looks at the oldest entries. The payload
+    size comes from each frame's first packet, so senders using different
+    protocol versions need no receiver configuration.
+
+    Per-camera packet and drop counts go into ``counters`` (pass a shared
+    dict to merge them with the receiver's own, see
+    :class:`src.capture.telemetry.ReceiveCounters`).
     """
 
-    def __init__(self, ttl: float = 0.2) -> None:
-        self._partials: Dict[Tuple[int, int], _PartialFrame] = {}
+    def __init__(self, ttl: float = 0.2, counters: Optional[Dict[int, ReceiveCounters]] = None) -> None:
+        self._partials: Dict[int, "OrderedDict[int, _PartialFrame]"] = {}
         self._latest_frame_id: Dict[int, int] = {}
         self._ttl = ttl
+        self.counters: Dict[int, ReceiveCounters] = counters if counters is not None else {}
 
     def feed(self, packet: bytes, now: Optional[float] = None) -> Optional[CompletedFrame]:
+        """Add one datagram (any bytes-like object; it is not retained).
+        Returns the frame it completed, if any."""
         if now is None:
             now = time.monotonic()
-        try:
-            header, payload = parse_packet(packet)
-        except ValueError:
+        if len(packet) < HEADER_SIZE:
             return None
-
-        latest = self._latest_frame_id.get(header.cam_id)
-        if latest is not None and header.frame_id <= latest:
-            # Already delivered (or older): drop straggler.
+        magic, version, cam_id, frame_id, packet_idx, _, _, _, _, payload_len = _HEADER.unpack_from(packet)
+        if magic != MAGIC:
+            return None
+        counters = self.counters.get(cam_id)
+        if counters is None:
+            counters = self.counters[cam_id] = ReceiveCounters()
+        counters.packets += 1
+        latest = self._latest_frame_id.get(cam_id)
+        if latest is not None and frame_id <= latest:
+            # Already delivered (or older): drop straggler. Parity packets
+            # trailing a frame that completed without them are expected.
+            if version != VERSION_FEC:
+                counters.stragglers += 1
             return None
 
-        key = (header.cam_id, header.frame_id)
-        partial = self._partials.get(key)
-        if partial is None:
-            partial = _PartialFrame(
-                total=header.total_pkts,
-                deadline=now + self._ttl,
-                timestamp=header.timestamp,
-                width=header.width,
-                height=header.height,
-            )
-            self._partials[key] = partial
-        partial.add(header.packet_idx, payload)
-        if not partial.is_complete():
+        partials = self._partials.get(cam_id)
+        if partials is None:
+            partials = self._partials[cam_id] = OrderedDict()
+        partial = partials.get(frame_id)
+        if partial is None or partial.offset is None or version == VERSION_FEC:
+            # First packet of a frame, the first data packet after parity,
+            # or parity: full validation. The first packet's header is
+            # kept for the whole frame.
+            try:
+                header, payload = parse_packet(packet)
+            except ValueError:
+                counters.rejected += 1
+                return None
+            if header.total_pkts == 0:
+                counters.rejected += 1
+                return None
+            parity = version == VERSION_FEC
+            if partial is None:
+                partial = _PartialFrame(
+                    total=header.total_pkts,
+                    chunk=header.chunk,
+                    deadline=now + self._ttl,
+                    header=header._replace(flags=header.flags & ~FLAG_PARITY),
+                    offset=None if parity else _payload_offset(version),
+                )
+                partials[frame_id] = partial
+            elif header.total_pkts != partial.total or header.chunk != partial.chunk:
+                counters.rejected += 1
+                return None
+            elif not parity:
+                partial.offset = _payload_offset(version)
+            frame_len = header.frame_len
+        else:
+            # Later packets of the same frame only need locating: skip
+            # building a header object per packet.
+            offset = partial.offset
+            payload = packet[offset : offset + payload_len]
+            if _payload_offset(version) != offset or len(payload) != payload_len:
+                counters.rejected += 1
+                return None
+            parity = False
+        if parity:
+            added = partial.add_parity(packet_idx - partial.total, payload, frame_len)
+        else:
+            added = partial.add(packet_idx, payload)
+        if not added:
+            counters.rejected += 1
             return None
+        if not partial.is_complete():
+            if partial.parity is None or not partial.is_recoverable():
+                return None
+            partial.rebuild()
+            counters.recovered += 1
 
-        del self._partials[key]
-        self._latest_frame_id[header.cam_id] = header.frame_id
-        # Drop any older partials for this cam (we've moved on past them).
-        stale = [k for k in self._partials if k[0] == header.cam_id and k[1] < header.frame_id]
-        for k in stale:
-            del self._partials[k]
+        del partials[frame_id]
+        self._latest_frame_id[cam_id] = frame_id
+        # Drop older partials for this cam (we've moved on past them).
+        while partials and next(iter(partials)) < frame_id:
+            partials.popitem(last=False)
+            counters.superseded += 1
+        first = partial.header
         return CompletedFrame(
-            cam_id=header.cam_id,
-            frame_id=header.frame_id,
-            timestamp=partial.timestamp,
-            width=partial.width,
-            height=partial.height,
+            cam_id=cam_id,
+            frame_id=frame_id,
+            timestamp=first.timestamp,
+            width=first.width,
+            height=first.height,
             jpeg_bytes=partial.assemble(),
+            flags=first.flags,
+            roi_x=first.roi_x,
+            roi_y=first.roi_y,
         )
 
     def prune(self, now: Optional[float] = None) -> int:
         if now is None:
             now = time.monotonic()
-        expired = [k for k, p in self._partials.items() if p.deadline <= now]
-        for k in expired:
-            del self._partials[k]
-        return len(expired)
+        dropped = 0
+        for cam_id, partials in self._partials.items():
+            expired = 0
+            while partials and next(iter(partials.values())).deadline <= now:
+                partials.popitem(last=False)
+                expired += 1
+            if expired:
+                self.counters[cam_id].pruned += expired
+                dropped += expired
+        return dropped
@@ -0,0 +1,278 @@
+"""Record the completed-frame stream to disk and play it back.
+
+A recording holds the :class:`~src.capture.protocol.CompletedFrame`
+stream exactly as the receiver reassembled it: cam_id, frame_id, capture
+timestamp, full-frame size, ROI offset and the JPEG bytes. Played back
+through :class:`src.capture.frame_receiver.ReplayFrameReceiver` (or a
+supervisor given a :class:`ReplayConfig`), modes run without cameras, so
+benchmarks and regression tests get the same input on every machine.
+
+File layout (little-endian)::
+
+    b"EYECREC1"
+    record*        RECORD_FMT header + JPEG bytes, in receive order
+    index          one u64 file offset per record
+    footer         FOOTER_FMT: index offset, record count, b"EYECIDX1"
+
+The index and footer are written on :meth:`FrameRecorder.close`. A
+recording cut short (crash, power loss) has neither; :class:`Recording`
+then rebuilds the index by walking the records and drops a torn last one.
+:class:`Recording` maps the file read-only and hands out JPEG payloads as
+views into the mapping, so replay never copies frame data.
+
+Replay pacing (:func:`replay_schedule`):
+
+- ``realtime``: frames are released with their recorded spacing;
+- ``fixed``: the same, sped up or slowed down so each camera runs at
+  ``fps``;
+- ``fast``: as fast as the consumer takes them.
+
+Replayed timestamps always keep the recorded spacing (shifted to the
+replay's start), whatever the pacing, so the skew between the two cameras
+of a stereo recording -- and with it stereo pairing -- is the same as
+live. Capture-to-delivery latency is only meaningful with ``realtime``.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from src.capture.protocol import CompletedFrame
+
+
+FILE_MAGIC = b"EYECREC1"
+INDEX_MAGIC = b"EYECIDX1"
+
+# cam_id, flags, width, height, roi_x, roi_y, frame_id, timestamp, jpeg length
+RECORD_FMT = "<BBHHHHIdI"
+RECORD_SIZE = struct.calcsize(RECORD_FMT)
+_RECORD = struct.Struct(RECORD_FMT)
+
+# index offset, record count, magic
+FOOTER_FMT = "<QQ8s"
+FOOTER_SIZE = struct.calcsize(FOOTER_FMT)
+_FOOTER = struct.Struct(FOOTER_FMT)
+_OFFSET = struct.Struct("<Q")
+
+PACINGS = ("realtime", "fixed", "fast")
+
+
+class ReplayConfig(NamedTuple):
+    """What a supervisor should play back instead of opening cameras."""
+
+    path: str
+    pacing: str = "realtime"
+    # Per-camera frame rate for ``fixed`` pacing.
+    fps: float = 0.0
+
+
+class FrameRecorder:
+    """Appends completed frames to a recording file. Thread-safe; the
+    receiver thread calls :meth:`write` for every frame it publishes."""
+
+    def __init__(self, path: str) -> None:
+        self._path = str(path)
+        self._lock = threading.Lock()
+        self._file = open(self._path, "wb")
+        self._file.write(FILE_MAGIC)
+        self._offsets: List[int] = []
+        self._pos = len(FILE_MAGIC)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def frames_written(self) -> int:
+        with self._lock:
+            return len(self._offsets)
+
+    def write(self, frame: CompletedFrame) -> None:
+        header = _RECORD.pack(
+            frame.cam_id,
+            frame.flags,
+            frame.width,
+            frame.height,
+            frame.roi_x,
+            frame.roi_y,
+            frame.frame_id,
+            frame.timestamp,
+            len(frame.jpeg_bytes),
+        )
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header)
+            self._file.write(frame.jpeg_bytes)
+            self._offsets.append(self._pos)
+            self._pos += RECORD_SIZE + len(frame.jpeg_bytes)
+
+    def close(self) -> None:
+        """Write the index and footer. Safe to call more than once."""
+        with self._lock:
+            if self._file is None:
+                return
+            index_at = self._pos
+            for offset in self._offsets:
+                self._file.write(_OFFSET.pack(offset))
+            self._file.write(_FOOTER.pack(index_at, len(self._offsets), INDEX_MAGIC))
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "FrameRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Recording:
+    """Read-only, memory-mapped view of a recording file.
+
+    Frames come back as :class:`CompletedFrame` whose ``jpeg_bytes`` is a
+    ``memoryview`` into the mapping; while any of them is still referenced
+    :meth:`close` leaves the mapping to be freed along with the last one.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = str(path)
+        with open(self._path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(FILE_MAGIC):
+                raise ValueError(f"{self._path}: not a capture recording (too short)")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if bytes(self._view[: len(FILE_MAGIC)]) != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{self._path}: not a capture recording (bad magic)")
+        offsets = self._read_index(size)
+        self.complete = offsets is not None
+        if offsets is None:
+            offsets = self._scan(size)
+        self._offsets = offsets
+        self._headers = [_RECORD.unpack_from(self._map, offset) for offset in offsets]
+
+    def _read_index(self, size: int) -> Optional[List[int]]:
+        if size < len(FILE_MAGIC) + FOOTER_SIZE:
+            return None
+        index_at, count, magic = _FOOTER.unpack_from(self._map, size - FOOTER_SIZE)
+        if magic != INDEX_MAGIC or index_at + count * _OFFSET.size != size - FOOTER_SIZE:
+            return None
+        return [_OFFSET.unpack_from(self._map, index_at + i * _OFFSET.size)[0] for i in range(count)]
+
+    def _scan(self, size: int) -> List[int]:
+        offsets: List[int] = []
+        pos = len(FILE_MAGIC)
+        while pos + RECORD_SIZE <= size:
+            length = _RECORD.unpack_from(self._map, pos)[-1]
+            end = pos + RECORD_SIZE + length
+            if end > size:
+                # Torn last record.
+                break
+            offsets.append(pos)
+            pos = end
+        return offsets
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, i: int) -> CompletedFrame:
+        cam_id, flags, width, height, roi_x, roi_y, frame_id, timestamp, length = self._headers[i]
+        start = self._offsets[i] + RECORD_SIZE
+        return CompletedFrame(
+            cam_id=cam_id,
+            frame_id=frame_id,
+            timestamp=timestamp,
+            width=width,
+            height=height,
+            jpeg_bytes=self._view[start : start + length],
+            flags=flags,
+            roi_x=roi_x,
+            roi_y=roi_y,
+        )
+
+    def __iter__(self) -> Iterator[CompletedFrame]:
+        for i in range(len(self._offsets)):
+            yield self[i]
+
+    def timestamps(self) -> List[float]:
+        """Capture timestamp of every record, in file order."""
+        return [header[7] for header in self._headers]
+
+    def cam_ids(self) -> List[int]:
+        return sorted({header[0] for header in self._headers})
+
+    def time_span(self) -> Tuple[float, float]:
+        """(first, last) capture timestamp; (0, 0) when empty."""
+        if not self._headers:
+            return 0.0, 0.0
+        stamps = self.timestamps()
+        return min(stamps), max(stamps)
+
+    def camera_fps(self) -> float:
+        """Mean per-camera frame rate over the recording (0 if unknown)."""
+        first, last = self.time_span()
+        cams = self.cam_ids()
+        if last <= first or not cams:
+            return 0.0
+        per_camera = (len(self._headers) - len(cams)) / len(cams)
+        return per_camera / (last - first)
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Frames handed out are still referenced; the mapping goes
+            # when they do.
+            pass
+
+    def __enter__(self) -> "Recording":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def replay_schedule(
+    recording: Recording,
+    pacing: str = "realtime",
+    fps: float = 0.0,
+) -> Iterator[Tuple[Optional[float], float, CompletedFrame]]:
+    """(due, offset, frame) in capture-timestamp order.
+
+    ``due`` is when to release the frame, in seconds after replay start
+    (None: right away); ``offset`` is its capture time relative to the
+    recording's first frame, to be added to the replay's own start time.
+    Raises ValueError for a bad ``pacing`` / ``fps`` up front.
+    """
+    if pacing not in PACINGS:
+        raise ValueError(f"pacing must be one of {PACINGS}, got {pacing!r}")
+    speed = 1.0
+    if pacing == "fixed":
+        if fps <= 0:
+            raise ValueError("fixed pacing needs fps > 0")
+        recorded_fps = recording.camera_fps()
+        speed = fps / recorded_fps if recorded_fps > 0 else 1.0
+    return _schedule(recording, None if pacing == "fast" else speed)
+
+
+def _schedule(
+    recording: Recording, speed: Optional[float]
+) -> Iterator[Tuple[Optional[float], float, CompletedFrame]]:
+    stamps = recording.timestamps()
+    first = min(stamps) if stamps else 0.0
+    for i in sorted(range(len(stamps)), key=stamps.__getitem__):
+        offset = stamps[i] - first
+        yield (None if speed is None else offset / speed), offset, recording[i]
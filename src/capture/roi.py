@@ -0,0 +1,191 @@
+"""Face-ROI crop streaming.
+
+Once a face has been found it covers only a small part of each frame. In
+ROI mode the desktop tells the capture process where the face is (``ROI``
+control command, see :mod:`src.capture.control`) and the capture process
+encodes and sends only a padded crop around it, tagged with its offset
+(``FLAG_ROI`` in :mod:`src.capture.protocol`). The receiver pastes the
+crop back at that offset into a full-size frame, so every consumer keeps
+working in full-frame coordinates.
+
+Full frames are still sent periodically, when the desktop reports the
+face lost, and when the desktop stops refreshing the box, so a face that
+leaves the crop is always picked up again.
+
+Desktop side: :class:`RoiFeedback` decides when a new box is worth
+sending. Capture side: :class:`RoiScheduler` decides, per camera and per
+frame, whether to send a crop or a full frame.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+Box = Tuple[int, int, int, int]
+
+# Crop edges snap to the JPEG MCU grid, which also keeps offsets exact in
+# the reduced-size (1/2, 1/4) decodes.
+ROI_ALIGN = 16
+# Margin added on every side, as a fraction of the face box's larger side.
+DEFAULT_PAD = 0.35
+# Crops larger than this share of the frame aren't worth the bookkeeping.
+MAX_CROP_FRACTION = 0.6
+
+KEYFRAME_INTERVAL_S = 1.0
+# Capture falls back to full frames if the desktop stops refreshing the box.
+ROI_TIMEOUT_S = 1.0
+# How often the desktop re-sends an unchanged box to keep it alive.
+ROI_REFRESH_S = 0.4
+
+
+def crop_rect(
+    box: Box,
+    frame_w: int,
+    frame_h: int,
+    pad: float = DEFAULT_PAD,
+    align: int = ROI_ALIGN,
+) -> Optional[Box]:
+    """Padded, grid-aligned crop (x, y, w, h) around ``box`` clamped to the
+    frame, or None if the box is degenerate or the crop would be nearly
+    the whole frame anyway."""
+    x, y, w, h = box
+    if w <= 0 or h <= 0 or frame_w <= 0 or frame_h <= 0:
+        return None
+    margin = pad * max(w, h)
+    x0 = max(0, int(x - margin) // align * align)
+    y0 = max(0, int(y - margin) // align * align)
+    x1 = min(frame_w, -(-int(x + w + margin) // align) * align)
+    y1 = min(frame_h, -(-int(y + h + margin) // align) * align)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    if (x1 - x0) * (y1 - y0) > MAX_CROP_FRACTION * frame_w * frame_h:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def square_crop(box: Box, frame_w: int, frame_h: int, pad: float = DEFAULT_PAD) -> Optional[Box]:
+    """Square crop (x, y, side, side) centred on ``box`` with a ``pad``
+    margin, shifted to lie inside the frame and no larger than its shorter
+    side, or None if the box is degenerate. Landmarkers want an
+    undistorted face (see
+    :class:`src.face_tracking.providers.roi_landmarks.RoiLandmarksProvider`)."""
+    x, y, w, h = box
+    if w <= 0 or h <= 0 or frame_w <= 0 or frame_h <= 0:
+        return None
+    side = min(int(round(max(w, h) * (1.0 + 2.0 * pad))), frame_w, frame_h)
+    x0 = int(round(x + (w - side) / 2.0))
+    y0 = int(round(y + (h - side) / 2.0))
+    x0 = max(0, min(frame_w - side, x0))
+    y0 = max(0, min(frame_h - side, y0))
+    return x0, y0, side, side
+
+
+def box_from_landmarks(landmarks: Iterable, frame_w: int, frame_h: int) -> Optional[Box]:
+    """Pixel bounding box of normalized (MediaPipe-style ``.x`` / ``.y``)
+    landmarks in a ``frame_w`` x ``frame_h`` frame."""
+    xs = []
+    ys = []
+    for lm in landmarks:
+        xs.append(float(lm.x))
+        ys.append(float(lm.y))
+    if not xs:
+        return None
+    x0 = max(0.0, min(xs)) * frame_w
+    y0 = max(0.0, min(ys)) * frame_h
+    x1 = min(1.0, max(xs)) * frame_w
+    y1 = min(1.0, max(ys)) * frame_h
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return int(x0), int(y0), int(x1 - x0 + 0.5), int(y1 - y0 + 0.5)
+
+
+def box_from_corners(corners: Optional[Tuple[int, int, int, int]]) -> Optional[Box]:
+    """(x, y, w, h) from a (left, top, right, bottom) detector rectangle
+    such as ``ETHXGazeInference.last_face_box``."""
+    if corners is None:
+        return None
+    left, top, right, bottom = corners
+    left = max(0, int(left))
+    top = max(0, int(top))
+    if right <= left or bottom <= top:
+        return None
+    return left, top, int(right) - left, int(bottom) - top
+
+
+class RoiFeedback:
+    """Desktop side: forwards face boxes to the capture process without
+    flooding the control channel.
+
+    A box is sent when it is new, when any edge moved by more than
+    ``move_px``, or every ``refresh_s`` to keep it alive. Losing the face
+    clears the ROI immediately so the next frame is a full one.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int, Optional[Box]], bool],
+        move_px: int = 8,
+        refresh_s: float = ROI_REFRESH_S,
+    ) -> None:
+        self._send = send
+        self._move_px = int(move_px)
+        self._refresh_s = float(refresh_s)
+        # cam_id -> (box last sent, when)
+        self._sent: Dict[int, Tuple[Box, float]] = {}
+
+    def update(self, cam_id: int, box: Optional[Box], now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.monotonic()
+        previous = self._sent.get(cam_id)
+        if box is None:
+            if previous is not None:
+                del self._sent[cam_id]
+                self._send(cam_id, None)
+            return
+        if previous is not None:
+            last_box, last_at = previous
+            moved = max(abs(a - b) for a, b in zip(box, last_box))
+            if moved <= self._move_px and now - last_at < self._refresh_s:
+                return
+        if self._send(cam_id, box):
+            self._sent[cam_id] = (box, now)
+
+
+class RoiScheduler:
+    """Capture side, one per camera: what to send for the next frame."""
+
+    def __init__(
+        self,
+        keyframe_interval_s: float = KEYFRAME_INTERVAL_S,
+        roi_timeout_s: float = ROI_TIMEOUT_S,
+    ) -> None:
+        self._keyframe_interval_s = keyframe_interval_s
+        self._roi_timeout_s = roi_timeout_s
+        self._box: Optional[Box] = None
+        self._box_at = 0.0
+        self._last_full: Optional[float] = None
+
+    def set_box(self, box: Optional[Box], now: float) -> None:
+        self._box = box if box is not None and box[2] > 0 and box[3] > 0 else None
+        self._box_at = now
+
+    def crop_for(self, now: float, frame_w: int, frame_h: int) -> Optional[Box]:
+        """Crop rectangle for this frame, or None to send the full frame
+        (no box, box gone stale, or a periodic full frame is due)."""
+        if self._box is not None and now - self._box_at > self._roi_timeout_s:
+            self._box = None
+        rect = None
+        if self._box is not None:
+            keyframe_due = (
+                self._last_full is None or now - self._last_full >= self._keyframe_interval_s
+            )
+            if not keyframe_due:
+                rect = crop_rect(self._box, frame_w, frame_h)
+        if rect is None:
+            self._last_full = now
+        return rect
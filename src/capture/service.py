@@ -0,0 +1,374 @@
+"""App-level capture service: one capture subprocess per camera set,
+shared by reference-counted consumers.
+
+Spawning the capture process (Python start, cv2 import, camera open)
+takes seconds, so the desktop keeps it running between consumers instead
+of tying it to one mode's lifetime. Modes (through
+:func:`src.capture.session.capture_session`) and camera previews call
+:meth:`CaptureService.acquire` and get a :class:`CaptureLease` on the
+supervisor for that camera set (:class:`PendingLease` does that off
+the calling thread); a second consumer of the same cameras
+and options shares the running process. When the last lease is released
+the capture parameters are reset (launch rate, full frames) and the
+process is kept warm for ``idle_grace_s`` seconds, so switching from
+``one_camera_head_pose`` to ``eye_gaze`` on the same camera doesn't
+reopen the device.
+
+A camera can only be opened by one process. Acquiring a camera set that
+overlaps an idle session stops that session first; overlapping one that
+is still leased raises RuntimeError.
+
+With a :class:`~src.capture.supervisor.WarmCapturePool` (the default
+service has one; :meth:`CaptureService.prewarm` fills it at app start)
+even a cold session skips interpreter start-up and the cv2 import.
+
+Imports no OpenCV itself (the supervisor is loaded on first use), so it
+can be unit-tested with a stand-in supervisor.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from src.capture.workers import WorkerLayout
+
+if TYPE_CHECKING:
+    from src.capture.supervisor import CaptureSupervisor, WarmCapturePool
+
+
+DEFAULT_IDLE_GRACE_S = 10.0
+
+# (camera indices, transport, passthrough, worker layout)
+SessionKey = Tuple[Tuple[int, ...], str, bool, Optional[WorkerLayout]]
+
+
+class CaptureLease:
+    """One consumer's handle on a shared :class:`CaptureSupervisor`.
+
+    Use as a context manager or call :meth:`release` once done; releasing
+    twice is a no-op.
+    """
+
+    def __init__(self, service: CaptureService, key: SessionKey, supervisor: CaptureSupervisor) -> None:
+        self._service = service
+        self._key = key
+        self._supervisor = supervisor
+        self._released = False
+
+    @property
+    def supervisor(self) -> CaptureSupervisor:
+        return self._supervisor
+
+    @property
+    def released(self) -> bool:
+        return self._released
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._service._release(self._key, self._supervisor)
+
+    def __enter__(self) -> CaptureSupervisor:
+        return self._supervisor
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class PendingLease:
+    """A :meth:`CaptureService.acquire` running on a background thread, for
+    callers (camera previews) that must not block on a cold start.
+
+    :attr:`lease` is None until the acquire lands; :attr:`failed` is set
+    if it raised. :meth:`cancel` gives the lease back -- including one
+    that lands afterwards -- and with ``wait`` returns only once the
+    acquire thread is done, so the cameras are free for the next consumer.
+    """
+
+    def __init__(self, service: CaptureService, camera_indices: List[int], **options) -> None:
+        self._lock = threading.Lock()
+        self._lease: Optional[CaptureLease] = None
+        self._failed = False
+        self._cancelled = False
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(service, list(camera_indices), options),
+            daemon=True,
+            name="capture-acquire",
+        )
+        self._thread.start()
+
+    @property
+    def lease(self) -> Optional[CaptureLease]:
+        with self._lock:
+            return self._lease
+
+    @property
+    def failed(self) -> bool:
+        with self._lock:
+            return self._failed
+
+    def cancel(self, wait: bool = False) -> None:
+        with self._lock:
+            self._cancelled = True
+            lease, self._lease = self._lease, None
+        if lease is not None:
+            lease.release()
+        if wait:
+            self._thread.join()
+
+    def _run(self, service: CaptureService, camera_indices: List[int], options: dict) -> None:
+        try:
+            lease: Optional[CaptureLease] = service.acquire(camera_indices, **options)
+        except RuntimeError:
+            lease = None
+        with self._lock:
+            if not self._cancelled:
+                self._lease = lease
+                self._failed = lease is None
+                return
+        if lease is not None:
+            lease.release()
+
+
+class _Session:
+    __slots__ = ("supervisor", "refs", "timer", "ready", "stopped", "error")
+
+    def __init__(self) -> None:
+        # None until the acquire that created the session has started it.
+        self.supervisor: Optional[CaptureSupervisor] = None
+        self.refs = 0
+        self.timer: Optional[threading.Timer] = None
+        # Set while the supervisor can be handed to a new lease; clear
+        # while it starts and while a release resets its parameters.
+        self.ready = threading.Event()
+        # Set once the session, removed from the registry, has stopped.
+        self.stopped = threading.Event()
+        # Why the start failed, for acquirers waiting on it.
+        self.error: Optional[str] = None
+
+    def cancel_timer(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+
+class CaptureService:
+    """Registry of running capture sessions keyed by camera set and
+    transport options. Thread-safe. A cold :meth:`acquire` blocks for the
+    subprocess handshake, and so do acquirers of the same session, but
+    the registry lock is never held while a supervisor starts, stops or
+    resets, so other sessions' callers are not held up."""
+
+    def __init__(
+        self,
+        idle_grace_s: float = DEFAULT_IDLE_GRACE_S,
+        supervisor_factory: Optional[Callable[..., CaptureSupervisor]] = None,
+        warm_pool: Optional[WarmCapturePool] = None,
+    ) -> None:
+        if supervisor_factory is None:
+            from src.capture.supervisor import CaptureSupervisor as supervisor_factory
+        self._idle_grace_s = float(idle_grace_s)
+        self._factory = supervisor_factory
+        self._warm_pool = warm_pool
+        self._lock = threading.Lock()
+        self._sessions: Dict[SessionKey, _Session] = {}
+        # Sessions taken out of the registry whose cameras are still open.
+        self._stopping: Dict[_Session, SessionKey] = {}
+
+    def acquire(
+        self,
+        camera_indices: List[int],
+        *,
+        transport: str = "udp",
+        passthrough: bool = False,
+        workers: Optional[WorkerLayout] = None,
+        startup_timeout: float = 5.0,
+    ) -> CaptureLease:
+        """Lease the capture session for ``camera_indices``, starting it if
+        no live one exists. Raises RuntimeError if the subprocess fails to
+        start or a camera is leased by a different session."""
+        key: SessionKey = (
+            tuple(int(i) for i in camera_indices),
+            transport,
+            bool(passthrough),
+            workers,
+        )
+        stale: List[_Session] = []
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and session.ready.is_set() and not session.supervisor.is_alive():
+                stale.append(self._detach_locked(key))
+                session = None
+            starting = session is None
+            if starting:
+                stale.extend(self._free_cameras_locked(key))
+                wanted = set(key[0])
+                closing = [s for s, k in self._stopping.items() if wanted.intersection(k[0])]
+                session = self._sessions[key] = _Session()
+            session.cancel_timer()
+            session.refs += 1
+
+        if not starting:
+            session.ready.wait()
+            if session.error is not None:
+                raise RuntimeError(session.error)
+            return CaptureLease(self, key, session.supervisor)
+
+        # The session is reserved; start it without blocking other callers.
+        self._stop_detached(stale)
+        for other in closing:
+            other.stopped.wait()
+        try:
+            options = {"warm_pool": self._warm_pool} if self._warm_pool is not None else {}
+            if workers is not None:
+                options["workers"] = workers
+            supervisor = self._factory(
+                camera_indices=list(key[0]),
+                transport=transport,
+                passthrough=passthrough,
+                **options,
+            )
+            supervisor.start(timeout=startup_timeout)
+        except BaseException as exc:
+            with self._lock:
+                if self._sessions.get(key) is session:
+                    del self._sessions[key]
+                session.error = f"Capture session failed to start: {exc}"
+                session.ready.set()
+            self._mark_stopped(session)
+            raise
+        with self._lock:
+            session.supervisor = supervisor
+            session.ready.set()
+            if self._sessions.get(key) is session:
+                return CaptureLease(self, key, supervisor)
+            # Shut down while starting: this acquire owns the stop.
+            session.error = "Capture service shut down while the session was starting"
+        self._stop_detached([session])
+        raise RuntimeError(session.error)
+
+    def prewarm(self) -> None:
+        """Spawn standby capture workers now, if this service has a pool."""
+        if self._warm_pool is not None:
+            self._warm_pool.fill()
+
+    def sessions(self) -> Dict[SessionKey, int]:
+        """Running sessions and how many leases each has (0 while in the
+        idle grace period). Sessions still starting count their waiting
+        acquirers."""
+        with self._lock:
+            return {key: session.refs for key, session in self._sessions.items()}
+
+    def release_idle(self) -> None:
+        """Stop every session nobody holds a lease on right away, e.g.
+        before something else needs to open the cameras directly."""
+        with self._lock:
+            stale = [
+                self._detach_locked(key)
+                for key, s in list(self._sessions.items())
+                if s.refs == 0 and s.ready.is_set()
+            ]
+        self._stop_detached(stale)
+
+    def shutdown(self) -> None:
+        """Stop all sessions, leased or not, and any standby workers.
+        Outstanding leases become no-ops to release; acquires still
+        starting fail."""
+        with self._lock:
+            detached = [self._detach_locked(key) for key in list(self._sessions)]
+            # Sessions still starting are stopped by the acquire starting them.
+            stale = [s for s in detached if s.supervisor is not None]
+        self._stop_detached(stale)
+        if self._warm_pool is not None:
+            self._warm_pool.shutdown()
+
+    def _release(self, key: SessionKey, supervisor: CaptureSupervisor) -> None:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or session.supervisor is not supervisor:
+                # Already stopped (shutdown, or replaced after dying).
+                return
+            session.refs -= 1
+            if session.refs > 0:
+                return
+            # Acquirers arriving now wait for the reset below.
+            session.ready.clear()
+        stale: List[_Session] = []
+        try:
+            # The next consumer starts from the launch rate and full frames,
+            # not whatever throttle / ROI the previous one left behind.
+            supervisor.reset_capture_params()
+        finally:
+            with self._lock:
+                session.ready.set()
+                if self._sessions.get(key) is session and session.refs == 0:
+                    if self._idle_grace_s <= 0 or not supervisor.is_alive():
+                        stale.append(self._detach_locked(key))
+                    else:
+                        timer = threading.Timer(self._idle_grace_s, self._expire, args=(key, supervisor))
+                        timer.daemon = True
+                        session.timer = timer
+                        timer.start()
+            self._stop_detached(stale)
+
+    def _expire(self, key: SessionKey, supervisor: CaptureSupervisor) -> None:
+        stale: List[_Session] = []
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and session.supervisor is supervisor and session.refs == 0:
+                stale.append(self._detach_locked(key))
+        self._stop_detached(stale)
+
+    def _free_cameras_locked(self, key: SessionKey) -> List[_Session]:
+        """Detach the idle sessions overlapping ``key``'s cameras, for the
+        caller to stop; raises if a leased one does."""
+        wanted = set(key[0])
+        overlapping = [k for k in self._sessions if wanted.intersection(k[0])]
+        for other_key in overlapping:
+            if self._sessions[other_key].refs > 0:
+                overlap = wanted.intersection(other_key[0])
+                cams = ", ".join(str(i) for i in sorted(overlap))
+                raise RuntimeError(f"Camera {cams} is in use by another capture session")
+        return [self._detach_locked(other_key) for other_key in overlapping]
+
+    def _detach_locked(self, key: SessionKey) -> _Session:
+        """Take a session out of the registry. Its cameras count as open
+        until :meth:`_stop_detached` (or, for one still starting, the
+        acquire starting it) has stopped it."""
+        session = self._sessions.pop(key)
+        session.cancel_timer()
+        self._stopping[session] = key
+        return session
+
+    def _stop_detached(self, sessions: List[_Session]) -> None:
+        for session in sessions:
+            try:
+                session.supervisor.stop()
+            finally:
+                self._mark_stopped(session)
+
+    def _mark_stopped(self, session: _Session) -> None:
+        with self._lock:
+            self._stopping.pop(session, None)
+        session.stopped.set()
+
+
+_default_service: Optional[CaptureService] = None
+_default_lock = threading.Lock()
+
+
+def default_capture_service() -> CaptureService:
+    """The process-wide service used by :func:`capture_session` and the UI.
+    Stopped at interpreter exit if the app didn't shut it down itself."""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            from src.capture.supervisor import WarmCapturePool
+
+            _default_service = CaptureService(warm_pool=WarmCapturePool())
+            atexit.register(_default_service.shutdown)
+        return _default_service
@@ -1,28 +1,143 @@
 """Lifecycle helpers for the capture subprocess.
 
 Tracking modes consume frames through :class:`CaptureSupervisor`, but every
-mode needs the same boilerplate around it: spawn the subprocess, translate
-spawn errors to a user-readable message, watch for premature subprocess
-death inside the loop, and tear it all down at the end. These helpers
-collapse that into one ``with capture_session(...) as supervisor:`` block
-plus an :func:`assert_capture_alive` call per loop iteration.
+mode needs the same boilerplate around it: lease the subprocess from the
+shared :class:`~src.capture.service.CaptureService` (which keeps it warm
+between modes), translate spawn errors to a user-readable message, watch
+for premature subprocess death inside the loop, and hand it back at the
+end. These helpers collapse that into one
+``with capture_session(...) as supervisor:`` block plus an
+:func:`assert_capture_alive` call per loop iteration.
+:func:`bind_idle_throttle` connects a mode's :class:`IdleController` to
+the capture process so an absent user doesn't cost a full-rate stream, and
+:func:`roi_feedback_from_settings` lets a mode stream only the face region.
+
+``capture_replay`` in a mode's settings plays a recording back instead of
+opening cameras, and ``capture_record`` saves the live stream to one (see
+:mod:`src.capture.recording`).
 """
 
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator, List
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from src.capture.recording import PACINGS, ReplayConfig
+from src.capture.roi import RoiFeedback
+from src.capture.service import CaptureService, default_capture_service
+from src.capture.supervisor import TRANSPORTS, CaptureSupervisor
+from src.capture.workers import WorkerLayout, parse_cpu_list
+
+if TYPE_CHECKING:
+    from src.core.modes.idle import IdleController
+
+
+DEFAULT_IDLE_CAPTURE_FPS = 5
 
-from src.capture.supervisor import CaptureSupervisor
+
+def capture_options_from_settings(settings: Optional[dict]) -> dict:
+    """Map the capture-related keys of a mode's settings dict onto
+    :func:`capture_session` keyword arguments. Unknown or bad values fall
+    back to the defaults so a stale settings file can't stop tracking."""
+    options: dict = {}
+    if not settings:
+        return options
+    transport = settings.get("capture_transport")
+    if transport is not None:
+        if transport in TRANSPORTS:
+            options["transport"] = transport
+        else:
+            print(f"warning: unknown capture_transport {transport!r}, using udp")
+    if settings.get("capture_mjpeg_passthrough") and options.get("transport", "udp") == "udp":
+        options["passthrough"] = True
+    layout = _worker_layout_from_settings(settings)
+    if layout is not None:
+        options["workers"] = layout
+    replay_path = settings.get("capture_replay")
+    if replay_path:
+        pacing = settings.get("capture_replay_pacing", "realtime")
+        if pacing not in PACINGS:
+            print(f"warning: unknown capture_replay_pacing {pacing!r}, using realtime")
+            pacing = "realtime"
+        try:
+            fps = float(settings.get("capture_replay_fps") or 0.0)
+        except (TypeError, ValueError):
+            fps = 0.0
+        if pacing == "fixed" and fps <= 0:
+            print("warning: capture_replay_pacing 'fixed' needs capture_replay_fps, using realtime")
+            pacing = "realtime"
+        options["replay"] = ReplayConfig(str(replay_path), pacing, fps)
+    elif settings.get("capture_record"):
+        options["record"] = str(settings["capture_record"])
+    return options
+
+
+def _worker_layout_from_settings(settings: dict) -> Optional[WorkerLayout]:
+    """``capture_per_camera_workers`` (bool), ``capture_cpu_affinity`` (one
+    CPU list per worker, e.g. ``["2", "3"]``, or a single list for all)
+    and ``capture_nice`` (int); None when all are unset."""
+    per_camera = bool(settings.get("capture_per_camera_workers"))
+    cpus = ()
+    raw_cpus = settings.get("capture_cpu_affinity")
+    if raw_cpus:
+        entries = [raw_cpus] if isinstance(raw_cpus, str) else list(raw_cpus)
+        try:
+            cpus = tuple(
+                parse_cpu_list(entry if isinstance(entry, str) else ",".join(map(str, entry)))
+                for entry in entries
+            )
+        except (TypeError, ValueError) as exc:
+            print(f"warning: bad capture_cpu_affinity {raw_cpus!r} ({exc}), not pinning")
+            cpus = ()
+    raw_nice = settings.get("capture_nice", 0)
+    try:
+        nice = int(raw_nice or 0)
+    except (TypeError, ValueError):
+        print(f"warning: bad capture_nice {raw_nice!r}, using 0")
+        nice = 0
+    if not (per_camera or cpus or nice):
+        return None
+    return WorkerLayout(per_camera=per_camera, cpus=cpus, nice=nice)
 
 
 @contextmanager
 def capture_session(
-    camera_indices: List[int], *, startup_timeout: float = 5.0
+    camera_indices: List[int],
+    *,
+    startup_timeout: float = 5.0,
+    transport: str = "udp",
+    passthrough: bool = False,
+    workers: Optional[WorkerLayout] = None,
+    service: Optional[CaptureService] = None,
+    replay: Optional[ReplayConfig] = None,
+    record: Optional[str] = None,
 ) -> Iterator[CaptureSupervisor]:
-    supervisor = CaptureSupervisor(camera_indices=camera_indices)
+    """Lease the capture process for ``camera_indices`` from ``service``
+    (default: :func:`default_capture_service`). The process outlives the
+    block by the service's idle grace period, so the next mode on the
+    same cameras starts without reopening them.
+
+    With ``replay`` the block gets a private supervisor playing that
+    recording instead; with ``record`` the frames received during the
+    block are saved to that path."""
+    if replay is not None:
+        supervisor = CaptureSupervisor(camera_indices=camera_indices, replay=replay)
+        supervisor.start()
+        try:
+            yield supervisor
+        finally:
+            supervisor.stop()
+        return
+    if service is None:
+        service = default_capture_service()
     try:
-        supervisor.start(timeout=startup_timeout)
+        lease = service.acquire(
+            camera_indices,
+            transport=transport,
+            passthrough=passthrough,
+            workers=workers,
+            startup_timeout=startup_timeout,
+        )
     except RuntimeError as exc:
         if len(camera_indices) == 1:
             raise RuntimeError(
@@ -36,14 +151,75 @@ def capture_session(
             f"Detail: {exc}"
         ) from exc
 
+    supervisor = lease.supervisor
+    if record:
+        try:
+            supervisor.start_recording(record)
+        except RuntimeError as exc:
+            print(f"warning: not recording capture: {exc}")
     try:
         yield supervisor
     finally:
-        supervisor.stop()
+        if record:
+            supervisor.stop_recording()
+        lease.release()
+
+
+def bind_idle_throttle(
+    supervisor: CaptureSupervisor,
+    idle: "IdleController",
+    settings: Optional[dict] = None,
+) -> None:
+    """Drop capture to ``settings["capture_idle_fps"]`` (default
+    :data:`DEFAULT_IDLE_CAPTURE_FPS`; 0 disables) while ``idle`` says the
+    user is away, and restore the launch rate the moment a face is seen
+    again. The capture process keeps reading the camera at full rate and
+    only skips processing, so the first frame after a transition back is
+    already at full rate.
+    """
+    raw = (settings or {}).get("capture_idle_fps", DEFAULT_IDLE_CAPTURE_FPS)
+    try:
+        idle_fps = int(raw or 0)
+    except (TypeError, ValueError):
+        print(f"warning: bad capture_idle_fps {raw!r}, using {DEFAULT_IDLE_CAPTURE_FPS}")
+        idle_fps = DEFAULT_IDLE_CAPTURE_FPS
+    if idle_fps <= 0:
+        idle.set_on_change(None)
+        return
+    idle_fps = min(idle_fps, 240)
+
+    def _on_change(is_idle: bool) -> None:
+        if is_idle:
+            supervisor.set_capture_params(fps=idle_fps)
+        else:
+            supervisor.reset_capture_params()
+
+    idle.set_on_change(_on_change)
+    if idle.is_idle:
+        supervisor.set_capture_params(fps=idle_fps)
+
+
+def roi_feedback_from_settings(
+    supervisor: CaptureSupervisor,
+    settings: Optional[dict] = None,
+) -> Optional[RoiFeedback]:
+    """A :class:`RoiFeedback` feeding the mode's face boxes to the capture
+    process when ``settings["capture_roi"]`` is on, else None. Only the
+    UDP re-encoding path benefits: shared memory has nothing to encode and
+    passthrough forwards the camera's own JPEG untouched.
+    """
+    if not (settings or {}).get("capture_roi"):
+        return None
+    if supervisor.transport != "udp" or supervisor.passthrough:
+        print("warning: capture_roi needs the udp transport without passthrough; ignoring")
+        return None
+    return RoiFeedback(supervisor.set_roi)
 
 
 def assert_capture_alive(supervisor: CaptureSupervisor) -> None:
     if not supervisor.is_alive():
+        if supervisor.replay is not None:
+            raise RuntimeError(f"Capture replay finished: {supervisor.replay.path}")
         tail = supervisor.last_stderr_lines(3)
         raise RuntimeError(
             f"Capture process exited unexpectedly. Last stderr: {tail}"
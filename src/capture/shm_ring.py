@@ -0,0 +1,233 @@
+"""Shared-memory frame ring for same-host capture.
+
+When the capture process and the desktop process live on the same machine
+the JPEG encode / decode round trip is pure overhead. This module lets the
+capture process publish raw BGR frames into a multi-slot ring in POSIX
+shared memory that the desktop maps and reads without re-encoding.
+
+One ring per camera. The capture process creates (and on exit unlinks)
+the segment; the desktop attaches after the ``READY=1`` handshake.
+
+Segment layout::
+
+    [ring header, 64 B][slot 0][slot 1] ... [slot n_slots-1]
+    slot = [slot header, 64 B][pixel bytes, slot_capacity B]
+
+Publishing is single-writer, seqlock style:
+
+1. ``slot.seq <- 0`` (slot is being rewritten; readers skip it),
+2. copy pixels and write the slot metadata,
+3. ``slot.seq <- n`` where ``n`` is the 1-based publish count,
+4. ``header.latest_seq <- n``.
+
+A reader takes ``latest_seq``, looks at slot ``(n - 1) % n_slots`` and
+accepts it only if that slot's ``seq`` still equals ``n``. Views handed
+out by :meth:`ShmFrameRing.read_latest` are only good until the writer
+laps the ring, i.e. for roughly ``n_slots - 1`` frame intervals, and a
+check made before the pixels are used cannot tell whether they were
+overwritten while in use. Callers either pass ``copy=True`` (the pixels
+are copied out and the slot re-checked afterwards, so a copy that comes
+back is intact) or call :meth:`ShmFrameRing.is_valid` once they are done
+with a view and discard whatever they derived from it if it fails.
+"""
+
+from __future__ import annotations
+
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+RING_MAGIC = b"EYSR"
+RING_VERSION = 1
+
+# magic, version, cam_id, n_slots, slot_capacity, <pad>, latest_seq
+RING_HEADER_FMT = "<4sBBHI4xQ"
+RING_HEADER_SIZE = 64
+_LATEST_SEQ_OFFSET = struct.calcsize("<4sBBHI4x")
+
+# seq, frame_id, timestamp, width, height, channels
+SLOT_HEADER_FMT = "<QIdHHB"
+SLOT_HEADER_SIZE = 64
+
+DEFAULT_SLOTS = 8
+
+assert struct.calcsize(RING_HEADER_FMT) <= RING_HEADER_SIZE
+assert struct.calcsize(SLOT_HEADER_FMT) <= SLOT_HEADER_SIZE
+
+
+class RingFrame(NamedTuple):
+    seq: int
+    frame_id: int
+    timestamp: float
+    image: np.ndarray
+
+
+def ring_name(prefix: str, cam_id: int) -> str:
+    """Shared-memory segment name for ``cam_id`` under ``prefix``. Both
+    processes derive names the same way so nothing but the prefix has to
+    cross the process boundary."""
+    return f"{prefix}_cam{cam_id}"
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without registering it with this
+    process's resource tracker (which would unlink it when *we* exit,
+    pulling it out from under the owner)."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:
+        # Python < 3.13 has no ``track`` flag.
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class ShmFrameRing:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        magic, version, cam_id, n_slots, slot_capacity, _ = struct.unpack_from(
+            RING_HEADER_FMT, shm.buf, 0
+        )
+        if magic != RING_MAGIC:
+            raise ValueError(f"bad ring magic: {magic!r}")
+        if version != RING_VERSION:
+            raise ValueError(f"unsupported ring version: {version}")
+        self.cam_id = cam_id
+        self.n_slots = n_slots
+        self.slot_capacity = slot_capacity
+        self._slot_stride = SLOT_HEADER_SIZE + slot_capacity
+        # Writer-side publish counter; readers always go through the header.
+        self._published = self.latest_seq
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        cam_id: int,
+        slot_capacity: int,
+        n_slots: int = DEFAULT_SLOTS,
+    ) -> "ShmFrameRing":
+        if n_slots < 2:
+            raise ValueError(f"n_slots must be >= 2, got {n_slots}")
+        if slot_capacity <= 0:
+            raise ValueError(f"slot_capacity must be positive, got {slot_capacity}")
+        size = RING_HEADER_SIZE + n_slots * (SLOT_HEADER_SIZE + slot_capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:RING_HEADER_SIZE] = bytes(RING_HEADER_SIZE)
+        struct.pack_into(
+            RING_HEADER_FMT,
+            shm.buf,
+            0,
+            RING_MAGIC,
+            RING_VERSION,
+            cam_id & 0xFF,
+            n_slots,
+            slot_capacity,
+            0,
+        )
+        for i in range(n_slots):
+            off = RING_HEADER_SIZE + i * (SLOT_HEADER_SIZE + slot_capacity)
+            struct.pack_into(SLOT_HEADER_FMT, shm.buf, off, 0, 0, 0.0, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmFrameRing":
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def latest_seq(self) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, _LATEST_SEQ_OFFSET)[0]
+
+    def _slot_offset(self, seq: int) -> int:
+        return RING_HEADER_SIZE + ((seq - 1) % self.n_slots) * self._slot_stride
+
+    def publish(self, frame_id: int, timestamp: float, frame: np.ndarray) -> bool:
+        """Copy ``frame`` (uint8, HxW or HxWxC) into the next slot. Returns
+        False if it does not fit the slot capacity."""
+        if frame.dtype != np.uint8 or frame.nbytes > self.slot_capacity:
+            return False
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        seq = self._published + 1
+        off = self._slot_offset(seq)
+        buf = self._shm.buf
+        struct.pack_into("<Q", buf, off, 0)
+        dst = np.ndarray(
+            frame.shape, dtype=np.uint8, buffer=buf, offset=off + SLOT_HEADER_SIZE
+        )
+        np.copyto(dst, frame)
+        struct.pack_into(
+            SLOT_HEADER_FMT,
+            buf,
+            off,
+            0,
+            frame_id & 0xFFFFFFFF,
+            timestamp,
+            width,
+            height,
+            channels,
+        )
+        struct.pack_into("<Q", buf, off, seq)
+        struct.pack_into("<Q", buf, _LATEST_SEQ_OFFSET, seq)
+        self._published = seq
+        return True
+
+    def read_latest(self, copy: bool = False) -> Optional[RingFrame]:
+        """Return the newest published frame, or None if nothing has been
+        published yet or the slot was overwritten while we read it.
+
+        By default the image is a zero-copy view into the ring; check
+        :meth:`is_valid` with its ``seq`` after using it. With ``copy=True``
+        the pixels are copied out first and the frame is only returned if
+        the slot still held ``seq`` once the copy finished."""
+        seq = self.latest_seq
+        if seq == 0:
+            return None
+        off = self._slot_offset(seq)
+        slot_seq, frame_id, timestamp, width, height, channels = struct.unpack_from(
+            SLOT_HEADER_FMT, self._shm.buf, off
+        )
+        if slot_seq != seq:
+            return None
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        image = np.ndarray(
+            shape, dtype=np.uint8, buffer=self._shm.buf, offset=off + SLOT_HEADER_SIZE
+        )
+        if copy:
+            image = image.copy()
+        # Re-check last: if the writer lapped us in the meantime the
+        # metadata (and, for a copy, the pixels) may be from two frames.
+        if not self.is_valid(seq):
+            return None
+        return RingFrame(seq=seq, frame_id=frame_id, timestamp=timestamp, image=image)
+
+    def is_valid(self, seq: int) -> bool:
+        """True while the slot that held ``seq`` has not been rewritten, so
+        long-lived consumers can check a view before trusting it."""
+        if seq <= 0:
+            return False
+        return struct.unpack_from("<Q", self._shm.buf, self._slot_offset(seq))[0] == seq
+
+    def close(self) -> None:
+        try:
+            self._shm.close()
+        except BufferError:
+            # A consumer still holds a view into the segment; the mapping
+            # is released when the last view is garbage collected.
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -1,50 +1,254 @@
 """Spawn and supervise the capture subprocess.
 
 The supervisor:
-- creates a :class:`FrameReceiver` bound to an OS-assigned UDP port,
+- with ``transport="udp"`` (default) creates a :class:`FrameReceiver`
+  bound to an OS-assigned UDP port and passes the port to the subprocess;
+  with ``transport="shm"`` picks a unique shared-memory prefix instead and
+  attaches a :class:`ShmFrameReceiver` once the subprocess is ready,
 - spawns ``python -m src.capture.frame_capture`` with the resolved camera
-  indices and the receiver's port as CLI args,
+  indices and the transport arguments as CLI args -- over UDP to a
+  loopback receiver it proposes near-64 KB datagrams, and the subprocess
+  reports the payload size it settled on in its READY line,
 - pumps the subprocess's stderr to our own stderr (with a ``[capture]``
   prefix) and parses the ``READY=1`` / ``READY=0 reason=...`` handshake,
+- turns the subprocess's per-camera ``STATS`` lines, together with the
+  receiver's counters, into :attr:`telemetry` samples (see
+  :mod:`src.capture.telemetry`),
+- keeps the subprocess's stdin open as a control channel
+  (:meth:`set_capture_params` / :meth:`reset_capture_params` /
+  :meth:`set_roi`, see :mod:`src.capture.control`),
 - on stop, sends SIGTERM, waits for ``grace`` seconds, escalates to
   SIGKILL, then tears down the receiver.
+
+With a :class:`~src.capture.workers.WorkerLayout` asking for it, a stereo
+rig gets one capture process per camera (optionally CPU-pinned and at a
+lower priority) instead of one for both. The workers are supervised as a
+unit: the session is ready once every worker has sent ``READY=1``,
+control commands go to the worker(s) owning the camera, stderr lines are
+prefixed per worker, and stop tears all of them down together.
+
+Given a :class:`WarmCapturePool`, :meth:`CaptureSupervisor.start` claims
+a pre-spawned ``--standby`` worker (interpreter up, cv2 imported) and
+hands it the launch arguments over stdin instead of spawning, so starting
+only pays for the camera open. Either way :attr:`startup_timing` records
+how long the handshake took, and it is logged once per start.
+
+Given a :class:`~src.capture.recording.ReplayConfig` instead, no process
+is spawned: a :class:`ReplayFrameReceiver` plays the recording back,
+the control methods are no-ops and :meth:`CaptureSupervisor.is_alive`
+turns False once the last frame has been published.
+:meth:`start_recording` saves a live UDP stream in the same format.
 """
 
 from __future__ import annotations
 
 import collections
+import os
+import secrets
 import subprocess
 import sys
 import threading
-from typing import Deque, List, Optional
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.capture.control import format_reset, format_roi, format_set, format_start
+from src.capture.protocol import MAX_LARGE_PAYLOAD
+from src.capture.telemetry import (
+    DEFAULT_STATS_INTERVAL_S,
+    STATS_PREFIX,
+    CaptureTelemetry,
+    parse_stats_line,
+)
+from src.capture.frame_capture import (
+    SINGLE_CAM_ID,
+    STANDBY_FLAG,
+    STEREO_LEFT_CAM_ID,
+    STEREO_RIGHT_CAM_ID,
+)
+from src.capture.frame_receiver import (
+    BaseFrameReceiver,
+    FrameReceiver,
+    ReplayFrameReceiver,
+    ShmFrameReceiver,
+)
+from src.capture.recording import FrameRecorder, Recording, ReplayConfig
+from src.capture.workers import WorkerLayout, WorkerSpec, plan_workers
+
+
+TRANSPORTS = ("udp", "shm")
+
+_CAPTURE_MODULE = "src.capture.frame_capture"
+
+
+def _spawn_capture(args: List[str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", _CAPTURE_MODULE] + args,
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True,
+        text=True,
+        bufsize=1,
+    )
+
+
+class WarmCapturePool:
+    """Capture workers spawned ahead of time in ``--standby``, so a
+    supervisor can claim one with the interpreter already running and
+    cv2 already imported.
 
-from src.capture.frame_receiver import FrameReceiver
+    A claimed worker is replaced right away; spawning returns immediately
+    and the imports run in the background. Workers exit on their own when
+    stdin closes, so a crashed app doesn't leave them behind.
+    """
+
+    def __init__(self, size: int = 1) -> None:
+        self._size = max(0, int(size))
+        self._lock = threading.Lock()
+        self._workers: List[subprocess.Popen] = []
+        self._closed = False
+
+    def fill(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._workers = [w for w in self._workers if w.poll() is None]
+            while len(self._workers) < self._size:
+                try:
+                    self._workers.append(_spawn_capture([STANDBY_FLAG]))
+                except (OSError, ValueError) as e:
+                    print(f"warning: could not pre-spawn capture worker: {e}")
+                    return
+
+    def take(self) -> Optional[subprocess.Popen]:
+        """A live standby worker (removed from the pool), or None."""
+        with self._lock:
+            worker = None
+            while self._workers:
+                candidate = self._workers.pop(0)
+                if candidate.poll() is None:
+                    worker = candidate
+                    break
+        self.fill()
+        return worker
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            try:
+                if worker.stdin is not None:
+                    worker.stdin.close()
+                worker.wait(timeout=1.0)
+            except (OSError, subprocess.TimeoutExpired):
+                worker.kill()
+
+
+class _CaptureWorker:
+    """One capture subprocess of a session and its handshake state."""
+
+    def __init__(self, spec: WorkerSpec, proc: subprocess.Popen, warm: bool) -> None:
+        self.spec = spec
+        self.proc = proc
+        self.warm = warm
+        self.stderr_thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.ready_ok = False
+        self.ready_reason = ""
+        self.ready_ms: Optional[float] = None
+        self.open_ms: Optional[float] = None
+        self.max_payload: Optional[int] = None
+        self.control_lock = threading.Lock()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
 
 
 class CaptureSupervisor:
-    def __init__(self, camera_indices: List[int]) -> None:
+    def __init__(
+        self,
+        camera_indices: List[int],
+        transport: str = "udp",
+        passthrough: bool = False,
+        warm_pool: Optional[WarmCapturePool] = None,
+        replay: Optional[ReplayConfig] = None,
+        workers: Optional[WorkerLayout] = None,
+    ) -> None:
         if len(camera_indices) not in (1, 2):
             raise ValueError(
                 f"camera_indices must have 1 or 2 entries, got {len(camera_indices)}"
             )
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, got {transport!r}")
+        if passthrough and transport != "udp":
+            raise ValueError("MJPEG passthrough is only supported with the udp transport")
         self._camera_indices: List[int] = [int(i) for i in camera_indices]
-        self._receiver: Optional[FrameReceiver] = None
-        self._proc: Optional[subprocess.Popen] = None
-        self._stderr_thread: Optional[threading.Thread] = None
-        self._ready_event = threading.Event()
-        self._ready_ok = False
-        self._ready_reason = ""
+        self._transport = transport
+        self._passthrough = bool(passthrough)
+        self._warm_pool = warm_pool
+        self._replay = replay
+        self._recorder: Optional[FrameRecorder] = None
+        self._layout = workers or WorkerLayout()
+        self._receiver: Optional[BaseFrameReceiver] = None
+        self._workers: List[_CaptureWorker] = []
         self._stderr_lines: Deque[str] = collections.deque(maxlen=50)
         self._stderr_lock = threading.Lock()
+        self._max_payload: Optional[int] = None
+        self._telemetry = CaptureTelemetry()
+        self._start_called_at = 0.0
+        self._startup_timing: Dict[str, float] = {}
 
     @property
-    def receiver(self) -> FrameReceiver:
+    def transport(self) -> str:
+        return self._transport
+
+    @property
+    def telemetry(self) -> CaptureTelemetry:
+        """Per-camera health samples, one per camera per second: use
+        ``telemetry.snapshot()`` for the latest and ``telemetry.history()``
+        for the rolling window."""
+        return self._telemetry
+
+    @property
+    def max_payload(self) -> Optional[int]:
+        """UDP payload bytes per datagram the subprocess settled on (the
+        smallest across workers), or None before READY / with the shm
+        transport."""
+        return self._max_payload
+
+    @property
+    def startup_timing(self) -> Dict[str, float]:
+        """How the last :meth:`start` went: ``warm`` (1.0 if only standby
+        workers were claimed), ``handshake_ms`` (start call to the last
+        READY), ``open_ms`` (the slowest worker's own camera + sink setup
+        time) and ``workers``. Empty before READY."""
+        return dict(self._startup_timing)
+
+    @property
+    def passthrough(self) -> bool:
+        return self._passthrough
+
+    @property
+    def receiver(self) -> BaseFrameReceiver:
         if self._receiver is None:
             raise RuntimeError("CaptureSupervisor not started")
         return self._receiver
 
+    @property
+    def replay(self) -> Optional[ReplayConfig]:
+        return self._replay
+
+    @property
+    def workers(self) -> WorkerLayout:
+        return self._layout
+
     def is_alive(self) -> bool:
-        return self._proc is not None and self._proc.poll() is None
+        if self._replay is not None:
+            # A replay ends with its last frame, like a capture process exiting.
+            receiver = self._receiver
+            return isinstance(receiver, ReplayFrameReceiver) and not receiver.finished.is_set()
+        return bool(self._workers) and all(worker.alive() for worker in self._workers)
 
     def last_stderr_lines(self, n: int = 10) -> List[str]:
         with self._stderr_lock:
@@ -52,112 +256,329 @@ class CaptureSupervisor:
         return lines[-n:]
 
     def start(self, timeout: float = 5.0) -> None:
-        if self._receiver is not None or self._proc is not None:
+        if self._receiver is not None or self._workers:
             raise RuntimeError("CaptureSupervisor already started")
 
-        receiver = FrameReceiver(host="127.0.0.1", port=0)
-        receiver.start()
-        self._receiver = receiver
-        port = receiver.actual_port
-
-        argv = [
-            sys.executable,
-            "-m",
-            "src.capture.frame_capture",
-            "--cam0",
-            str(self._camera_indices[0]),
-            "--port",
-            str(port),
-        ]
-        if len(self._camera_indices) == 2:
-            argv += ["--cam1", str(self._camera_indices[1])]
+        self._start_called_at = time.monotonic()
+        self._startup_timing = {}
+        if self._replay is not None:
+            self._start_replay(self._replay)
+            return
 
         try:
-            self._proc = subprocess.Popen(
-                argv,
-                stderr=subprocess.PIPE,
-                stdout=subprocess.DEVNULL,
-                start_new_session=True,
-                text=True,
-                bufsize=1,
+            specs = plan_workers(self._camera_indices, self._cam_ids(), self._layout)
+        except ValueError as e:
+            raise RuntimeError(f"bad capture worker layout: {e}") from e
+        common = [
+            "--control-stdin",
+            "--stats-interval",
+            str(DEFAULT_STATS_INTERVAL_S),
+        ]
+
+        shm_prefix = None
+        if self._transport == "udp":
+            receiver = FrameReceiver(host="127.0.0.1", port=0)
+            receiver.start()
+            self._receiver = receiver
+            common += ["--port", str(receiver.actual_port)]
+            # Our receiver is always on loopback; the subprocess checks
+            # that too before going above the Ethernet-sized default.
+            common += ["--max-payload", str(MAX_LARGE_PAYLOAD)]
+            if self._passthrough:
+                common.append("--passthrough")
+        else:
+            # The rings only exist once the subprocess is up, so the
+            # receiver is attached after the READY handshake below. Ring
+            # names carry the cam_id, so per-camera workers share a prefix.
+            shm_prefix = f"eyec_{os.getpid()}_{secrets.token_hex(4)}"
+            common += ["--transport", "shm", "--shm-prefix", shm_prefix]
+
+        for spec in specs:
+            args = spec.args + common
+            proc = self._claim_warm_worker(args)
+            warm = proc is not None
+            try:
+                if proc is None:
+                    proc = _spawn_capture(args)
+            except (OSError, ValueError) as e:
+                self.stop()
+                raise RuntimeError(f"failed to spawn capture process: {e}") from e
+            worker = _CaptureWorker(spec, proc, warm)
+            worker.stderr_thread = threading.Thread(
+                target=self._pump_stderr,
+                args=(worker,),
+                daemon=True,
+                name=f"{spec.label.replace(' ', '-')}-stderr-pump",
             )
-        except (OSError, ValueError) as e:
-            receiver.stop()
-            self._receiver = None
-            raise RuntimeError(f"failed to spawn capture process: {e}") from e
+            self._workers.append(worker)
+            worker.stderr_thread.start()
+
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            if not worker.ready.wait(timeout=max(0.0, deadline - time.monotonic())):
+                tail = self.last_stderr_lines(5)
+                self.stop()
+                raise RuntimeError(
+                    f"capture process did not signal ready within {timeout}s. "
+                    f"Last stderr lines: {tail}"
+                )
+            if not worker.ready_ok:
+                reason = worker.ready_reason or "capture process failed to start"
+                if len(self._workers) > 1:
+                    reason = f"{worker.spec.label}: {reason}"
+                self.stop()
+                raise RuntimeError(reason)
+
+        self._record_startup()
+
+        if shm_prefix is not None:
+            try:
+                receiver = ShmFrameReceiver(shm_prefix, self._cam_ids())
+            except (OSError, ValueError) as e:
+                self.stop()
+                raise RuntimeError(f"failed to attach capture shared memory: {e}") from e
+            receiver.start()
+            self._receiver = receiver
 
-        self._stderr_thread = threading.Thread(
-            target=self._pump_stderr, daemon=True, name="capture-stderr-pump"
-        )
-        self._stderr_thread.start()
+    def _record_startup(self) -> None:
+        """Aggregate the workers' READY lines into one session."""
+        workers = self._workers
+        payloads = [w.max_payload for w in workers if w.max_payload is not None]
+        self._max_payload = min(payloads) if payloads else None
+        warm = all(w.warm for w in workers)
+        timing = {
+            "warm": 1.0 if warm else 0.0,
+            "handshake_ms": max(w.ready_ms or 0.0 for w in workers),
+            "workers": float(len(workers)),
+        }
+        opened = [w.open_ms for w in workers if w.open_ms is not None]
+        if opened:
+            timing["open_ms"] = max(opened)
+        self._startup_timing = timing
 
-        if not self._ready_event.wait(timeout=timeout):
-            tail = self.last_stderr_lines(5)
-            self.stop()
+        detail = "warm worker" if warm else "cold start"
+        if len(workers) > 1:
+            detail = f"{len(workers)} workers, " + ("warm" if warm else "cold start")
+        if opened:
+            detail += f", cameras opened in {timing['open_ms']:.0f} ms"
+        try:
+            sys.stderr.write(f"[capture] ready in {timing['handshake_ms']:.0f} ms ({detail})\n")
+        except OSError:
+            pass
+
+    def _start_replay(self, replay: ReplayConfig) -> None:
+        try:
+            recording = Recording(replay.path)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"cannot open capture recording: {e}") from e
+        unexpected = set(recording.cam_ids()) - set(self._cam_ids())
+        if unexpected or not len(recording):
+            recording.close()
             raise RuntimeError(
-                f"capture process did not signal ready within {timeout}s. "
-                f"Last stderr lines: {tail}"
+                f"recording {replay.path} has cam_ids {recording.cam_ids()}, "
+                f"expected {self._cam_ids()}"
+            )
+        try:
+            receiver = ReplayFrameReceiver(recording, pacing=replay.pacing, fps=replay.fps)
+        except ValueError as e:
+            recording.close()
+            raise RuntimeError(f"bad replay settings: {e}") from e
+        receiver.start()
+        self._receiver = receiver
+
+    def start_recording(self, path: str) -> FrameRecorder:
+        """Save every frame received from now on to ``path`` (see
+        :mod:`src.capture.recording`) until :meth:`stop_recording`. Needs
+        the udp transport: shared memory carries raw pixels, not JPEG."""
+        if not isinstance(self._receiver, FrameReceiver):
+            raise RuntimeError("recording needs a running udp capture session")
+        self.stop_recording()
+        try:
+            recorder = FrameRecorder(path)
+        except OSError as e:
+            raise RuntimeError(f"cannot create capture recording: {e}") from e
+        self._recorder = recorder
+        self._receiver.set_recorder(recorder)
+        return recorder
+
+    def stop_recording(self) -> None:
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return
+        if isinstance(self._receiver, FrameReceiver):
+            self._receiver.set_recorder(None)
+        recorder.close()
+
+    def _claim_warm_worker(self, args: List[str]) -> Optional[subprocess.Popen]:
+        """A standby worker from the pool, already handed ``args``; None to
+        spawn cold (no pool, pool empty, or the worker died meanwhile)."""
+        if self._warm_pool is None:
+            return None
+        worker = self._warm_pool.take()
+        if worker is None or worker.stdin is None:
+            return None
+        try:
+            worker.stdin.write(format_start(args) + "\n")
+            worker.stdin.flush()
+        except (OSError, ValueError):
+            worker.kill()
+            return None
+        return worker
+
+    def set_capture_params(
+        self,
+        fps: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        jpeg_quality: Optional[int] = None,
+    ) -> bool:
+        """Change capture parameters of the running subprocess. Only the
+        given ones change. Returns False if the command could not be
+        delivered (not started, or the subprocess is gone -- which
+        :func:`assert_capture_alive` reports separately)."""
+        params = {
+            key: int(value)
+            for key, value in (
+                ("fps", fps),
+                ("width", width),
+                ("height", height),
+                ("jpeg_quality", jpeg_quality),
             )
+            if value is not None
+        }
+        if not params:
+            return True
+        return self._send_control(format_set(**params))
 
-        if not self._ready_ok:
-            reason = self._ready_reason
-            self.stop()
-            raise RuntimeError(reason or "capture process failed to start")
+    def reset_capture_params(self) -> bool:
+        """Restore the parameters the subprocess was launched with."""
+        return self._send_control(format_reset())
 
-    def _pump_stderr(self) -> None:
-        proc = self._proc
-        if proc is None or proc.stderr is None:
+    def set_roi(self, cam_id: int, box: Optional[Tuple[int, int, int, int]]) -> bool:
+        """Stream only a padded crop around ``box`` (x, y, w, h in
+        full-frame pixels) for ``cam_id``, or full frames again for None.
+        Only the UDP re-encoding path crops; see :mod:`src.capture.roi`."""
+        return self._send_control(format_roi(cam_id, box), cam_id=cam_id)
+
+    def _send_control(self, line: str, cam_id: Optional[int] = None) -> bool:
+        """Write ``line`` to every worker, or only to the one publishing
+        ``cam_id``. False unless all of them took it."""
+        targets = [
+            worker
+            for worker in self._workers
+            if cam_id is None or cam_id in worker.spec.cam_ids
+        ]
+        if not targets:
+            return False
+        delivered = True
+        for worker in targets:
+            stdin = worker.proc.stdin
+            if stdin is None:
+                delivered = False
+                continue
+            with worker.control_lock:
+                try:
+                    stdin.write(line + "\n")
+                    stdin.flush()
+                except (OSError, ValueError):
+                    # Broken pipe, or stdin already closed by stop().
+                    delivered = False
+        return delivered
+
+    def _cam_ids(self) -> List[int]:
+        """Wire-protocol cam_ids the subprocess will publish under."""
+        if len(self._camera_indices) == 1:
+            return [SINGLE_CAM_ID]
+        return [STEREO_LEFT_CAM_ID, STEREO_RIGHT_CAM_ID]
+
+    def _pump_stderr(self, worker: _CaptureWorker) -> None:
+        stream = worker.proc.stderr
+        if stream is None:
             return
-        for raw in proc.stderr:
+        prefix = f"[{worker.spec.label}] "
+        for raw in stream:
             line = raw.rstrip()
+            if line.startswith(STATS_PREFIX + " "):
+                # Periodic and parsed; kept out of the log and the tail.
+                self._handle_stats(line)
+                continue
             with self._stderr_lock:
-                self._stderr_lines.append(line)
+                self._stderr_lines.append(prefix + line if len(self._workers) > 1 else line)
             try:
-                sys.stderr.write(f"[capture] {line}\n")
+                sys.stderr.write(prefix + line + "\n")
                 sys.stderr.flush()
             except OSError:
                 pass
-            if not self._ready_event.is_set() and line.startswith("READY="):
-                self._handle_ready(line)
+            if not worker.ready.is_set() and line.startswith("READY="):
+                self._handle_ready(worker, line)
 
-    def _handle_ready(self, line: str) -> None:
+    def _handle_stats(self, line: str) -> None:
+        try:
+            cam_id, values = parse_stats_line(line)
+        except ValueError:
+            return
+        receiver = self._receiver
+        received = pool = None
+        if receiver is not None:
+            received = receiver.receive_counters(cam_id)
+            pool = receiver.pool_stats().get(cam_id)
+        self._telemetry.record(cam_id, values, received, pool=pool)
+
+    def _handle_ready(self, worker: _CaptureWorker, line: str) -> None:
+        worker.ready_ms = 1000.0 * (time.monotonic() - self._start_called_at)
         if line.startswith("READY=1"):
-            self._ready_ok = True
-            self._ready_event.set()
+            for field in line.split()[1:]:
+                key, _, value = field.partition("=")
+                if key == "payload" and value.isdigit():
+                    worker.max_payload = int(value)
+                elif key == "open_ms" and value.isdigit():
+                    worker.open_ms = float(value)
+            worker.ready_ok = True
+            worker.ready.set()
             return
         if line.startswith("READY=0"):
-            self._ready_ok = False
+            worker.ready_ok = False
             after = line[len("READY=0") :].strip()
             if after.startswith("reason="):
-                self._ready_reason = after[len("reason=") :]
+                worker.ready_reason = after[len("reason=") :]
             else:
-                self._ready_reason = after
-            self._ready_event.set()
+                worker.ready_reason = after
+            worker.ready.set()
 
     def stop(self, grace: float = 2.0) -> None:
-        proc = self._proc
-        if proc is not None:
-            if proc.poll() is None:
+        self.stop_recording()
+        workers, self._workers = self._workers, []
+        # Every worker gets the signal before any is waited on, so a
+        # stereo session shuts down in one grace period, not one per camera.
+        for worker in workers:
+            if worker.proc.stdin is not None:
+                with worker.control_lock:
+                    try:
+                        worker.proc.stdin.close()
+                    except OSError:
+                        pass
+            if worker.alive():
                 try:
-                    proc.terminate()
+                    worker.proc.terminate()
                 except OSError:
                     pass
+        deadline = time.monotonic() + grace
+        for worker in workers:
+            try:
+                worker.proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
                 try:
-                    proc.wait(timeout=grace)
+                    worker.proc.kill()
+                except OSError:
+                    pass
+                try:
+                    worker.proc.wait(timeout=1.0)
                 except subprocess.TimeoutExpired:
-                    try:
-                        proc.kill()
-                    except OSError:
-                        pass
-                    try:
-                        proc.wait(timeout=1.0)
-                    except subprocess.TimeoutExpired:
-                        pass
-            self._proc = None
+                    pass
 
-        if self._stderr_thread is not None:
-            self._stderr_thread.join(timeout=1.0)
-            self._stderr_thread = None
+        for worker in workers:
+            if worker.stderr_thread is not None:
+                worker.stderr_thread.join(timeout=1.0)
 
         if self._receiver is not None:
             self._receiver.stop()
@@ -0,0 +1,236 @@
+"""Per-camera health statistics for the capture pipeline.
+
+Three places know something about a frame's journey:
+
+- the capture process (camera rate, encode time, bytes and packets sent)
+  counts in a :class:`CaptureCounters` per camera and reports once per
+  interval on stderr as a ``STATS`` line (:func:`format_stats_line`);
+- the receiver counts packets, completed frames and drops per camera in
+  :class:`ReceiveCounters` (:class:`src.capture.protocol.Reassembler` for
+  UDP) plus decode time and capture-to-delivery latency;
+- :class:`CaptureTelemetry`, owned by the supervisor, merges each
+  ``STATS`` line with the receive counters for the same interval into one
+  sample per camera and keeps a rolling history.
+
+Reading one sample: ``capture_fps`` well under the configured rate points
+at the camera; ``sent_fps`` under ``capture_fps`` at the encoder or an
+idle throttle; ``delivered_fps`` under ``sent_fps`` (with drops) at the
+transport; ``never_decoded`` climbing means the mode loop can't keep up;
+``pool_misses`` that keep coming after start-up (with ``pool_outstanding``
+growing) mean frame buffers are leased and never given back (see
+:mod:`src.capture.buffer_pool`).
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+
+STATS_PREFIX = "STATS"
+DEFAULT_STATS_INTERVAL_S = 1.0
+DEFAULT_HISTORY_LEN = 120
+
+
+def format_stats_line(cam_id: int, values: Mapping[str, float]) -> str:
+    """``STATS cam=<id> key=value ...`` (without the trailing newline)."""
+    fields = [f"{key}={value:.6g}" for key, value in values.items()]
+    return " ".join([STATS_PREFIX, f"cam={int(cam_id)}"] + fields)
+
+
+def parse_stats_line(line: str) -> Tuple[int, Dict[str, float]]:
+    """Decode a ``STATS`` line into (cam_id, values). Raises ValueError on
+    anything malformed."""
+    parts = line.split()
+    if not parts or parts[0] != STATS_PREFIX:
+        raise ValueError(f"not a {STATS_PREFIX} line: {line!r}")
+    cam_id: Optional[int] = None
+    values: Dict[str, float] = {}
+    for field in parts[1:]:
+        key, sep, raw = field.partition("=")
+        if not sep:
+            raise ValueError(f"malformed field {field!r}; expected key=value")
+        try:
+            if key == "cam":
+                cam_id = int(raw)
+            else:
+                values[key] = float(raw)
+        except ValueError:
+            raise ValueError(f"{key} must be numeric, got {raw!r}") from None
+    if cam_id is None:
+        raise ValueError(f"{STATS_PREFIX} line without cam=")
+    return cam_id, values
+
+
+class CaptureCounters:
+    """Capture-process counters for one camera, owned by its camera thread.
+
+    :meth:`report` turns the counts since the previous report into rates
+    and means once ``interval`` seconds have passed.
+    """
+
+    __slots__ = ("grabbed", "sent", "encode_s", "bytes", "packets", "send_errors", "_since", "_interval")
+
+    def __init__(self, interval: float = DEFAULT_STATS_INTERVAL_S, now: Optional[float] = None) -> None:
+        self._interval = interval
+        self._since = time.monotonic() if now is None else now
+        self._clear()
+
+    def _clear(self) -> None:
+        self.grabbed = 0
+        self.sent = 0
+        self.encode_s = 0.0
+        self.bytes = 0
+        self.packets = 0
+        self.send_errors = 0
+
+    def report(self, now: float) -> Optional[Dict[str, float]]:
+        elapsed = now - self._since
+        if self._interval <= 0 or elapsed < self._interval:
+            return None
+        sent = max(1, self.sent)
+        values = {
+            "capture_fps": self.grabbed / elapsed,
+            "sent_fps": self.sent / elapsed,
+            "encode_ms": 1000.0 * self.encode_s / sent,
+            "frame_bytes": self.bytes / sent,
+            "packets_per_s": self.packets / elapsed,
+            "send_errors": float(self.send_errors),
+        }
+        self._since = now
+        self._clear()
+        return values
+
+
+class ReceiveCounters:
+    """Cumulative receive-side counters for one camera. Written by the
+    receiver thread only; readers take a :meth:`copy`."""
+
+    __slots__ = (
+        "packets",
+        "frames",
+        "pruned",
+        "stragglers",
+        "superseded",
+        "rejected",
+        "recovered",
+        "decoded",
+        "decode_s",
+        "never_decoded",
+        "latency_s",
+        "latency_max_s",
+    )
+
+    def __init__(self) -> None:
+        self.packets = 0
+        # Completed / published frames.
+        self.frames = 0
+        # Incomplete frames dropped by TTL.
+        self.pruned = 0
+        # Packets of frames already delivered (or older).
+        self.stragglers = 0
+        # Incomplete frames dropped because a newer one completed first.
+        self.superseded = 0
+        # Malformed, duplicate or misplaced packets.
+        self.rejected = 0
+        # Frames rebuilt from FEC parity after losing data packets.
+        self.recovered = 0
+        # Decode accounting, taken when a frame leaves the history.
+        self.decoded = 0
+        self.decode_s = 0.0
+        self.never_decoded = 0
+        # Capture timestamp -> publish, summed over frames.
+        self.latency_s = 0.0
+        self.latency_max_s = 0.0
+
+    def copy(self) -> "ReceiveCounters":
+        other = ReceiveCounters()
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+
+class CaptureTelemetry:
+    """Merged per-camera samples plus a rolling history.
+
+    Each ``STATS`` line from the capture process triggers one sample for
+    its camera: the capture-side values as reported, and the receive-side
+    counters turned into rates / means over the time since that camera's
+    previous sample. Thread-safe.
+    """
+
+    def __init__(self, history_len: int = DEFAULT_HISTORY_LEN) -> None:
+        self._lock = threading.Lock()
+        self._latest: Dict[int, Dict[str, float]] = {}
+        self._history: Deque[Dict[str, float]] = deque(maxlen=history_len)
+        # cam_id -> (sample time, receive counters at that time)
+        self._previous: Dict[int, Tuple[float, ReceiveCounters]] = {}
+        # cam_id -> buffer pool misses at the previous sample
+        self._pool_misses: Dict[int, int] = {}
+
+    def record(
+        self,
+        cam_id: int,
+        capture: Mapping[str, float],
+        received: Optional[ReceiveCounters],
+        now: Optional[float] = None,
+        pool: Optional[Mapping[str, int]] = None,
+    ) -> Dict[str, float]:
+        """Build, store and return the sample for one ``STATS`` report.
+        ``pool`` is the camera's :meth:`BufferPool.stats`, if it has one."""
+        if now is None:
+            now = time.monotonic()
+        sample: Dict[str, float] = {"cam": float(cam_id), "t": now}
+        sample.update(capture)
+        with self._lock:
+            if received is not None:
+                previous = self._previous.get(cam_id)
+                if previous is not None:
+                    sample.update(_receive_rates(previous[1], received, now - previous[0]))
+                self._previous[cam_id] = (now, received.copy())
+            if pool is not None:
+                misses = pool["misses"]
+                sample["pool_misses"] = float(misses - self._pool_misses.get(cam_id, 0))
+                sample["pool_outstanding"] = float(pool["outstanding"])
+                self._pool_misses[cam_id] = misses
+            self._latest[cam_id] = sample
+            self._history.append(sample)
+        return dict(sample)
+
+    def snapshot(self) -> Dict[int, Dict[str, float]]:
+        """Latest sample per camera."""
+        with self._lock:
+            return {cam_id: dict(sample) for cam_id, sample in self._latest.items()}
+
+    def history(self, cam_id: Optional[int] = None) -> List[Dict[str, float]]:
+        """Samples oldest first, optionally for one camera only."""
+        with self._lock:
+            return [
+                dict(sample)
+                for sample in self._history
+                if cam_id is None or sample["cam"] == cam_id
+            ]
+
+
+def _receive_rates(before: ReceiveCounters, after: ReceiveCounters, elapsed: float) -> Dict[str, float]:
+    elapsed = max(elapsed, 1e-9)
+    frames = after.frames - before.frames
+    decoded = after.decoded - before.decoded
+    return {
+        "packets_received_per_s": (after.packets - before.packets) / elapsed,
+        "delivered_fps": frames / elapsed,
+        "ttl_pruned": float(after.pruned - before.pruned),
+        "stragglers": float(after.stragglers - before.stragglers),
+        "superseded": float(after.superseded - before.superseded),
+        "rejected": float(after.rejected - before.rejected),
+        "fec_recovered": float(after.recovered - before.recovered),
+        "decode_ms": 1000.0 * (after.decode_s - before.decode_s) / decoded if decoded else 0.0,
+        "never_decoded": float(after.never_decoded - before.never_decoded),
+        "latency_ms": 1000.0 * (after.latency_s - before.latency_s) / frames if frames else 0.0,
+        "latency_max_ms": 1000.0 * after.latency_max_s,
+    }
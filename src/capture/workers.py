@@ -0,0 +1,99 @@
+"""How the capture work is split over processes and scheduled.
+
+By default one capture process reads both cameras of a stereo rig, with
+one thread each. Under heavy inference load the two cameras' read and
+encode work then competes with each other and with the desktop for the
+same cores. A :class:`WorkerLayout` can instead ask for one process per
+camera (each publishing under its own stereo cam_id to the same
+receiver), pin workers to CPU sets and lower their scheduling priority,
+so per-camera frame rates stay predictable.
+
+:func:`plan_workers` turns a layout into the launch arguments of each
+worker; :class:`src.capture.supervisor.CaptureSupervisor` spawns and
+supervises them as one unit.
+
+Pure Python like :mod:`src.capture.protocol`, so it can be unit-tested
+without OpenCV.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Sequence, Tuple
+
+
+class WorkerLayout(NamedTuple):
+    # One capture process per camera instead of one for both.
+    per_camera: bool = False
+    # CPU sets, one per worker (or a single set shared by all); empty: no
+    # pinning.
+    cpus: Tuple[Tuple[int, ...], ...] = ()
+    # Added to the workers' nice value; positive yields to inference.
+    nice: int = 0
+
+
+class WorkerSpec(NamedTuple):
+    # Log prefix for the worker's stderr lines.
+    label: str
+    # Wire-protocol cam_ids the worker publishes under.
+    cam_ids: Tuple[int, ...]
+    # Camera and scheduling arguments for src.capture.frame_capture.
+    args: List[str]
+
+
+def parse_cpu_list(text: str) -> Tuple[int, ...]:
+    """``"0-2,5"`` -> (0, 1, 2, 5). Raises ValueError on anything else."""
+    cpus = set()
+    for part in str(text).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        try:
+            first = int(lo)
+            last = int(hi) if sep else first
+        except ValueError:
+            raise ValueError(f"bad CPU list entry {part!r}") from None
+        if first < 0 or last < first:
+            raise ValueError(f"bad CPU range {part!r}")
+        cpus.update(range(first, last + 1))
+    if not cpus:
+        raise ValueError("empty CPU list")
+    return tuple(sorted(cpus))
+
+
+def format_cpu_list(cpus: Sequence[int]) -> str:
+    return ",".join(str(int(cpu)) for cpu in sorted(set(cpus)))
+
+
+def plan_workers(
+    camera_indices: Sequence[int],
+    cam_ids: Sequence[int],
+    layout: WorkerLayout = WorkerLayout(),
+) -> List[WorkerSpec]:
+    """One :class:`WorkerSpec` per capture process for these cameras;
+    ``cam_ids`` are the wire ids that go with ``camera_indices``."""
+    if len(camera_indices) != len(cam_ids):
+        raise ValueError("camera_indices and cam_ids must pair up")
+    if layout.per_camera and len(camera_indices) > 1:
+        groups = [([index], [cam_id]) for index, cam_id in zip(camera_indices, cam_ids)]
+    else:
+        groups = [(list(camera_indices), list(cam_ids))]
+    if layout.cpus and len(layout.cpus) not in (1, len(groups)):
+        raise ValueError(
+            f"{len(layout.cpus)} CPU sets for {len(groups)} capture worker(s); "
+            "give one per worker or one for all"
+        )
+    specs = []
+    for n, (indices, ids) in enumerate(groups):
+        args = ["--cam0", str(int(indices[0]))]
+        if len(indices) == 2:
+            args += ["--cam1", str(int(indices[1]))]
+        elif len(groups) > 1:
+            args += ["--cam-id", str(int(ids[0]))]
+        if layout.cpus:
+            args += ["--cpus", format_cpu_list(layout.cpus[n if len(layout.cpus) > 1 else 0])]
+        if layout.nice:
+            args += ["--nice", str(int(layout.nice))]
+        label = "capture" if len(groups) == 1 else f"capture cam{ids[0]}"
+        specs.append(WorkerSpec(label, tuple(ids), args))
+    return specs
@@ -38,7 +38,7 @@ class FacialGestureCalibrationSession:
     """
 
     def __init__(self) -> None:
-        self._provider = FaceLandmarksProvider()
+        self._provider = FaceLandmarksProvider(profile="landmarks+blendshapes")
         self._relax_samples: List[Tuple[float, float, float, float]] = []
         self._left_smirk_samples: List[Tuple[float, float, float, float]] = []
         self._right_smirk_samples: List[Tuple[float, float, float, float]] = []
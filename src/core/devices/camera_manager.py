@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 import cv2
 import numpy as np
 
+from src.capture.service import default_capture_service
 from src.core.devices.camera_model import CameraInfo
 from src.core.devices.stable_camera_id import stable_id_for_index
 
@@ -19,6 +20,9 @@ class CameraManager:
         self._last_scan: List[CameraInfo] = []
 
     def discover_cameras(self) -> List[CameraInfo]:
+        # A capture session kept warm after the last mode or preview would
+        # hold its cameras and make them look busy; it isn't needed now.
+        default_capture_service().release_idle()
         indices = self._candidate_indices()
         cameras = []
         for idx in indices:
@@ -50,6 +54,7 @@ class CameraManager:
                 return cap
             cap.release()
 
+        default_capture_service().release_idle()
         cap = cv2.VideoCapture(index)
         if not cap.isOpened():
             raise RuntimeError(
@@ -2,11 +2,18 @@ import pathlib
 import time
 from typing import Callable, Dict, List, Optional, Tuple
 
-import cv2
 import numpy as np
 
 from src.capture.frame_capture import SINGLE_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
+from src.capture.roi import box_from_corners
 from src.core.devices.camera_identity import warn_if_single_camera_mismatch
 from src.core.modes._viz_helpers import derive_last_action
 from src.core.modes.base import TrackingMode
@@ -15,6 +22,7 @@ from src.core.modes.one_camera_head_pose import (
     _apply_cursor_settings,
     _apply_gesture_settings,
     _build_gesture_controller,
+    _landmarker_delegate_from_settings,
 )
 from src.face_tracking.controllers.gesture import GestureController
 from src.face_tracking.pipelines.face_analysis import FaceAnalysisResult
@@ -145,11 +153,20 @@ class EyeGazeMode(TrackingMode):
         _apply_gaze_controller_settings(controller, settings)
         _apply_gesture_settings(gesture_controller, settings)
 
-        landmarks_provider = FaceLandmarksProvider()
+        # MediaPipe only feeds the gesture controller here.
+        landmarks_provider = FaceLandmarksProvider(
+            profile="landmarks+blendshapes", delegate=_landmarker_delegate_from_settings(settings)
+        )
         screen_bounds = controller.cursor_bounds
 
         try:
-            with capture_session([selected_cameras[0]]) as supervisor:
+            with capture_session(
+                [selected_cameras[0]], **capture_options_from_settings(settings)
+            ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
+                pool = supervisor.receiver.buffer_pool(SINGLE_CAM_ID)
                 last_ts = 0.0
                 while not self._should_stop:
                     if self._paused:
@@ -158,22 +175,35 @@ class EyeGazeMode(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    got = supervisor.receiver.get_latest_bgr(
+                    handle = supervisor.receiver.get_latest_frame(
                         cam_id=SINGLE_CAM_ID, since=last_ts, timeout=0.5
                     )
-                    if got is None:
+                    if handle is None:
+                        continue
+                    last_ts = handle.timestamp
+                    latency.record("receive", handle.timestamp, handle.received_at)
+                    # dlib only needs intensity; the full colour decode is
+                    # left until it has found a face for the normalization
+                    # warp.
+                    frame_gray = handle.image("gray")
+                    if frame_gray is None:
                         continue
-                    frame, last_ts = got
+                    latency.record("decode", handle.timestamp)
 
-                    result = inference.infer_from_frame(frame)
+                    result = inference.infer_from_gray(
+                        frame_gray, lambda: handle.image("full"), pool=pool
+                    )
+                    latency.record("inference", handle.timestamp)
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        roi_feedback.update(SINGLE_CAM_ID, box_from_corners(inference.last_face_box))
                     if result is None:
                         # Skip MediaPipe + cursor work entirely. Only emit a
                         # visualization payload when the badge state changes
                         # or while we're throttled.
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
-                                frame_bgr=frame,
+                                frame=handle,
                                 idle=idle,
                                 screen_bounds=screen_bounds,
                                 force=transitioned,
@@ -188,17 +218,21 @@ class EyeGazeMode(TrackingMode):
                         or gesture_controller.scroll_enabled
                         or gesture_controller._held_button is not None
                     ):
-                        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        observation = landmarks_provider.get_primary_face_observation(rgb)
+                        # Blendshapes don't need full resolution.
+                        with supervisor.receiver.lease_rgb(
+                            handle.cam_id, handle.image("half")
+                        ) as rgb:
+                            observation = landmarks_provider.get_primary_face_observation(rgb)
                         if observation is not None:
                             blendshapes = extract_blendshapes(observation.blendshapes)
                             pre_scroll = gesture_controller.active_scroll_gesture
                             face_analysis = FaceAnalysisResult(
-                                landmarks=observation.landmarks,
+                                landmarks=observation.points,
                                 facial_transformation_matrix=observation.facial_transformation_matrix,
                                 screen_position=None,
                                 angles=None,
                                 blendshapes=blendshapes,
+                                capture_timestamp=handle.timestamp,
                             )
                             gesture_controller.handle_face_analysis(face_analysis, now=time.time())
 
@@ -208,8 +242,9 @@ class EyeGazeMode(TrackingMode):
                     )
                     if target is not None and controller.cursor is not None:
                         controller.cursor.step_towards(*target)
+                        latency.record("cursor", handle.timestamp)
                     self._maybe_emit_visualization(
-                        frame_bgr=frame,
+                        frame=handle,
                         pitch_rad=pitch_rad,
                         yaw_rad=yaw_rad,
                         face_patch_bgr=face_patch_bgr,
@@ -232,7 +267,7 @@ class EyeGazeMode(TrackingMode):
 
     def _maybe_emit_visualization(
         self,
-        frame_bgr,
+        frame,
         pitch_rad: float,
         yaw_rad: float,
         face_patch_bgr,
@@ -252,6 +287,9 @@ class EyeGazeMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         dlib_landmarks = getattr(inference, "last_dlib_landmarks", None)
         face_box = getattr(inference, "last_face_box", None)
@@ -307,7 +345,7 @@ class EyeGazeMode(TrackingMode):
 
     def _emit_idle_visualization(
         self,
-        frame_bgr,
+        frame,
         idle: IdleController,
         screen_bounds,
         force: bool = False,
@@ -320,6 +358,9 @@ class EyeGazeMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         payload = {
             "mode_id": self.id,
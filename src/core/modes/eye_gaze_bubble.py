@@ -5,7 +5,15 @@ from typing import Callable, Dict, List, Optional, Tuple
 import numpy as np
 
 from src.capture.frame_capture import SINGLE_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
+from src.capture.roi import box_from_corners
 from src.core.devices.camera_identity import warn_if_single_camera_mismatch
 from src.core.modes.base import TrackingMode
 from src.core.modes.eye_gaze import _apply_gaze_controller_settings
@@ -110,7 +118,13 @@ class EyeGazeBubbleMode(TrackingMode):
         screen_bounds = controller.cursor_bounds
 
         try:
-            with capture_session([selected_cameras[0]]) as supervisor:
+            with capture_session(
+                [selected_cameras[0]], **capture_options_from_settings(settings)
+            ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
+                pool = supervisor.receiver.buffer_pool(SINGLE_CAM_ID)
                 last_ts = 0.0
                 while not self._should_stop:
                     if self._paused:
@@ -119,19 +133,32 @@ class EyeGazeBubbleMode(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    got = supervisor.receiver.get_latest_bgr(
+                    handle = supervisor.receiver.get_latest_frame(
                         cam_id=SINGLE_CAM_ID, since=last_ts, timeout=0.5
                     )
-                    if got is None:
+                    if handle is None:
                         continue
-                    frame, last_ts = got
+                    last_ts = handle.timestamp
+                    latency.record("receive", handle.timestamp, handle.received_at)
+                    # dlib only needs intensity; the full colour decode is
+                    # left until it has found a face for the normalization
+                    # warp.
+                    frame_gray = handle.image("gray")
+                    if frame_gray is None:
+                        continue
+                    latency.record("decode", handle.timestamp)
 
-                    result = inference.infer_from_frame(frame)
+                    result = inference.infer_from_gray(
+                        frame_gray, lambda: handle.image("full"), pool=pool
+                    )
+                    latency.record("inference", handle.timestamp)
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        roi_feedback.update(SINGLE_CAM_ID, box_from_corners(inference.last_face_box))
                     if result is None:
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
-                                frame_bgr=frame,
+                                frame=handle,
                                 idle=idle,
                                 screen_bounds=screen_bounds,
                                 force=transitioned,
@@ -143,8 +170,10 @@ class EyeGazeBubbleMode(TrackingMode):
                     target = controller.target_from_gaze(yaw_rad=yaw_rad, pitch_rad=pitch_rad)
                     if target is not None and self.gaze_target_callback is not None:
                         self.gaze_target_callback(target[0], target[1])
+                        # The bubble overlay stands in for the cursor here.
+                        latency.record("cursor", handle.timestamp)
                     self._maybe_emit_visualization(
-                        frame_bgr=frame,
+                        frame=handle,
                         pitch_rad=pitch_rad,
                         yaw_rad=yaw_rad,
                         face_patch_bgr=face_patch_bgr,
@@ -161,7 +190,7 @@ class EyeGazeBubbleMode(TrackingMode):
 
     def _maybe_emit_visualization(
         self,
-        frame_bgr,
+        frame,
         pitch_rad: float,
         yaw_rad: float,
         face_patch_bgr,
@@ -178,6 +207,9 @@ class EyeGazeBubbleMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         dlib_landmarks = getattr(inference, "last_dlib_landmarks", None)
         face_box = getattr(inference, "last_face_box", None)
@@ -207,7 +239,7 @@ class EyeGazeBubbleMode(TrackingMode):
 
     def _emit_idle_visualization(
         self,
-        frame_bgr,
+        frame,
         idle: IdleController,
         screen_bounds,
         force: bool = False,
@@ -220,6 +252,9 @@ class EyeGazeBubbleMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         payload = {
             "mode_id": self.id,
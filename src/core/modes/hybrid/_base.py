@@ -5,15 +5,25 @@ import time
 from abc import abstractmethod
 from typing import Callable, Dict, List, Optional, Tuple
 
-import cv2
 import numpy as np
 
 from src.capture.frame_capture import SINGLE_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
 from src.core.modes._viz_helpers import derive_last_action
 from src.core.modes.base import TrackingMode
 from src.core.modes.idle import IdleController, apply_idle_settings
-from src.core.modes.one_camera_head_pose import _build_gesture_controller
+from src.core.modes.one_camera_head_pose import (
+    _build_gesture_controller,
+    _landmarker_delegate_from_settings,
+    _landmarks_provider_from_settings,
+)
 from src.face_tracking.controllers.gesture import GestureController
 from src.face_tracking.pipelines.face_analysis import FaceAnalysisPipeline
 from src.face_tracking.signals.blendshapes import (
@@ -21,6 +31,7 @@ from src.face_tracking.signals.blendshapes import (
     pucker_value,
     tuck_value,
 )
+from src.face_tracking.signals.landmark_points import box_from_points
 
 
 _VIZ_MIN_INTERVAL = 1.0 / 15.0
@@ -90,6 +101,8 @@ class _HybridGazeHeadModeBase(TrackingMode):
             yaw_span=calib_head["yaw_span"],
             pitch_span=calib_head["pitch_span"],
             ema_alpha=calib_head.get("ema_alpha", 0.1),
+            delegate=_landmarker_delegate_from_settings(settings),
+            landmarks_provider=_landmarks_provider_from_settings(settings),
         )
         head_pipeline.calibrate_to_center(calib_head["center_yaw"], calib_head["center_pitch"])
 
@@ -128,7 +141,12 @@ class _HybridGazeHeadModeBase(TrackingMode):
         self._idle = idle
 
         try:
-            with capture_session([selected_cameras[0]]) as supervisor:
+            with capture_session(
+                [selected_cameras[0]], **capture_options_from_settings(settings)
+            ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
                 last_ts = 0.0
                 while not self._should_stop:
                     if self._paused:
@@ -137,28 +155,44 @@ class _HybridGazeHeadModeBase(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    got = supervisor.receiver.get_latest_bgr(
+                    handle = supervisor.receiver.get_latest_frame(
                         cam_id=SINGLE_CAM_ID, since=last_ts, timeout=0.5
                     )
-                    if got is None:
+                    if handle is None:
                         continue
-                    frame, last_ts = got
-
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    result = head_pipeline.analyze(
-                        rgb_frame=rgb,
-                        frame_width=frame.shape[1],
-                        frame_height=frame.shape[0],
-                        screen_width=screen_w,
-                        screen_height=screen_h,
-                    )
+                    last_ts = handle.timestamp
+                    latency.record("receive", handle.timestamp, handle.received_at)
+                    # Head pose runs on the half-size decode and dlib on the
+                    # grayscale one; the full colour frame is only decoded
+                    # once dlib has found a face, or for the preview.
+                    head_frame = handle.image("half")
+                    if head_frame is None:
+                        continue
+                    latency.record("decode", handle.timestamp)
+
+                    with supervisor.receiver.lease_rgb(SINGLE_CAM_ID, head_frame) as rgb:
+                        result = head_pipeline.analyze(
+                            rgb_frame=rgb,
+                            frame_width=head_frame.shape[1],
+                            frame_height=head_frame.shape[0],
+                            screen_width=screen_w,
+                            screen_height=screen_h,
+                            capture_timestamp=handle.timestamp,
+                        )
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        roi_feedback.update(
+                            SINGLE_CAM_ID,
+                            box_from_points(result.landmarks, handle.width, handle.height)
+                            if result is not None
+                            else None,
+                        )
                     if result is None:
                         # Skip the gaze CNN entirely when no head was detected
                         # (it would just fail to find a face anyway).
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
-                                frame_bgr=frame,
+                                frame=handle,
                                 idle=idle,
                                 screen_w=screen_w,
                                 screen_h=screen_h,
@@ -175,7 +209,15 @@ class _HybridGazeHeadModeBase(TrackingMode):
                     gaze_pitch_rad = None
                     gaze_yaw_rad = None
                     face_patch_bgr = None
-                    gz = inference.infer_from_frame(frame)
+                    frame_gray = handle.image("gray")
+                    gz = None
+                    if frame_gray is not None:
+                        gz = inference.infer_from_gray(
+                            frame_gray,
+                            lambda: handle.image("full"),
+                            pool=supervisor.receiver.buffer_pool(SINGLE_CAM_ID),
+                        )
+                    latency.record("inference", handle.timestamp)
                     if gz is not None:
                         gaze_pitch_rad, gaze_yaw_rad, face_patch_bgr, _ = gz
                         t = gaze_controller.target_from_gaze(
@@ -200,9 +242,11 @@ class _HybridGazeHeadModeBase(TrackingMode):
                     if blended_xy is not None:
                         result.screen_position = (int(blended_xy[0]), int(blended_xy[1]))
                     gesture_controller.handle_face_analysis(result, now=time.time())
+                    if result.screen_position is not None:
+                        latency.record("cursor", result.capture_timestamp)
 
                     self._maybe_emit_visualization(
-                        frame_bgr=frame,
+                        frame=handle,
                         result=result,
                         head_xy=head_xy,
                         gaze_xy=gaze_xy,
@@ -248,7 +292,7 @@ class _HybridGazeHeadModeBase(TrackingMode):
 
     def _maybe_emit_visualization(
         self,
-        frame_bgr,
+        frame,
         result,
         head_xy: Optional[Tuple[int, int]],
         gaze_xy: Optional[Tuple[int, int]],
@@ -273,6 +317,9 @@ class _HybridGazeHeadModeBase(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         last_action = derive_last_action(
             last_click_side=gesture_controller._last_click_side,
@@ -347,7 +394,7 @@ class _HybridGazeHeadModeBase(TrackingMode):
             "screen_width": int(screen_w),
             "screen_height": int(screen_h),
             "screen_bounds": tuple(int(v) for v in virtual_bounds),
-            "landmarks": list(result.landmarks) if result.landmarks is not None else None,
+            "landmarks": result.landmarks,
             "facial_transformation_matrix": result.facial_transformation_matrix,
             "yaw_deg": yaw_deg,
             "pitch_deg": pitch_deg,
@@ -374,7 +421,7 @@ class _HybridGazeHeadModeBase(TrackingMode):
 
     def _emit_idle_visualization(
         self,
-        frame_bgr,
+        frame,
         idle: IdleController,
         screen_w: int,
         screen_h: int,
@@ -389,6 +436,9 @@ class _HybridGazeHeadModeBase(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         payload = {
             "mode_id": self.id,
@@ -6,11 +6,17 @@ import pathlib
 import time
 from typing import Callable, Dict, List, Optional, Tuple
 
-import cv2
 import numpy as np
 
 from src.capture.frame_capture import STEREO_LEFT_CAM_ID, STEREO_RIGHT_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
 from src.core.devices.camera_identity import match_stereo_cameras
 from src.core.modes._viz_helpers import derive_last_action
 from src.core.modes.base import TrackingMode
@@ -19,6 +25,7 @@ from src.core.modes.idle import IdleController, apply_idle_settings
 from src.core.modes.one_camera_head_pose import (
     _apply_cursor_settings,
     _build_gesture_controller,
+    _landmarker_delegate_from_settings,
 )
 from src.face_tracking.controllers.gesture import GestureController
 from src.face_tracking.pipelines.stereo_face_analysis import (
@@ -30,6 +37,7 @@ from src.face_tracking.signals.blendshapes import (
     pucker_value,
     tuck_value,
 )
+from src.face_tracking.signals.landmark_points import box_from_points
 from src.ui.overlays.gaze_bubble_overlay import BUBBLE_RADIUS_PX
 
 
@@ -145,6 +153,8 @@ class HybridBubbleLockMode(TrackingMode):
             yaw_span=calib_head["yaw_span"],
             pitch_span=calib_head["pitch_span"],
             ema_alpha=calib_head.get("ema_alpha", 0.25),
+            epipolar_tracking=bool(settings.get("stereo_epipolar_tracking", False)),
+            delegate=_landmarker_delegate_from_settings(settings),
         )
         head_pipeline.calibrate_to_center(
             calib_head["center_yaw"], calib_head["center_pitch"]
@@ -212,8 +222,12 @@ class HybridBubbleLockMode(TrackingMode):
 
         try:
             with capture_session(
-                [selected_cameras[0], selected_cameras[1]]
+                [selected_cameras[0], selected_cameras[1]],
+                **capture_options_from_settings(settings),
             ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
                 since_left = 0.0
                 since_right = 0.0
                 while not self._should_stop:
@@ -223,7 +237,7 @@ class HybridBubbleLockMode(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    pair = supervisor.receiver.get_latest_pair(
+                    pair = supervisor.receiver.get_latest_frame_pair(
                         cam_id_left=STEREO_LEFT_CAM_ID,
                         cam_id_right=STEREO_RIGHT_CAM_ID,
                         timeout=0.5,
@@ -233,21 +247,47 @@ class HybridBubbleLockMode(TrackingMode):
                     )
                     if pair is None:
                         continue
-                    frame_l, frame_r, since_left, since_right = pair
-
-                    rgb_l = cv2.cvtColor(frame_l, cv2.COLOR_BGR2RGB)
-                    rgb_r = cv2.cvtColor(frame_r, cv2.COLOR_BGR2RGB)
-                    result = head_pipeline.analyze(
-                        left_rgb_frame=rgb_l,
-                        right_rgb_frame=rgb_r,
-                        left_frame_width=frame_l.shape[1],
-                        left_frame_height=frame_l.shape[0],
-                        right_frame_width=frame_r.shape[1],
-                        right_frame_height=frame_r.shape[0],
-                        screen_width=screen_w,
-                        screen_height=screen_h,
-                    )
+                    left, right = pair
+                    since_left, since_right = left.timestamp, right.timestamp
+                    captured_at = min(left.timestamp, right.timestamp)
+                    latency.record("receive", captured_at, max(left.received_at, right.received_at))
+                    # Stereo head pose runs on half-size decodes (landmarks
+                    # are normalized; triangulation scales by the full
+                    # capture size). The full left frame is only decoded
+                    # for gaze, i.e. while following.
+                    frame_l = left.image("half")
+                    frame_r = right.image("half")
+                    if frame_l is None or frame_r is None:
+                        continue
+                    latency.record("decode", captured_at)
+
+                    receiver = supervisor.receiver
+                    with receiver.lease_rgb(left.cam_id, frame_l) as rgb_l, receiver.lease_rgb(
+                        right.cam_id, frame_r
+                    ) as rgb_r:
+                        result = head_pipeline.analyze(
+                            left_rgb_frame=rgb_l,
+                            right_rgb_frame=rgb_r,
+                            left_frame_width=left.width,
+                            left_frame_height=left.height,
+                            right_frame_width=right.width,
+                            right_frame_height=right.height,
+                            screen_width=screen_w,
+                            screen_height=screen_h,
+                            capture_timestamp=captured_at,
+                        )
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        for handle, landmarks in (
+                            (left, result.landmarks if result is not None else None),
+                            (right, result.right_landmarks if result is not None else None),
+                        ):
+                            roi_feedback.update(
+                                handle.cam_id,
+                                box_from_points(landmarks, handle.width, handle.height)
+                                if landmarks is not None
+                                else None,
+                            )
                     if result is None:
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
@@ -273,7 +313,14 @@ class HybridBubbleLockMode(TrackingMode):
                     gaze_yaw_rad: Optional[float] = None
                     face_patch_bgr = None
                     if state == _STATE_GAZE_FOLLOW:
-                        gz = inference.infer_from_frame(frame_l)
+                        left_gray = left.image("gray")
+                        gz = None
+                        if left_gray is not None:
+                            gz = inference.infer_from_gray(
+                                left_gray,
+                                lambda: left.image("full"),
+                                pool=receiver.buffer_pool(left.cam_id),
+                            )
                         if gz is not None:
                             gaze_pitch_rad, gaze_yaw_rad, face_patch_bgr, _ = gz
                             t = gaze_controller.target_from_gaze(
@@ -281,6 +328,7 @@ class HybridBubbleLockMode(TrackingMode):
                             )
                             if t is not None:
                                 gaze_target = t
+                    latency.record("inference", captured_at)
 
                     now = time.time()
                     blendshapes = result.blendshapes or {}
@@ -292,6 +340,7 @@ class HybridBubbleLockMode(TrackingMode):
                         if gaze_target is not None and self.gaze_target_callback is not None:
                             self.gaze_target_callback(gaze_target[0], gaze_target[1])
                             last_bubble_target = gaze_target
+                            latency.record("cursor", captured_at)
 
                         # Entry re-arm: only depends on pucker so a high resting
                         # tuck value doesn't prevent the user from ever freezing.
@@ -338,6 +387,7 @@ class HybridBubbleLockMode(TrackingMode):
                             target_y = int(round(frozen_center[1] + bubble_dy))
                             target_x, target_y = cursor.clamp_target(target_x, target_y)
                             cursor.step_towards(target_x, target_y)
+                            latency.record("cursor", captured_at)
 
                         # Exit re-arm: pucker relaxing re-arms exit (pucker-only check
                         # avoids being blocked by a high resting tuck value).
@@ -481,7 +531,7 @@ class HybridBubbleLockMode(TrackingMode):
             "screen_width": int(screen_w),
             "screen_height": int(screen_h),
             "screen_bounds": tuple(int(v) for v in virtual_bounds),
-            "landmarks": list(result.landmarks) if result.landmarks is not None else None,
+            "landmarks": result.landmarks,
             "facial_transformation_matrix": result.facial_transformation_matrix,
             "yaw_deg": yaw_deg,
             "pitch_deg": pitch_deg,
@@ -5,9 +5,9 @@ configurable streak. Mode loops use this to back off from per-frame
 inference work when the user has stepped away.
 
 Designed to live entirely on the tracking thread (no locks; the mode loop
-is the only caller). The Pi-future hook (``set_on_change``) is a single
-callback slot meant for the capture supervisor to subscribe to so it can
-throttle camera FPS over a control channel — left unwired today.
+is the only caller). ``set_on_change`` is a single callback slot; modes
+bind it with :func:`src.capture.session.bind_idle_throttle` so the capture
+process drops its frame rate while idle and restores it on the next face.
 """
 
 import time
@@ -60,11 +60,11 @@ class IdleController:
             time.sleep(self.idle_sleep_s)
 
     def set_on_change(self, callback: Optional[Callable[[bool], None]]) -> None:
-        """Reserved Pi-future hook: a capture supervisor can subscribe here
-        so it gets a True/False call on every active↔idle transition and
-        relay that to the capture subprocess (control channel TBD) to drop
-        camera FPS while idle. Today nothing besides the mode loop observes
-        the idle state."""
+        """Subscribe to active↔idle transitions: ``callback`` gets True on
+        entering idle and False on leaving it, synchronously from
+        :meth:`observe`. Used by :func:`src.capture.session.bind_idle_throttle`
+        to relay the state to the capture subprocess over its control
+        channel. ``None`` unsubscribes."""
         self._on_change = callback
 
     def _fire_change(self, is_idle: bool) -> None:
@@ -1,10 +1,15 @@
 import time
 from typing import Callable, Dict, List, Optional, Tuple
 
-import cv2
-
 from src.capture.frame_capture import SINGLE_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
 from src.core.devices.camera_identity import warn_if_single_camera_mismatch
 from src.core.modes._viz_helpers import derive_last_action
 from src.core.modes.base import TrackingMode
@@ -23,11 +28,14 @@ from src.face_tracking.controllers.blendshape_gesture_constants import (
 )
 from src.face_tracking.controllers.gesture import GestureController
 from src.face_tracking.pipelines.face_analysis import FaceAnalysisPipeline
+from src.face_tracking.providers.face_landmarks import DELEGATES
+from src.face_tracking.providers.roi_landmarks import RoiLandmarksProvider
 from src.face_tracking.signals.blendshapes import (
     compute_smirk_activations,
     pucker_value,
     tuck_value,
 )
+from src.face_tracking.signals.landmark_points import box_from_points
 
 
 _VIZ_MIN_INTERVAL = 1.0 / 15.0
@@ -65,6 +73,24 @@ def _apply_gesture_settings(gesture_controller, settings: dict) -> None:
         gesture_controller.scroll_enabled = bool(settings["scroll_enabled"])
 
 
+def _landmarker_delegate_from_settings(settings: dict) -> str:
+    """``settings["landmarker_delegate"]``: where MediaPipe runs the face
+    landmarker (one of :data:`DELEGATES`), the CPU by default."""
+    delegate = settings.get("landmarker_delegate", "cpu")
+    if delegate not in DELEGATES:
+        print(f"warning: unknown landmarker_delegate {delegate!r}, using cpu")
+        return "cpu"
+    return delegate
+
+
+def _landmarks_provider_from_settings(settings: dict):
+    """A :class:`RoiLandmarksProvider` when ``settings["landmarker_roi"]``
+    is on, else None (the pipeline's own full-frame landmarker)."""
+    if not settings.get("landmarker_roi"):
+        return None
+    return RoiLandmarksProvider(delegate=_landmarker_delegate_from_settings(settings))
+
+
 def _build_gesture_controller(cursor, gesture_calib: Optional[dict]) -> GestureController:
     """Construct the gesture controller, honoring v5 calibration if present."""
     if gesture_calib and gesture_calib.get("version") == _CURRENT_GESTURE_CALIB_VERSION:
@@ -159,6 +185,8 @@ class OneCameraHeadPoseMode(TrackingMode):
             yaw_span=calib["yaw_span"],
             pitch_span=calib["pitch_span"],
             ema_alpha=calib.get("ema_alpha", 0.1),
+            delegate=_landmarker_delegate_from_settings(settings),
+            landmarks_provider=_landmarks_provider_from_settings(settings),
         )
         pipeline.calibrate_to_center(calib["center_yaw"], calib["center_pitch"])
 
@@ -179,7 +207,12 @@ class OneCameraHeadPoseMode(TrackingMode):
         _apply_gesture_settings(gesture_controller, settings)
 
         try:
-            with capture_session([selected_cameras[0]]) as supervisor:
+            with capture_session(
+                [selected_cameras[0]], **capture_options_from_settings(settings)
+            ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
                 last_ts = 0.0
                 while not self._should_stop:
                     if self._paused:
@@ -188,26 +221,43 @@ class OneCameraHeadPoseMode(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    got = supervisor.receiver.get_latest_bgr(
+                    # MediaPipe landmarks are normalized, so the half-size
+                    # decode is all the landmarker needs; the preview gets
+                    # the full frame, decoded only when one is emitted.
+                    handle = supervisor.receiver.get_latest_frame(
                         cam_id=SINGLE_CAM_ID, since=last_ts, timeout=0.5
                     )
-                    if got is None:
+                    if handle is None:
                         continue
-                    frame, last_ts = got
-
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    result = pipeline.analyze(
-                        rgb_frame=rgb,
-                        frame_width=frame.shape[1],
-                        frame_height=frame.shape[0],
-                        screen_width=screen_w,
-                        screen_height=screen_h,
-                    )
+                    last_ts = handle.timestamp
+                    latency.record("receive", handle.timestamp, handle.received_at)
+                    frame = handle.image("half")
+                    if frame is None:
+                        continue
+                    latency.record("decode", handle.timestamp)
+
+                    with supervisor.receiver.lease_rgb(SINGLE_CAM_ID, frame) as rgb:
+                        result = pipeline.analyze(
+                            rgb_frame=rgb,
+                            frame_width=frame.shape[1],
+                            frame_height=frame.shape[0],
+                            screen_width=screen_w,
+                            screen_height=screen_h,
+                            capture_timestamp=handle.timestamp,
+                        )
+                    latency.record("inference", handle.timestamp)
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        roi_feedback.update(
+                            SINGLE_CAM_ID,
+                            box_from_points(result.landmarks, handle.width, handle.height)
+                            if result is not None
+                            else None,
+                        )
                     if result is None:
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
-                                frame_bgr=frame,
+                                frame=handle,
                                 idle=idle,
                                 screen_w=screen_w,
                                 screen_h=screen_h,
@@ -218,8 +268,10 @@ class OneCameraHeadPoseMode(TrackingMode):
                         continue
                     pre_scroll = gesture_controller.active_scroll_gesture
                     gesture_controller.handle_face_analysis(result, now=time.time())
+                    if result.screen_position is not None:
+                        latency.record("cursor", result.capture_timestamp)
                     self._maybe_emit_visualization(
-                        frame_bgr=frame,
+                        frame=handle,
                         result=result,
                         gesture_controller=gesture_controller,
                         pre_scroll=pre_scroll,
@@ -238,7 +290,7 @@ class OneCameraHeadPoseMode(TrackingMode):
 
     def _maybe_emit_visualization(
         self,
-        frame_bgr,
+        frame,
         result,
         gesture_controller: GestureController,
         pre_scroll: Optional[str],
@@ -255,6 +307,9 @@ class OneCameraHeadPoseMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         last_action = derive_last_action(
             last_click_side=gesture_controller._last_click_side,
@@ -304,7 +359,7 @@ class OneCameraHeadPoseMode(TrackingMode):
             "screen_width": int(screen_w),
             "screen_height": int(screen_h),
             "screen_bounds": tuple(int(v) for v in virtual_bounds),
-            "landmarks": list(result.landmarks) if result.landmarks is not None else None,
+            "landmarks": result.landmarks,
             "facial_transformation_matrix": result.facial_transformation_matrix,
             "yaw_deg": yaw_deg,
             "pitch_deg": pitch_deg,
@@ -324,7 +379,7 @@ class OneCameraHeadPoseMode(TrackingMode):
 
     def _emit_idle_visualization(
         self,
-        frame_bgr,
+        frame,
         idle: IdleController,
         screen_w: int,
         screen_h: int,
@@ -344,6 +399,9 @@ class OneCameraHeadPoseMode(TrackingMode):
         if not force and (now - self._last_viz_emit) < _VIZ_MIN_INTERVAL:
             return
         self._last_viz_emit = now
+        frame_bgr = frame.image("full")
+        if frame_bgr is None:
+            return
 
         payload = {
             "mode_id": self.id,
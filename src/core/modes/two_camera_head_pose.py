@@ -3,11 +3,17 @@ import socket
 import time
 from typing import Callable, Dict, List, Optional, Tuple
 
-import cv2
 import numpy as np
 
 from src.capture.frame_capture import STEREO_LEFT_CAM_ID, STEREO_RIGHT_CAM_ID
-from src.capture.session import assert_capture_alive, capture_session
+from src.capture.latency import mode_latency
+from src.capture.session import (
+    assert_capture_alive,
+    bind_idle_throttle,
+    capture_options_from_settings,
+    capture_session,
+    roi_feedback_from_settings,
+)
 from src.core.devices.camera_identity import match_stereo_cameras
 from src.core.modes._viz_helpers import derive_last_action
 from src.core.modes.base import TrackingMode
@@ -16,6 +22,7 @@ from src.core.modes.one_camera_head_pose import (
     _apply_cursor_settings,
     _apply_gesture_settings,
     _build_gesture_controller,
+    _landmarker_delegate_from_settings,
 )
 from src.face_tracking.controllers.gesture import GestureController
 from src.face_tracking.pipelines.stereo_face_analysis import (
@@ -27,6 +34,7 @@ from src.face_tracking.signals.blendshapes import (
     pucker_value,
     tuck_value,
 )
+from src.face_tracking.signals.landmark_points import box_from_points
 
 
 _VIZ_MIN_INTERVAL = 1.0 / 15.0
@@ -151,6 +159,8 @@ class TwoCameraHeadPoseMode(TrackingMode):
             yaw_span=head_calib["yaw_span"],
             pitch_span=head_calib["pitch_span"],
             ema_alpha=head_calib.get("ema_alpha", 0.25),
+            epipolar_tracking=bool(settings.get("stereo_epipolar_tracking", False)),
+            delegate=_landmarker_delegate_from_settings(settings),
         )
         pipeline.calibrate_to_center(head_calib["center_yaw"], head_calib["center_pitch"])
 
@@ -174,8 +184,12 @@ class TwoCameraHeadPoseMode(TrackingMode):
 
         try:
             with capture_session(
-                [selected_cameras[0], selected_cameras[1]]
+                [selected_cameras[0], selected_cameras[1]],
+                **capture_options_from_settings(settings),
             ) as supervisor:
+                bind_idle_throttle(supervisor, idle, settings)
+                roi_feedback = roi_feedback_from_settings(supervisor, settings)
+                latency = mode_latency(self.id)
                 since_left = 0.0
                 since_right = 0.0
                 while not self._should_stop:
@@ -185,7 +199,7 @@ class TwoCameraHeadPoseMode(TrackingMode):
 
                     assert_capture_alive(supervisor)
 
-                    pair = supervisor.receiver.get_latest_pair(
+                    pair = supervisor.receiver.get_latest_frame_pair(
                         cam_id_left=STEREO_LEFT_CAM_ID,
                         cam_id_right=STEREO_RIGHT_CAM_ID,
                         timeout=0.5,
@@ -195,22 +209,49 @@ class TwoCameraHeadPoseMode(TrackingMode):
                     )
                     if pair is None:
                         continue
-                    frame_l, frame_r, since_left, since_right = pair
-
-                    rgb_l = cv2.cvtColor(frame_l, cv2.COLOR_BGR2RGB)
-                    rgb_r = cv2.cvtColor(frame_r, cv2.COLOR_BGR2RGB)
-
-                    result = pipeline.analyze(
-                        left_rgb_frame=rgb_l,
-                        right_rgb_frame=rgb_r,
-                        left_frame_width=frame_l.shape[1],
-                        left_frame_height=frame_l.shape[0],
-                        right_frame_width=frame_r.shape[1],
-                        right_frame_height=frame_r.shape[0],
-                        screen_width=screen_w,
-                        screen_height=screen_h,
-                    )
+                    left, right = pair
+                    since_left, since_right = left.timestamp, right.timestamp
+                    # A pair is as old as its older frame and arrives with
+                    # its newer one.
+                    captured_at = min(left.timestamp, right.timestamp)
+                    latency.record("receive", captured_at, max(left.received_at, right.received_at))
+                    # Landmarks come back normalized, so the landmarker runs
+                    # on half-size decodes while triangulation still scales
+                    # them by the full capture size the intrinsics refer to.
+                    frame_l = left.image("half")
+                    frame_r = right.image("half")
+                    if frame_l is None or frame_r is None:
+                        continue
+                    latency.record("decode", captured_at)
+
+                    receiver = supervisor.receiver
+                    with receiver.lease_rgb(left.cam_id, frame_l) as rgb_l, receiver.lease_rgb(
+                        right.cam_id, frame_r
+                    ) as rgb_r:
+                        result = pipeline.analyze(
+                            left_rgb_frame=rgb_l,
+                            right_rgb_frame=rgb_r,
+                            left_frame_width=left.width,
+                            left_frame_height=left.height,
+                            right_frame_width=right.width,
+                            right_frame_height=right.height,
+                            screen_width=screen_w,
+                            screen_height=screen_h,
+                            capture_timestamp=captured_at,
+                        )
+                    latency.record("inference", captured_at)
                     transitioned = idle.observe(result is not None)
+                    if roi_feedback is not None:
+                        for handle, landmarks in (
+                            (left, result.landmarks if result is not None else None),
+                            (right, result.right_landmarks if result is not None else None),
+                        ):
+                            roi_feedback.update(
+                                handle.cam_id,
+                                box_from_points(landmarks, handle.width, handle.height)
+                                if landmarks is not None
+                                else None,
+                            )
                     if result is None:
                         if transitioned or idle.is_idle:
                             self._emit_idle_visualization(
@@ -226,6 +267,8 @@ class TwoCameraHeadPoseMode(TrackingMode):
                         continue
                     pre_scroll = gesture_controller.active_scroll_gesture
                     gesture_controller.handle_face_analysis(result, now=time.time())
+                    if result.screen_position is not None:
+                        latency.record("cursor", result.capture_timestamp)
                     broadcaster.send(result.depth)
                     self._maybe_emit_visualization(
                         frame_left=frame_l,
@@ -319,8 +362,8 @@ class TwoCameraHeadPoseMode(TrackingMode):
             "screen_width": int(screen_w),
             "screen_height": int(screen_h),
             "screen_bounds": tuple(int(v) for v in virtual_bounds),
-            "landmarks_left": list(result.landmarks) if result.landmarks is not None else None,
-            "landmarks_right": list(result.right_landmarks) if result.right_landmarks is not None else None,
+            "landmarks_left": result.landmarks,
+            "landmarks_right": result.right_landmarks,
             "points_3d": result.points_3d,
             "facial_transformation_matrix": result.facial_transformation_matrix,
             "yaw_deg": yaw_deg,
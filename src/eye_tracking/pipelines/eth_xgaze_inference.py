@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import pathlib
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import cv2
 import dlib
@@ -10,6 +10,7 @@ import torch
 import torch.nn as nn
 from torchvision import transforms
 
+from src.capture.buffer_pool import BufferPool
 from src.eye_tracking.models.xgaze_network import XGazeNetwork
 
 
@@ -255,9 +256,18 @@ class ETHXGazeInference:
         return img_warped, landmarks_warped
 
     @staticmethod
-    def _preprocess(face_patch_bgr: np.ndarray, device: torch.device) -> torch.Tensor:
-        input_rgb = face_patch_bgr[:, :, [2, 1, 0]]
-        tensor = TRANSFORM(input_rgb)
+    def _preprocess(
+        face_patch_bgr: np.ndarray,
+        device: torch.device,
+        pool: Optional[BufferPool] = None,
+    ) -> torch.Tensor:
+        if pool is None:
+            tensor = TRANSFORM(face_patch_bgr[:, :, [2, 1, 0]])
+        else:
+            # The transform copies, so the RGB buffer goes straight back.
+            with pool.lease(face_patch_bgr.shape) as input_rgb:
+                cv2.cvtColor(face_patch_bgr, cv2.COLOR_BGR2RGB, dst=input_rgb)
+                tensor = TRANSFORM(input_rgb)
         tensor = tensor.float().to(device)
         tensor = tensor.view(1, tensor.size(0), tensor.size(1), tensor.size(2))
         return tensor
@@ -265,10 +275,36 @@ class ETHXGazeInference:
     def infer_from_frame(
         self,
         frame_bgr: np.ndarray,
+        frame_gray: Optional[np.ndarray] = None,
     ) -> Optional[Tuple[float, float, np.ndarray, np.ndarray]]:
-        frame_h, frame_w = frame_bgr.shape[:2]
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        detected_faces = self.face_detector(rgb, 0)
+        """Run detection, landmarking and the gaze network on one frame.
+
+        dlib's HOG detector and shape predictor only look at intensity, so
+        callers that already have a grayscale copy of the same frame (e.g.
+        a grayscale JPEG decode) can pass it as ``frame_gray``; only the
+        normalization warp needs ``frame_bgr`` in colour.
+        """
+        if frame_gray is None:
+            frame_gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+        return self.infer_from_gray(frame_gray, lambda: frame_bgr)
+
+    def infer_from_gray(
+        self,
+        frame_gray: np.ndarray,
+        load_bgr: Callable[[], Optional[np.ndarray]],
+        pool: Optional[BufferPool] = None,
+    ) -> Optional[Tuple[float, float, np.ndarray, np.ndarray]]:
+        """:meth:`infer_from_frame` starting from a grayscale frame.
+
+        ``load_bgr`` returns the same frame in colour (same size); it is
+        only called once dlib has found a face, so frames without one never
+        need a colour decode. Returns None if it returns None. Given a
+        ``pool`` (e.g. the receiver's, see
+        :meth:`~src.capture.frame_receiver.BaseFrameReceiver.buffer_pool`),
+        the face patch's RGB conversion uses a leased buffer.
+        """
+        frame_h, frame_w = frame_gray.shape[:2]
+        detected_faces = self.face_detector(frame_gray, 0)
         if len(detected_faces) == 0:
             self.last_dlib_landmarks = None
             self.last_face_box = None
@@ -281,13 +317,17 @@ class ETHXGazeInference:
             int(face_rect.right()),
             int(face_rect.bottom()),
         )
-        shape = self.shape_predictor(frame_bgr, face_rect)
+        shape = self.shape_predictor(frame_gray, face_rect)
         landmarks = self._shape_to_np(shape)
         self.last_dlib_landmarks = landmarks.copy()
 
         landmarks_sub = landmarks[self.LANDMARK_SUBSET, :].astype(np.float64)
         landmarks_sub = landmarks_sub.reshape(6, 1, 2)
 
+        frame_bgr = load_bgr()
+        if frame_bgr is None:
+            return None
+
         camera_matrix = self._camera_matrix(frame_w, frame_h)
         rvec, tvec = self._estimate_head_pose(
             landmarks_sub=landmarks_sub,
@@ -304,7 +344,7 @@ class ETHXGazeInference:
         )
 
         with torch.no_grad():
-            input_tensor = self._preprocess(face_patch, self.device)
+            input_tensor = self._preprocess(face_patch, self.device, pool)
             pred = self.model(input_tensor).squeeze(0).detach().cpu().numpy()
 
         pitch_rad = float(pred[0])
@@ -0,0 +1,164 @@
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.face_tracking.signals.landmark_points import landmarks_to_array
+
+
+def fundamental_from_calibration(calibration) -> np.ndarray:
+    """F with ``x_right^T F x_left = 0`` for undistorted pixel coordinates,
+    from a :class:`StereoCalibration` (right = R * left + T)."""
+    tx, ty, tz = np.asarray(calibration.t, dtype=np.float64).reshape(3)
+    t_cross = np.array([[0.0, -tz, ty], [tz, 0.0, -tx], [-ty, tx, 0.0]])
+    essential = t_cross @ calibration.r
+    return np.linalg.inv(calibration.k2).T @ essential @ np.linalg.inv(calibration.k1)
+
+
+class EpipolarLandmarkTracker:
+    """Follows a few right-camera landmarks between full landmarker runs.
+
+    Stereo only triangulates a handful of landmarks, so the right camera
+    does not need the full 478-point landmarker every frame. After a
+    landmarker run (:meth:`seed`), :meth:`track` finds the same landmarks
+    in the next right frame with pyramidal Lucas-Kanade flow, seeded by
+    sliding each point's last position onto the epipolar line of its
+    left-camera counterpart, and rejects matches that end up more than
+    ``max_epipolar_px`` off that line. The rest of the mesh follows the
+    median motion of the tracked points so visualization and ROI boxes
+    keep a full face.
+
+    :meth:`track` returns None -- run the landmarker and :meth:`seed`
+    again -- every ``refresh_interval`` frames, or when fewer than
+    ``min_inlier_ratio`` of the points pass.
+
+    Distances are in pixels of the full capture size the calibration
+    refers to; the images handed in may be smaller (half-size decodes).
+    """
+
+    def __init__(
+        self,
+        calibration,
+        landmark_indices: Sequence[int],
+        refresh_interval: int = 15,
+        max_epipolar_px: float = 3.0,
+        min_inlier_ratio: float = 0.8,
+        window: int = 21,
+        pyramid_levels: int = 3,
+    ) -> None:
+        if refresh_interval < 1:
+            raise ValueError("refresh_interval must be >= 1.")
+        if not (0.0 < min_inlier_ratio <= 1.0):
+            raise ValueError("min_inlier_ratio must be in the range (0, 1].")
+        self._calibration = calibration
+        self._indices = np.asarray(sorted(landmark_indices), dtype=np.intp)
+        self._fundamental = fundamental_from_calibration(calibration)
+        self.refresh_interval = int(refresh_interval)
+        self.max_epipolar_px = float(max_epipolar_px)
+        self.min_inlier_ratio = float(min_inlier_ratio)
+        self._lk_params = dict(
+            winSize=(int(window), int(window)),
+            maxLevel=int(pyramid_levels),
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+            flags=cv2.OPTFLOW_USE_INITIAL_FLOW,
+        )
+
+        self._prev_gray: Optional[np.ndarray] = None
+        # Normalized (x, y, z) of the whole right mesh, as last seen.
+        self._mesh: Optional[np.ndarray] = None
+        self._tracked_frames = 0
+        self._last_score: Optional[float] = None
+
+    @property
+    def refresh_due(self) -> bool:
+        """Whether the next right frame needs the full landmarker."""
+        return self._prev_gray is None or self._tracked_frames >= self.refresh_interval
+
+    @property
+    def last_score(self) -> Optional[float]:
+        """Fraction of points that passed on the last :meth:`track` call."""
+        return self._last_score
+
+    def reset(self) -> None:
+        self._prev_gray = None
+        self._mesh = None
+        self._tracked_frames = 0
+
+    def seed(self, right_rgb_frame, right_landmarks) -> None:
+        """Start tracking from a full landmarker result on ``right_rgb_frame``."""
+        mesh = landmarks_to_array(right_landmarks).astype(np.float64)
+        if len(mesh) <= int(self._indices[-1]):
+            self.reset()
+            return
+        self._prev_gray = cv2.cvtColor(right_rgb_frame, cv2.COLOR_RGB2GRAY)
+        self._mesh = mesh
+        self._tracked_frames = 0
+
+    def track(
+        self,
+        right_rgb_frame,
+        left_landmarks,
+        left_frame_size: Tuple[int, int],
+        right_frame_size: Tuple[int, int],
+    ) -> Optional[np.ndarray]:
+        """The right mesh for ``right_rgb_frame`` as (N, 3) float32 points,
+        or None when the full landmarker has to run instead. Frame sizes
+        are (width, height) of the full captures."""
+        if self.refresh_due:
+            return None
+        gray = cv2.cvtColor(right_rgb_frame, cv2.COLOR_RGB2GRAY)
+        if gray.shape != self._prev_gray.shape:
+            self.reset()
+            return None
+
+        left_points = landmarks_to_array(left_landmarks)
+        if len(left_points) <= int(self._indices[-1]):
+            return None
+        calib = self._calibration
+        left_w, left_h = left_frame_size
+        right_w, right_h = right_frame_size
+        right_scale = np.array([right_w, right_h], dtype=np.float64)
+        image_scale = np.array([gray.shape[1], gray.shape[0]], dtype=np.float64)
+
+        left_px = left_points[self._indices, :2].astype(np.float64) * (left_w, left_h)
+        lines = self._epipolar_lines(_undistort(left_px, calib.k1, calib.d1))
+
+        # Slide each point's last position onto its new epipolar line and
+        # let the flow search from there.
+        prev_norm = self._mesh[self._indices, :2]
+        prev_px = prev_norm * right_scale
+        prev_und = _undistort(prev_px, calib.k2, calib.d2)
+        offset = _line_distance(lines, prev_und)
+        guess_px = prev_px - offset[:, None] * lines[:, :2]
+
+        p0 = (prev_norm * image_scale).astype(np.float32).reshape(-1, 1, 2)
+        p1 = (guess_px / right_scale * image_scale).astype(np.float32).reshape(-1, 1, 2)
+        p1, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, p0, p1, **self._lk_params)
+        tracked_norm = p1.reshape(-1, 2).astype(np.float64) / image_scale
+
+        residual = np.abs(_line_distance(lines, _undistort(tracked_norm * right_scale, calib.k2, calib.d2)))
+        inliers = (status.reshape(-1) == 1) & (residual <= self.max_epipolar_px)
+        self._last_score = float(np.mean(inliers))
+        if self._last_score < self.min_inlier_ratio:
+            return None
+
+        shift = np.median(tracked_norm[inliers] - prev_norm[inliers], axis=0)
+        self._mesh[:, :2] += shift
+        self._mesh[self._indices[inliers], :2] = tracked_norm[inliers]
+        self._prev_gray = gray
+        self._tracked_frames += 1
+        return self._mesh.astype(np.float32)
+
+    def _epipolar_lines(self, left_undistorted: np.ndarray) -> np.ndarray:
+        homogeneous = np.hstack((left_undistorted, np.ones((len(left_undistorted), 1))))
+        lines = homogeneous @ self._fundamental.T
+        return lines / (np.hypot(lines[:, 0], lines[:, 1])[:, None] + 1e-12)
+
+
+def _undistort(points_px: np.ndarray, k: np.ndarray, d: np.ndarray) -> np.ndarray:
+    return cv2.undistortPoints(points_px.reshape(-1, 1, 2), k, d, P=k).reshape(-1, 2)
+
+
+def _line_distance(lines: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Signed distance of each point to its (normalized) line."""
+    return lines[:, 0] * points[:, 0] + lines[:, 1] * points[:, 1] + lines[:, 2]
@@ -1,23 +1,54 @@
-from dataclasses import dataclass
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 from src.face_tracking.providers.face_landmarks import FaceLandmarksProvider
 from src.face_tracking.signals.blendshapes import extract_blendshapes
 from src.face_tracking.signals.head_pose import HeadPoseSignalMapper
 
 
-@dataclass
 class FaceAnalysisResult:
-    landmarks: Iterable
-    screen_position: Optional[Tuple[int, int]]
-    angles: Optional[Tuple[float, float]]
-    facial_transformation_matrix: Optional[object] = None
-    depth: Optional[float] = None
-    blendshapes: Optional[Dict[str, float]] = None
-    # Stereo-only extras, populated by StereoFaceAnalysisPipeline. Visualizers and
-    # other observers can read them; the regular gesture/cursor logic ignores them.
-    right_landmarks: Optional[Iterable] = None
-    points_3d: Optional[Dict[int, object]] = None
+    """One analysed frame. Landmarks are (N, 3) float32 arrays of
+    normalized points (see src.face_tracking.signals.landmark_points);
+    one of these is built per frame, hence the slots."""
+
+    __slots__ = (
+        "landmarks",
+        "screen_position",
+        "angles",
+        "facial_transformation_matrix",
+        "depth",
+        "blendshapes",
+        "right_landmarks",
+        "points_3d",
+        "capture_timestamp",
+    )
+
+    def __init__(
+        self,
+        landmarks: np.ndarray,
+        screen_position: Optional[Tuple[int, int]],
+        angles: Optional[Tuple[float, float]],
+        facial_transformation_matrix: Optional[object] = None,
+        depth: Optional[float] = None,
+        blendshapes: Optional[Dict[str, float]] = None,
+        right_landmarks: Optional[np.ndarray] = None,
+        points_3d: Optional[Dict[int, object]] = None,
+        capture_timestamp: Optional[float] = None,
+    ) -> None:
+        self.landmarks = landmarks
+        self.screen_position = screen_position
+        self.angles = angles
+        self.facial_transformation_matrix = facial_transformation_matrix
+        self.depth = depth
+        self.blendshapes = blendshapes
+        # Stereo-only extras, populated by StereoFaceAnalysisPipeline. Visualizers and
+        # other observers can read them; the regular gesture/cursor logic ignores them.
+        self.right_landmarks = right_landmarks
+        self.points_3d = points_3d
+        # time.monotonic() at which the analysed frame was captured (the older
+        # of the two for stereo); see src.capture.latency.
+        self.capture_timestamp = capture_timestamp
 
 
 class FaceAnalysisPipeline:
@@ -29,8 +60,18 @@ class FaceAnalysisPipeline:
         pitch_span: float = 10.0,
         ema_alpha: float = 0.25,
         face_model_path: Optional[str] = None,
+        landmarks_provider=None,
+        delegate: str = "cpu",
     ) -> None:
-        self._landmarks_provider = FaceLandmarksProvider(face_model_path=face_model_path)
+        # Any object with FaceLandmarksProvider's get_primary_face_observation /
+        # release, e.g. a StreamedLandmarksProvider for a --landmarks capture node.
+        # Head pose reads the matrix and gestures the blendshapes, so the
+        # default landmarker runs the full profile.
+        if landmarks_provider is None:
+            landmarks_provider = FaceLandmarksProvider(
+                face_model_path=face_model_path, profile="full", delegate=delegate
+            )
+        self._landmarks_provider = landmarks_provider
         self._head_pose_mapper = HeadPoseSignalMapper(
             yaw_span=yaw_span,
             pitch_span=pitch_span,
@@ -44,12 +85,13 @@ class FaceAnalysisPipeline:
         frame_height: int,
         screen_width: int,
         screen_height: int,
+        capture_timestamp: Optional[float] = None,
     ) -> Optional[FaceAnalysisResult]:
         observation = self._landmarks_provider.get_primary_face_observation(rgb_frame)
         if observation is None:
             return None
 
-        landmarks = observation.landmarks
+        landmarks = observation.points
         facial_transformation_matrix = observation.facial_transformation_matrix
         blendshapes = extract_blendshapes(observation.blendshapes)
 
@@ -74,6 +116,7 @@ class FaceAnalysisPipeline:
             screen_position=screen_position,
             angles=angles,
             blendshapes=blendshapes,
+            capture_timestamp=capture_timestamp,
         )
 
     def calibrate_to_center(self, yaw: float, pitch: float) -> None:
@@ -1,3 +1,5 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Sequence, Tuple
@@ -5,9 +7,11 @@ from typing import Dict, Iterable, Optional, Sequence, Tuple
 import cv2
 import numpy as np
 
+from src.face_tracking.pipelines.epipolar_tracking import EpipolarLandmarkTracker
 from src.face_tracking.pipelines.face_analysis import FaceAnalysisResult
-from src.face_tracking.providers.face_landmarks import FaceLandmarksProvider
+from src.face_tracking.providers.face_landmarks import FaceLandmarksObservation, FaceLandmarksProvider
 from src.face_tracking.signals.blendshapes import extract_blendshapes
+from src.face_tracking.signals.landmark_points import landmarks_to_array
 
 
 @dataclass
@@ -226,28 +230,20 @@ class StereoTriangulator:
         right_frame_width: int,
         right_frame_height: int,
     ) -> Dict[int, np.ndarray]:
-        left_list = list(left_landmarks)
-        right_list = list(right_landmarks)
-
-        left_points = []
-        right_points = []
-        valid_indices = []
-
-        for index in self._landmark_indices:
-            if index >= len(left_list) or index >= len(right_list):
-                continue
-
-            lp = left_list[index]
-            rp = right_list[index]
-            left_points.append([float(lp.x) * left_frame_width, float(lp.y) * left_frame_height])
-            right_points.append([float(rp.x) * right_frame_width, float(rp.y) * right_frame_height])
-            valid_indices.append(index)
+        left_all = landmarks_to_array(left_landmarks)
+        right_all = landmarks_to_array(right_landmarks)
+        available = min(len(left_all), len(right_all))
+        valid_indices = [index for index in self._landmark_indices if index < available]
 
         if len(valid_indices) < 5:
             return {}
 
-        left_arr = np.asarray(left_points, dtype=np.float64).reshape(-1, 1, 2)
-        right_arr = np.asarray(right_points, dtype=np.float64).reshape(-1, 1, 2)
+        left_arr = (
+            left_all[valid_indices, :2].astype(np.float64) * (left_frame_width, left_frame_height)
+        ).reshape(-1, 1, 2)
+        right_arr = (
+            right_all[valid_indices, :2].astype(np.float64) * (right_frame_width, right_frame_height)
+        ).reshape(-1, 1, 2)
 
         undistorted_left = cv2.undistortPoints(
             left_arr,
@@ -271,8 +267,41 @@ class StereoTriangulator:
         return {index: points_3d[i] for i, index in enumerate(valid_indices)}
 
 
+@dataclass
+class StereoInferenceTimings:
+    """How long the landmarkers took on the last analysed pair, in ms."""
+
+    left_ms: float
+    right_ms: float
+    # Both observations in hand; about max(left, right) when run in
+    # parallel, their sum otherwise.
+    wall_ms: float
+    # The right landmarks came from the epipolar tracker, not the landmarker.
+    right_tracked: bool = False
+
+
+def _timed_observation(provider, rgb_frame):
+    started = time.perf_counter()
+    observation = provider.get_primary_face_observation(rgb_frame)
+    return observation, (time.perf_counter() - started) * 1000.0
+
+
 class StereoFaceAnalysisPipeline:
-    """Stereo variant of FaceAnalysisPipeline using triangulated 3D landmarks."""
+    """Stereo variant of FaceAnalysisPipeline using triangulated 3D landmarks.
+
+    The two landmarkers run at the same time by default: the right one on a
+    dedicated worker thread, the left one on the caller's. MediaPipe Tasks
+    releases the GIL while its graph runs, so a pair costs about one
+    landmarker's latency instead of two. Each provider stays on one thread,
+    and the left observation still drives pose and gestures.
+
+    With ``epipolar_tracking`` the right camera only runs the landmarker
+    every ``refresh_interval`` frames (or when tracking degrades); in
+    between, an :class:`EpipolarLandmarkTracker` follows the triangulated
+    landmarks, so a pair costs about one landmarker run plus a little flow.
+    Right-side observations then carry no matrix or blendshapes, which
+    nothing downstream reads.
+    """
 
     def __init__(
         self,
@@ -282,9 +311,32 @@ class StereoFaceAnalysisPipeline:
         pitch_span: float = 10.0,
         ema_alpha: float = 0.25,
         face_model_path: Optional[str] = None,
+        parallel_inference: bool = True,
+        epipolar_tracking: bool = False,
+        refresh_interval: int = 15,
+        delegate: str = "cpu",
+        left_landmarks_provider=None,
+        right_landmarks_provider=None,
     ) -> None:
-        self._left_provider = FaceLandmarksProvider(face_model_path=face_model_path)
-        self._right_provider = FaceLandmarksProvider(face_model_path=face_model_path)
+        # Only the left observation's matrix and blendshapes are read; the
+        # right camera just needs points to triangulate.
+        if left_landmarks_provider is None:
+            left_landmarks_provider = FaceLandmarksProvider(
+                face_model_path=face_model_path, profile="full", delegate=delegate
+            )
+        if right_landmarks_provider is None:
+            right_landmarks_provider = FaceLandmarksProvider(
+                face_model_path=face_model_path, profile="landmarks", delegate=delegate
+            )
+        self._left_provider = left_landmarks_provider
+        self._right_provider = right_landmarks_provider
+        self._right_worker: Optional[ThreadPoolExecutor] = None
+        if parallel_inference:
+            self._right_worker = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="stereo-right-landmarker",
+            )
+        self._last_timings: Optional[StereoInferenceTimings] = None
 
         if stereo_calibration is not None:
             calibration = stereo_calibration
@@ -316,6 +368,14 @@ class StereoFaceAnalysisPipeline:
             454,
         }
 
+        self._right_tracker: Optional[EpipolarLandmarkTracker] = None
+        if epipolar_tracking:
+            self._right_tracker = EpipolarLandmarkTracker(
+                calibration=calibration,
+                landmark_indices=sorted(important_indices),
+                refresh_interval=refresh_interval,
+            )
+
         self._triangulator = StereoTriangulator(
             calibration=calibration,
             landmark_indices=sorted(important_indices),
@@ -336,15 +396,20 @@ class StereoFaceAnalysisPipeline:
         right_frame_height: int,
         screen_width: int,
         screen_height: int,
+        capture_timestamp: Optional[float] = None,
     ) -> Optional[FaceAnalysisResult]:
-        left_observation = self._left_provider.get_primary_face_observation(left_rgb_frame)
-        right_observation = self._right_provider.get_primary_face_observation(right_rgb_frame)
+        left_observation, right_observation = self._observe_pair(
+            left_rgb_frame,
+            right_rgb_frame,
+            left_frame_size=(left_frame_width, left_frame_height),
+            right_frame_size=(right_frame_width, right_frame_height),
+        )
         if left_observation is None or right_observation is None:
             return None
 
         points_3d = self._triangulator.triangulate_from_landmarks(
-            left_landmarks=left_observation.landmarks,
-            right_landmarks=right_observation.landmarks,
+            left_landmarks=left_observation.points,
+            right_landmarks=right_observation.points,
             left_frame_width=left_frame_width,
             left_frame_height=left_frame_height,
             right_frame_width=right_frame_width,
@@ -369,19 +434,103 @@ class StereoFaceAnalysisPipeline:
         blendshapes = extract_blendshapes(left_observation.blendshapes)
 
         return FaceAnalysisResult(
-            landmarks=left_observation.landmarks,
+            landmarks=left_observation.points,
             screen_position=screen_position,
             angles=angles,
             facial_transformation_matrix=left_observation.facial_transformation_matrix,
             depth=depth,
             blendshapes=blendshapes,
-            right_landmarks=right_observation.landmarks,
+            right_landmarks=right_observation.points,
             points_3d=points_3d,
+            capture_timestamp=capture_timestamp,
+        )
+
+    @property
+    def last_timings(self) -> Optional[StereoInferenceTimings]:
+        """Landmarker timings of the last :meth:`analyze` call."""
+        return self._last_timings
+
+    def _observe_pair(self, left_rgb_frame, right_rgb_frame, left_frame_size, right_frame_size):
+        started = time.perf_counter()
+        tracker = self._right_tracker
+        if tracker is not None and not tracker.refresh_due:
+            return self._observe_tracked(
+                left_rgb_frame, right_rgb_frame, left_frame_size, right_frame_size, started
+            )
+        left_observation, right_observation, left_ms, right_ms = self._run_landmarkers(
+            left_rgb_frame, right_rgb_frame
+        )
+        if tracker is not None:
+            self._seed_tracker(right_rgb_frame, right_observation)
+        self._last_timings = StereoInferenceTimings(
+            left_ms=left_ms,
+            right_ms=right_ms,
+            wall_ms=(time.perf_counter() - started) * 1000.0,
+        )
+        return left_observation, right_observation
+
+    def _observe_tracked(self, left_rgb_frame, right_rgb_frame, left_frame_size, right_frame_size, started):
+        # The tracker needs this frame's left landmarks, so the left
+        # landmarker runs first.
+        left_observation, left_ms = _timed_observation(self._left_provider, left_rgb_frame)
+        right_observation = None
+        right_ms = 0.0
+        tracked = False
+        if left_observation is None:
+            self._right_tracker.reset()
+        else:
+            right_started = time.perf_counter()
+            points = self._right_tracker.track(
+                right_rgb_frame, left_observation.points, left_frame_size, right_frame_size
+            )
+            if points is not None:
+                right_observation = FaceLandmarksObservation(
+                    landmarks=points, facial_transformation_matrix=None, points=points
+                )
+                right_ms = (time.perf_counter() - right_started) * 1000.0
+                tracked = True
+            else:
+                right_observation, right_ms = _timed_observation(self._right_provider, right_rgb_frame)
+                self._seed_tracker(right_rgb_frame, right_observation)
+        self._last_timings = StereoInferenceTimings(
+            left_ms=left_ms,
+            right_ms=right_ms,
+            wall_ms=(time.perf_counter() - started) * 1000.0,
+            right_tracked=tracked,
         )
+        return left_observation, right_observation
+
+    def _seed_tracker(self, right_rgb_frame, right_observation) -> None:
+        if right_observation is None:
+            self._right_tracker.reset()
+        else:
+            self._right_tracker.seed(right_rgb_frame, right_observation.points)
+
+    def _run_landmarkers(self, left_rgb_frame, right_rgb_frame):
+        if self._right_worker is None:
+            left_observation, left_ms = _timed_observation(self._left_provider, left_rgb_frame)
+            right_observation, right_ms = _timed_observation(self._right_provider, right_rgb_frame)
+        else:
+            right_future = self._right_worker.submit(
+                _timed_observation, self._right_provider, right_rgb_frame
+            )
+            # Never return or raise while the worker still reads
+            # right_rgb_frame: callers hand in leased buffers. If the left
+            # landmarker fails, its error is the one that propagates.
+            try:
+                left_observation, left_ms = _timed_observation(self._left_provider, left_rgb_frame)
+            except BaseException:
+                wait([right_future])
+                raise
+            right_observation, right_ms = right_future.result()
+        return left_observation, right_observation, left_ms, right_ms
 
     def calibrate_to_center(self, yaw: float, pitch: float) -> None:
         self._pose_mapper.calibrate_to_center(yaw=yaw, pitch=pitch)
 
     def release(self) -> None:
+        if self._right_worker is not None:
+            self._right_worker.shutdown(wait=True)
+            self._right_worker = None
         self._left_provider.release()
         self._right_provider.release()
@@ -1,3 +1,10 @@
 from .face_landmarks import FaceLandmarksObservation, FaceLandmarksProvider
+from .roi_landmarks import RoiLandmarksProvider
+from .streamed_landmarks import StreamedLandmarksProvider
 
-__all__ = ["FaceLandmarksObservation", "FaceLandmarksProvider"]
+__all__ = [
+    "FaceLandmarksObservation",
+    "FaceLandmarksProvider",
+    "RoiLandmarksProvider",
+    "StreamedLandmarksProvider",
+]
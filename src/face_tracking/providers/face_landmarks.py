@@ -3,25 +3,69 @@ import time
 import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 import mediapipe as mp
 import numpy as np
 
+from src.face_tracking.signals.landmark_points import landmarks_to_array
+
+
+# Optional MediaPipe outputs each profile asks for, as
+# (facial transformation matrix, blendshapes). The blendshape head is a
+# second network run per face, so consumers that ignore its scores should
+# not pay for it.
+LANDMARKER_PROFILES: Dict[str, Tuple[bool, bool]] = {
+    "landmarks": (False, False),
+    "landmarks+matrix": (True, False),
+    "landmarks+blendshapes": (False, True),
+    "full": (True, True),
+}
+DEFAULT_PROFILE = "full"
+
+DELEGATES = ("cpu", "gpu")
+
 
 @dataclass
 class FaceLandmarksObservation:
     landmarks: Iterable
     facial_transformation_matrix: Optional[list[list[float]]]
     blendshapes: Optional[list] = None
+    # The landmarks as an (N, 3) float32 array, converted once here so
+    # consumers index it instead of reading objects (see
+    # src.face_tracking.signals.landmark_points).
+    points: Optional[np.ndarray] = None
 
+    def __post_init__(self) -> None:
+        if self.points is None and self.landmarks is not None:
+            self.points = landmarks_to_array(self.landmarks)
 
-class FaceLandmarksProvider:
-    """Provides primary face landmarks using MediaPipe Tasks FaceLandmarker."""
 
-    def __init__(self, face_model_path: Optional[str] = None) -> None:
+class FaceLandmarksProvider:
+    """Provides primary face landmarks using MediaPipe Tasks FaceLandmarker.
+
+    ``profile`` (see :data:`LANDMARKER_PROFILES`) picks the optional
+    outputs; observations carry None for the ones it leaves out.
+    ``delegate`` runs the model on the CPU or, where MediaPipe supports it,
+    the GPU; other model builds are selected with ``face_model_path``.
+    """
+
+    def __init__(
+        self,
+        face_model_path: Optional[str] = None,
+        profile: str = DEFAULT_PROFILE,
+        delegate: str = "cpu",
+    ) -> None:
+        if profile not in LANDMARKER_PROFILES:
+            raise ValueError(
+                f"Unknown landmarker profile {profile!r}; expected one of {', '.join(LANDMARKER_PROFILES)}."
+            )
+        if delegate not in DELEGATES:
+            raise ValueError(f"Unknown delegate {delegate!r}; expected one of {', '.join(DELEGATES)}.")
         self._tasks_timestamp_ms = 0
         self._face_model_path = face_model_path
+        self.profile = profile
+        self.delegate = delegate
         self._landmarker = self._initialize_landmarker()
 
     def _resolve_model_path(self) -> Path:
@@ -69,11 +113,15 @@ class FaceLandmarksProvider:
         except Exception as exc:
             raise RuntimeError("MediaPipe Tasks API is unavailable in this environment.") from exc
 
+        output_matrix, output_blendshapes = LANDMARKER_PROFILES[self.profile]
+        base_options = mp_tasks_python.BaseOptions(model_asset_path=str(model_path))
+        if self.delegate == "gpu":
+            base_options.delegate = mp_tasks_python.BaseOptions.Delegate.GPU
         options = mp_vision.FaceLandmarkerOptions(
-            base_options=mp_tasks_python.BaseOptions(model_asset_path=str(model_path)),
+            base_options=base_options,
             running_mode=mp_vision.RunningMode.VIDEO,
-            output_facial_transformation_matrixes=True,
-            output_face_blendshapes=True,
+            output_facial_transformation_matrixes=output_matrix,
+            output_face_blendshapes=output_blendshapes,
             num_faces=1,
             min_face_detection_confidence=0.5,
             min_face_presence_confidence=0.5,
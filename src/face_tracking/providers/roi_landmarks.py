@@ -0,0 +1,151 @@
+from typing import Dict, Optional
+
+import math
+
+import cv2
+import numpy as np
+
+from src.capture.roi import square_crop
+from src.face_tracking.providers.face_landmarks import FaceLandmarksObservation, FaceLandmarksProvider
+from src.face_tracking.signals.landmark_points import box_from_points
+
+# Vertical field of view of the perspective camera MediaPipe's face
+# geometry assumes for whatever image it is given (principal point at the
+# centre, looking down -Z with +Y up).
+LANDMARKER_VERTICAL_FOV_DEG = 63.0
+
+
+class RoiLandmarksProvider:
+    """Runs the landmarker on a crop around the face it found last.
+
+    Drop-in for :class:`FaceLandmarksProvider`: the landmarker sees a
+    square, padded crop around the previous frame's landmarks, shrunk to
+    at most ``input_size`` pixels a side, and the landmarks come back
+    mapped to full-frame normalized coordinates. The full frame is used at
+    startup, after the face is lost (a crop that misses is retried on the
+    full frame straight away), and every ``full_frame_interval`` frames so
+    a second, larger face is not ignored for long.
+
+    The landmarker fits the facial transformation matrix as if the crop
+    were a whole camera image. Its rotation is kept; its translation is
+    moved into the full frame's camera (see :func:`_matrix_to_frame`), so
+    crop and full-frame observations agree.
+    """
+
+    def __init__(
+        self,
+        provider=None,
+        face_model_path: Optional[str] = None,
+        input_size: int = 256,
+        pad: float = 0.25,
+        full_frame_interval: int = 30,
+        delegate: str = "cpu",
+    ) -> None:
+        if input_size < 32:
+            raise ValueError("input_size must be >= 32.")
+        if full_frame_interval < 1:
+            raise ValueError("full_frame_interval must be >= 1.")
+        if provider is None:
+            provider = FaceLandmarksProvider(face_model_path=face_model_path, delegate=delegate)
+        self._provider = provider
+        self.input_size = int(input_size)
+        self.pad = float(pad)
+        self.full_frame_interval = int(full_frame_interval)
+
+        self._box = None
+        self._crops_since_full = 0
+        self._frames = 0
+        self._crop_hits = 0
+        self._crop_misses = 0
+        self._full_frames = 0
+        self._crop_side_total = 0
+
+    def get_primary_face_observation(self, rgb_image) -> Optional[FaceLandmarksObservation]:
+        frame_h, frame_w = rgb_image.shape[:2]
+        self._frames += 1
+        observation = None
+        if self._box is not None and self._crops_since_full < self.full_frame_interval:
+            crop = square_crop(self._box, frame_w, frame_h, self.pad)
+            if crop is not None:
+                observation = self._observe_crop(rgb_image, crop, frame_w, frame_h)
+                if observation is None:
+                    self._crop_misses += 1
+                else:
+                    self._crop_hits += 1
+                    self._crop_side_total += crop[2]
+                    self._crops_since_full += 1
+        if observation is None:
+            observation = self._provider.get_primary_face_observation(rgb_image)
+            self._full_frames += 1
+            self._crops_since_full = 0
+        self._box = box_from_points(observation.points, frame_w, frame_h) if observation is not None else None
+        return observation
+
+    def _observe_crop(self, rgb_image, crop, frame_w: int, frame_h: int) -> Optional[FaceLandmarksObservation]:
+        x0, y0, side, _ = crop
+        patch = rgb_image[y0 : y0 + side, x0 : x0 + side]
+        if side > self.input_size:
+            patch = cv2.resize(patch, (self.input_size, self.input_size), interpolation=cv2.INTER_AREA)
+        else:
+            patch = np.ascontiguousarray(patch)
+        observation = self._provider.get_primary_face_observation(patch)
+        if observation is None:
+            return None
+        points = observation.points * np.array(
+            (side / frame_w, side / frame_h, side / frame_w), dtype=np.float32
+        )
+        points[:, 0] += x0 / frame_w
+        points[:, 1] += y0 / frame_h
+        return FaceLandmarksObservation(
+            landmarks=points,
+            facial_transformation_matrix=_matrix_to_frame(
+                observation.facial_transformation_matrix, crop, frame_w, frame_h
+            ),
+            blendshapes=observation.blendshapes,
+            points=points,
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """``frames`` analysed, ``crop_hits`` / ``crop_misses`` (face found /
+        lost in the crop), ``full_frames`` run on the whole image,
+        ``hit_rate`` (share of frames served from a crop) and
+        ``mean_crop_px`` (side of the crops that hit)."""
+        return {
+            "frames": self._frames,
+            "crop_hits": self._crop_hits,
+            "crop_misses": self._crop_misses,
+            "full_frames": self._full_frames,
+            "hit_rate": self._crop_hits / self._frames if self._frames else 0.0,
+            "mean_crop_px": self._crop_side_total / self._crop_hits if self._crop_hits else 0.0,
+        }
+
+    def get_primary_face_landmarks(self, rgb_image):
+        observation = self.get_primary_face_observation(rgb_image)
+        if observation is None:
+            return None
+        return observation.landmarks
+
+    def release(self) -> None:
+        self._provider.release()
+
+
+def _matrix_to_frame(matrix, crop, frame_w: int, frame_h: int):
+    """A crop's facial transformation matrix, re-expressed for the whole
+    ``frame_w`` x ``frame_h`` frame.
+
+    In the crop's camera the face looks ``frame_h / side`` times larger,
+    so it is that much closer; its lateral offset is measured from the
+    crop's centre instead of the frame's. Rotation is unchanged. The
+    resize to ``input_size`` does not matter: the model sees normalized
+    coordinates.
+    """
+    if matrix is None:
+        return None
+    out = np.array(matrix, dtype=float).reshape(4, 4)
+    x0, y0, side, _ = crop
+    focal = 0.5 * frame_h / math.tan(math.radians(LANDMARKER_VERTICAL_FOV_DEG) / 2.0)
+    out[2, 3] *= frame_h / side
+    distance = -out[2, 3]
+    out[0, 3] += (x0 + 0.5 * side - 0.5 * frame_w) * distance / focal
+    out[1, 3] -= (y0 + 0.5 * side - 0.5 * frame_h) * distance / focal
+    return out.tolist()
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from src.capture.landmark_stream import LandmarkFrame
+from src.face_tracking.providers.face_landmarks import FaceLandmarksObservation
+
+
+class StreamedLandmarksProvider:
+    """Serves landmarks computed on a remote capture node (``--landmarks``).
+
+    Drop-in for :class:`FaceLandmarksProvider` in
+    :class:`~src.face_tracking.pipelines.face_analysis.FaceAnalysisPipeline`:
+    :meth:`poll` fetches the newest landmark record from the receiver, and
+    :meth:`get_primary_face_observation` rebuilds the observation the local
+    landmarker would have produced, ignoring the image it is handed.
+    """
+
+    def __init__(self, receiver, cam_id: int = 0) -> None:
+        self._receiver = receiver
+        self._cam_id = cam_id
+        self._frame: Optional[LandmarkFrame] = None
+
+    @property
+    def frame(self) -> Optional[LandmarkFrame]:
+        """The record :meth:`get_primary_face_observation` answers from."""
+        return self._frame
+
+    def poll(self, since: float = 0.0, timeout: float = 0.5) -> Optional[LandmarkFrame]:
+        """Wait for a record captured after ``since``; None on timeout."""
+        frame = self._receiver.get_latest_landmarks(self._cam_id, since=since, timeout=timeout)
+        if frame is not None:
+            self._frame = frame
+        return frame
+
+    def get_primary_face_observation(self, rgb_image=None) -> Optional[FaceLandmarksObservation]:
+        if self._frame is None:
+            return None
+        record = self._frame.record
+        if record.landmarks is None:
+            return None
+        return FaceLandmarksObservation(
+            landmarks=record.landmarks,
+            facial_transformation_matrix=record.facial_transformation_matrix,
+            blendshapes=record.blendshapes,
+        )
+
+    def get_primary_face_landmarks(self, rgb_image=None):
+        observation = self.get_primary_face_observation(rgb_image)
+        if observation is None:
+            return None
+        return observation.landmarks
+
+    def release(self) -> None:
+        # The receiver belongs to the capture supervisor.
+        pass
@@ -5,11 +5,14 @@ from .blendshapes import (
     pucker_value,
 )
 from .head_pose import HeadPoseSignalMapper
+from .landmark_points import box_from_points, landmarks_to_array
 
 __all__ = [
     "BLENDSHAPE_KEYS",
     "HeadPoseSignalMapper",
+    "box_from_points",
     "compute_smirk_activations",
     "extract_blendshapes",
+    "landmarks_to_array",
     "pucker_value",
 ]
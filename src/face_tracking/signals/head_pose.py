@@ -2,6 +2,8 @@ from typing import Optional, Sequence, Tuple
 
 import numpy as np
 
+from src.face_tracking.signals.landmark_points import landmarks_to_array
+
 
 class HeadPoseSignalMapper:
     """Maps face landmarks to head-pose angles and screen coordinates."""
@@ -103,14 +105,9 @@ class HeadPoseSignalMapper:
         return forward_axis
 
     def _forward_axis_from_landmarks(self, landmarks, frame_width: int, frame_height: int) -> np.ndarray:
-        def landmark_to_numpy(landmark_index: int) -> np.ndarray:
-            point = landmarks[landmark_index]
-            return np.array([point.x * frame_width, point.y * frame_height, point.z * frame_width], dtype=float)
-
-        left = landmark_to_numpy(self._landmark_indices["left"])
-        right = landmark_to_numpy(self._landmark_indices["right"])
-        top = landmark_to_numpy(self._landmark_indices["top"])
-        bottom = landmark_to_numpy(self._landmark_indices["bottom"])
+        names = ("left", "right", "top", "bottom")
+        points = landmarks_to_array(landmarks)[[self._landmark_indices[name] for name in names]]
+        left, right, top, bottom = points.astype(float) * (frame_width, frame_height, frame_width)
 
         right_axis = right - left
         right_axis /= np.linalg.norm(right_axis) + 1e-9
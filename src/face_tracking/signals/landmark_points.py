@@ -0,0 +1,49 @@
+"""Face landmarks as one ``(N, 3)`` float32 array per face.
+
+MediaPipe hands back a list of ``NormalizedLandmark`` objects; reading
+them one ``.x`` / ``.y`` / ``.z`` at a time in every consumer costs
+hundreds of attribute lookups per frame. Observations convert them once
+(:attr:`FaceLandmarksObservation.points`) and everything downstream --
+head pose, triangulation, ROI boxes, visualization -- indexes the array.
+Rows are normalized ``x``, ``y`` (fractions of the frame) and ``z`` (same
+scale as ``x``), in landmark-index order.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+NOSE_TIP = 1
+
+
+def landmarks_to_array(landmarks: Iterable) -> np.ndarray:
+    """``(N, 3)`` float32 points. Arrays pass through (as C-contiguous
+    float32); anything else is read as objects with ``x`` / ``y`` / ``z``."""
+    if isinstance(landmarks, np.ndarray):
+        return np.ascontiguousarray(landmarks, dtype=np.float32).reshape(-1, 3)
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32).reshape(-1, 3)
+
+
+def box_from_points(points: np.ndarray, frame_w: int, frame_h: int) -> Optional[Tuple[int, int, int, int]]:
+    """Pixel bounding box (x, y, w, h) of normalized points in a
+    ``frame_w`` x ``frame_h`` frame, like
+    :func:`src.capture.roi.box_from_landmarks`."""
+    if points is None or len(points) == 0:
+        return None
+    lo = np.clip(points[:, :2].min(axis=0), 0.0, 1.0) * (frame_w, frame_h)
+    hi = np.clip(points[:, :2].max(axis=0), 0.0, 1.0) * (frame_w, frame_h)
+    if hi[0] <= lo[0] or hi[1] <= lo[1]:
+        return None
+    return int(lo[0]), int(lo[1]), int(hi[0] - lo[0] + 0.5), int(hi[1] - lo[1] + 0.5)
+
+
+def nose_pixel(landmarks, frame_w: int, frame_h: int) -> Optional[Tuple[int, int]]:
+    """Pixel position of the nose tip in a ``frame_w`` x ``frame_h``
+    frame, from points or landmark objects, or None without one."""
+    if landmarks is None or len(landmarks) <= NOSE_TIP or frame_w <= 0 or frame_h <= 0:
+        return None
+    if isinstance(landmarks, np.ndarray):
+        x, y = landmarks[NOSE_TIP, :2]
+    else:
+        x, y = landmarks[NOSE_TIP].x, landmarks[NOSE_TIP].y
+    return int(float(x) * frame_w), int(float(y) * frame_h)
@@ -1,23 +1,25 @@
 from typing import Optional
 
 import cv2
-import numpy as np
 from PySide6.QtWidgets import QLabel
 from PySide6.QtCore import QTimer, Qt
 from PySide6.QtGui import QImage, QPixmap
 
-from src.core.devices.camera_manager import CameraManager
+from src.capture.frame_capture import SINGLE_CAM_ID
+from src.capture.service import PendingLease, default_capture_service
 
 
 class CameraPreview(QLabel):
-    def __init__(
-        self,
-        camera_manager: CameraManager,
-        parent=None,
-    ) -> None:
+    """Live thumbnail of one camera, leased from the shared capture service
+    so starting tracking on the same camera afterwards doesn't reopen it."""
+
+    def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        self._camera_manager = camera_manager
         self._camera_index: Optional[int] = None
+        # Acquiring can take seconds on a cold start, so it runs off the GUI
+        # thread.
+        self._pending: Optional[PendingLease] = None
+        self._last_ts = 0.0
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._update_frame)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -27,25 +29,42 @@ class CameraPreview(QLabel):
 
     def start_preview(self, camera_index: int) -> None:
         self.stop_preview()
-        try:
-            self._camera_manager.open_camera(camera_index)
-            self._camera_index = camera_index
-            self._timer.start(33)
-        except RuntimeError:
-            self.setText("Camera unavailable")
+        self._camera_index = camera_index
+        self.setText("Starting camera...")
+        self._pending = PendingLease(default_capture_service(), [camera_index])
+        self._timer.start(33)
 
-    def stop_preview(self) -> None:
+    def stop_preview(self, wait: bool = False) -> None:
+        """Stop and give the camera back. With ``wait``, also wait for an
+        acquire still in flight to finish and release its lease, so the
+        camera is free to open elsewhere once this returns."""
         self._timer.stop()
-        if self._camera_index is not None:
-            self._camera_manager.release_camera(self._camera_index)
-            self._camera_index = None
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.cancel(wait=wait)
+        self._camera_index = None
+        self._last_ts = 0.0
         self.clear()
         self.setText("No Preview")
 
     def _update_frame(self) -> None:
-        if self._camera_index is None:
+        pending = self._pending
+        if pending is None:
+            return
+        if pending.failed:
+            self._timer.stop()
+            self.setText("Camera unavailable")
+            return
+        lease = pending.lease
+        if lease is None:
+            return
+        handle = lease.supervisor.receiver.get_latest_frame(
+            cam_id=SINGLE_CAM_ID, since=self._last_ts, timeout=0.0
+        )
+        if handle is None:
             return
-        frame = self._camera_manager.get_frame(self._camera_index)
+        self._last_ts = handle.timestamp
+        frame = handle.image("half")
         if frame is None:
             return
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -13,6 +13,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, QTimer, Slot
 from PySide6.QtGui import QFont, QIcon
 
+from src.capture.service import default_capture_service
 from src.core.devices.calibration_migration import migrate_all_profiles
 from src.core.devices.camera_manager import CameraManager
 from src.core.modes.base import TrackingMode
@@ -49,6 +50,9 @@ class MainWindow(QMainWindow):
         self._gaze_signal_proxy = None
         self._visualizer_window = None
         self._viz_signal_proxy = None
+        # Get a capture worker through interpreter start-up and the cv2
+        # import now, while the user is still looking at the dashboard.
+        default_capture_service().prewarm()
 
         self.setWindowTitle("EyeCursor")
         self.setMinimumSize(960, 640)
@@ -368,7 +372,9 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Requirements Not Met", reason)
             return
 
-        self._cameras_page.stop_previews()
+        # Wait for any preview acquire still starting, or its lease would
+        # hold the cameras the mode is about to open.
+        self._cameras_page.stop_previews(wait=True)
         self._camera_manager.release_all()
 
         self._pending_mode = mode_instance
@@ -589,4 +595,5 @@ class MainWindow(QMainWindow):
         self._teardown_gaze_overlay()
         self._cameras_page.stop_previews()
         self._camera_manager.release_all()
+        default_capture_service().shutdown()
         event.accept()
@@ -27,7 +27,6 @@ class CameraCard(QFrame):
     def __init__(
         self,
         camera_info: CameraInfo,
-        camera_manager: CameraManager,
         parent=None,
     ) -> None:
         super().__init__(parent)
@@ -41,7 +40,7 @@ class CameraCard(QFrame):
         layout = QVBoxLayout(self)
         layout.setSpacing(8)
 
-        self._preview = CameraPreview(camera_manager)
+        self._preview = CameraPreview()
         self._preview.setFixedHeight(180)
         layout.addWidget(self._preview)
 
@@ -95,8 +94,8 @@ class CameraCard(QFrame):
     def start_preview(self) -> None:
         self._preview.start_preview(self._info.index)
 
-    def stop_preview(self) -> None:
-        self._preview.stop_preview()
+    def stop_preview(self, wait: bool = False) -> None:
+        self._preview.stop_preview(wait=wait)
 
     def get_label(self) -> str:
         return self._label_edit.text()
@@ -201,7 +200,7 @@ class CamerasPage(QWidget):
         self._scan_btn.setEnabled(True)
 
         for cam in self._cameras:
-            card = CameraCard(cam, self._camera_manager)
+            card = CameraCard(cam)
             card.select_one_camera.connect(lambda idx: self._on_select("one_camera", idx))
             card.select_left.connect(lambda idx: self._on_select("two_camera_left", idx))
             card.select_right.connect(lambda idx: self._on_select("two_camera_right", idx))
@@ -237,9 +236,9 @@ class CamerasPage(QWidget):
     def _update_selection_labels(self) -> None:
         pass
 
-    def _stop_all_previews(self) -> None:
+    def _stop_all_previews(self, wait: bool = False) -> None:
         for card in self._cards:
-            card.stop_preview()
+            card.stop_preview(wait=wait)
 
     def _clear_cards(self) -> None:
         self._stop_all_previews()
@@ -248,5 +247,7 @@ class CamerasPage(QWidget):
             card.deleteLater()
         self._cards.clear()
 
-    def stop_previews(self) -> None:
-        self._stop_all_previews()
+    def stop_previews(self, wait: bool = False) -> None:
+        """Stop every preview; ``wait`` also waits out acquires still in
+        flight (see :meth:`CameraPreview.stop_preview`)."""
+        self._stop_all_previews(wait=wait)
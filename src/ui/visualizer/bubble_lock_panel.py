@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from src.face_tracking.signals.landmark_points import nose_pixel
 from src.ui.overlays.gaze_bubble_overlay import BUBBLE_RADIUS_PX
 from src.ui.visualizer._idle_overlay import dim_widget_for_idle, overlay_idle_on_label
 from src.ui.visualizer.drawing import (
@@ -300,7 +301,7 @@ class BubbleLockPanel(QWidget):
             if landmarks is not None and frame_w and frame_h:
                 annotated = draw_mediapipe_landmarks(annotated, landmarks, frame_w, frame_h)
             forward  = forward_axis_from_matrix(ftm)
-            nose_xy  = self._nose_pixel(landmarks, frame_w, frame_h)
+            nose_xy  = nose_pixel(landmarks, frame_w, frame_h)
             if forward is not None and nose_xy is not None:
                 annotated = draw_head_pose_arrow(annotated, nose_xy, forward)
             self._set_bgr(self._landmarks_label, annotated)
@@ -441,18 +442,6 @@ class BubbleLockPanel(QWidget):
     # Helpers                                                              #
     # ------------------------------------------------------------------ #
 
-    def _nose_pixel(self, landmarks, frame_w: int, frame_h: int) -> Optional[Tuple[int, int]]:
-        if not landmarks or frame_w <= 0 or frame_h <= 0:
-            return None
-        try:
-            pts = list(landmarks)
-            if len(pts) <= 1:
-                return None
-            nose = pts[1]
-            return int(float(nose.x) * frame_w), int(float(nose.y) * frame_h)
-        except (AttributeError, TypeError):
-            return None
-
     def _record_action(self, gesture_state: dict) -> None:
         action = gesture_state.get("last_action")
         if not action:
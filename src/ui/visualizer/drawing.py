@@ -4,6 +4,8 @@ import cv2
 import numpy as np
 from PySide6.QtGui import QImage, QPixmap
 
+from src.face_tracking.signals.landmark_points import landmarks_to_array
+
 
 def bgr_to_qpixmap(frame_bgr: np.ndarray) -> QPixmap:
     if frame_bgr is None or frame_bgr.size == 0:
@@ -43,16 +45,13 @@ def draw_mediapipe_landmarks(
     radius: int = 10,
 ) -> np.ndarray:
     out = frame_bgr.copy()
-    pts = list(landmarks) if landmarks is not None else []
-    if not pts:
+    pts = landmarks_to_array(landmarks) if landmarks is not None else None
+    if pts is None or len(pts) == 0:
         return out
-    indices = _MEDIAPIPE_LANDMARK_SUBSET if subset_only else range(len(pts))
-    for idx in indices:
-        if idx >= len(pts):
-            continue
-        lm = pts[idx]
-        x = int(float(lm.x) * frame_width)
-        y = int(float(lm.y) * frame_height)
+    if subset_only:
+        pts = pts[[idx for idx in _MEDIAPIPE_LANDMARK_SUBSET if idx < len(pts)]]
+    pixels = (pts[:, :2] * (frame_width, frame_height)).astype(np.int32)
+    for x, y in pixels.tolist():
         cv2.circle(out, (x, y), radius, color, -1, lineType=cv2.LINE_AA)
     return out
 
@@ -111,9 +110,9 @@ def render_displacement_panel(
     canvas_size: Tuple[int, int] = (640, 480),
 ) -> np.ndarray:
     canvas = np.zeros((canvas_size[1], canvas_size[0], 3), dtype=np.uint8)
-    left_list = list(landmarks_left) if landmarks_left is not None else []
-    right_list = list(landmarks_right) if landmarks_right is not None else []
-    if not left_list or not right_list:
+    left_pts = landmarks_to_array(landmarks_left) if landmarks_left is not None else np.empty((0, 3))
+    right_pts = landmarks_to_array(landmarks_right) if landmarks_right is not None else np.empty((0, 3))
+    if len(left_pts) == 0 or len(right_pts) == 0:
         cv2.putText(
             canvas,
             "Waiting for stereo landmarks...",
@@ -138,13 +137,11 @@ def render_displacement_panel(
     cyan = (255, 220, 80)
     magenta = (200, 80, 240)
     line_color = (100, 100, 100)
-    for idx in indices:
-        if idx >= len(left_list) or idx >= len(right_list):
-            continue
-        lp = left_list[idx]
-        rp = right_list[idx]
-        lx, ly = to_canvas(float(lp.x), float(lp.y))
-        rx, ry = to_canvas(float(rp.x), float(rp.y))
+    available = min(len(left_pts), len(right_pts))
+    shown = [idx for idx in indices if idx < available]
+    for (lpx, lpy), (rpx, rpy) in zip(left_pts[shown, :2].tolist(), right_pts[shown, :2].tolist()):
+        lx, ly = to_canvas(lpx, lpy)
+        rx, ry = to_canvas(rpx, rpy)
         cv2.line(canvas, (lx, ly), (rx, ry), line_color, 1, cv2.LINE_AA)
         cv2.circle(canvas, (lx, ly), 3, cyan, -1, cv2.LINE_AA)
         cv2.circle(canvas, (rx, ry), 3, magenta, -1, cv2.LINE_AA)
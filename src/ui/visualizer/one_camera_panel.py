@@ -13,6 +13,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from src.face_tracking.signals.landmark_points import nose_pixel
 from src.ui.visualizer._idle_overlay import dim_widget_for_idle, overlay_idle_on_label
 from src.ui.visualizer.drawing import (
     bgr_to_qpixmap,
@@ -196,7 +197,7 @@ class OneCameraPanel(QWidget):
                 )
 
             forward = forward_axis_from_matrix(ftm)
-            nose_xy = self._nose_pixel(landmarks, frame_w, frame_h)
+            nose_xy = nose_pixel(landmarks, frame_w, frame_h)
             if forward is not None and nose_xy is not None:
                 with_arrow = draw_head_pose_arrow(frame_bgr, nose_xy, forward)
                 self._pose_label.setPixmap(
@@ -285,18 +286,6 @@ class OneCameraPanel(QWidget):
 
         self._record_action(payload)
 
-    def _nose_pixel(self, landmarks, frame_w: int, frame_h: int):
-        if not landmarks or frame_w <= 0 or frame_h <= 0:
-            return None
-        try:
-            pts = list(landmarks)
-            if len(pts) <= 1:
-                return None
-            nose = pts[1]
-            return int(float(nose.x) * frame_w), int(float(nose.y) * frame_h)
-        except (AttributeError, TypeError):
-            return None
-
     def _record_action(self, payload: dict) -> None:
         gesture_state = payload.get("gesture_state") or {}
         action = gesture_state.get("last_action")
@@ -0,0 +1,171 @@
+"""Benchmark: frame delivery over a lossy link, with and without FEC.
+
+A sender thread streams frames over loopback UDP through a lossy socket
+wrapper that drops each datagram with probability ``loss`` -- either
+independently or in bursts (``--burst N``: a drop starts a run of N
+losses on average, like Wi-Fi fading). The receiver reassembles with
+:class:`Reassembler`. For every loss level and FEC ratio it reports the
+share of frames delivered, the bandwidth spent on parity and the
+sender / receiver CPU per frame. Pure Python (no OpenCV, no cameras).
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_capture_fec --frames 1000 --frame-bytes 40000
+    python -m tests.bench_capture_fec --loss 0.01,0.05 --fec 0,0.1,0.2 --burst 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import select
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.protocol import Reassembler, pack_packets
+
+
+class LossySocket:
+    """Wraps a UDP socket; ``sendto`` silently drops datagrams.
+
+    Two-state (Gilbert) model: in the good state a datagram is lost with
+    a probability chosen so that, with runs of ``burst`` losses on
+    average, the long-run loss rate is ``loss``; in the bad state every
+    datagram is lost. ``burst=1`` is independent loss.
+    """
+
+    def __init__(self, sock: socket.socket, loss: float, burst: float = 1.0, seed: int = 0) -> None:
+        self._sock = sock
+        self._rng = random.Random(seed)
+        self._stay_bad = 1.0 - 1.0 / max(1.0, burst)
+        # P(enter bad) so that the stationary bad-state share equals loss.
+        self._enter_bad = loss * (1.0 - self._stay_bad) / (1.0 - loss) if loss < 1.0 else 1.0
+        self._bad = False
+        self.sent = 0
+        self.dropped = 0
+
+    def sendto(self, data: bytes, addr) -> None:
+        self.sent += 1
+        self._bad = self._rng.random() < (self._stay_bad if self._bad else self._enter_bad)
+        if self._bad:
+            self.dropped += 1
+            return
+        self._sock.sendto(data, addr)
+
+
+def _receive(sock: socket.socket, stop: threading.Event, out: Dict[str, float]) -> None:
+    sock.setblocking(False)
+    reasm = Reassembler()
+    buf = bytearray(65536)
+    view = memoryview(buf)
+    done = 0
+    t0 = time.thread_time()
+    while not stop.is_set():
+        readable, _, _ = select.select([sock], [], [], 0.05)
+        if not readable:
+            continue
+        while True:
+            try:
+                n = sock.recv_into(buf)
+            except BlockingIOError:
+                break
+            if reasm.feed(view[:n]) is not None:
+                done += 1
+    out["cpu"] = time.thread_time() - t0
+    out["frames"] = done
+    out["recovered"] = sum(c.recovered for c in reasm.counters.values())
+
+
+def run(
+    payload: bytes,
+    n_frames: int,
+    loss: float,
+    fec_ratio: float,
+    burst: float,
+    fps: float,
+) -> Dict[str, float]:
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    rx.bind(("127.0.0.1", 0))
+    addr = rx.getsockname()
+    stop = threading.Event()
+    out: Dict[str, float] = {}
+    thread = threading.Thread(target=_receive, args=(rx, stop, out))
+    thread.start()
+
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    lossy = LossySocket(tx, loss, burst)
+    sent_bytes = 0
+    pack_s = 0.0
+    interval = 1.0 / fps
+    next_at = time.perf_counter()
+    for i in range(n_frames):
+        t = time.perf_counter()
+        packets = pack_packets(0, i, float(i), 640, 480, payload, fec_ratio=fec_ratio)
+        pack_s += time.perf_counter() - t
+        for pkt in packets:
+            sent_bytes += len(pkt)
+            lossy.sendto(pkt, addr)
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    time.sleep(0.3)
+    stop.set()
+    thread.join()
+    tx.close()
+    rx.close()
+    return {
+        "delivered": out["frames"] / n_frames,
+        "recovered": out["recovered"],
+        "packet_loss": lossy.dropped / max(1, lossy.sent),
+        "bytes_per_frame": sent_bytes / n_frames,
+        "pack_us": 1e6 * pack_s / n_frames,
+        "recv_us": 1e6 * out["cpu"] / max(1, out["frames"]),
+    }
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--frame-bytes", type=int, default=40000, help="JPEG size per frame.")
+    parser.add_argument("--fps", type=float, default=300.0, help="Sender pacing.")
+    parser.add_argument("--loss", type=_floats, default=_floats("0,0.005,0.01,0.02,0.05"))
+    parser.add_argument("--fec", type=_floats, default=_floats("0,0.05,0.1,0.2"))
+    parser.add_argument("--burst", type=float, default=1.0, help="Mean length of a loss run.")
+    args = parser.parse_args(argv)
+
+    payload = os.urandom(args.frame_bytes)
+    base = len(pack_packets(0, 0, 0.0, 640, 480, payload))
+    print(f"{args.frames} frames x {args.frame_bytes} bytes ({base} data packets each), burst {args.burst:g}")
+    print(f"{'loss':>6} {'fec':>5} {'delivered':>10} {'rebuilt':>8} {'overhead':>9} {'pack':>9} {'recv':>9}")
+    baseline: Dict[float, float] = {}
+    for loss in args.loss:
+        for fec in args.fec:
+            r = run(payload, args.frames, loss, fec, args.burst, args.fps)
+            if fec == 0:
+                baseline[loss] = r["bytes_per_frame"]
+            overhead = r["bytes_per_frame"] / baseline.get(loss, r["bytes_per_frame"]) - 1.0
+            print(
+                f"{100 * r['packet_loss']:5.1f}% {fec:5.2f} {100 * r['delivered']:9.1f}% "
+                f"{r['recovered']:8.0f} {100 * overhead:8.1f}% "
+                f"{r['pack_us']:6.0f} us {r['recv_us']:6.0f} us"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Benchmark: UDP frame receive + reassembly throughput.
+
+Two measurements, both pure Python (no OpenCV, no cameras):
+
+- ``reassembly``: feed pre-packed frames through :class:`Reassembler`,
+  either as one fresh ``bytes`` object per packet (what ``recvfrom``
+  returns) or as views into one reused buffer (what ``recv_into`` in
+  :class:`FrameReceiver` does), against a dict-of-fragments + join
+  reassembler for reference;
+- ``loopback``: a sender thread streams frames over a loopback UDP socket
+  while the receiver runs either one blocking ``recvfrom`` per packet or
+  the ``select`` + non-blocking ``recv_into`` drain loop. Reported as
+  receiver-thread CPU time per completed frame, so the sender's pacing
+  doesn't skew it. The drain loop is run again with ``--max-payload``
+  sized datagrams (``VERSION_LARGE``, the loopback default).
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_capture_protocol --frames 2000 --frame-bytes 40000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import select
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.protocol import (
+    MAX_LARGE_PAYLOAD,
+    MAX_PAYLOAD,
+    Reassembler,
+    pack_packets,
+    parse_packet,
+)
+
+
+class _DictJoinReassembler:
+    """Reference: fragments kept in a dict and joined on completion."""
+
+    def __init__(self) -> None:
+        self._partials: Dict[Tuple[int, int], Dict[int, bytes]] = {}
+
+    def feed(self, packet: bytes) -> bool:
+        header, payload = parse_packet(packet)
+        key = (header.cam_id, header.frame_id)
+        parts = self._partials.setdefault(key, {})
+        parts[header.packet_idx] = bytes(payload)
+        if len(parts) < header.total_pkts:
+            return False
+        del self._partials[key]
+        b"".join(parts[i] for i in range(header.total_pkts))
+        return True
+
+
+def make_frames(n_frames: int, frame_bytes: int, max_payload: int = MAX_PAYLOAD) -> List[List[bytes]]:
+    payload = os.urandom(frame_bytes)
+    return [
+        pack_packets(0, i, float(i), 640, 480, payload, max_payload=max_payload)
+        for i in range(n_frames)
+    ]
+
+
+def bench_reassembly(frames: List[List[bytes]]) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+
+    ref = _DictJoinReassembler()
+    t0 = time.perf_counter()
+    for packets in frames:
+        for pkt in packets:
+            ref.feed(bytes(pkt))
+    results["dict + join"] = time.perf_counter() - t0
+
+    reasm = Reassembler()
+    t0 = time.perf_counter()
+    for packets in frames:
+        for pkt in packets:
+            reasm.feed(bytes(pkt), now=0.0)
+    results["bytes per packet"] = time.perf_counter() - t0
+
+    reasm = Reassembler()
+    buf = bytearray(65536)
+    view = memoryview(buf)
+    t0 = time.perf_counter()
+    for packets in frames:
+        for pkt in packets:
+            n = len(pkt)
+            buf[:n] = pkt
+            reasm.feed(view[:n], now=0.0)
+    results["reused buffer"] = time.perf_counter() - t0
+    return results
+
+
+def _recvfrom_loop(sock: socket.socket, reasm: Reassembler, stop: threading.Event) -> int:
+    sock.settimeout(0.2)
+    done = 0
+    while not stop.is_set():
+        try:
+            packet, _ = sock.recvfrom(65536)
+        except socket.timeout:
+            continue
+        if reasm.feed(packet) is not None:
+            done += 1
+    return done
+
+
+def _drain_loop(sock: socket.socket, reasm: Reassembler, stop: threading.Event) -> int:
+    sock.setblocking(False)
+    buf = bytearray(65536)
+    view = memoryview(buf)
+    done = 0
+    while not stop.is_set():
+        readable, _, _ = select.select([sock], [], [], 0.2)
+        if not readable:
+            continue
+        while True:
+            try:
+                n = sock.recv_into(buf)
+            except BlockingIOError:
+                break
+            if reasm.feed(view[:n]) is not None:
+                done += 1
+    return done
+
+
+def bench_loopback(
+    frames: List[List[bytes]],
+    loop: Callable[[socket.socket, Reassembler, threading.Event], int],
+    fps: float,
+) -> Tuple[int, float]:
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    rx.bind(("127.0.0.1", 0))
+    addr = rx.getsockname()
+    stop = threading.Event()
+    out: Dict[str, float] = {}
+
+    def _receiver() -> None:
+        t0 = time.thread_time()
+        out["frames"] = loop(rx, Reassembler(), stop)
+        out["cpu"] = time.thread_time() - t0
+
+    thread = threading.Thread(target=_receiver)
+    thread.start()
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / fps
+    next_at = time.perf_counter()
+    for packets in frames:
+        for pkt in packets:
+            tx.sendto(pkt, addr)
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    time.sleep(0.3)
+    stop.set()
+    thread.join()
+    tx.close()
+    rx.close()
+    return int(out["frames"]), out["cpu"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--frame-bytes", type=int, default=40000, help="JPEG size per frame.")
+    parser.add_argument("--fps", type=float, default=500.0, help="Sender pacing for the loopback test.")
+    parser.add_argument("--max-payload", type=int, default=MAX_LARGE_PAYLOAD)
+    args = parser.parse_args(argv)
+
+    frames = make_frames(args.frames, args.frame_bytes)
+    n = len(frames)
+    print(f"{n} frames x {args.frame_bytes} bytes ({len(frames[0])} packets each)")
+
+    print("reassembly:")
+    for name, seconds in bench_reassembly(frames).items():
+        print(f"  {name:<20}: {1e6 * seconds / n:8.1f} us/frame")
+
+    print(f"loopback @ {args.fps:g} fps (receiver CPU):")
+    large = make_frames(args.frames, args.frame_bytes, args.max_payload)
+    runs = (
+        ("recvfrom", frames, _recvfrom_loop),
+        ("recv_into drain", frames, _drain_loop),
+        (f"drain, {len(large[0])} pkt/frame", large, _drain_loop),
+    )
+    for name, source, loop in runs:
+        done, cpu = bench_loopback(source, loop, args.fps)
+        per = 1e6 * cpu / max(1, done)
+        print(f"  {name:<20}: {per:8.1f} us/frame  ({done}/{n} frames completed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
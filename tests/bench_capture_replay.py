@@ -0,0 +1,97 @@
+"""Benchmark: replay a capture recording through the receiver.
+
+Plays a recording (made with ``capture_record`` in a mode's settings, or
+:meth:`CaptureSupervisor.start_recording`) through
+:class:`ReplayFrameReceiver` and pulls frames the way a mode loop does --
+``get_latest_frame`` for single-camera recordings, ``get_latest_frame_pair``
+for stereo ones -- decoding each at ``--variant``. Reports delivered vs.
+consumed frame rates, decode time, frames never looked at and, for stereo,
+the pair skew. No cameras needed; OpenCV is.
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_capture_replay session.eyerec --pacing fast --variant half
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.frame_capture import SINGLE_CAM_ID, STEREO_LEFT_CAM_ID, STEREO_RIGHT_CAM_ID
+from src.capture.frame_receiver import FRAME_VARIANTS, ReplayFrameReceiver
+from src.capture.recording import PACINGS, Recording
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--pacing", choices=PACINGS, default="fast")
+    parser.add_argument("--fps", type=float, default=0.0, help="Per-camera rate for --pacing fixed.")
+    parser.add_argument("--variant", choices=FRAME_VARIANTS, default="full")
+    args = parser.parse_args(argv)
+
+    recording = Recording(args.recording)
+    cam_ids = recording.cam_ids()
+    first, last = recording.time_span()
+    print(
+        f"{len(recording)} frames, cams {cam_ids}, {last - first:.1f} s recorded "
+        f"at {recording.camera_fps():.1f} fps/camera"
+        + ("" if recording.complete else " (index rebuilt)")
+    )
+    stereo = STEREO_LEFT_CAM_ID in cam_ids and STEREO_RIGHT_CAM_ID in cam_ids
+
+    receiver = ReplayFrameReceiver(recording, pacing=args.pacing, fps=args.fps)
+    consumed = 0
+    decode_s = 0.0
+    t0 = time.perf_counter()
+    receiver.start()
+    try:
+        since_l = since_r = 0.0
+        while True:
+            if stereo:
+                pair = receiver.get_latest_frame_pair(
+                    timeout=0.2, since_left=since_l, since_right=since_r
+                )
+                handles = list(pair) if pair is not None else []
+                if handles:
+                    since_l, since_r = handles[0].timestamp, handles[1].timestamp
+            else:
+                handle = receiver.get_latest_frame(SINGLE_CAM_ID, since=since_l, timeout=0.2)
+                handles = [handle] if handle is not None else []
+                if handles:
+                    since_l = handles[0].timestamp
+            if not handles:
+                if receiver.finished.is_set():
+                    break
+                continue
+            t = time.perf_counter()
+            for handle in handles:
+                handle.image(args.variant)
+            decode_s += time.perf_counter() - t
+            consumed += 1
+        elapsed = time.perf_counter() - t0
+        stats = receiver.decode_stats()
+        pair_stats = receiver.pair_stats() if stereo else None
+    finally:
+        receiver.stop()
+
+    unit = "pairs" if stereo else "frames"
+    print(f"pacing {args.pacing}, variant {args.variant}:")
+    print(f"  delivered : {stats['frames_received'] / elapsed:8.1f} frames/s")
+    print(f"  consumed  : {consumed / elapsed:8.1f} {unit}/s ({consumed} {unit})")
+    print(f"  decode    : {1000.0 * decode_s / max(1, consumed):8.2f} ms per {unit[:-1]}")
+    print(f"  never decoded: {stats['frames_never_decoded']}")
+    if pair_stats is not None:
+        print("  pair skew : " + ", ".join(f"{k}={v:.4g}" for k, v in pair_stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
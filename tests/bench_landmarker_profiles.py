@@ -0,0 +1,116 @@
+"""Benchmark: per-frame FaceLandmarker cost for each output profile.
+
+Loads a clip (``--video``), a still (``--image``) or a burst from a
+camera (``--camera``) into memory, converts it to RGB once, then runs
+:class:`FaceLandmarksProvider` over the same frames with every profile in
+:data:`LANDMARKER_PROFILES` (or those given with ``--profiles``) and
+reports the mean / median / p95 time per frame and how many frames had a
+face. Frames without a face skip the blendshape head, so use footage with
+a face in view. Needs OpenCV and MediaPipe.
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_landmarker_profiles --video face.mp4 --frames 300
+    python -m tests.bench_landmarker_profiles --camera 0 --width 320 --delegate gpu
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import cv2
+import numpy as np
+
+from src.face_tracking.providers.face_landmarks import (
+    DELEGATES,
+    LANDMARKER_PROFILES,
+    FaceLandmarksProvider,
+)
+
+
+def load_frames(args) -> List[np.ndarray]:
+    """Up to ``args.frames`` RGB frames, resized to ``args.width`` if set."""
+    frames = []
+    if args.image:
+        bgr = cv2.imread(args.image, cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise SystemExit(f"could not read {args.image}")
+        frames = [bgr] * args.frames
+    else:
+        cap = cv2.VideoCapture(args.video if args.video else args.camera)
+        try:
+            while len(frames) < args.frames:
+                ok, bgr = cap.read()
+                if not ok:
+                    break
+                frames.append(bgr)
+        finally:
+            cap.release()
+    out = []
+    for bgr in frames:
+        if args.width and bgr.shape[1] != args.width:
+            height = int(round(bgr.shape[0] * args.width / bgr.shape[1]))
+            bgr = cv2.resize(bgr, (args.width, height), interpolation=cv2.INTER_AREA)
+        out.append(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+    return out
+
+
+def bench_profile(frames: List[np.ndarray], profile: str, args):
+    """(per-frame seconds, frames with a face) for one profile."""
+    provider = FaceLandmarksProvider(face_model_path=args.face_model, profile=profile, delegate=args.delegate)
+    try:
+        for rgb in frames[: args.warmup]:
+            provider.get_primary_face_observation(rgb)
+        times = []
+        faces = 0
+        for rgb in frames:
+            started = time.perf_counter()
+            observation = provider.get_primary_face_observation(rgb)
+            times.append(time.perf_counter() - started)
+            faces += observation is not None
+        return times, faces
+    finally:
+        provider.release()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", default=None)
+    source.add_argument("--image", default=None)
+    source.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--width", type=int, default=0, help="resize frames to this width first")
+    parser.add_argument("--profiles", default=",".join(LANDMARKER_PROFILES))
+    parser.add_argument("--delegate", choices=DELEGATES, default="cpu")
+    parser.add_argument("--face-model", default=None)
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args)
+    if not frames:
+        print("no frames", file=sys.stderr)
+        return 1
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frames @ {width}x{height}, delegate {args.delegate}")
+    for profile in args.profiles.split(","):
+        times, faces = bench_profile(frames, profile.strip(), args)
+        ms = sorted(1000.0 * t for t in times)
+        p95 = ms[min(len(ms) - 1, int(0.95 * len(ms)))]
+        print(
+            f"  {profile:22s}: mean {sum(ms) / len(ms):7.3f}  p50 {ms[len(ms) // 2]:7.3f}"
+            f"  p95 {p95:7.3f} ms/frame  face in {faces}/{len(frames)}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Benchmark: MJPEG passthrough vs decode + re-encode in the capture loop.
+
+Feeds a synthetic MJPEG source (pre-encoded camera-like frames with the
+Huffman tables stripped, as many UVC webcams send them) through the two
+per-frame paths the capture process can take:
+
+- ``reencode``: decode to BGR (what OpenCV does inside ``cap.read()``),
+  ``cv2.imencode`` back to JPEG, then ``pack_packets``;
+- ``passthrough``: the ``--passthrough`` path -- trim, scan the header,
+  insert standard Huffman tables, then ``pack_packets``.
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_mjpeg_passthrough --frames 300 --width 640 --height 480
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import cv2
+import numpy as np
+
+from src.capture.mjpeg import ensure_huffman_tables, scan_jpeg, trim_to_eoi
+from src.capture.protocol import pack_packets
+
+
+def _strip_dht(jpeg: bytes) -> bytes:
+    """Remove every DHT segment, mimicking AVI1-style UVC MJPEG frames."""
+    out = bytearray(jpeg[:2])
+    pos = 2
+    while pos + 4 <= len(jpeg):
+        marker = jpeg[pos + 1]
+        seg_len = int.from_bytes(jpeg[pos + 2 : pos + 4], "big")
+        if marker == 0xDA:
+            out += jpeg[pos:]
+            break
+        if marker != 0xC4:
+            out += jpeg[pos : pos + 2 + seg_len]
+        pos += 2 + seg_len
+    return bytes(out)
+
+
+def synthetic_mjpeg_source(n_frames: int, width: int, height: int, quality: int = 80) -> List[bytes]:
+    """Camera-like frames: smooth gradient, a moving blob and sensor noise."""
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = np.dstack(
+        [
+            (xx * 255 // max(1, width - 1)).astype(np.uint8),
+            (yy * 255 // max(1, height - 1)).astype(np.uint8),
+            np.full((height, width), 128, dtype=np.uint8),
+        ]
+    )
+    params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    frames: List[bytes] = []
+    for i in range(n_frames):
+        img = base.copy()
+        cx = int((0.5 + 0.3 * np.sin(i / 15.0)) * width)
+        cy = int((0.5 + 0.3 * np.cos(i / 20.0)) * height)
+        cv2.circle(img, (cx, cy), min(width, height) // 6, (30, 200, 90), -1)
+        noise = rng.integers(0, 12, size=img.shape, dtype=np.uint8)
+        img = cv2.add(img, noise)
+        ok, enc = cv2.imencode(".jpg", img, params)
+        if not ok:
+            raise RuntimeError("synthetic frame encode failed")
+        # Drivers hand over a padded buffer; make trim_to_eoi earn its keep.
+        frames.append(_strip_dht(bytes(enc)) + bytes(64))
+    return frames
+
+
+def bench_reencode(frames: List[bytes], quality: int) -> float:
+    params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    # The camera backend decodes with its own copy of the tables; give
+    # imdecode complete frames so only decode + encode + pack are timed.
+    frames = [ensure_huffman_tables(trim_to_eoi(raw)) for raw in frames]
+    t0 = time.perf_counter()
+    for i, raw in enumerate(frames):
+        bgr = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+        ok, enc = cv2.imencode(".jpg", bgr, params)
+        h, w = bgr.shape[:2]
+        pack_packets(0, i, 0.0, w, h, bytes(enc))
+    return time.perf_counter() - t0
+
+
+def bench_passthrough(frames: List[bytes]) -> float:
+    t0 = time.perf_counter()
+    for i, raw in enumerate(frames):
+        data = trim_to_eoi(raw)
+        info = scan_jpeg(data)
+        data = ensure_huffman_tables(data, info)
+        pack_packets(0, i, 0.0, info.width, info.height, data)
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--jpeg-quality", type=int, default=85)
+    args = parser.parse_args(argv)
+
+    frames = synthetic_mjpeg_source(args.frames, args.width, args.height)
+    # Sanity: the passthrough output must decode to the same image.
+    fixed = ensure_huffman_tables(trim_to_eoi(frames[0]))
+    if cv2.imdecode(np.frombuffer(fixed, dtype=np.uint8), cv2.IMREAD_COLOR) is None:
+        print("passthrough output failed to decode", file=sys.stderr)
+        return 1
+
+    t_re = bench_reencode(frames, args.jpeg_quality)
+    t_pt = bench_passthrough(frames)
+    n = len(frames)
+    print(f"{n} frames @ {args.width}x{args.height}")
+    print(f"  reencode    : {1000.0 * t_re / n:7.3f} ms/frame")
+    print(f"  passthrough : {1000.0 * t_pt / n:7.3f} ms/frame")
+    print(f"  speedup     : {t_re / max(t_pt, 1e-9):7.1f}x per camera")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Benchmark: stereo landmarker pair, run in parallel versus one after another.
+
+Loads frames like :mod:`tests.bench_landmarker_profiles` and feeds each
+one to both cameras of a :class:`StereoFaceAnalysisPipeline` built on a
+synthetic calibration (the pose output is meaningless; only the
+landmarker cost is measured). Reports the mean left, right and wall time
+per pair from :attr:`StereoFaceAnalysisPipeline.last_timings` with
+``parallel_inference`` on and off. With the pair overlapping, wall time
+should come in well under left + right. Needs OpenCV and MediaPipe.
+
+Not collected by the test runner. Run with:
+
+    python -m tests.bench_stereo_parallel --video face.mp4 --frames 300
+    python -m tests.bench_stereo_parallel --image face.jpg --width 640
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import numpy as np
+
+from src.face_tracking.pipelines.stereo_face_analysis import (
+    StereoCalibration,
+    StereoFaceAnalysisPipeline,
+)
+from src.face_tracking.providers.face_landmarks import DELEGATES
+from tests.bench_landmarker_profiles import load_frames
+
+
+def synthetic_calibration(width: int, height: int) -> StereoCalibration:
+    focal = float(width)
+    k = np.array([[focal, 0.0, width / 2.0], [0.0, focal, height / 2.0], [0.0, 0.0, 1.0]])
+    return StereoCalibration(
+        k1=k, d1=np.zeros(5), k2=k.copy(), d2=np.zeros(5), r=np.eye(3), t=np.array([[-60.0], [0.0], [0.0]])
+    )
+
+
+def bench_pair(frames: List[np.ndarray], parallel: bool, args):
+    """(left ms, right ms, wall ms) per frame pair, one list each."""
+    height, width = frames[0].shape[:2]
+    pipeline = StereoFaceAnalysisPipeline(
+        stereo_calibration=synthetic_calibration(width, height),
+        face_model_path=args.face_model,
+        parallel_inference=parallel,
+        delegate=args.delegate,
+    )
+    try:
+        left, right, wall = [], [], []
+        for i, rgb in enumerate(frames[: args.warmup] + frames):
+            pipeline.analyze(rgb, rgb, width, height, width, height, screen_width=1920, screen_height=1080)
+            timings = pipeline.last_timings
+            if i >= args.warmup and timings is not None:
+                left.append(timings.left_ms)
+                right.append(timings.right_ms)
+                wall.append(timings.wall_ms)
+        return left, right, wall
+    finally:
+        pipeline.release()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", default=None)
+    source.add_argument("--image", default=None)
+    source.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--width", type=int, default=0, help="resize frames to this width first")
+    parser.add_argument("--delegate", choices=DELEGATES, default="cpu")
+    parser.add_argument("--face-model", default=None)
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args)
+    if not frames:
+        print("no frames", file=sys.stderr)
+        return 1
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frame pairs @ {width}x{height}, delegate {args.delegate}")
+    for parallel in (True, False):
+        left, right, wall = bench_pair(frames, parallel, args)
+        if not wall:
+            print("no timings recorded", file=sys.stderr)
+            return 1
+        left_ms, right_ms, wall_ms = (sum(v) / len(v) for v in (left, right, wall))
+        label = "parallel" if parallel else "sequential"
+        print(
+            f"  {label:10s}: left {left_ms:7.3f}  right {right_ms:7.3f}  wall {wall_ms:7.3f} ms/pair"
+            f"  (left + right {left_ms + right_ms:7.3f})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
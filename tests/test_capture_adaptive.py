@@ -0,0 +1,147 @@
+"""Unit tests for receiver feedback and the adaptive quality controller.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_adaptive -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.adaptive import (
+    AdaptiveConfig,
+    AdaptiveSetting,
+    Feedback,
+    FeedbackReporter,
+    QualityController,
+    is_feedback_packet,
+    pack_feedback,
+    parse_feedback,
+)
+from src.capture.clock_sync import answer_ping
+from src.capture.protocol import Reassembler
+from src.capture.telemetry import ReceiveCounters
+
+
+class PacketTests(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        fb = Feedback(cam_id=2, last_frame_id=1234, frames=1200, latency_ms=12.5, decode_ms=3.0)
+        packet = pack_feedback(fb)
+        self.assertTrue(is_feedback_packet(packet))
+        self.assertEqual(parse_feedback(packet), fb)
+
+    def test_other_peers_ignore_feedback(self) -> None:
+        packet = pack_feedback(Feedback(0, 1, 1, 0.0, 0.0))
+        self.assertIsNone(answer_ping(packet, 1.0, 2.0))
+        self.assertIsNone(Reassembler().feed(packet))
+        with self.assertRaises(ValueError):
+            parse_feedback(b"EYEF" + bytes(3))
+
+
+class ReporterTests(unittest.TestCase):
+    def test_reports_interval_means(self) -> None:
+        reporter = FeedbackReporter(interval=0.5)
+        counters = {0: ReceiveCounters()}
+        self.assertEqual(reporter.due(10.0, counters), [])
+        reporter.frame_completed(0, 9, now=10.0)
+        c = counters[0]
+        c.frames, c.latency_s, c.decoded, c.decode_s = 10, 0.1, 5, 0.02
+        self.assertEqual(reporter.due(10.2, counters), [])
+        (fb,) = reporter.due(10.5, counters)
+        self.assertEqual((fb.cam_id, fb.last_frame_id, fb.frames), (0, 9, 10))
+        self.assertAlmostEqual(fb.latency_ms, 10.0)
+        self.assertAlmostEqual(fb.decode_ms, 4.0)
+        # Nothing new: the means are zero, not a repeat of the last ones.
+        (fb,) = reporter.due(11.0, counters)
+        self.assertEqual((fb.latency_ms, fb.decode_ms), (0.0, 0.0))
+
+
+class _Link:
+    """Feeds the controller one FEEDBACK per cycle for a sender at 30 fps
+    of which ``delivery`` of the frames arrive."""
+
+    def __init__(self, controller: QualityController, now: float = 0.0) -> None:
+        self.controller = controller
+        self.now = now
+        self.frame_id = 0
+        self.frames = 0
+        self.bytes_sent = 0
+
+    def run(self, seconds: float, delivery: float = 1.0, latency_ms: float = 5.0,
+            bytes_per_s: float = 0.0, ceiling: int = 85):
+        changes = []
+        for _ in range(int(seconds / 0.5)):
+            self.now += 0.5
+            self.frame_id += 15
+            self.frames += round(15 * delivery)
+            self.bytes_sent += int(bytes_per_s * 0.5)
+            self.controller.on_feedback(
+                Feedback(0, self.frame_id, self.frames, latency_ms, 2.0), self.now
+            )
+            setting = self.controller.update(self.now, self.bytes_sent, ceiling)
+            if setting is not None:
+                changes.append(setting)
+        return changes
+
+
+class ControllerTests(unittest.TestCase):
+    def test_good_link_keeps_the_commanded_quality(self) -> None:
+        link = _Link(QualityController())
+        self.assertEqual(link.run(20.0), [])
+        self.assertEqual(link.controller.setting, AdaptiveSetting(100, 1.0))
+
+    def test_loss_cuts_quality_then_resolution(self) -> None:
+        config = AdaptiveConfig(min_quality=60, scales=(1.0, 0.5))
+        link = _Link(QualityController(config))
+        changes = link.run(30.0, delivery=0.7)
+        self.assertEqual(
+            changes,
+            [AdaptiveSetting(75, 1.0), AdaptiveSetting(65, 1.0), AdaptiveSetting(60, 1.0),
+             AdaptiveSetting(60, 0.5)],
+        )
+
+    def test_recovery_undoes_the_last_cut_first(self) -> None:
+        config = AdaptiveConfig(min_quality=75, scales=(1.0, 0.5), step_up=5)
+        link = _Link(QualityController(config))
+        link.run(10.0, delivery=0.5)
+        self.assertEqual(link.controller.setting, AdaptiveSetting(75, 0.5))
+        changes = link.run(60.0)
+        self.assertEqual(
+            changes,
+            [AdaptiveSetting(75, 1.0), AdaptiveSetting(80, 1.0), AdaptiveSetting(100, 1.0)],
+        )
+
+    def test_latency_and_byte_budget_count_as_congestion(self) -> None:
+        link = _Link(QualityController(AdaptiveConfig(max_latency_ms=50.0)))
+        self.assertTrue(link.run(3.0, latency_ms=80.0))
+        link = _Link(QualityController(AdaptiveConfig(byte_budget=1e6)))
+        self.assertEqual(link.run(1.0, bytes_per_s=2e6), [AdaptiveSetting(75, 1.0)])
+        # Just under budget: no cut, but no raise either.
+        self.assertEqual(link.run(10.0, bytes_per_s=0.95e6), [])
+
+    def test_cuts_start_from_the_commanded_quality(self) -> None:
+        link = _Link(QualityController())
+        (first, *_) = link.run(3.0, delivery=0.5, ceiling=70)
+        self.assertEqual(first.quality_cap, 60)
+
+    def test_config_is_validated(self) -> None:
+        for config in (
+            AdaptiveConfig(min_quality=0),
+            AdaptiveConfig(target_delivery=0.0),
+            AdaptiveConfig(scales=(0.5, 1.0)),
+        ):
+            with self.subTest(config=config), self.assertRaises(ValueError):
+                QualityController(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for the frame buffer pool.
+
+No OpenCV or cameras required; the default allocator needs NumPy.
+
+Run with:
+
+    python -m unittest tests.test_capture_buffer_pool -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.buffer_pool import BufferPool
+
+
+def _bytes(shape, dtype):
+    size = 1
+    for n in shape:
+        size *= n
+    return bytearray(size)
+
+
+class BufferPoolTests(unittest.TestCase):
+    def test_released_buffers_are_reused(self) -> None:
+        pool = BufferPool(allocate=_bytes)
+        with pool.lease((240, 320, 3)) as first:
+            self.assertEqual(len(first), 240 * 320 * 3)
+        with pool.lease((240, 320, 3)) as second:
+            self.assertIs(second, first)
+        self.assertEqual(pool.stats(), {"hits": 1, "misses": 1, "outstanding": 0, "free": 1})
+
+    def test_shapes_and_dtypes_do_not_mix(self) -> None:
+        pool = BufferPool(allocate=_bytes)
+        pool.lease((2, 2)).release()
+        pool.lease((2, 3)).release()
+        pool.lease((2, 2), "float32").release()
+        self.assertEqual(pool.stats()["misses"], 3)
+
+    def test_concurrent_leases_get_distinct_buffers(self) -> None:
+        pool = BufferPool(allocate=_bytes)
+        left = pool.lease((4,))
+        right = pool.lease((4,))
+        self.assertIsNot(left.array, right.array)
+        self.assertEqual(pool.stats()["outstanding"], 2)
+        left.release()
+        left.release()
+        self.assertEqual(pool.stats()["outstanding"], 1)
+
+    def test_free_list_is_bounded(self) -> None:
+        pool = BufferPool(max_free=2, allocate=_bytes)
+        leases = [pool.lease((4,)) for _ in range(5)]
+        for lease in leases:
+            lease.release()
+        self.assertEqual(pool.stats()["free"], 2)
+        pool.clear()
+        self.assertEqual(pool.stats()["free"], 0)
+
+    def test_default_allocator_makes_ndarrays(self) -> None:
+        import numpy as np
+
+        pool = BufferPool()
+        with pool.lease((3, 4, 3)) as first:
+            self.assertIsInstance(first, np.ndarray)
+            self.assertEqual((first.shape, first.dtype), ((3, 4, 3), np.dtype(np.uint8)))
+            first.fill(7)
+        with pool.lease((3, 4, 3), np.dtype(np.uint8).name) as second:
+            self.assertIs(second, first)
+        with pool.lease((3, 4), "float32") as other:
+            self.assertEqual(other.dtype, np.float32)
+        self.assertEqual(pool.stats()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for remote capture clock-offset estimation.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_clock_sync -v
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.clock_sync import (
+    KIND_PING,
+    KIND_PONG,
+    ClockEstimator,
+    ClockSync,
+    answer_ping,
+    is_sync_packet,
+    pack_ping,
+    parse_sync_packet,
+)
+from src.capture.protocol import Reassembler
+
+
+REMOTE = ("192.168.1.40", 50123)
+LOCAL = ("127.0.0.1", 50124)
+
+
+class _RemoteClock:
+    """remote(t) = offset + (1 + drift) * t, with one-way delays of at
+    least ``base`` plus random queueing."""
+
+    def __init__(self, offset: float, drift: float, base: float = 0.002, seed: int = 1) -> None:
+        self.offset = offset
+        self.drift = drift
+        self.base = base
+        self._rng = random.Random(seed)
+
+    def remote(self, local_t: float) -> float:
+        return self.offset + (1.0 + self.drift) * local_t
+
+    def round_trip(self, t0: float):
+        t1_local = t0 + self.base + self._rng.expovariate(1 / 0.004)
+        t2_local = t1_local + 0.0002
+        t3 = t2_local + self.base + self._rng.expovariate(1 / 0.004)
+        return self.remote(t1_local), self.remote(t2_local), t3
+
+
+class PacketTests(unittest.TestCase):
+    def test_ping_pong_round_trip(self) -> None:
+        ping = pack_ping(7, 12.5)
+        self.assertTrue(is_sync_packet(ping))
+        self.assertEqual(parse_sync_packet(ping).kind, KIND_PING)
+        pong = parse_sync_packet(answer_ping(ping, 100.0, 100.001))
+        self.assertEqual(pong, (KIND_PONG, 7, 12.5, 100.0, 100.001))
+        self.assertIsNone(answer_ping(answer_ping(ping, 1.0, 2.0), 3.0, 4.0))
+
+    def test_frame_packets_are_not_sync_packets(self) -> None:
+        self.assertFalse(is_sync_packet(b"EYEC" + bytes(32)))
+        with self.assertRaises(ValueError):
+            parse_sync_packet(b"EYES" + bytes(3))
+
+    def test_reassembler_ignores_sync_packets(self) -> None:
+        self.assertIsNone(Reassembler().feed(pack_ping(1, 0.0)))
+
+
+class EstimatorTests(unittest.TestCase):
+    def test_offset_within_reported_uncertainty(self) -> None:
+        clock = _RemoteClock(offset=5000.0, drift=0.0)
+        est = ClockEstimator()
+        for i in range(20):
+            t0 = 10.0 + i
+            est.add(t0, *clock.round_trip(t0))
+        self.assertTrue(est.synced)
+        error = abs(est.offset_at(30.0) - 5000.0)
+        self.assertLessEqual(error, est.uncertainty)
+        self.assertLess(est.uncertainty, 0.005)
+
+    def test_drift_is_tracked(self) -> None:
+        clock = _RemoteClock(offset=-300.0, drift=50e-6)
+        est = ClockEstimator()
+        for i in range(64):
+            t0 = 1000.0 + i
+            est.add(t0, *clock.round_trip(t0))
+        self.assertAlmostEqual(est.drift * 1e6, 50.0, delta=15.0)
+        # A frame captured at local t=1100 maps back to about t=1100.
+        self.assertAlmostEqual(est.to_local(clock.remote(1100.0)), 1100.0, delta=0.003)
+
+    def test_inconsistent_samples_are_rejected(self) -> None:
+        est = ClockEstimator()
+        self.assertFalse(est.add(10.0, 0.0, 5.0, 10.001))
+        self.assertEqual(est.samples, 0)
+
+
+class ClockSyncTests(unittest.TestCase):
+    def test_local_senders_are_left_alone(self) -> None:
+        sync = ClockSync()
+        self.assertIsNone(sync.observe(LOCAL, 0.0))
+        self.assertEqual(sync.to_local(LOCAL, 12.0, 12.01), 12.0)
+        self.assertEqual(sync.due_pings(1.0), [])
+
+    def test_remote_sender_is_pinged_and_mapped(self) -> None:
+        clock = _RemoteClock(offset=7777.0, drift=0.0, seed=3)
+        sync = ClockSync(interval=1.0, fast_interval=0.1)
+        now = 50.0
+        # Unsynced: receive time stands in for the capture time.
+        self.assertEqual(sync.to_local(REMOTE, clock.remote(49.99), now), now)
+        for _ in range(10):
+            for addr, ping in sync.due_pings(now):
+                self.assertEqual(addr, REMOTE)
+                t0 = parse_sync_packet(ping).t0
+                t1, t2, t3 = clock.round_trip(t0)
+                self.assertTrue(sync.handle(answer_ping(ping, t1, t2), addr, t3))
+            now += 0.1
+        status = sync.status()[REMOTE]
+        self.assertEqual(status["synced"], 1.0)
+        mapped = sync.to_local(REMOTE, clock.remote(now - 0.030), now)
+        self.assertAlmostEqual(mapped, now - 0.030, delta=status["uncertainty_ms"] / 1000.0)
+        # Synced after the fourth round trip; since then pings go out at
+        # the slow rate.
+        self.assertEqual(sync.due_pings(now), [])
+        self.assertEqual(len(sync.due_pings(now + 0.5)), 1)
+
+    def test_pongs_from_unknown_sources_are_ignored(self) -> None:
+        sync = ClockSync()
+        pong = answer_ping(pack_ping(1, 0.0), 1.0, 1.0)
+        self.assertFalse(sync.handle(pong, REMOTE, 0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
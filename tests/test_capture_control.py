@@ -0,0 +1,113 @@
+"""Unit tests for the capture control-channel line format.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_control -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.control import (
+    OP_RESET,
+    OP_ROI,
+    OP_SET,
+    format_reset,
+    format_roi,
+    format_set,
+    format_start,
+    parse_control_line,
+    parse_start_line,
+)
+
+
+class FormatTests(unittest.TestCase):
+    def test_set_round_trip(self) -> None:
+        line = format_set(fps=5, jpeg_quality=60)
+        self.assertEqual(line, "SET fps=5 jpeg_quality=60")
+        cmd = parse_control_line(line)
+        self.assertEqual(cmd.op, OP_SET)
+        self.assertEqual(cmd.params, {"fps": 5, "jpeg_quality": 60})
+
+    def test_reset_round_trip(self) -> None:
+        cmd = parse_control_line(format_reset())
+        self.assertEqual(cmd.op, OP_RESET)
+        self.assertEqual(cmd.params, {})
+
+    def test_roi_round_trip(self) -> None:
+        line = format_roi(1, (200, 96, 160, 192))
+        self.assertEqual(line, "ROI cam=1 x=200 y=96 w=160 h=192")
+        cmd = parse_control_line(line)
+        self.assertEqual(cmd.op, OP_ROI)
+        self.assertEqual(cmd.params, {"cam": 1, "x": 200, "y": 96, "w": 160, "h": 192})
+
+    def test_roi_clear_and_clamp(self) -> None:
+        self.assertEqual(format_roi(0, None), "ROI cam=0 x=0 y=0 w=0 h=0")
+        self.assertEqual(format_roi(0, (-5, 3, 10, 10)), "ROI cam=0 x=0 y=3 w=10 h=10")
+
+    def test_format_rejects_bad_values(self) -> None:
+        with self.assertRaises(ValueError):
+            format_set()
+        with self.assertRaises(ValueError):
+            format_set(fps=0)
+        with self.assertRaises(ValueError):
+            format_set(brightness=10)
+
+
+class ParseTests(unittest.TestCase):
+    def test_resolution(self) -> None:
+        cmd = parse_control_line("SET width=320 height=240\n")
+        self.assertEqual(cmd.params, {"width": 320, "height": 240})
+
+    def test_op_is_case_insensitive(self) -> None:
+        self.assertEqual(parse_control_line("set fps=10").op, OP_SET)
+        self.assertEqual(parse_control_line("reset").op, OP_RESET)
+
+    def test_rejects_malformed_lines(self) -> None:
+        for line in (
+            "",
+            "   ",
+            "SET",
+            "SET fps",
+            "SET fps=abc",
+            "SET fps=1000",
+            "SET jpeg_quality=0",
+            "SET exposure=3",
+            "RESET fps=30",
+            "PAUSE",
+            "ROI cam=0 x=1 y=1 w=1",
+            "ROI cam=0 x=1 y=1 w=1 h=1 z=1",
+            "ROI cam=0 x=-1 y=1 w=1 h=1",
+        ):
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    parse_control_line(line)
+
+
+class StartLineTests(unittest.TestCase):
+    def test_round_trip_keeps_arguments_intact(self) -> None:
+        args = ["--cam0", "0", "--port", "9123", "--shm-prefix", "odd name's"]
+        line = format_start(args)
+        self.assertTrue(line.startswith("START "))
+        self.assertEqual(parse_start_line(line), args)
+
+    def test_rejects_other_lines(self) -> None:
+        for line in ("", "START", "SET fps=5", "START 'unterminated"):
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    parse_start_line(line)
+        with self.assertRaises(ValueError):
+            format_start([])
+
+
+if __name__ == "__main__":
+    unittest.main()
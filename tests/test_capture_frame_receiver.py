@@ -0,0 +1,210 @@
+"""Unit tests for the frame receiver's decode-on-demand frame handles.
+
+Needs OpenCV and NumPy (frames are real JPEGs) -- no cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_frame_receiver -v
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.buffer_pool import BufferPool
+from src.capture.frame_receiver import BaseFrameReceiver, ReceivedFrame
+from src.capture.protocol import FLAG_ROI, CompletedFrame
+
+_WIDTH = 64
+_HEIGHT = 48
+
+
+def _completed(frame_id: int = 1, cam_id: int = 0) -> CompletedFrame:
+    bgr = np.zeros((_HEIGHT, _WIDTH, 3), dtype=np.uint8)
+    bgr[:, : _WIDTH // 2] = (0, 0, 255)
+    ok, jpeg = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    assert ok
+    return CompletedFrame(
+        cam_id=cam_id,
+        frame_id=frame_id,
+        timestamp=float(frame_id),
+        width=_WIDTH,
+        height=_HEIGHT,
+        jpeg_bytes=jpeg.tobytes(),
+    )
+
+
+def _roi_completed(frame_id: int = 1) -> CompletedFrame:
+    crop = np.full((16, 32, 3), 200, dtype=np.uint8)
+    ok, jpeg = cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    assert ok
+    return _completed(frame_id)._replace(
+        jpeg_bytes=jpeg.tobytes(), flags=FLAG_ROI, roi_x=16, roi_y=16
+    )
+
+
+class _Receiver(BaseFrameReceiver):
+    def _run(self) -> None:
+        pass
+
+
+class ReceivedFrameTests(unittest.TestCase):
+    def test_decodes_on_first_access_only(self) -> None:
+        frame = ReceivedFrame.from_completed(_completed())
+        self.assertFalse(frame.decoded)
+        self.assertEqual(frame.decode_s, 0.0)
+        bgr = frame.image("full")
+        self.assertTrue(frame.decoded)
+        self.assertEqual(bgr.shape, (_HEIGHT, _WIDTH, 3))
+        self.assertGreater(frame.decode_s, 0.0)
+        self.assertIs(frame.image("full"), bgr)
+        self.assertIs(frame.bgr(), bgr)
+
+    def test_variants_have_expected_shapes(self) -> None:
+        frame = ReceivedFrame.from_completed(_completed())
+        self.assertEqual(frame.image("half").shape, (_HEIGHT // 2, _WIDTH // 2, 3))
+        self.assertEqual(frame.image("quarter").shape, (_HEIGHT // 4, _WIDTH // 4, 3))
+        gray = frame.image("gray")
+        self.assertEqual(gray.shape, (_HEIGHT, _WIDTH))
+        # The red left half is brighter than the black right half.
+        self.assertGreater(int(gray[:, 0].mean()), int(gray[:, -1].mean()))
+        self.assertEqual((frame.width, frame.height), (_WIDTH, _HEIGHT))
+
+    def test_variants_derive_from_cached_full_decode(self) -> None:
+        frame = ReceivedFrame.from_completed(_completed())
+        frame.image("full")
+        decode_s = frame.decode_s
+        half = frame.image("half")
+        gray = frame.image("gray")
+        self.assertEqual(frame.decode_s, decode_s)
+        self.assertIs(frame.image("half"), half)
+        self.assertIs(frame.image("gray"), gray)
+        self.assertEqual(half.shape, (_HEIGHT // 2, _WIDTH // 2, 3))
+
+    def test_corrupt_jpeg_returns_none_and_stays_failed(self) -> None:
+        frame = ReceivedFrame.from_completed(_completed()._replace(jpeg_bytes=b"not a jpeg"))
+        self.assertIsNone(frame.image("half"))
+        self.assertTrue(frame.decoded)
+        self.assertIsNone(frame.image("full"))
+
+    def test_unknown_variant_is_rejected(self) -> None:
+        frame = ReceivedFrame.from_completed(_completed())
+        with self.assertRaises(ValueError):
+            frame.image("tiny")
+
+
+class RoiPasteTests(unittest.TestCase):
+    def test_crop_is_pasted_at_its_offset(self) -> None:
+        frame = ReceivedFrame.from_completed(_roi_completed())
+        self.assertEqual(frame.roi, (16, 16))
+        bgr = frame.image("full")
+        self.assertEqual(bgr.shape, (_HEIGHT, _WIDTH, 3))
+        self.assertGreater(int(bgr[16:32, 16:48].min()), 150)
+        self.assertEqual(int(bgr[:16].max()), 0)
+        half = frame.image("half")
+        self.assertEqual(half.shape, (_HEIGHT // 2, _WIDTH // 2, 3))
+        self.assertGreater(int(half[8:16, 8:24].min()), 150)
+
+    def test_canvases_are_reused_once_the_frame_is_collected(self) -> None:
+        pool = BufferPool()
+        frame = ReceivedFrame.from_completed(_roi_completed(1), pool)
+        first = frame.image("full")
+        first[:] = 255  # dirty the buffer: the next paste must clear it
+        self.assertEqual(pool.stats()["outstanding"], 1)
+        del frame, first
+        gc.collect()
+        self.assertEqual(pool.stats()["outstanding"], 0)
+
+        frame = ReceivedFrame.from_completed(_roi_completed(2), pool)
+        second = frame.image("full")
+        self.assertEqual(pool.stats()["hits"], 1)
+        self.assertEqual(int(second[:16].max()), 0)
+        self.assertGreater(int(second[16:32, 16:48].min()), 150)
+
+    def test_receiver_pools_roi_frames_only(self) -> None:
+        receiver = _Receiver()
+        receiver._publish_completed(_roi_completed(1), 1.0)
+        receiver._publish_completed(_completed(2), 2.0)
+        receiver.get_latest_frame(0, timeout=0.0).image("full")
+        self.assertEqual(receiver.pool_stats()[0]["misses"], 0)
+        receiver._history[0][0].image("full")
+        self.assertEqual(receiver.pool_stats()[0]["outstanding"], 1)
+
+    def test_getters_hand_out_roi_images_that_outlive_the_history(self) -> None:
+        receiver = _Receiver(history_len=1)
+        receiver._publish_completed(_roi_completed(1), 1.0)
+        held, _ = receiver.get_latest_bgr(0, timeout=0.0)
+        expected = held.copy()
+        for frame_id in range(2, 6):
+            receiver._publish_completed(_roi_completed(frame_id)._replace(roi_x=0, roi_y=0), float(frame_id))
+            gc.collect()
+            receiver.get_latest_bgr(0, timeout=0.0)
+        self.assertGreater(receiver.pool_stats()[0]["hits"], 0)
+        np.testing.assert_array_equal(held, expected)
+
+        for cam_id in (1, 2):
+            receiver._publish_completed(_roi_completed(1)._replace(cam_id=cam_id), 1.0)
+        left, right, _, _ = receiver.get_latest_pair(1, 2, timeout=0.0)
+        expected = (left.copy(), right.copy())
+        for frame_id in range(2, 6):
+            for cam_id in (1, 2):
+                receiver._publish_completed(
+                    _roi_completed(frame_id)._replace(cam_id=cam_id, roi_x=0, roi_y=0), float(frame_id)
+                )
+            gc.collect()
+            receiver.get_latest_pair(1, 2, timeout=0.0)
+        np.testing.assert_array_equal(left, expected[0])
+        np.testing.assert_array_equal(right, expected[1])
+
+
+class LeaseRgbTests(unittest.TestCase):
+    def test_converts_into_reused_pool_buffers(self) -> None:
+        receiver = _Receiver()
+        bgr = np.zeros((4, 6, 3), dtype=np.uint8)
+        bgr[..., 0] = 10
+        bgr[..., 2] = 30
+        with receiver.lease_rgb(0, bgr) as rgb:
+            self.assertEqual(rgb.shape, bgr.shape)
+            self.assertEqual(tuple(rgb[0, 0]), (30, 0, 10))
+            first = rgb
+        with receiver.lease_rgb(0, bgr[::-1].copy()) as rgb:
+            self.assertIs(rgb, first)
+        receiver.lease_rgb(1, bgr).release()
+        self.assertEqual(
+            receiver.pool_stats(),
+            {
+                0: {"hits": 1, "misses": 1, "outstanding": 0, "free": 1},
+                1: {"hits": 0, "misses": 1, "outstanding": 0, "free": 1},
+            },
+        )
+
+
+class DecodeStatsTests(unittest.TestCase):
+    def test_evicted_frames_are_counted_by_decode_state(self) -> None:
+        receiver = _Receiver(history_len=1)
+        first = ReceivedFrame.from_completed(_completed(1))
+        receiver._publish(first, 1.0)
+        first.image("gray")
+        receiver._publish(ReceivedFrame.from_completed(_completed(2)), 2.0)
+        receiver._publish(ReceivedFrame.from_completed(_completed(3)), 3.0)
+
+        self.assertEqual(
+            receiver.decode_stats(), {"frames_received": 3, "frames_never_decoded": 1}
+        )
+        counters = receiver.receive_counters(0)
+        self.assertEqual(counters.decoded, 1)
+        self.assertAlmostEqual(counters.decode_s, first.decode_s)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Unit tests for landmark-only streaming records.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_landmark_stream -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.landmark_stream import (
+    BLENDSHAPE_NAMES,
+    Landmark,
+    LandmarkRecord,
+    decode_record,
+    encode_record,
+)
+from src.capture.protocol import FLAG_LANDMARKS, FLAG_ROI, Reassembler, pack_packets
+
+
+def _face(n: int = 478):
+    landmarks = [SimpleNamespace(x=i / n, y=1.0 - i / n, z=-0.01 * (i % 7)) for i in range(n)]
+    matrix = [[float(r * 4 + c) for c in range(4)] for r in range(4)]
+    blendshapes = [
+        SimpleNamespace(index=i, category_name=name, score=i / 100.0)
+        for i, name in enumerate(BLENDSHAPE_NAMES)
+    ]
+    return landmarks, matrix, blendshapes
+
+
+class RecordTests(unittest.TestCase):
+    def test_round_trip_is_compact(self) -> None:
+        landmarks, matrix, blendshapes = _face()
+        payload = encode_record(landmarks, matrix, blendshapes)
+        self.assertLess(len(payload), 6200)
+        record = decode_record(payload)
+        self.assertEqual(len(record.landmarks), 478)
+        self.assertAlmostEqual(record.landmarks[100].x, 100 / 478, places=6)
+        self.assertIsInstance(record.landmarks[0], Landmark)
+        self.assertEqual(record.facial_transformation_matrix, matrix)
+        by_name = {c.category_name: c.score for c in record.blendshapes}
+        self.assertEqual(len(by_name), 52)
+        self.assertAlmostEqual(by_name["mouthPucker"], 0.38, places=6)
+
+    def test_no_face(self) -> None:
+        self.assertEqual(decode_record(encode_record(None)), LandmarkRecord(None))
+
+    def test_optional_parts(self) -> None:
+        landmarks, _, _ = _face(10)
+        record = decode_record(encode_record(landmarks))
+        self.assertIsNone(record.facial_transformation_matrix)
+        self.assertIsNone(record.blendshapes)
+        unknown = [SimpleNamespace(category_name="tongueOut", score=1.0)]
+        self.assertEqual(decode_record(encode_record(landmarks, None, unknown)).blendshapes, [])
+
+    def test_malformed_records_are_rejected(self) -> None:
+        payload = encode_record(*_face(10))
+        for bad in (payload[:-1], payload + b"\0", b"\x02" + payload[1:], b""):
+            with self.subTest(size=len(bad)), self.assertRaises(ValueError):
+                decode_record(bad)
+
+
+class ProtocolTests(unittest.TestCase):
+    def test_records_travel_as_flagged_frames(self) -> None:
+        payload = encode_record(*_face())
+        reasm = Reassembler()
+        completed = None
+        packets = pack_packets(3, 7, 1.5, 640, 480, payload, fec_ratio=0.2, flags=FLAG_LANDMARKS)
+        # Lose one data packet; parity rebuilds the record.
+        for pkt in packets[1:]:
+            completed = reasm.feed(pkt) or completed
+        self.assertIsNotNone(completed)
+        self.assertEqual(completed.flags, FLAG_LANDMARKS)
+        self.assertEqual(bytes(completed.jpeg_bytes), payload)
+        self.assertEqual((completed.width, completed.height), (640, 480))
+
+    def test_only_known_extra_flags(self) -> None:
+        with self.assertRaises(ValueError):
+            pack_packets(0, 0, 0.0, 640, 480, b"x", flags=FLAG_ROI)
+
+
+if __name__ == "__main__":
+    unittest.main()
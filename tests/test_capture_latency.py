@@ -0,0 +1,80 @@
+"""Unit tests for capture timestamp selection and latency histograms.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_latency -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.latency import (
+    LatencyHistogram,
+    LatencyTracker,
+    mode_latency,
+    pick_capture_timestamp,
+)
+
+
+class CaptureTimestampTests(unittest.TestCase):
+    def test_plausible_driver_stamp_wins(self) -> None:
+        # Exposure ended 40 ms before the frame left the driver queue.
+        self.assertEqual(pick_capture_timestamp(99.96, 100.0), (99.96, True))
+
+    def test_other_clocks_fall_back_to_grab_time(self) -> None:
+        for driver_s in (None, 0.0, 3.2, 100.5, 1.7e9):
+            with self.subTest(driver_s=driver_s):
+                self.assertEqual(pick_capture_timestamp(driver_s, 100.0), (100.0, False))
+
+
+class HistogramTests(unittest.TestCase):
+    def test_percentiles_are_bucket_accurate(self) -> None:
+        h = LatencyHistogram()
+        for ms in range(1, 101):
+            h.add(ms / 1000.0)
+        s = h.summary()
+        self.assertEqual(s["count"], 100)
+        self.assertAlmostEqual(s["mean_ms"], 50.5)
+        self.assertAlmostEqual(s["max_ms"], 100.0)
+        self.assertGreaterEqual(s["p50_ms"], 50.0)
+        self.assertLess(s["p50_ms"], 50.0 * 1.2)
+        self.assertGreaterEqual(s["p95_ms"], 95.0)
+        self.assertLessEqual(s["p99_ms"], s["max_ms"])
+
+    def test_overflow_and_empty(self) -> None:
+        self.assertEqual(LatencyHistogram().summary(), {"count": 0})
+        h = LatencyHistogram()
+        h.add(30.0)
+        self.assertEqual(h.percentile(0.5), 30.0)
+
+
+class TrackerTests(unittest.TestCase):
+    def test_stages_are_measured_from_capture(self) -> None:
+        tracker = LatencyTracker("test", report_interval=0)
+        tracker.record("receive", 10.0, now=10.002)
+        tracker.record("cursor", 10.0, now=10.050)
+        tracker.record("cursor", None, now=11.0)
+        snap = tracker.snapshot()
+        self.assertEqual(snap["receive"]["count"], 1)
+        self.assertAlmostEqual(snap["cursor"]["max_ms"], 50.0)
+        self.assertEqual(snap["decode"], {"count": 0})
+        self.assertIn("cursor p50=", tracker.format())
+        with self.assertRaises(ValueError):
+            tracker.record("paint", 10.0, now=10.1)
+
+    def test_trackers_are_per_mode(self) -> None:
+        self.assertIs(mode_latency("a-test-mode"), mode_latency("a-test-mode"))
+        self.assertIsNot(mode_latency("a-test-mode"), mode_latency("b-test-mode"))
+
+
+if __name__ == "__main__":
+    unittest.main()
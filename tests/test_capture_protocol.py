@@ -9,6 +9,9 @@ Run with:
 
 from __future__ import annotations
 
+import itertools
+import random
+import socket
 import struct
 import sys
 import unittest
@@ -19,14 +22,24 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 from src.capture.protocol import (
+    EXT_FMT,
+    EXT_SIZE,
+    FLAG_PARITY,
+    FLAG_ROI,
     HEADER_FMT,
     HEADER_SIZE,
     MAGIC,
+    MAX_FRAME_BYTES,
+    MAX_LARGE_PAYLOAD,
     MAX_PAYLOAD,
     VERSION,
+    VERSION_EXT,
+    VERSION_FEC,
+    VERSION_LARGE,
     Reassembler,
     pack_packets,
     parse_packet,
+    pick_max_payload,
 )
 
 
@@ -214,6 +227,41 @@ class ReassemblerTests(unittest.TestCase):
         self.assertEqual(by_cam[1].jpeg_bytes, jpeg_a)
         self.assertEqual(by_cam[2].jpeg_bytes, jpeg_b)
 
+    def test_duplicate_packets_are_ignored(self) -> None:
+        jpeg, packets = self._make_packets(cam_id=1, frame_id=1, payload_size=3000)
+        reasm = Reassembler()
+        self.assertIsNone(reasm.feed(packets[0], now=0.0))
+        self.assertIsNone(reasm.feed(packets[0], now=0.0))
+        self.assertIsNone(reasm.feed(packets[1], now=0.0))
+        result = reasm.feed(packets[2], now=0.0)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.jpeg_bytes, jpeg)
+
+    def test_short_middle_packet_is_dropped(self) -> None:
+        _, packets = self._make_packets(cam_id=1, frame_id=1, payload_size=3000)
+        short = pack_packets(1, 1, 0.1, 640, 480, b"x" * 10)[0]
+        # Same frame, index 0 of 3, but a 10-byte payload: cannot be placed.
+        bad = struct.pack(HEADER_FMT, MAGIC, VERSION, 1, 1, 0, 3, 0.1, 640, 480, 10) + short[HEADER_SIZE:]
+        reasm = Reassembler()
+        self.assertIsNone(reasm.feed(bad, now=0.0))
+        for pkt in packets[1:]:
+            self.assertIsNone(reasm.feed(pkt, now=0.0))
+        self.assertIsNotNone(reasm.feed(packets[0], now=0.0))
+
+    def test_accepts_memoryview_over_reused_buffer(self) -> None:
+        jpeg, packets = self._make_packets(cam_id=1, frame_id=1, payload_size=5000)
+        reasm = Reassembler()
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        result = None
+        for pkt in packets:
+            buf[: len(pkt)] = pkt
+            result = reasm.feed(view[: len(pkt)], now=0.0) or result
+            # Scribble over the buffer as the next recv_into would.
+            buf[: len(pkt)] = bytes(len(pkt))
+        self.assertIsNotNone(result)
+        self.assertEqual(result.jpeg_bytes, jpeg)
+
     def test_feed_with_garbage_returns_none(self) -> None:
         reasm = Reassembler()
         self.assertIsNone(reasm.feed(b""))
@@ -245,5 +293,173 @@ class PackPacketsBoundsTests(unittest.TestCase):
         self.assertEqual(len(last_payload), 17)
 
 
+class RoiExtensionTests(unittest.TestCase):
+    def test_plain_frames_keep_version_1(self) -> None:
+        header, _ = parse_packet(pack_packets(0, 0, 0.0, 640, 480, b"x")[0])
+        self.assertEqual(header.flags, 0)
+        self.assertEqual(pack_packets(0, 0, 0.0, 640, 480, b"x")[0][4], VERSION)
+
+    def test_roi_frame_round_trips_through_reassembler(self) -> None:
+        jpeg = bytes(i & 0xFF for i in range(MAX_PAYLOAD * 2 + 5))
+        packets = pack_packets(1, 7, 1.5, 640, 480, jpeg, roi=(208, 96))
+        self.assertEqual(packets[0][4], VERSION_EXT)
+        self.assertEqual(len(packets[0]), HEADER_SIZE + EXT_SIZE + MAX_PAYLOAD)
+        reasm = Reassembler()
+        completed = None
+        for pkt in reversed(packets):
+            completed = reasm.feed(pkt, now=0.0) or completed
+        self.assertIsNotNone(completed)
+        self.assertEqual(completed.jpeg_bytes, jpeg)
+        self.assertEqual((completed.width, completed.height), (640, 480))
+        self.assertEqual(completed.flags, FLAG_ROI)
+        self.assertEqual((completed.roi_x, completed.roi_y), (208, 96))
+
+    def test_unknown_flags_are_rejected(self) -> None:
+        header = struct.pack(HEADER_FMT, MAGIC, VERSION_EXT, 0, 0, 0, 1, 0.0, 1, 1, 1)
+        ext = struct.pack(EXT_FMT, 0x80, 0, 0)
+        with self.assertRaises(ValueError):
+            parse_packet(header + ext + b"x")
+
+    def test_truncated_extension_raises(self) -> None:
+        header = struct.pack(HEADER_FMT, MAGIC, VERSION_EXT, 0, 0, 0, 1, 0.0, 1, 1, 0)
+        with self.assertRaises(ValueError):
+            parse_packet(header + b"\x01\x00")
+
+
+class LargePayloadTests(unittest.TestCase):
+    def test_large_payload_packs_fewer_packets(self) -> None:
+        jpeg = bytes(i & 0xFF for i in range(50000))
+        packets = pack_packets(1, 3, 0.5, 640, 480, jpeg, max_payload=MAX_LARGE_PAYLOAD)
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0][4], VERSION_LARGE)
+        header, payload = parse_packet(packets[0])
+        self.assertEqual(header.chunk, MAX_LARGE_PAYLOAD)
+        self.assertEqual(bytes(payload), jpeg)
+
+    def test_reassembles_large_frames_with_roi_out_of_order(self) -> None:
+        jpeg = bytes((i * 7) & 0xFF for i in range(25000))
+        packets = pack_packets(2, 9, 0.5, 640, 480, jpeg, roi=(32, 48), max_payload=10000)
+        self.assertEqual(len(packets), 3)
+        reasm = Reassembler()
+        self.assertIsNone(reasm.feed(packets[2], now=0.0))
+        self.assertIsNone(reasm.feed(packets[0], now=0.0))
+        completed = reasm.feed(packets[1], now=0.0)
+        self.assertIsNotNone(completed)
+        self.assertEqual(completed.jpeg_bytes, jpeg)
+        self.assertEqual((completed.roi_x, completed.roi_y), (32, 48))
+
+    def test_versions_coexist_per_camera(self) -> None:
+        small = b"a" * 3000
+        large = b"b" * 3000
+        reasm = Reassembler()
+        got = {}
+        for pkt in pack_packets(1, 1, 0.0, 8, 8, small) + pack_packets(2, 1, 0.0, 8, 8, large, max_payload=8000):
+            done = reasm.feed(pkt, now=0.0)
+            if done is not None:
+                got[done.cam_id] = done.jpeg_bytes
+        self.assertEqual(got, {1: small, 2: large})
+
+    def test_rejects_bad_max_payload(self) -> None:
+        with self.assertRaises(ValueError):
+            pack_packets(0, 0, 0.0, 1, 1, b"x", max_payload=0)
+        with self.assertRaises(ValueError):
+            pack_packets(0, 0, 0.0, 1, 1, b"x", max_payload=MAX_LARGE_PAYLOAD + 1)
+
+    def test_oversized_frame_headers_are_rejected(self) -> None:
+        # One small datagram claiming 65535 packets of 65000 bytes must not
+        # size a 4 GB reassembly buffer.
+        header = struct.pack(HEADER_FMT, MAGIC, VERSION_LARGE, 1, 5, 0, 0xFFFF, 0.0, 640, 480, 0)
+        packet = header + struct.pack("<BxHHH", 0, 0, 0, 65000)
+        with self.assertRaisesRegex(ValueError, "too large"):
+            parse_packet(packet)
+        reasm = Reassembler()
+        self.assertIsNone(reasm.feed(packet, now=0.0))
+        self.assertEqual(reasm.counters[1].rejected, 1)
+        self.assertEqual(reasm.prune(now=1e9), 0)
+        with self.assertRaises(ValueError):
+            pack_packets(0, 0, 0.0, 1, 1, b"x" * (MAX_FRAME_BYTES + 1), max_payload=MAX_LARGE_PAYLOAD)
+
+    def test_pick_max_payload_on_loopback(self) -> None:
+        rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            rx.bind(("127.0.0.1", 0))
+            addr = rx.getsockname()
+            self.assertEqual(pick_max_payload(tx, addr, MAX_PAYLOAD), MAX_PAYLOAD)
+            picked = pick_max_payload(tx, addr, MAX_LARGE_PAYLOAD)
+            self.assertGreaterEqual(picked, MAX_PAYLOAD)
+            self.assertLessEqual(picked, MAX_LARGE_PAYLOAD)
+        finally:
+            rx.close()
+            tx.close()
+
+
+class FecTests(unittest.TestCase):
+    JPEG = bytes(random.Random(7).randrange(256) for _ in range(10 * MAX_PAYLOAD - 321))
+
+    def _packets(self, fec_ratio: float = 0.3, **kw):
+        return pack_packets(0, 5, 1.5, 640, 480, self.JPEG, fec_ratio=fec_ratio, **kw)
+
+    def test_parity_packets_follow_the_data(self) -> None:
+        packets = self._packets()
+        self.assertEqual(len(packets), 10 + 3)
+        self.assertEqual([p[4] for p in packets[:10]], [VERSION] * 10)
+        header, payload = parse_packet(packets[10])
+        self.assertEqual(packets[10][4], VERSION_FEC)
+        self.assertEqual((header.packet_idx, header.total_pkts), (10, 10))
+        self.assertEqual(header.flags, FLAG_PARITY)
+        self.assertEqual(header.frame_len, len(self.JPEG))
+        self.assertEqual(len(payload), MAX_PAYLOAD)
+
+    def test_any_total_packets_rebuild_the_frame(self) -> None:
+        packets = self._packets()
+        for lost in itertools.combinations(range(13), 3):
+            with self.subTest(lost=lost):
+                reasm = Reassembler()
+                completed = None
+                for i, pkt in enumerate(packets):
+                    if i not in lost:
+                        completed = reasm.feed(pkt, now=0.0) or completed
+                self.assertIsNotNone(completed)
+                self.assertEqual(bytes(completed.jpeg_bytes), self.JPEG)
+                self.assertEqual(completed.flags, 0)
+                self.assertEqual(reasm.counters[0].recovered, 1 if any(i < 10 for i in lost) else 0)
+
+    def test_parity_first_and_roi_frames(self) -> None:
+        packets = self._packets(roi=(16, 32))
+        order = packets[10:] + packets[2:10]
+        reasm = Reassembler()
+        completed = None
+        for pkt in order:
+            completed = reasm.feed(pkt, now=0.0) or completed
+        self.assertEqual(bytes(completed.jpeg_bytes), self.JPEG)
+        self.assertEqual((completed.flags, completed.roi_x, completed.roi_y), (FLAG_ROI, 16, 32))
+
+    def test_one_packet_frames_and_large_payloads(self) -> None:
+        for kw in ({}, {"max_payload": 8000}):
+            with self.subTest(**kw):
+                jpeg = b"\xff\xd8tiny\xff\xd9"
+                data, parity = pack_packets(0, 1, 0.0, 8, 8, jpeg, fec_ratio=0.1, **kw)
+                completed = Reassembler().feed(parity, now=0.0)
+                self.assertEqual(bytes(completed.jpeg_bytes), jpeg)
+
+    def test_too_many_losses_leave_the_frame_incomplete(self) -> None:
+        reasm = Reassembler()
+        for pkt in self._packets()[4:]:
+            self.assertIsNone(reasm.feed(pkt, now=0.0))
+
+    def test_late_parity_is_not_a_straggler(self) -> None:
+        reasm = Reassembler()
+        for pkt in self._packets():
+            reasm.feed(pkt, now=0.0)
+        self.assertEqual(reasm.counters[0].stragglers, 0)
+
+    def test_parity_flag_only_on_parity_packets(self) -> None:
+        header = struct.pack(HEADER_FMT, MAGIC, VERSION_EXT, 0, 0, 0, 1, 0.0, 1, 1, 1)
+        ext = struct.pack(EXT_FMT, FLAG_PARITY, 0, 0)
+        with self.assertRaises(ValueError):
+            parse_packet(header + ext + b"x")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+"""Unit tests for the capture recording container and replay pacing.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_recording -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.protocol import FLAG_ROI, CompletedFrame
+from src.capture.recording import (
+    FOOTER_SIZE,
+    FrameRecorder,
+    Recording,
+    replay_schedule,
+)
+
+
+def _frame(cam_id: int, frame_id: int, timestamp: float, payload: bytes = b"", **kw) -> CompletedFrame:
+    return CompletedFrame(
+        cam_id=cam_id,
+        frame_id=frame_id,
+        timestamp=timestamp,
+        width=640,
+        height=480,
+        jpeg_bytes=payload or bytes([frame_id % 256]) * (100 + frame_id),
+        **kw,
+    )
+
+
+class _TempDirCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "session.eyerec")
+
+    def _record(self, frames) -> None:
+        with FrameRecorder(self.path) as recorder:
+            for frame in frames:
+                recorder.write(frame)
+
+    def _open(self) -> Recording:
+        recording = Recording(self.path)
+        self.addCleanup(recording.close)
+        return recording
+
+
+class ContainerTests(_TempDirCase):
+    def test_round_trip(self) -> None:
+        frames = [
+            _frame(0, 1, 10.0),
+            _frame(0, 2, 10.033, payload=bytearray(b"\xff\xd8crop\xff\xd9"), flags=FLAG_ROI, roi_x=32, roi_y=48),
+            _frame(0, 3, 10.066),
+        ]
+        self._record(frames)
+        recording = self._open()
+        self.assertTrue(recording.complete)
+        self.assertEqual(len(recording), 3)
+        for original, loaded in zip(frames, recording):
+            self.assertEqual(loaded._replace(jpeg_bytes=b""), original._replace(jpeg_bytes=b""))
+            self.assertEqual(bytes(loaded.jpeg_bytes), bytes(original.jpeg_bytes))
+        self.assertEqual(recording.cam_ids(), [0])
+        self.assertEqual(recording.time_span(), (10.0, 10.066))
+
+    def test_payloads_are_views_into_the_mapping(self) -> None:
+        self._record([_frame(0, 1, 1.0)])
+        recording = self._open()
+        self.assertIsInstance(recording[0].jpeg_bytes, memoryview)
+
+    def test_unfinished_recording_is_recovered(self) -> None:
+        recorder = FrameRecorder(self.path)
+        for i in range(4):
+            recorder.write(_frame(0, i, float(i)))
+        recorder._file.flush()
+        # Simulate a crash part-way through the last record.
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 20)
+        recording = self._open()
+        self.assertFalse(recording.complete)
+        self.assertEqual([f.frame_id for f in recording], [0, 1, 2])
+        recorder._file.close()
+
+    def test_rejects_other_files(self) -> None:
+        with open(self.path, "wb") as f:
+            f.write(b"not a recording at all")
+        with self.assertRaises(ValueError):
+            Recording(self.path)
+
+    def test_empty_recording(self) -> None:
+        self._record([])
+        recording = self._open()
+        self.assertTrue(recording.complete)
+        self.assertEqual(len(recording), 0)
+        self.assertEqual(os.path.getsize(self.path), 8 + FOOTER_SIZE)
+        self.assertEqual(list(replay_schedule(recording, "fast")), [])
+
+
+class ScheduleTests(_TempDirCase):
+    def _stereo(self) -> Recording:
+        # Right camera 4 ms behind left, written in receive order (the
+        # right frame of a pair sometimes lands first).
+        frames = []
+        for i in range(10):
+            t = 100.0 + i / 30.0
+            left = _frame(1, i, t)
+            right = _frame(2, i, t + 0.004)
+            frames += [right, left] if i % 3 == 0 else [left, right]
+        self._record(frames)
+        return self._open()
+
+    def test_realtime_keeps_recorded_spacing_and_skew(self) -> None:
+        schedule = list(replay_schedule(self._stereo(), "realtime"))
+        offsets = [offset for _, offset, _ in schedule]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertEqual([due for due, _, _ in schedule], offsets)
+        first_left = next(o for _, o, f in schedule if f.cam_id == 1)
+        first_right = next(o for _, o, f in schedule if f.cam_id == 2)
+        self.assertAlmostEqual(first_right - first_left, 0.004)
+
+    def test_fixed_rate_rescales_release_times_only(self) -> None:
+        recording = self._stereo()
+        self.assertAlmostEqual(recording.camera_fps(), 30.0, delta=0.5)
+        schedule = list(replay_schedule(recording, "fixed", fps=60.0))
+        last_due, last_offset, _ = schedule[-1]
+        self.assertAlmostEqual(last_due, last_offset / (60.0 / recording.camera_fps()))
+        # Timestamps keep the recorded spacing, so pairing sees live skew.
+        self.assertAlmostEqual(schedule[1][1] - schedule[0][1], 0.004)
+
+    def test_fast_releases_immediately(self) -> None:
+        schedule = list(replay_schedule(self._stereo(), "fast"))
+        self.assertEqual(len(schedule), 20)
+        self.assertTrue(all(due is None for due, _, _ in schedule))
+
+    def test_bad_pacing_fails_up_front(self) -> None:
+        recording = self._stereo()
+        with self.assertRaises(ValueError):
+            replay_schedule(recording, "warp")
+        with self.assertRaises(ValueError):
+            replay_schedule(recording, "fixed")
+
+
+if __name__ == "__main__":
+    unittest.main()
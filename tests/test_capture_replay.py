@@ -0,0 +1,72 @@
+"""Unit tests for a capture supervisor playing back a recording.
+
+Needs OpenCV (the supervisor imports the receivers) -- no subprocess or
+cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_replay -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.frame_capture import SINGLE_CAM_ID
+from src.capture.protocol import CompletedFrame
+from src.capture.recording import FrameRecorder, ReplayConfig
+from src.capture.session import assert_capture_alive
+from src.capture.supervisor import CaptureSupervisor
+
+
+class ReplaySupervisorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "session.eyerec")
+        with FrameRecorder(self.path) as recorder:
+            for i in range(3):
+                recorder.write(
+                    CompletedFrame(
+                        cam_id=SINGLE_CAM_ID,
+                        frame_id=i,
+                        timestamp=0.05 * i,
+                        width=640,
+                        height=480,
+                        jpeg_bytes=bytes([i]) * 64,
+                    )
+                )
+
+    def _start(self, pacing: str) -> CaptureSupervisor:
+        supervisor = CaptureSupervisor([0], replay=ReplayConfig(self.path, pacing=pacing))
+        supervisor.start()
+        self.addCleanup(supervisor.stop)
+        return supervisor
+
+    def test_alive_while_frames_remain(self) -> None:
+        supervisor = self._start("realtime")
+        self.assertTrue(supervisor.is_alive())
+        assert_capture_alive(supervisor)
+
+    def test_not_alive_once_the_last_frame_is_out(self) -> None:
+        supervisor = self._start("fast")
+        deadline = time.monotonic() + 2.0
+        while supervisor.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertFalse(supervisor.is_alive())
+        self.assertEqual(supervisor.receiver.get_latest_frame(SINGLE_CAM_ID, timeout=0.0).frame_id, 2)
+        with self.assertRaisesRegex(RuntimeError, "replay finished"):
+            assert_capture_alive(supervisor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for ``src.capture.roi``.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_roi -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.roi import (
+    ROI_ALIGN,
+    RoiFeedback,
+    RoiScheduler,
+    box_from_corners,
+    box_from_landmarks,
+    crop_rect,
+    square_crop,
+)
+
+
+class CropRectTests(unittest.TestCase):
+    def test_crop_is_padded_aligned_and_contains_box(self) -> None:
+        x, y, w, h = crop_rect((250, 130, 100, 120), 640, 480)
+        self.assertEqual(x % ROI_ALIGN, 0)
+        self.assertEqual(y % ROI_ALIGN, 0)
+        self.assertEqual(w % ROI_ALIGN, 0)
+        self.assertEqual(h % ROI_ALIGN, 0)
+        self.assertLess(x, 250 - 30)
+        self.assertGreater(x + w, 350 + 30)
+        self.assertLess(y, 130 - 30)
+        self.assertGreater(y + h, 250 + 30)
+
+    def test_crop_is_clamped_to_frame(self) -> None:
+        x, y, w, h = crop_rect((0, 0, 80, 80), 640, 480)
+        self.assertEqual((x, y), (0, 0))
+        x, y, w, h = crop_rect((580, 420, 60, 60), 640, 480)
+        self.assertEqual((x + w, y + h), (640, 480))
+
+    def test_degenerate_or_huge_boxes_give_none(self) -> None:
+        self.assertIsNone(crop_rect((10, 10, 0, 50), 640, 480))
+        self.assertIsNone(crop_rect((50, 50, 500, 400), 640, 480))
+
+
+class SquareCropTests(unittest.TestCase):
+    def test_crop_is_square_and_centred(self) -> None:
+        self.assertEqual(square_crop((270, 180, 100, 120), 640, 480, pad=0.25), (230, 150, 180, 180))
+
+    def test_crop_is_shifted_inside_and_capped(self) -> None:
+        self.assertEqual(square_crop((0, 400, 80, 80), 640, 480, pad=0.25), (0, 360, 120, 120))
+        self.assertEqual(square_crop((100, 50, 400, 380), 640, 480), (60, 0, 480, 480))
+        self.assertIsNone(square_crop((10, 10, 50, 0), 640, 480))
+
+
+class BoxHelperTests(unittest.TestCase):
+    def test_box_from_landmarks(self) -> None:
+        pts = [SimpleNamespace(x=0.25, y=0.5), SimpleNamespace(x=0.5, y=0.75)]
+        self.assertEqual(box_from_landmarks(pts, 640, 480), (160, 240, 160, 120))
+        self.assertIsNone(box_from_landmarks([], 640, 480))
+
+    def test_box_from_corners(self) -> None:
+        self.assertEqual(box_from_corners((10, 20, 110, 140)), (10, 20, 100, 120))
+        self.assertEqual(box_from_corners((-4, 20, 110, 140)), (0, 20, 110, 120))
+        self.assertIsNone(box_from_corners(None))
+        self.assertIsNone(box_from_corners((50, 50, 40, 60)))
+
+
+class RoiFeedbackTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sent = []
+        self.feedback = RoiFeedback(
+            lambda cam, box: self.sent.append((cam, box)) or True,
+            move_px=8,
+            refresh_s=0.5,
+        )
+
+    def test_small_moves_are_suppressed_until_refresh(self) -> None:
+        self.feedback.update(0, (100, 100, 80, 80), now=0.0)
+        self.feedback.update(0, (104, 100, 80, 80), now=0.1)
+        self.assertEqual(len(self.sent), 1)
+        self.feedback.update(0, (104, 100, 80, 80), now=0.6)
+        self.assertEqual(len(self.sent), 2)
+
+    def test_large_move_is_sent(self) -> None:
+        self.feedback.update(0, (100, 100, 80, 80), now=0.0)
+        self.feedback.update(0, (120, 100, 80, 80), now=0.1)
+        self.assertEqual(self.sent[-1], (0, (120, 100, 80, 80)))
+
+    def test_losing_the_face_clears_once(self) -> None:
+        self.feedback.update(1, (100, 100, 80, 80), now=0.0)
+        self.feedback.update(1, None, now=0.1)
+        self.feedback.update(1, None, now=0.2)
+        self.assertEqual(self.sent, [(1, (100, 100, 80, 80)), (1, None)])
+
+    def test_cameras_are_independent(self) -> None:
+        self.feedback.update(1, (100, 100, 80, 80), now=0.0)
+        self.feedback.update(2, (100, 100, 80, 80), now=0.0)
+        self.assertEqual(len(self.sent), 2)
+
+
+class RoiSchedulerTests(unittest.TestCase):
+    def test_full_frames_without_box(self) -> None:
+        self.assertIsNone(RoiScheduler().crop_for(0.0, 640, 480))
+
+    def test_keyframe_then_crops_then_keyframe(self) -> None:
+        sched = RoiScheduler(keyframe_interval_s=1.0, roi_timeout_s=10.0)
+        sched.set_box((250, 130, 100, 120), now=0.0)
+        self.assertIsNone(sched.crop_for(0.0, 640, 480))
+        self.assertIsNotNone(sched.crop_for(0.5, 640, 480))
+        self.assertIsNone(sched.crop_for(1.0, 640, 480))
+        self.assertIsNotNone(sched.crop_for(1.1, 640, 480))
+
+    def test_stale_box_falls_back_to_full_frames(self) -> None:
+        sched = RoiScheduler(keyframe_interval_s=100.0, roi_timeout_s=1.0)
+        sched.set_box((250, 130, 100, 120), now=0.0)
+        sched.crop_for(0.0, 640, 480)
+        self.assertIsNotNone(sched.crop_for(0.9, 640, 480))
+        self.assertIsNone(sched.crop_for(1.2, 640, 480))
+        self.assertIsNone(sched.crop_for(1.3, 640, 480))
+
+    def test_clearing_the_box(self) -> None:
+        sched = RoiScheduler(keyframe_interval_s=100.0)
+        sched.set_box((250, 130, 100, 120), now=0.0)
+        sched.crop_for(0.0, 640, 480)
+        sched.set_box(None, now=0.1)
+        self.assertIsNone(sched.crop_for(0.2, 640, 480))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,366 @@
+"""Unit tests for the shared capture service's lease bookkeeping.
+
+Uses a stand-in supervisor -- no subprocess, OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_service -v
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.service import CaptureService, PendingLease
+
+
+class _FakeSupervisor:
+    def __init__(
+        self,
+        camera_indices,
+        transport="udp",
+        passthrough=False,
+        fail=False,
+        warm_pool=None,
+        gate=None,
+    ) -> None:
+        self.camera_indices = list(camera_indices)
+        self.gate = gate
+        self.warm_pool = warm_pool
+        self.transport = transport
+        self.passthrough = passthrough
+        self.fail = fail
+        self.started = 0
+        self.stopped = 0
+        self.resets = 0
+        self.alive = False
+
+    def start(self, timeout: float = 5.0) -> None:
+        if self.gate is not None:
+            self.gate.wait(timeout)
+        if self.fail:
+            raise RuntimeError("camera busy")
+        self.started += 1
+        self.alive = True
+
+    def stop(self) -> None:
+        self.stopped += 1
+        self.alive = False
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def reset_capture_params(self) -> bool:
+        self.resets += 1
+        return True
+
+
+class _Factory:
+    def __init__(self) -> None:
+        self.made = []
+        self.fail_next = False
+        # When set, supervisors block in start() until it is.
+        self.gate = None
+
+    def __call__(self, **kwargs) -> _FakeSupervisor:
+        supervisor = _FakeSupervisor(fail=self.fail_next, gate=self.gate, **kwargs)
+        self.fail_next = False
+        self.made.append(supervisor)
+        return supervisor
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.fills = 0
+        self.shut = False
+
+    def fill(self) -> None:
+        self.fills += 1
+
+    def shutdown(self) -> None:
+        self.shut = True
+
+
+class CaptureServiceTests(unittest.TestCase):
+    def _service(self, grace: float = 60.0):
+        factory = _Factory()
+        service = CaptureService(idle_grace_s=grace, supervisor_factory=factory)
+        self.addCleanup(service.shutdown)
+        return service, factory
+
+    def test_consumers_of_same_cameras_share_one_process(self) -> None:
+        service, factory = self._service()
+        a = service.acquire([0])
+        b = service.acquire([0])
+        self.assertIs(a.supervisor, b.supervisor)
+        self.assertEqual(len(factory.made), 1)
+        self.assertEqual(service.sessions(), {((0,), "udp", False, None): 2})
+
+    def test_mode_switch_within_grace_reuses_process(self) -> None:
+        service, factory = self._service()
+        with service.acquire([0]) as first:
+            pass
+        self.assertEqual(first.stopped, 0)
+        self.assertEqual(first.resets, 1)
+        self.assertEqual(service.sessions(), {((0,), "udp", False, None): 0})
+        with service.acquire([0]) as second:
+            self.assertIs(second, first)
+        self.assertEqual(len(factory.made), 1)
+
+    def test_grace_period_expiry_stops_process(self) -> None:
+        service, factory = self._service(grace=0.05)
+        service.acquire([0]).release()
+        supervisor = factory.made[0]
+        deadline = time.monotonic() + 2.0
+        while supervisor.stopped == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(supervisor.stopped, 1)
+        self.assertEqual(service.sessions(), {})
+
+    def test_zero_grace_stops_on_last_release(self) -> None:
+        service, factory = self._service(grace=0.0)
+        a = service.acquire([0])
+        b = service.acquire([0])
+        a.release()
+        self.assertEqual(factory.made[0].stopped, 0)
+        b.release()
+        self.assertEqual(factory.made[0].stopped, 1)
+
+    def test_release_is_idempotent(self) -> None:
+        service, _ = self._service()
+        a = service.acquire([0])
+        b = service.acquire([0])
+        a.release()
+        a.release()
+        self.assertTrue(a.released)
+        self.assertEqual(service.sessions(), {((0,), "udp", False, None): 1})
+        b.release()
+
+    def test_different_options_get_their_own_session(self) -> None:
+        service, factory = self._service()
+        service.acquire([0]).release()
+        service.acquire([0], transport="shm")
+        # Camera 0 can't be opened twice: the idle udp session made way.
+        self.assertEqual(factory.made[0].stopped, 1)
+        self.assertEqual(list(service.sessions()), [((0,), "shm", False, None)])
+
+    def test_overlapping_leased_session_is_refused(self) -> None:
+        service, factory = self._service()
+        service.acquire([0, 1])
+        with self.assertRaises(RuntimeError):
+            service.acquire([1])
+        self.assertEqual(len(factory.made), 1)
+        service.acquire([2])
+        self.assertEqual(len(service.sessions()), 2)
+
+    def test_dead_process_is_replaced(self) -> None:
+        service, factory = self._service()
+        service.acquire([0]).release()
+        factory.made[0].alive = False
+        lease = service.acquire([0])
+        self.assertEqual(len(factory.made), 2)
+        self.assertIs(lease.supervisor, factory.made[1])
+        self.assertEqual(factory.made[0].stopped, 1)
+
+    def test_failed_start_is_not_registered(self) -> None:
+        service, factory = self._service()
+        factory.fail_next = True
+        with self.assertRaises(RuntimeError):
+            service.acquire([0])
+        self.assertEqual(service.sessions(), {})
+        service.acquire([0])
+        self.assertEqual(len(factory.made), 2)
+
+    def test_release_idle_and_shutdown(self) -> None:
+        service, factory = self._service()
+        service.acquire([0]).release()
+        held = service.acquire([1])
+        service.release_idle()
+        self.assertEqual(list(service.sessions()), [((1,), "udp", False, None)])
+        service.shutdown()
+        self.assertEqual(service.sessions(), {})
+        self.assertEqual(factory.made[1].stopped, 1)
+        # A lease outliving shutdown releases without effect.
+        held.release()
+        self.assertEqual(factory.made[1].resets, 0)
+
+    def test_warm_pool_is_handed_to_supervisors(self) -> None:
+        factory = _Factory()
+        pool = _FakePool()
+        service = CaptureService(supervisor_factory=factory, warm_pool=pool)
+        service.prewarm()
+        self.assertEqual(pool.fills, 1)
+        service.acquire([0])
+        self.assertIs(factory.made[0].warm_pool, pool)
+        service.shutdown()
+        self.assertTrue(pool.shut)
+
+
+class ConcurrentStartTests(unittest.TestCase):
+    """A cold start must only hold up callers of the same session."""
+
+    def setUp(self) -> None:
+        self.factory = _Factory()
+        self.service = CaptureService(idle_grace_s=60.0, supervisor_factory=self.factory)
+        self.gate = threading.Event()
+        self.addCleanup(self.service.shutdown)
+        self.addCleanup(self.gate.set)
+
+    def _acquire_in_background(self, cameras, results) -> threading.Thread:
+        def run() -> None:
+            try:
+                results.append(self.service.acquire(cameras))
+            except RuntimeError as exc:
+                results.append(exc)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def _start_gated(self, cameras, results) -> threading.Thread:
+        self.factory.gate = self.gate
+        thread = self._acquire_in_background(cameras, results)
+        PendingLeaseTests._wait_for(lambda: self.factory.made)
+        self.factory.gate = None
+        return thread
+
+    def test_other_sessions_do_not_wait_for_a_cold_start(self) -> None:
+        results = []
+        thread = self._start_gated([0], results)
+        started = time.monotonic()
+        other = self.service.acquire([1])
+        self.assertEqual(
+            self.service.sessions(),
+            {((0,), "udp", False, None): 1, ((1,), "udp", False, None): 1},
+        )
+        other.release()
+        self.service.release_idle()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(list(self.service.sessions()), [((0,), "udp", False, None)])
+        # A camera of the starting session is leased, not free.
+        with self.assertRaises(RuntimeError):
+            self.service.acquire([0, 2])
+
+        self.gate.set()
+        thread.join(2.0)
+        self.assertIs(results[0].supervisor, self.factory.made[0])
+        self.assertEqual(self.factory.made[0].started, 1)
+
+    def test_acquirers_of_a_starting_session_wait_and_share_it(self) -> None:
+        results = []
+        first = self._start_gated([0], results)
+        second = self._acquire_in_background([0], results)
+        time.sleep(0.05)
+        self.assertEqual(results, [])
+        self.gate.set()
+        first.join(2.0)
+        second.join(2.0)
+        self.assertEqual(len(self.factory.made), 1)
+        self.assertIs(results[0].supervisor, results[1].supervisor)
+        self.assertEqual(self.service.sessions(), {((0,), "udp", False, None): 2})
+
+    def test_waiters_see_a_failed_start(self) -> None:
+        results = []
+        self.factory.fail_next = True
+        first = self._start_gated([0], results)
+        second = self._acquire_in_background([0], results)
+        time.sleep(0.05)
+        self.gate.set()
+        first.join(2.0)
+        second.join(2.0)
+        self.assertEqual([type(r) for r in results], [RuntimeError, RuntimeError])
+        self.assertEqual(self.service.sessions(), {})
+        self.service.acquire([0])
+        self.assertEqual(len(self.factory.made), 2)
+
+    def test_shutdown_while_starting_stops_the_new_process(self) -> None:
+        results = []
+        thread = self._start_gated([0], results)
+        self.service.shutdown()
+        self.gate.set()
+        thread.join(2.0)
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(self.factory.made[0].stopped, 1)
+
+    def test_slow_reset_holds_up_only_its_own_session(self) -> None:
+        lease = self.service.acquire([0])
+        supervisor = lease.supervisor
+        reset_gate = threading.Event()
+        self.addCleanup(reset_gate.set)
+        supervisor.reset_capture_params = lambda: reset_gate.wait(2.0)
+        releaser = threading.Thread(target=lease.release, daemon=True)
+        releaser.start()
+        time.sleep(0.05)
+        # Other sessions go ahead while camera 0 resets ...
+        self.service.acquire([1]).release()
+        # ... and a new consumer of camera 0 gets it once the reset is done.
+        results = []
+        waiter = self._acquire_in_background([0], results)
+        time.sleep(0.05)
+        self.assertEqual(results, [])
+        reset_gate.set()
+        waiter.join(2.0)
+        releaser.join(2.0)
+        self.assertIs(results[0].supervisor, supervisor)
+        self.assertEqual(supervisor.stopped, 0)
+
+
+class PendingLeaseTests(unittest.TestCase):
+    def _service(self):
+        factory = _Factory()
+        service = CaptureService(idle_grace_s=60.0, supervisor_factory=factory)
+        self.addCleanup(service.shutdown)
+        return service, factory
+
+    @staticmethod
+    def _wait_for(predicate) -> None:
+        deadline = time.monotonic() + 2.0
+        while not predicate() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_lease_lands_and_cancel_releases_it(self) -> None:
+        service, _ = self._service()
+        pending = PendingLease(service, [0])
+        self._wait_for(lambda: pending.lease is not None)
+        self.assertFalse(pending.failed)
+        self.assertEqual(service.sessions(), {((0,), "udp", False, None): 1})
+        pending.cancel()
+        self.assertIsNone(pending.lease)
+        self.assertEqual(service.sessions(), {((0,), "udp", False, None): 0})
+
+    def test_failed_acquire_is_reported(self) -> None:
+        service, factory = self._service()
+        factory.fail_next = True
+        pending = PendingLease(service, [0])
+        self._wait_for(lambda: pending.failed)
+        self.assertTrue(pending.failed)
+        self.assertIsNone(pending.lease)
+
+    def test_cancel_with_wait_frees_cameras_for_a_stereo_mode(self) -> None:
+        # A preview on camera 1 is still starting when a stereo mode on
+        # cameras 1 and 2 is launched.
+        service, factory = self._service()
+        factory.gate = threading.Event()
+        pending = PendingLease(service, [1])
+        self._wait_for(lambda: factory.made)
+        threading.Timer(0.05, factory.gate.set).start()
+        pending.cancel(wait=True)
+
+        self.assertIsNone(pending.lease)
+        self.assertEqual(service.sessions(), {((1,), "udp", False, None): 0})
+        factory.gate = None
+        with service.acquire([1, 2]) as supervisor:
+            self.assertEqual(supervisor.camera_indices, [1, 2])
+        self.assertEqual(factory.made[0].stopped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Unit tests for the shared-memory frame ring.
+
+Needs NumPy and POSIX shared memory -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_shm_ring -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.shm_ring import ShmFrameRing, ring_name
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+class ShmFrameRingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        name = ring_name(f"eyetest{os.getpid()}_{id(self) & 0xFFFF}", 1)
+        self.writer = ShmFrameRing.create(name, cam_id=1, slot_capacity=4 * 6 * 3, n_slots=4)
+        # Attach with a plain SharedMemory: in one process the untracked
+        # attach would unregister the writer's segment from the tracker.
+        self.reader = ShmFrameRing(shared_memory.SharedMemory(name=name), owner=False)
+
+    def tearDown(self) -> None:
+        self.reader.close()
+        self.writer.close()
+
+    def test_read_latest_returns_newest_frame(self) -> None:
+        self.assertIsNone(self.reader.read_latest())
+        self.writer.publish(7, 1.5, _frame(1))
+        self.writer.publish(8, 2.5, _frame(2))
+        got = self.reader.read_latest()
+        self.assertEqual((got.seq, got.frame_id, got.timestamp), (2, 8, 2.5))
+        self.assertTrue(np.all(got.image == 2))
+        del got
+
+    def test_lapped_view_is_detected_and_copy_stays_intact(self) -> None:
+        self.writer.publish(1, 0.0, _frame(10))
+        view = self.reader.read_latest()
+        copied = self.reader.read_latest(copy=True)
+        self.assertTrue(self.reader.is_valid(view.seq))
+
+        for i in range(self.writer.n_slots):
+            self.writer.publish(2 + i, 0.0, _frame(20 + i))
+
+        # The writer reused the slot under the view: its pixels changed and
+        # the post-use check says so.
+        self.assertFalse(self.reader.is_valid(view.seq))
+        self.assertFalse(np.all(view.image == 10))
+        self.assertTrue(np.all(copied.image == 10))
+        del view
+
+    def test_copy_is_dropped_if_the_slot_is_rewritten_meanwhile(self) -> None:
+        writer = self.writer
+
+        class _LappedReader(ShmFrameRing):
+            # The writer laps the ring between the copy and the re-check.
+            def is_valid(self, seq: int) -> bool:
+                for i in range(writer.n_slots):
+                    writer.publish(2 + i, 0.0, _frame(30 + i))
+                return super().is_valid(seq)
+
+        self.writer.publish(1, 0.0, _frame(10))
+        reader = _LappedReader(shared_memory.SharedMemory(name=self.writer.name), owner=False)
+        try:
+            self.assertIsNone(reader.read_latest(copy=True))
+        finally:
+            reader.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Unit tests for ``src.capture.telemetry`` and the reassembler's counters.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_telemetry -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.protocol import Reassembler, pack_packets
+from src.capture.telemetry import (
+    CaptureCounters,
+    CaptureTelemetry,
+    ReceiveCounters,
+    format_stats_line,
+    parse_stats_line,
+)
+
+
+class StatsLineTests(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        line = format_stats_line(2, {"capture_fps": 29.97, "encode_ms": 3.25})
+        self.assertEqual(line, "STATS cam=2 capture_fps=29.97 encode_ms=3.25")
+        cam_id, values = parse_stats_line(line)
+        self.assertEqual(cam_id, 2)
+        self.assertEqual(values, {"capture_fps": 29.97, "encode_ms": 3.25})
+
+    def test_rejects_malformed_lines(self) -> None:
+        for line in ("", "STAT cam=0", "STATS fps=3", "STATS cam=x", "STATS cam=0 fps", "STATS cam=0 fps=a"):
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    parse_stats_line(line)
+
+
+class CaptureCountersTests(unittest.TestCase):
+    def test_reports_once_per_interval_and_resets(self) -> None:
+        stats = CaptureCounters(interval=1.0, now=0.0)
+        stats.grabbed = 30
+        stats.sent = 10
+        stats.encode_s = 0.05
+        stats.bytes = 400000
+        stats.packets = 10
+        self.assertIsNone(stats.report(0.5))
+        report = stats.report(1.0)
+        self.assertAlmostEqual(report["capture_fps"], 30.0)
+        self.assertAlmostEqual(report["sent_fps"], 10.0)
+        self.assertAlmostEqual(report["encode_ms"], 5.0)
+        self.assertAlmostEqual(report["frame_bytes"], 40000.0)
+        self.assertEqual(stats.grabbed, 0)
+        self.assertIsNone(stats.report(1.5))
+
+    def test_no_frames_sent(self) -> None:
+        stats = CaptureCounters(interval=1.0, now=0.0)
+        report = stats.report(2.0)
+        self.assertEqual(report["sent_fps"], 0.0)
+        self.assertEqual(report["encode_ms"], 0.0)
+
+
+class CaptureTelemetryTests(unittest.TestCase):
+    def test_merges_capture_and_receive_rates(self) -> None:
+        telemetry = CaptureTelemetry()
+        received = ReceiveCounters()
+        first = telemetry.record(1, {"capture_fps": 30.0}, received, now=10.0)
+        self.assertNotIn("delivered_fps", first)
+
+        received.packets = 60
+        received.frames = 28
+        received.pruned = 2
+        received.latency_s = 28 * 0.004
+        received.latency_max_s = 0.009
+        received.decoded = 20
+        received.decode_s = 20 * 0.002
+        second = telemetry.record(1, {"capture_fps": 30.0}, received, now=12.0)
+        self.assertAlmostEqual(second["delivered_fps"], 14.0)
+        self.assertAlmostEqual(second["packets_received_per_s"], 30.0)
+        self.assertEqual(second["ttl_pruned"], 2.0)
+        self.assertAlmostEqual(second["latency_ms"], 4.0)
+        self.assertAlmostEqual(second["latency_max_ms"], 9.0)
+        self.assertAlmostEqual(second["decode_ms"], 2.0)
+
+        self.assertEqual(set(telemetry.snapshot()), {1})
+        self.assertEqual(telemetry.snapshot()[1]["t"], 12.0)
+
+    def test_reports_buffer_pool_misses_per_interval(self) -> None:
+        telemetry = CaptureTelemetry()
+        first = telemetry.record(1, {}, None, now=1.0, pool={"misses": 3, "outstanding": 1})
+        self.assertEqual(first["pool_misses"], 3.0)
+        second = telemetry.record(1, {}, None, now=2.0, pool={"misses": 3, "outstanding": 0})
+        self.assertEqual(second["pool_misses"], 0.0)
+        self.assertEqual(second["pool_outstanding"], 0.0)
+        self.assertNotIn("pool_misses", telemetry.record(2, {}, None, now=2.0))
+
+    def test_history_is_bounded_and_filterable(self) -> None:
+        telemetry = CaptureTelemetry(history_len=3)
+        for i in range(4):
+            telemetry.record(1 + i % 2, {"capture_fps": float(i)}, None, now=float(i))
+        self.assertEqual([s["capture_fps"] for s in telemetry.history()], [1.0, 2.0, 3.0])
+        self.assertEqual([s["capture_fps"] for s in telemetry.history(cam_id=2)], [1.0, 3.0])
+
+
+class ReassemblerCounterTests(unittest.TestCase):
+    def test_counts_drops_per_camera(self) -> None:
+        reasm = Reassembler(ttl=0.2)
+        payload = b"z" * 3000
+        frame1 = pack_packets(1, 1, 0.0, 8, 8, payload)
+        frame2 = pack_packets(1, 2, 0.0, 8, 8, payload)
+        frame3 = pack_packets(1, 3, 0.0, 8, 8, payload)
+        other = pack_packets(2, 1, 0.0, 8, 8, payload)
+
+        reasm.feed(frame1[0], now=0.0)  # never completed: superseded
+        for pkt in frame2:
+            reasm.feed(pkt, now=0.0)
+        reasm.feed(frame1[1], now=0.0)  # straggler
+        reasm.feed(frame3[0], now=0.0)
+        reasm.feed(frame3[0], now=0.0)  # duplicate: rejected
+        reasm.prune(now=1.0)  # frame 3 expires
+        reasm.feed(other[0], now=1.0)
+
+        c = reasm.counters[1]
+        self.assertEqual(c.packets, 1 + 3 + 1 + 2)
+        self.assertEqual(c.superseded, 1)
+        self.assertEqual(c.stragglers, 1)
+        self.assertEqual(c.rejected, 1)
+        self.assertEqual(c.pruned, 1)
+        self.assertEqual(reasm.counters[2].packets, 1)
+
+    def test_shared_counters_dict(self) -> None:
+        shared = {}
+        reasm = Reassembler(counters=shared)
+        reasm.feed(pack_packets(0, 0, 0.0, 8, 8, b"x")[0], now=0.0)
+        self.assertEqual(shared[0].packets, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
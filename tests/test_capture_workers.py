@@ -0,0 +1,72 @@
+"""Unit tests for the capture worker layout planning.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_capture_workers -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.workers import WorkerLayout, format_cpu_list, parse_cpu_list, plan_workers
+
+
+class CpuListTests(unittest.TestCase):
+    def test_ranges_and_singles(self) -> None:
+        self.assertEqual(parse_cpu_list("0-2,5"), (0, 1, 2, 5))
+        self.assertEqual(parse_cpu_list(" 3 , 1,1"), (1, 3))
+        self.assertEqual(format_cpu_list((5, 0, 1)), "0,1,5")
+
+    def test_rejects_garbage(self) -> None:
+        for text in ("", "a", "3-1", "-1", "1-"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_cpu_list(text)
+
+
+class PlanTests(unittest.TestCase):
+    def test_default_is_one_process_for_both_cameras(self) -> None:
+        specs = plan_workers([0, 2], [1, 2])
+        self.assertEqual(len(specs), 1)
+        self.assertEqual(specs[0].label, "capture")
+        self.assertEqual(specs[0].cam_ids, (1, 2))
+        self.assertEqual(specs[0].args, ["--cam0", "0", "--cam1", "2"])
+
+    def test_per_camera_workers_publish_stereo_ids(self) -> None:
+        layout = WorkerLayout(per_camera=True, cpus=((2,), (3,)), nice=5)
+        left, right = plan_workers([0, 2], [1, 2], layout)
+        self.assertEqual(left.cam_ids, (1,))
+        self.assertEqual(right.label, "capture cam2")
+        self.assertEqual(
+            left.args, ["--cam0", "0", "--cam-id", "1", "--cpus", "2", "--nice", "5"]
+        )
+        self.assertEqual(
+            right.args, ["--cam0", "2", "--cam-id", "2", "--cpus", "3", "--nice", "5"]
+        )
+
+    def test_single_cpu_set_is_shared(self) -> None:
+        layout = WorkerLayout(per_camera=True, cpus=((4, 5),))
+        specs = plan_workers([0, 2], [1, 2], layout)
+        self.assertTrue(all(spec.args[-2:] == ["--cpus", "4,5"] for spec in specs))
+
+    def test_single_camera_keeps_default_cam_id(self) -> None:
+        (spec,) = plan_workers([3], [0], WorkerLayout(per_camera=True))
+        self.assertEqual(spec.args, ["--cam0", "3"])
+
+    def test_cpu_set_count_must_match(self) -> None:
+        layout = WorkerLayout(per_camera=True, cpus=((1,), (2,), (3,)))
+        with self.assertRaises(ValueError):
+            plan_workers([0, 2], [1, 2], layout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+"""Unit tests for epipolar right-camera landmark tracking.
+
+Runs on a synthetic stereo rig and a synthetic textured image -- needs
+OpenCV and NumPy, but no MediaPipe model or cameras.
+
+Run with:
+
+    python -m unittest tests.test_epipolar_tracking -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.face_tracking.pipelines.epipolar_tracking import (
+    EpipolarLandmarkTracker,
+    fundamental_from_calibration,
+)
+from src.face_tracking.pipelines.stereo_face_analysis import StereoCalibration
+from tests.test_stereo_face_analysis import (
+    FRAME_H,
+    FRAME_W,
+    FakeProvider,
+    analyze,
+    make_pipeline,
+    synthetic_face,
+    synthetic_rig,
+)
+
+DISPARITY_PX = 40.0
+
+
+def textured_frame(seed: int = 0) -> np.ndarray:
+    """Blurred noise, so every patch has something for the flow to lock on."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, size=(FRAME_H, FRAME_W), dtype=np.uint8)
+    gray = cv2.GaussianBlur(noise, (0, 0), 2.0)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+
+
+def shifted(rgb: np.ndarray, dx: int = 0, dy: int = 0, below_y: int = 0) -> np.ndarray:
+    """``rgb`` moved by (dx, dy) pixels, only the rows from ``below_y`` down."""
+    out = rgb.copy()
+    out[below_y:] = np.roll(np.roll(rgb, dy, axis=0), dx, axis=1)[below_y:]
+    return out
+
+
+def mesh_pair(count: int = 40):
+    """Right-camera points on a grid in the middle of the frame and their
+    left-camera counterparts (a rectified rig: same row, fixed disparity),
+    both normalized."""
+    xs, ys = np.meshgrid(np.linspace(180, 460, 8), np.linspace(140, 340, 5))
+    right_px = np.column_stack((xs.ravel(), ys.ravel()))[:count]
+    left_px = right_px + (DISPARITY_PX, 0.0)
+    scale = np.array([FRAME_W, FRAME_H], dtype=np.float64)
+
+    def normalized(px):
+        out = np.zeros((len(px), 3), dtype=np.float32)
+        out[:, :2] = px / scale
+        return out
+
+    return normalized(left_px), normalized(right_px)
+
+
+class FundamentalMatrixTests(unittest.TestCase):
+    def test_projected_points_satisfy_the_epipolar_constraint(self) -> None:
+        k = np.array([[520.0, 0.0, 310.0], [0.0, 515.0, 250.0], [0.0, 0.0, 1.0]])
+        r, _ = cv2.Rodrigues(np.array([0.02, -0.15, 0.01]))
+        calibration = StereoCalibration(
+            k1=k, d1=np.zeros(5), k2=k.copy(), d2=np.zeros(5), r=r, t=np.array([[-60.0], [2.0], [5.0]])
+        )
+        rng = np.random.default_rng(1)
+        points = rng.uniform((-100.0, -80.0, 400.0), (100.0, 80.0, 700.0), size=(50, 3))
+        x1 = points @ k.T
+        x1 /= x1[:, 2:3]
+        x2 = (points @ r.T + calibration.t.reshape(1, 3)) @ k.T
+        x2 /= x2[:, 2:3]
+
+        fundamental = fundamental_from_calibration(calibration)
+        residual = np.einsum("ni,ij,nj->n", x2, fundamental, x1)
+        scale = np.linalg.norm(fundamental)
+        np.testing.assert_allclose(residual / scale, 0.0, atol=1e-9)
+        # A point moved off its line breaks the constraint.
+        off_line = x2[0] + (0.0, 5.0, 0.0)
+        self.assertGreater(abs(off_line @ fundamental @ x1[0]) / scale, 1e-6)
+
+
+class TrackerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calibration = synthetic_rig()
+        self.left_points, self.right_points = mesh_pair()
+        self.frame = textured_frame()
+
+    def _tracker(self, **kwargs) -> EpipolarLandmarkTracker:
+        kwargs.setdefault("pyramid_levels", 1)
+        tracker = EpipolarLandmarkTracker(self.calibration, range(40), **kwargs)
+        tracker.seed(self.frame, self.right_points)
+        return tracker
+
+    def _track(self, tracker, frame):
+        return tracker.track(frame, self.left_points, (FRAME_W, FRAME_H), (FRAME_W, FRAME_H))
+
+    def test_motion_along_the_epipolar_line_is_followed(self) -> None:
+        tracker = self._tracker()
+        mesh = self._track(tracker, shifted(self.frame, dx=4))
+        self.assertIsNotNone(mesh)
+        self.assertEqual(mesh.shape, (40, 3))
+        self.assertEqual(mesh.dtype, np.float32)
+        self.assertEqual(tracker.last_score, 1.0)
+        moved_px = (mesh[:, :2] - self.right_points[:, :2]) * (FRAME_W, FRAME_H)
+        # Tracked and untracked (median-shifted) points alike.
+        np.testing.assert_allclose(moved_px, np.tile((4.0, 0.0), (40, 1)), atol=0.3)
+
+    def test_points_pushed_off_the_epipolar_line_are_rejected(self) -> None:
+        tracker = self._tracker(min_inlier_ratio=0.3)
+        # The bottom row of the grid drifts 8 px off their (horizontal)
+        # epipolar lines; the rest stays put.
+        frame = shifted(self.frame, dy=8, below_y=315)
+        mesh = self._track(tracker, frame)
+        self.assertIsNotNone(mesh)
+        # The last grid row (8 of 40 points) is rejected and follows the
+        # median motion of the rest instead of its own flow.
+        self.assertAlmostEqual(tracker.last_score, 0.8)
+        np.testing.assert_allclose(mesh[:, 1] * FRAME_H, self.right_points[:, 1] * FRAME_H, atol=0.5)
+
+    def test_falls_back_to_the_landmarker_below_the_inlier_ratio(self) -> None:
+        tracker = self._tracker(min_inlier_ratio=0.9)
+        self.assertIsNone(self._track(tracker, shifted(self.frame, dy=8, below_y=315)))
+        self.assertAlmostEqual(tracker.last_score, 0.8)
+        self.assertIsNone(self._track(tracker, shifted(self.frame, dy=8)))
+        self.assertLess(tracker.last_score, 0.2)
+
+    def test_refresh_is_due_after_refresh_interval_frames(self) -> None:
+        tracker = self._tracker(refresh_interval=2)
+        self.assertFalse(tracker.refresh_due)
+        self.assertIsNotNone(self._track(tracker, shifted(self.frame, dx=2)))
+        self.assertIsNotNone(self._track(tracker, shifted(self.frame, dx=4)))
+        self.assertTrue(tracker.refresh_due)
+        self.assertIsNone(self._track(tracker, shifted(self.frame, dx=6)))
+        tracker.seed(shifted(self.frame, dx=6), self.right_points)
+        self.assertFalse(tracker.refresh_due)
+
+    def test_short_meshes_and_resized_frames_reset(self) -> None:
+        tracker = self._tracker()
+        self.assertIsNone(self._track(tracker, cv2.resize(self.frame, (320, 240))))
+        self.assertTrue(tracker.refresh_due)
+        tracker.seed(self.frame, self.right_points[:10])
+        self.assertTrue(tracker.refresh_due)
+
+
+class PipelineTrackingTests(unittest.TestCase):
+    def test_tracked_frames_skip_the_right_landmarker(self) -> None:
+        calibration = synthetic_rig()
+        _, left_points, right_points = synthetic_face(calibration)
+        right = FakeProvider(right_points)
+        pipeline = make_pipeline(
+            FakeProvider(left_points),
+            right,
+            calibration=calibration,
+            epipolar_tracking=True,
+            refresh_interval=2,
+        )
+        self.addCleanup(pipeline.release)
+        frame = textured_frame()
+
+        tracked = []
+        for _ in range(4):
+            result = analyze(pipeline, frame, frame)
+            self.assertIsNotNone(result)
+            tracked.append(pipeline.last_timings.right_tracked)
+        self.assertEqual(tracked, [False, True, True, False])
+        self.assertEqual(right.calls, 2)
+
+    def test_losing_the_left_face_resets_tracking(self) -> None:
+        calibration = synthetic_rig()
+        _, left_points, right_points = synthetic_face(calibration)
+        left = FakeProvider(left_points)
+        pipeline = make_pipeline(
+            left, FakeProvider(right_points), calibration=calibration, epipolar_tracking=True
+        )
+        self.addCleanup(pipeline.release)
+        frame = textured_frame()
+        analyze(pipeline, frame, frame)
+        left.points = None
+        self.assertIsNone(analyze(pipeline, frame, frame))
+        self.assertFalse(pipeline.last_timings.right_tracked)
+        left.points = left_points
+        analyze(pipeline, frame, frame)
+        self.assertFalse(pipeline.last_timings.right_tracked)
+
+
+if __name__ == "__main__":
+    unittest.main()
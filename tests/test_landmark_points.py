@@ -0,0 +1,181 @@
+"""Unit tests for face landmarks carried as (N, 3) arrays.
+
+Checks the array helpers and that the vectorized consumers (stereo
+triangulation, the head-pose landmark axis) match the per-landmark
+object code they replaced. Needs OpenCV and NumPy -- no MediaPipe model
+or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_landmark_points -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.roi import box_from_landmarks
+from src.face_tracking.pipelines.stereo_face_analysis import StereoTriangulator
+from src.face_tracking.signals.head_pose import HeadPoseSignalMapper
+from src.face_tracking.signals.landmark_points import box_from_points, landmarks_to_array, nose_pixel
+from tests.test_stereo_face_analysis import FRAME_H, FRAME_W, synthetic_face, synthetic_rig
+
+
+def as_objects(points: np.ndarray):
+    """The points as MediaPipe-style objects with ``x`` / ``y`` / ``z``."""
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points]
+
+
+def face_points(count: int = 478, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    points = rng.uniform((0.3, 0.25, -0.05), (0.7, 0.8, 0.05), size=(count, 3))
+    return points.astype(np.float32)
+
+
+class LandmarksToArrayTests(unittest.TestCase):
+    def test_objects_become_float32_rows(self) -> None:
+        points = face_points(5)
+        array = landmarks_to_array(as_objects(points))
+        self.assertEqual((array.shape, array.dtype), ((5, 3), np.float32))
+        np.testing.assert_array_equal(array, points)
+
+    def test_arrays_pass_through(self) -> None:
+        points = face_points(5)
+        self.assertTrue(np.shares_memory(landmarks_to_array(points), points))
+        strided = np.asfortranarray(points.astype(np.float64))
+        array = landmarks_to_array(strided)
+        self.assertTrue(array.flags.c_contiguous)
+        self.assertEqual(array.dtype, np.float32)
+        np.testing.assert_allclose(array, points)
+        self.assertEqual(landmarks_to_array(points.ravel()).shape, (5, 3))
+
+    def test_empty(self) -> None:
+        self.assertEqual(landmarks_to_array([]).shape, (0, 3))
+
+
+class BoxFromPointsTests(unittest.TestCase):
+    def test_matches_the_object_version(self) -> None:
+        points = face_points()
+        self.assertEqual(
+            box_from_points(points, FRAME_W, FRAME_H),
+            box_from_landmarks(as_objects(points), FRAME_W, FRAME_H),
+        )
+
+    def test_clips_to_the_frame(self) -> None:
+        points = np.array([(-0.1, 0.5, 0.0), (0.5, 1.2, 0.0)], dtype=np.float32)
+        self.assertEqual(box_from_points(points, 100, 100), (0, 50, 50, 50))
+
+    def test_degenerate_input(self) -> None:
+        self.assertIsNone(box_from_points(None, 100, 100))
+        self.assertIsNone(box_from_points(np.zeros((0, 3), np.float32), 100, 100))
+        self.assertIsNone(box_from_points(np.full((3, 3), 0.5, np.float32), 100, 100))
+
+
+class NosePixelTests(unittest.TestCase):
+    def test_arrays_and_objects_agree(self) -> None:
+        points = face_points(3)
+        expected = (int(float(points[1, 0]) * FRAME_W), int(float(points[1, 1]) * FRAME_H))
+        self.assertEqual(nose_pixel(points, FRAME_W, FRAME_H), expected)
+        self.assertEqual(nose_pixel(as_objects(points), FRAME_W, FRAME_H), expected)
+
+    def test_missing_nose(self) -> None:
+        self.assertIsNone(nose_pixel(None, FRAME_W, FRAME_H))
+        self.assertIsNone(nose_pixel(face_points(1), FRAME_W, FRAME_H))
+        self.assertIsNone(nose_pixel(face_points(3), 0, FRAME_H))
+
+
+def triangulate_per_point(calibration, indices, left, right, size):
+    """Reference: one landmark object at a time, as before vectorization."""
+    w, h = size
+    p1 = np.hstack((np.eye(3), np.zeros((3, 1))))
+    p2 = np.hstack((calibration.r, calibration.t))
+    out = {}
+    for index in indices:
+        lp, rp = left[index], right[index]
+        lu = cv2.undistortPoints(np.array([[[lp.x * w, lp.y * h]]]), calibration.k1, calibration.d1)
+        ru = cv2.undistortPoints(np.array([[[rp.x * w, rp.y * h]]]), calibration.k2, calibration.d2)
+        point = cv2.triangulatePoints(p1, p2, lu.reshape(2, 1), ru.reshape(2, 1))
+        out[index] = (point[:3] / point[3]).ravel()
+    return out
+
+
+class TriangulationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calibration = synthetic_rig()
+        self.points_3d, self.left, self.right = synthetic_face(self.calibration)
+        self.indices = [1, 10, 33, 152, 234, 263, 454]
+
+    def test_matches_the_per_point_reference(self) -> None:
+        self.calibration.d1 = np.array([0.05, -0.02, 0.001, 0.0, 0.0])
+        triangulator = StereoTriangulator(self.calibration, self.indices)
+        vectorized = triangulator.triangulate_from_landmarks(
+            self.left, self.right, FRAME_W, FRAME_H, FRAME_W, FRAME_H
+        )
+        reference = triangulate_per_point(
+            self.calibration, self.indices, as_objects(self.left), as_objects(self.right), (FRAME_W, FRAME_H)
+        )
+        self.assertEqual(sorted(vectorized), sorted(reference))
+        for index in self.indices:
+            np.testing.assert_allclose(vectorized[index], reference[index], rtol=1e-6, atol=1e-6)
+
+    def test_recovers_the_synthetic_face(self) -> None:
+        triangulator = StereoTriangulator(self.calibration, self.indices)
+        points = triangulator.triangulate_from_landmarks(
+            as_objects(self.left), self.right, FRAME_W, FRAME_H, FRAME_W, FRAME_H
+        )
+        for index in self.indices:
+            np.testing.assert_allclose(points[index], self.points_3d[index], atol=0.5)
+
+    def test_too_few_landmarks(self) -> None:
+        triangulator = StereoTriangulator(self.calibration, self.indices)
+        self.assertEqual(
+            triangulator.triangulate_from_landmarks(
+                self.left[:100], self.right[:100], FRAME_W, FRAME_H, FRAME_W, FRAME_H
+            ),
+            {},
+        )
+
+
+class HeadPoseAxisTests(unittest.TestCase):
+    def _reference_axis(self, landmarks, w, h) -> np.ndarray:
+        def pixel(index):
+            point = landmarks[index]
+            return np.array([point.x * w, point.y * h, point.z * w], dtype=float)
+
+        right_axis = pixel(454) - pixel(234)
+        right_axis /= np.linalg.norm(right_axis) + 1e-9
+        up_axis = pixel(10) - pixel(152)
+        up_axis /= np.linalg.norm(up_axis) + 1e-9
+        forward = np.cross(right_axis, up_axis)
+        return -forward / (np.linalg.norm(forward) + 1e-9)
+
+    def test_arrays_and_objects_give_the_reference_axis(self) -> None:
+        mapper = HeadPoseSignalMapper()
+        points = face_points()
+        reference = self._reference_axis(as_objects(points), FRAME_W, FRAME_H)
+        for landmarks in (points, as_objects(points)):
+            axis = mapper._forward_axis_from_landmarks(landmarks, FRAME_W, FRAME_H)
+            np.testing.assert_allclose(axis, reference, atol=1e-6)
+
+    def test_frontal_face_looks_down_the_camera_axis(self) -> None:
+        points = np.full((478, 3), 0.5, dtype=np.float32)
+        points[234, :2] = (0.4, 0.5)
+        points[454, :2] = (0.6, 0.5)
+        points[10, :2] = (0.5, 0.35)
+        points[152, :2] = (0.5, 0.65)
+        axis = HeadPoseSignalMapper()._forward_axis_from_landmarks(points, FRAME_W, FRAME_H)
+        np.testing.assert_allclose(np.abs(axis), (0.0, 0.0, 1.0), atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unit tests for the MJPEG passthrough helpers.
+
+Pure bytes-in / bytes-out -- no cameras, no OpenCV.
+
+Run with:
+
+    python -m unittest tests.test_mjpeg -v
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.mjpeg import (
+    STD_DHT_SEGMENT,
+    ensure_huffman_tables,
+    scan_jpeg,
+    trim_to_eoi,
+)
+
+
+def _segment(marker: int, body: bytes) -> bytes:
+    return bytes([0xFF, marker]) + struct.pack(">H", len(body) + 2) + body
+
+
+def _make_jpeg(width: int = 640, height: int = 480, with_dht: bool = False) -> bytes:
+    """Header-only baseline JPEG skeleton: enough structure for the scanner."""
+    app0 = _segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+    dqt = _segment(0xDB, b"\x00" + bytes(64))
+    sof0 = _segment(
+        0xC0,
+        b"\x08" + struct.pack(">HH", height, width) + b"\x03" + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01",
+    )
+    dht = STD_DHT_SEGMENT if with_dht else b""
+    sos = _segment(0xDA, b"\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00")
+    scan_data = b"\x12\x34\xff\x00\x56"
+    return b"\xff\xd8" + app0 + dqt + sof0 + dht + sos + scan_data + b"\xff\xd9"
+
+
+class StandardTablesTests(unittest.TestCase):
+    def test_segment_is_the_well_known_420_bytes(self) -> None:
+        self.assertEqual(len(STD_DHT_SEGMENT), 420)
+        self.assertEqual(STD_DHT_SEGMENT[:2], b"\xff\xc4")
+
+    def test_ac_tables_cover_every_run_size_symbol(self) -> None:
+        expected = {0x00, 0xF0} | {(r << 4) | s for r in range(16) for s in range(1, 11)}
+        body = STD_DHT_SEGMENT[4:]
+        pos = 0
+        ac_tables = 0
+        while pos < len(body):
+            tc_th = body[pos]
+            bits = body[pos + 1 : pos + 17]
+            count = sum(bits)
+            vals = body[pos + 17 : pos + 17 + count]
+            if tc_th >> 4 == 1:
+                ac_tables += 1
+                self.assertEqual(set(vals), expected)
+                self.assertEqual(len(vals), len(expected))
+            pos += 17 + count
+        self.assertEqual(ac_tables, 2)
+
+
+class ScanJpegTests(unittest.TestCase):
+    def test_reads_dimensions_from_sof(self) -> None:
+        info = scan_jpeg(_make_jpeg(width=1280, height=720))
+        self.assertIsNotNone(info)
+        self.assertEqual((info.width, info.height), (1280, 720))
+        self.assertFalse(info.has_dht)
+
+    def test_detects_existing_huffman_tables(self) -> None:
+        info = scan_jpeg(_make_jpeg(with_dht=True))
+        self.assertTrue(info.has_dht)
+
+    def test_rejects_non_jpeg_and_truncated_input(self) -> None:
+        self.assertIsNone(scan_jpeg(b""))
+        self.assertIsNone(scan_jpeg(b"\x00\x01\x02\x03"))
+        jpeg = _make_jpeg()
+        self.assertIsNone(scan_jpeg(jpeg[:30]))
+
+
+class EnsureHuffmanTablesTests(unittest.TestCase):
+    def test_inserts_tables_before_start_of_scan(self) -> None:
+        jpeg = _make_jpeg()
+        fixed = ensure_huffman_tables(jpeg)
+        self.assertEqual(len(fixed), len(jpeg) + len(STD_DHT_SEGMENT))
+        info = scan_jpeg(fixed)
+        self.assertTrue(info.has_dht)
+        self.assertEqual(fixed[info.sos_offset : info.sos_offset + 2], b"\xff\xda")
+        self.assertEqual(fixed[info.sos_offset - len(STD_DHT_SEGMENT) : info.sos_offset], STD_DHT_SEGMENT)
+
+    def test_leaves_complete_jpeg_untouched(self) -> None:
+        jpeg = _make_jpeg(with_dht=True)
+        self.assertIs(ensure_huffman_tables(jpeg), jpeg)
+
+    def test_leaves_garbage_untouched(self) -> None:
+        self.assertEqual(ensure_huffman_tables(b"not a jpeg"), b"not a jpeg")
+
+
+class TrimToEoiTests(unittest.TestCase):
+    def test_drops_driver_padding(self) -> None:
+        jpeg = _make_jpeg()
+        self.assertEqual(trim_to_eoi(jpeg + bytes(100)), jpeg)
+
+    def test_no_eoi_is_passed_through(self) -> None:
+        self.assertEqual(trim_to_eoi(b"\xff\xd8abc"), b"\xff\xd8abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
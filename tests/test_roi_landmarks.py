@@ -0,0 +1,198 @@
+"""Unit tests for the ROI-crop landmark provider.
+
+Uses a stand-in landmarker that "finds" a bright rectangle in whatever
+image it is given -- needs OpenCV and NumPy, but no MediaPipe model or
+cameras.
+
+Run with:
+
+    python -m unittest tests.test_roi_landmarks -v
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.face_tracking.providers.face_landmarks import FaceLandmarksObservation
+from src.face_tracking.providers.roi_landmarks import LANDMARKER_VERTICAL_FOV_DEG, RoiLandmarksProvider
+
+FRAME_W = 640
+FRAME_H = 480
+FACE_WIDTH_CM = 15.0
+# A head turned a little to the side.
+ROTATION = np.array(
+    [[0.96, 0.0, 0.28], [0.0, 1.0, 0.0], [-0.28, 0.0, 0.96]]
+)
+
+
+class RectangleLandmarker:
+    """Reports the corners of the bright pixels in the image it sees,
+    normalized to that image, as a four-point "face", and a transformation
+    matrix placing a ``FACE_WIDTH_CM`` wide face there with the camera
+    model MediaPipe assumes for the image."""
+
+    def __init__(self) -> None:
+        self.seen_shapes = []
+        self.released = False
+
+    def get_primary_face_observation(self, rgb_image):
+        self.seen_shapes.append(rgb_image.shape[:2])
+        ys, xs = np.nonzero(rgb_image[:, :, 0] > 127)
+        if len(xs) == 0:
+            return None
+        h, w = rgb_image.shape[:2]
+        x0, x1 = xs.min() / w, (xs.max() + 1) / w
+        y0, y1 = ys.min() / h, (ys.max() + 1) / h
+        points = np.array([(x0, y0, 0.1), (x1, y0, 0.1), (x0, y1, 0.1), (x1, y1, 0.1)], dtype=np.float32)
+        focal = 0.5 * h / math.tan(math.radians(LANDMARKER_VERTICAL_FOV_DEG) / 2.0)
+        distance = focal * FACE_WIDTH_CM / ((x1 - x0) * w)
+        matrix = np.eye(4)
+        matrix[:3, :3] = ROTATION
+        matrix[:3, 3] = (
+            (0.5 * (x0 + x1) - 0.5) * w * distance / focal,
+            -(0.5 * (y0 + y1) - 0.5) * h * distance / focal,
+            -distance,
+        )
+        return FaceLandmarksObservation(
+            landmarks=points, facial_transformation_matrix=matrix.tolist(), blendshapes=["scores"], points=points
+        )
+
+    def release(self) -> None:
+        self.released = True
+
+
+def frame_with_face(x: int, y: int, w: int = 80, h: int = 100) -> np.ndarray:
+    rgb = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+    rgb[y : y + h, x : x + w] = 255
+    return rgb
+
+
+def corners_px(observation) -> np.ndarray:
+    return observation.points[:, :2] * (FRAME_W, FRAME_H)
+
+
+class RoiLandmarksProviderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.landmarker = RectangleLandmarker()
+
+    def _provider(self, **kwargs) -> RoiLandmarksProvider:
+        return RoiLandmarksProvider(provider=self.landmarker, **kwargs)
+
+    def test_crop_landmarks_map_back_to_the_full_frame(self) -> None:
+        provider = self._provider()
+        frame = frame_with_face(300, 200)
+        full = provider.get_primary_face_observation(frame)
+        cropped = provider.get_primary_face_observation(frame)
+        # Box 80x100 padded by 25 % a side: a 150 px square, not resized.
+        self.assertEqual(self.landmarker.seen_shapes, [(FRAME_H, FRAME_W), (150, 150)])
+        expected = [(300, 200), (380, 200), (300, 300), (380, 300)]
+        np.testing.assert_allclose(corners_px(full), expected, atol=1e-3)
+        np.testing.assert_allclose(corners_px(cropped), expected, atol=1e-3)
+        # z scales with x, like the landmarker's own output.
+        self.assertAlmostEqual(float(cropped.points[0, 2]), 0.1 * 150 / FRAME_W, places=6)
+
+    def test_large_crops_are_shrunk_to_input_size(self) -> None:
+        provider = self._provider(input_size=64)
+        frame = frame_with_face(300, 200)
+        provider.get_primary_face_observation(frame)
+        cropped = provider.get_primary_face_observation(frame)
+        self.assertEqual(self.landmarker.seen_shapes[-1], (64, 64))
+        # One pixel of the 64 px input is ~2.3 px of the 150 px crop.
+        np.testing.assert_allclose(
+            corners_px(cropped), [(300, 200), (380, 200), (300, 300), (380, 300)], atol=2.5
+        )
+
+    def test_full_frame_every_full_frame_interval(self) -> None:
+        provider = self._provider(full_frame_interval=3)
+        frame = frame_with_face(300, 200)
+        for _ in range(8):
+            self.assertIsNotNone(provider.get_primary_face_observation(frame))
+        full = [shape == (FRAME_H, FRAME_W) for shape in self.landmarker.seen_shapes]
+        self.assertEqual(full, [True, False, False, False, True, False, False, False])
+
+    def test_a_missed_crop_falls_back_to_the_full_frame(self) -> None:
+        provider = self._provider()
+        provider.get_primary_face_observation(frame_with_face(300, 200))
+        # The face jumps out of the crop: the crop misses, the full frame
+        # finds it in the same call, and the next crop follows it.
+        moved = provider.get_primary_face_observation(frame_with_face(40, 40))
+        np.testing.assert_allclose(corners_px(moved)[0], (40, 40), atol=1e-3)
+        provider.get_primary_face_observation(frame_with_face(40, 40))
+        self.assertEqual(
+            self.landmarker.seen_shapes,
+            [(FRAME_H, FRAME_W), (150, 150), (FRAME_H, FRAME_W), (150, 150)],
+        )
+        # Lost entirely: no observation and the next frame is a full one.
+        self.assertIsNone(provider.get_primary_face_observation(np.zeros((FRAME_H, FRAME_W, 3), np.uint8)))
+        provider.get_primary_face_observation(frame_with_face(300, 200))
+        self.assertEqual(self.landmarker.seen_shapes[-1], (FRAME_H, FRAME_W))
+
+    def test_crop_matrices_match_the_full_frame(self) -> None:
+        frame = frame_with_face(420, 260)
+        for input_size in (256, 64):
+            provider = self._provider(input_size=input_size)
+            full = np.array(provider.get_primary_face_observation(frame).facial_transformation_matrix)
+            cropped = provider.get_primary_face_observation(frame)
+            self.assertNotEqual(self.landmarker.seen_shapes[-1], (FRAME_H, FRAME_W))
+            matrix = np.array(cropped.facial_transformation_matrix)
+            np.testing.assert_allclose(matrix[:3, :3], ROTATION)
+            # A 64 px input blurs the face edges by about a pixel.
+            tolerance = 1e-6 if input_size == 256 else 0.5
+            np.testing.assert_allclose(matrix[:3, 3], full[:3, 3], atol=tolerance)
+            self.assertEqual(cropped.blendshapes, ["scores"])
+
+    def test_missing_matrices_stay_missing(self) -> None:
+        landmarker = self.landmarker
+
+        class NoMatrix:
+            def get_primary_face_observation(self, rgb_image):
+                observation = landmarker.get_primary_face_observation(rgb_image)
+                observation.facial_transformation_matrix = None
+                return observation
+
+        provider = RoiLandmarksProvider(provider=NoMatrix())
+        frame = frame_with_face(300, 200)
+        for _ in range(2):
+            self.assertIsNone(provider.get_primary_face_observation(frame).facial_transformation_matrix)
+
+    def test_stats(self) -> None:
+        provider = self._provider()
+        self.assertEqual(provider.stats()["hit_rate"], 0.0)
+        provider.get_primary_face_observation(frame_with_face(300, 200))
+        provider.get_primary_face_observation(frame_with_face(300, 200))
+        provider.get_primary_face_observation(frame_with_face(300, 200))
+        provider.get_primary_face_observation(frame_with_face(40, 40))
+        self.assertEqual(
+            provider.stats(),
+            {
+                "frames": 4,
+                "crop_hits": 2,
+                "crop_misses": 1,
+                "full_frames": 2,
+                "hit_rate": 0.5,
+                "mean_crop_px": 150.0,
+            },
+        )
+
+    def test_release_releases_the_landmarker(self) -> None:
+        self._provider().release()
+        self.assertTrue(self.landmarker.released)
+
+    def test_rejects_bad_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            self._provider(input_size=16)
+        with self.assertRaises(ValueError):
+            self._provider(full_frame_interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""Unit tests for the stereo face analysis pipeline.
+
+Uses stand-in landmark providers and a synthetic stereo rig -- needs
+OpenCV and NumPy, but no MediaPipe model or cameras.
+
+Run with:
+
+    python -m unittest tests.test_stereo_face_analysis -v
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.face_tracking.pipelines.stereo_face_analysis import (
+    StereoCalibration,
+    StereoFaceAnalysisPipeline,
+)
+from src.face_tracking.providers.face_landmarks import FaceLandmarksObservation
+
+FRAME_W = 640
+FRAME_H = 480
+
+
+def synthetic_rig():
+    """Two 500 px cameras 60 mm apart, no distortion; right = left + T."""
+    k = np.array([[500.0, 0.0, 320.0], [0.0, 500.0, 240.0], [0.0, 0.0, 1.0]])
+    return StereoCalibration(
+        k1=k,
+        d1=np.zeros(5),
+        k2=k.copy(),
+        d2=np.zeros(5),
+        r=np.eye(3),
+        t=np.array([[-60.0], [0.0], [0.0]]),
+    )
+
+
+def synthetic_face(calibration, count: int = 478, seed: int = 0):
+    """(3D points in the left camera frame, left points, right points),
+    the 2D ones normalized like MediaPipe landmarks."""
+    rng = np.random.default_rng(seed)
+    points_3d = rng.uniform((-60.0, -70.0, 450.0), (60.0, 70.0, 520.0), size=(count, 3))
+
+    def project(k, points):
+        px = points @ k.T
+        px = px[:, :2] / px[:, 2:3]
+        out = np.zeros((count, 3), dtype=np.float32)
+        out[:, 0] = px[:, 0] / FRAME_W
+        out[:, 1] = px[:, 1] / FRAME_H
+        return out
+
+    right_3d = points_3d @ calibration.r.T + calibration.t.reshape(1, 3)
+    return points_3d, project(calibration.k1, points_3d), project(calibration.k2, right_3d)
+
+
+class FakeProvider:
+    """Returns a fixed observation after ``delay`` seconds, or raises."""
+
+    def __init__(self, points=None, delay: float = 0.0, error: BaseException = None) -> None:
+        self.points = points
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.finished = threading.Event()
+        self.released = False
+
+    def get_primary_face_observation(self, rgb_image):
+        self.calls += 1
+        try:
+            time.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            if self.points is None:
+                return None
+            return FaceLandmarksObservation(
+                landmarks=self.points, facial_transformation_matrix=None, points=self.points
+            )
+        finally:
+            self.finished.set()
+
+    def release(self) -> None:
+        self.released = True
+
+
+def make_pipeline(left, right, **kwargs) -> StereoFaceAnalysisPipeline:
+    return StereoFaceAnalysisPipeline(
+        stereo_calibration=kwargs.pop("calibration", None) or synthetic_rig(),
+        left_landmarks_provider=left,
+        right_landmarks_provider=right,
+        **kwargs,
+    )
+
+
+def analyze(pipeline, left_rgb=None, right_rgb=None):
+    blank = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+    return pipeline.analyze(
+        left_rgb if left_rgb is not None else blank,
+        right_rgb if right_rgb is not None else blank,
+        FRAME_W,
+        FRAME_H,
+        FRAME_W,
+        FRAME_H,
+        screen_width=1920,
+        screen_height=1080,
+    )
+
+
+class ParallelInferenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calibration = synthetic_rig()
+        self.points_3d, self.left_points, self.right_points = synthetic_face(self.calibration)
+
+    def _pipeline(self, left, right, **kwargs):
+        pipeline = make_pipeline(left, right, calibration=self.calibration, **kwargs)
+        self.addCleanup(pipeline.release)
+        return pipeline
+
+    def test_results_keep_left_and_right_apart(self) -> None:
+        pipeline = self._pipeline(
+            FakeProvider(self.left_points, delay=0.02), FakeProvider(self.right_points)
+        )
+        result = analyze(pipeline)
+        self.assertIs(result.landmarks, self.left_points)
+        self.assertIs(result.right_landmarks, self.right_points)
+        np.testing.assert_allclose(result.points_3d[1], self.points_3d[1], atol=0.5)
+
+    def test_timings_show_the_landmarkers_overlapping(self) -> None:
+        pipeline = self._pipeline(
+            FakeProvider(self.left_points, delay=0.05), FakeProvider(self.right_points, delay=0.05)
+        )
+        analyze(pipeline)
+        timings = pipeline.last_timings
+        self.assertGreaterEqual(timings.left_ms, 45.0)
+        self.assertGreaterEqual(timings.right_ms, 45.0)
+        self.assertLess(timings.wall_ms, timings.left_ms + timings.right_ms - 20.0)
+        self.assertFalse(timings.right_tracked)
+
+    def test_sequential_inference_adds_up(self) -> None:
+        pipeline = self._pipeline(
+            FakeProvider(self.left_points, delay=0.02),
+            FakeProvider(self.right_points, delay=0.02),
+            parallel_inference=False,
+        )
+        analyze(pipeline)
+        timings = pipeline.last_timings
+        self.assertGreaterEqual(timings.wall_ms, timings.left_ms + timings.right_ms)
+
+    def test_left_error_wins_after_the_right_call_finishes(self) -> None:
+        right = FakeProvider(delay=0.05, error=RuntimeError("right failed"))
+        pipeline = self._pipeline(FakeProvider(error=ValueError("left failed")), right)
+        with self.assertRaisesRegex(ValueError, "left failed"):
+            analyze(pipeline)
+        # The right frame is not handed back while the worker still reads it.
+        self.assertTrue(right.finished.is_set())
+
+    def test_right_error_propagates(self) -> None:
+        pipeline = self._pipeline(
+            FakeProvider(self.left_points), FakeProvider(error=RuntimeError("right failed"))
+        )
+        with self.assertRaisesRegex(RuntimeError, "right failed"):
+            analyze(pipeline)
+
+    def test_missing_face_on_either_side_gives_no_result(self) -> None:
+        pipeline = self._pipeline(FakeProvider(self.left_points), FakeProvider(None))
+        self.assertIsNone(analyze(pipeline))
+
+    def test_release_shuts_down_the_worker_and_providers(self) -> None:
+        left = FakeProvider(self.left_points)
+        right = FakeProvider(self.right_points)
+        pipeline = make_pipeline(left, right, calibration=self.calibration)
+        analyze(pipeline)
+        self.assertTrue(_worker_threads())
+        pipeline.release()
+        self.assertEqual(_worker_threads(), [])
+        self.assertTrue(left.released and right.released)
+
+
+def _worker_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("stereo-right-landmarker")]
+
+
+if __name__ == "__main__":
+    unittest.main()
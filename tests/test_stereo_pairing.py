@@ -0,0 +1,100 @@
+"""Unit tests for ``src.capture.pairing``.
+
+Pure Python -- no OpenCV or cameras required.
+
+Run with:
+
+    python -m unittest tests.test_stereo_pairing -v
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.capture.pairing import PairSkewStats, select_pair
+
+
+class SelectPairTests(unittest.TestCase):
+    def test_empty_history_returns_none(self) -> None:
+        self.assertIsNone(select_pair([], [1.0], 0.0, 0.0, 0.05))
+        self.assertIsNone(select_pair([1.0], [], 0.0, 0.0, 0.05))
+
+    def test_newest_pair_when_aligned(self) -> None:
+        left = [0.000, 0.033, 0.066]
+        right = [0.001, 0.034, 0.067]
+        self.assertEqual(select_pair(left, right, 0.0, 0.0, 0.05), (2, 2))
+
+    def test_older_frame_rescues_drifted_pair(self) -> None:
+        # Newest frames are 30 ms apart (beyond a 20 ms skew limit), but
+        # the previous right frame matches the newest left within 3 ms.
+        left = [0.000, 0.033, 0.066]
+        right = [0.039, 0.069, 0.096]
+        self.assertEqual(select_pair(left, right, 0.0, 0.0, 0.02), (2, 1))
+
+    def test_prefers_minimum_skew(self) -> None:
+        left = [0.000, 0.033, 0.066]
+        right = [0.050, 0.060, 0.070]
+        self.assertEqual(select_pair(left, right, 0.0, 0.0, 0.05), (2, 2))
+
+    def test_respects_watermarks(self) -> None:
+        left = [0.000, 0.033, 0.066]
+        right = [0.039, 0.069, 0.096]
+        # The 0.069 right frame was already consumed.
+        self.assertIsNone(select_pair(left, right, 0.0, 0.069, 0.02))
+        self.assertEqual(select_pair(left, right, 0.0, 0.069, 0.05), (2, 2))
+
+    def test_nothing_newer_than_watermark(self) -> None:
+        left = [0.000, 0.033]
+        right = [0.001, 0.034]
+        self.assertIsNone(select_pair(left, right, 0.033, 0.0, 0.05))
+
+    def test_at_least_one_side_is_newest(self) -> None:
+        # (0, 0) is a perfect match but both frames are stale; the pair
+        # anchored on the newest right frame wins instead.
+        left = [0.000, 0.040]
+        right = [0.000, 0.045]
+        self.assertEqual(select_pair(left, right, -1.0, -1.0, 0.05), (1, 1))
+
+    def test_tie_goes_to_newer_pair(self) -> None:
+        left = [0.0, 0.5]
+        right = [0.25, 0.75]
+        # (1, 0) and (1, 1) are both 250 ms apart; (1, 1) is newer.
+        self.assertEqual(select_pair(left, right, -1.0, -1.0, 1.0), (1, 1))
+
+    def test_skew_limit_is_inclusive(self) -> None:
+        self.assertEqual(select_pair([0.0], [0.05], -1.0, -1.0, 0.05), (0, 0))
+        self.assertIsNone(select_pair([0.0], [0.051], -1.0, -1.0, 0.05))
+
+
+class PairSkewStatsTests(unittest.TestCase):
+    def test_empty_snapshot(self) -> None:
+        snap = PairSkewStats().snapshot()
+        self.assertEqual(snap["pairs"], 0)
+        self.assertEqual(snap["mean_skew_s"], 0.0)
+
+    def test_records_running_stats(self) -> None:
+        stats = PairSkewStats()
+        stats.record(0.010, from_history=False)
+        stats.record(-0.030, from_history=True)
+        snap = stats.snapshot()
+        self.assertEqual(snap["pairs"], 2)
+        self.assertEqual(snap["from_history"], 1)
+        self.assertAlmostEqual(snap["mean_skew_s"], 0.020)
+        self.assertAlmostEqual(snap["max_skew_s"], 0.030)
+        self.assertAlmostEqual(snap["last_skew_s"], 0.030)
+
+    def test_reset(self) -> None:
+        stats = PairSkewStats()
+        stats.record(0.010, from_history=True)
+        stats.reset()
+        self.assertEqual(stats.snapshot()["pairs"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()